@@ -2,9 +2,10 @@
 Enhanced A2A Protocol Implementation for Multi-Agent Research System with Tool Support
 """
 import json
+import threading
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, asdict
 from enum import Enum
 
@@ -56,24 +57,103 @@ class A2AMessage:
         )
 
 
+class A2ATransport:
+    """
+    Delivery channel for A2A messages, shared by all the clients of a process.
+    
+    In a real deployment this would hold the pooled HTTP connections to other agents'
+    /a2a/message endpoints; for this demo it keeps the messages in a shared queue.
+    """
+    def __init__(self):
+        self.message_queue: List[A2AMessage] = []
+        self._lock = threading.Lock()
+    
+    def deliver(self, receiver: str, message: A2AMessage) -> bool:
+        """Hand a message over for delivery to the receiver"""
+        with self._lock:
+            self.message_queue.append(message)
+        return True
+    
+    def status(self, receiver: str) -> Optional[Dict[str, Any]]:
+        """
+        The receiver's /a2a/status (see get_agent_status), or None if it does not report one.
+        The demo queue knows nothing about the receivers, so it reports none.
+        """
+        return None
+
+
 class A2AClient:
     """Basic A2A client for sending messages between agents"""
-    def __init__(self, agent_id: str):
+    def __init__(self, agent_id: str, transport: Optional[A2ATransport] = None):
         self.agent_id = agent_id
+        # Clients are cheap per-agent handles; the transport (and its connections) is shared
+        self.transport = transport if transport is not None else DEFAULT_TRANSPORT
     
     def send_message(self, receiver: str, message: A2AMessage) -> bool:
         """
         Send message to another agent - in a real implementation this would make HTTP calls
-        For this demo, we'll use a mock implementation that stores messages in a queue
+        For this demo, the transport stores messages in a queue
         """
         # In a real implementation, this would be an HTTP POST to receiver's /a2a/message endpoint
         print(f"A2A Client {self.agent_id} sending message to {receiver}: {message.type}")
-        # For demo purposes, we'll store the message in a shared queue
-        if hasattr(A2AClient, 'message_queue'):
-            A2AClient.message_queue.append(message)
+        return self.transport.deliver(receiver, message)
+    
+    def get_status(self, receiver: str) -> Optional[Dict[str, Any]]:
+        """Get another agent's status - in a real implementation a GET of the receiver's /a2a/status endpoint"""
+        return self.transport.status(receiver)
+
+
+class CreditLedger:
+    """
+    Sender side of credit-based flow control.
+    
+    A receiver advertises how many more requests it can take through /a2a/status
+    ("credits"). The sender spends one credit per request and gets it back with the
+    reply, and asks for a fresh status only when it runs out, which also picks up
+    capacity added since (new replicas, other senders' requests finishing). Receivers
+    that do not report a status are not limited.
+    """
+    def __init__(self, client: A2AClient):
+        self.client = client
+        self._credits: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def credits(self, receiver: str) -> Optional[int]:
+        """Credits left for the receiver; None if it does not advertise any"""
+        with self._lock:
+            if self._credits.get(receiver, 0) <= 0:
+                self._refresh(receiver)
+            return self._credits.get(receiver)
+    
+    def try_acquire(self, receivers: List[str]) -> bool:
+        """Take one credit for each receiver, or none at all if any of them is out of credits"""
+        with self._lock:
+            for receiver in receivers:
+                if self._credits.get(receiver, 0) <= 0:
+                    self._refresh(receiver)
+            if any(self._credits.get(receiver, 1) <= 0 for receiver in receivers):
+                return False
+            for receiver in receivers:
+                if receiver in self._credits:
+                    self._credits[receiver] -= 1
+            return True
+    
+    def release(self, receiver: str):
+        """Return the credit of a request the receiver has replied to"""
+        with self._lock:
+            if receiver in self._credits:
+                self._credits[receiver] += 1
+    
+    def _refresh(self, receiver: str):
+        status = self.client.get_status(receiver)
+        if status is None:
+            self._credits.pop(receiver, None)
         else:
-            A2AClient.message_queue = [message]
-        return True
+            self._credits[receiver] = status["credits"]
+
+
+# Transport used by clients created without one
+DEFAULT_TRANSPORT = A2ATransport()
 
 
 def get_agent_capabilities(agent_id: str, name: str, description: str, supported_types: list) -> Dict[str, Any]:
@@ -96,4 +176,19 @@ def get_agent_capabilities(agent_id: str, name: str, description: str, supported
             "capabilities": "/a2a/capabilities",
             "status": "/a2a/status"
         }
-    }
\ No newline at end of file
+    }
+
+
+def get_agent_status(agent_id: str, capacity: int, outstanding: int) -> Dict[str, Any]:
+    """
+    Generate an agent's /a2a/status: how many requests it can work on at once (capacity),
+    how many it has queued or in progress (outstanding), and how many more it accepts (credits)
+    """
+    credits = max(0, capacity - outstanding)
+    return {
+        "id": agent_id,
+        "status": "available" if credits else "busy",
+        "capacity": capacity,
+        "outstanding": outstanding,
+        "credits": credits
+    }
@@ -0,0 +1,188 @@
+"""
+Base Research Agent for Multi-Agent Research System
+Shared agent runtime (LLM client, tool service, A2A transport) and declaratively defined research agents
+"""
+from a2a_protocol import A2AMessage, MessageType, A2AClient, A2ATransport, DEFAULT_TRANSPORT, get_agent_capabilities
+from dataclasses import dataclass
+import threading
+from typing import Dict, Any, Optional, Tuple
+from llm_interface import GeminiLLMInterface, ResearchPrompt
+from tools.tool_execution_service import ToolExecutionService
+
+
+class AgentRuntime:
+    """
+    Resources shared by the agents of a process: one LLM client, one tool execution
+    service and one A2A transport.
+    
+    The LLM client and tool service are created on first use, so a runtime costs
+    nothing until an agent needs them and the LLM setup notes are printed once.
+    """
+    
+    _shared: Optional["AgentRuntime"] = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, llm_interface: Optional[GeminiLLMInterface] = None,
+                 tool_service: Optional[ToolExecutionService] = None,
+                 transport: Optional[A2ATransport] = None):
+        self._llm_interface = llm_interface
+        self._tool_service = tool_service
+        self.transport = transport if transport is not None else DEFAULT_TRANSPORT
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def shared(cls) -> "AgentRuntime":
+        """The process-wide runtime used by agents created without one"""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+    
+    @property
+    def llm_interface(self) -> GeminiLLMInterface:
+        if self._llm_interface is None:
+            with self._lock:
+                if self._llm_interface is None:
+                    self._llm_interface = GeminiLLMInterface()
+        return self._llm_interface
+    
+    @property
+    def tool_service(self) -> ToolExecutionService:
+        if self._tool_service is None:
+            with self._lock:
+                if self._tool_service is None:
+                    self._tool_service = ToolExecutionService()
+        return self._tool_service
+    
+    def client_for(self, agent_id: str) -> A2AClient:
+        """A client for one agent, sending through the shared transport"""
+        return A2AClient(agent_id, self.transport)
+
+
+@dataclass(frozen=True)
+class ResearchAgentSpec:
+    """Declarative definition of a domain research agent"""
+    agent_id: str
+    agent_type: str  # Reported as "agent_type" in research results, e.g. "tech"
+    name: str  # Name in the agent's capabilities
+    log_name: str  # Prefix of the agent's console messages
+    description: str
+    research: ResearchPrompt
+    # Agent method (query, context) -> results that performs the research, for agents that provide
+    # one as their public override point; otherwise the research prompt goes to the LLM directly
+    research_method: Optional[str] = None
+    supported_message_types: Tuple[str, ...] = (
+        MessageType.REQUEST_RESEARCH_TASK.value,
+        MessageType.RESPONSE_TOOL_RESULT.value
+    )
+
+
+class BaseResearchAgent:
+    """
+    Research agent answering research tasks for one domain, defined by a ResearchAgentSpec.
+    
+    Subclasses set the spec class attribute; a one-off agent can also be created from
+    a spec directly with BaseResearchAgent(spec=...).
+    """
+    
+    spec: ResearchAgentSpec = None
+    
+    def __init__(self, runtime: Optional[AgentRuntime] = None, spec: Optional[ResearchAgentSpec] = None):
+        if spec is not None:
+            self.spec = spec
+        if self.spec is None:
+            raise ValueError(f"{type(self).__name__} has no ResearchAgentSpec")
+        self.runtime = runtime if runtime is not None else AgentRuntime.shared()
+        self.agent_id = self.spec.agent_id
+        self.client = self.runtime.client_for(self.agent_id)
+        self.llm_interface = self.runtime.llm_interface
+        
+        # Define supported message types
+        self.supported_message_types = list(self.spec.supported_message_types)
+    
+    @property
+    def tool_service(self) -> ToolExecutionService:
+        return self.runtime.tool_service
+    
+    def get_capabilities(self):
+        """Return agent capabilities in A2A format"""
+        return get_agent_capabilities(
+            agent_id=self.agent_id,
+            name=self.spec.name,
+            description=self.spec.description,
+            supported_types=list(self.spec.supported_message_types)
+        )
+    
+    def receive_message(self, message: A2AMessage):
+        """Handle incoming A2A messages"""
+        print(f"{self.spec.log_name} received message of type: {message.type}")
+        
+        if message.type == MessageType.REQUEST_RESEARCH_TASK.value:
+            self.handle_research_task(message)
+        elif message.type == MessageType.RESPONSE_TOOL_RESULT.value:
+            self.handle_tool_result(message)
+        else:
+            print(f"{self.spec.log_name}: Unknown message type received: {message.type}")
+    
+    def handle_research_task(self, message: A2AMessage):
+        """Process a research task and respond with results"""
+        query = message.payload.get("query", "")
+        context = message.payload.get("context", "")
+        
+        print(f"{self.spec.log_name} processing: {query}")
+        
+        # Perform research using Gemini LLM
+        results = self.perform_research(query, context)
+        
+        # Prepare response
+        response_payload = {
+            "agent_type": self.spec.agent_type,
+            "query": query,
+            "results": results
+        }
+        
+        response_msg = A2AMessage.create_message(
+            MessageType.RESPONSE_RESEARCH_RESULTS,
+            self.agent_id,
+            message.sender,  # Send back to orchestrator
+            response_payload,
+            {"in_reply_to": message.id}  # Lets the orchestrator match the reply to its request
+        )
+        
+        print(f"{self.spec.log_name} sending results to {message.sender}")
+        self.client.send_message(message.sender, response_msg)
+    
+    def handle_tool_result(self, message: A2AMessage):
+        """Handle results from tool execution"""
+        tool_id = message.payload.get("tool_id", "unknown")
+        result = message.payload.get("result", {})
+        print(f"{self.spec.log_name} received tool result from {tool_id}: {result}")
+        # In a real implementation, we would incorporate the tool result into our research process
+    
+    def perform_research(self, query: str, context: str) -> Dict[str, Any]:
+        """Perform this agent's domain research using Gemini LLM"""
+        if self.spec.research_method is not None:
+            return getattr(self, self.spec.research_method)(query, context)
+        return self.llm_interface.perform_research(query, context, self.spec.research)
+    
+    def execute_tool(self, tool_id: str, **params) -> Dict[str, Any]:
+        """Run a tool directly on the shared tool execution service"""
+        return self.tool_service.execute_tool(tool_id, **params)
+    
+    def send_tool_request(self, tool_id: str, parameters: Dict[str, Any], receiver: str = "tool-service"):
+        """Send a request to use a specific tool"""
+        tool_payload = {
+            "tool_id": tool_id,
+            "parameters": parameters
+        }
+        
+        tool_msg = A2AMessage.create_message(
+            MessageType.REQUEST_USE_TOOL,
+            self.agent_id,
+            receiver,
+            tool_payload
+        )
+        
+        print(f"{self.spec.log_name} requesting tool execution: {tool_id}")
+        self.client.send_message(receiver, tool_msg)
@@ -2,19 +2,21 @@
 Fact-Checking Agent for Multi-Agent Research System
 Implements the Fact-Checking Agent using A2A protocol with tool capabilities
 """
-from a2a_protocol import A2AMessage, MessageType, A2AClient, get_agent_capabilities
+from a2a_protocol import A2AMessage, MessageType, get_agent_capabilities
 import json
-from typing import Dict, Any
-from llm_interface import GeminiLLMInterface
+from typing import Dict, Any, Optional
+from agents.base_research_agent import AgentRuntime
 
 
 class FactCheckAgent:
     """Fact-Checking Agent - Validates information from other agents"""
     
-    def __init__(self):
+    def __init__(self, runtime: Optional[AgentRuntime] = None):
         self.agent_id = "factcheck-agent"
-        self.client = A2AClient(self.agent_id)
-        self.llm_interface = GeminiLLMInterface()
+        # LLM client and transport are shared with the other agents of the process
+        self.runtime = runtime if runtime is not None else AgentRuntime.shared()
+        self.client = self.runtime.client_for(self.agent_id)
+        self.llm_interface = self.runtime.llm_interface
         
         # Define supported message types
         self.supported_message_types = [
@@ -64,7 +66,8 @@ class FactCheckAgent:
             MessageType.RESPONSE_FACTCHECK_RESULTS,
             self.agent_id,
             message.sender,  # Send back to orchestrator
-            response_payload
+            response_payload,
+            {"in_reply_to": message.id}
         )
         
         print(f"Fact-Check Agent sending validation results to {message.sender}")
@@ -2,20 +2,45 @@
 Orchestrator Agent for Multi-Agent Research System
 Implements the Research Orchestrator using A2A protocol with tool capabilities
 """
-from a2a_protocol import A2AMessage, MessageType, A2AClient, get_agent_capabilities
+from a2a_protocol import A2AMessage, MessageType, A2AClient, A2ATransport, CreditLedger, get_agent_capabilities
+from collections import deque
 import json
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Optional, Tuple
 import time
+import uuid
 from tools.tool_execution_service import ToolExecutionService
 from tools.tool_framework import ToolRegistry
 
+# Assumed time from starting a request to its final report, until one has been measured
+DEFAULT_REQUEST_SECONDS = 1.0
+
+# IDs of timed-out tasks remembered, so that replies arriving after all are recognized and ignored
+EXPIRED_TASKS_KEPT = 1024
+
 
 class ResearchOrchestratorAgent:
-    """Research Orchestrator Agent - Coordinates research tasks and aggregates results"""
+    """
+    Research Orchestrator Agent - Coordinates research tasks and aggregates results
+    
+    Research requests are admitted into a queue of at most max_pending_requests and
+    started while fewer than max_active_requests are in progress and every research
+    agent has a credit left (see CreditLedger); fact-check requests of started research
+    go ahead of new research. When the queue is full a request is rejected with a hint
+    of when to retry, so the work waiting anywhere in the system stays bounded.
     
-    def __init__(self):
+    A request whose task has had no reply for request_timeout_seconds (a crashed agent
+    or a lost message) is reclaimed: the credits of its unanswered tasks are returned and
+    it is started again, or dropped after max_request_attempts. Overdue requests are found
+    on every admission and reply; call dispatch_pending() periodically if neither may
+    happen for a while.
+    """
+    
+    def __init__(self, transport: Optional[A2ATransport] = None, max_pending_requests: Optional[int] = 16,
+                 max_active_requests: int = 4, request_timeout_seconds: Optional[float] = 120.0,
+                 max_request_attempts: int = 2):
         self.agent_id = "research-orchestrator-agent"
-        self.client = A2AClient(self.agent_id)
+        self.client = A2AClient(self.agent_id, transport)
         self.research_results = {}
         self.agents = {
             "tech": "tech-research-agent",
@@ -23,6 +48,20 @@ class ResearchOrchestratorAgent:
             "factcheck": "factcheck-agent"
         }
         
+        # Flow control
+        self.flow_control = CreditLedger(self.client)
+        self.max_pending_requests = max_pending_requests  # None for no limit
+        self.max_active_requests = max_active_requests
+        self.request_timeout_seconds = request_timeout_seconds  # None to wait for replies forever
+        self.max_request_attempts = max_request_attempts
+        self.pending_requests = deque()  # (request ID, query, admission time, attempt) of requests not yet started
+        self.active_requests: Dict[str, Dict[str, Any]] = {}
+        self.awaiting_factcheck = deque()  # IDs of requests with all research results, waiting for a fact-check credit
+        self._tasks: Dict[str, Tuple[str, str, float]] = {}  # ID of a message sent to an agent -> request ID, agent, send time
+        self._expired_tasks: Dict[str, None] = {}  # Insertion-ordered set of the last EXPIRED_TASKS_KEPT timed-out tasks
+        self._request_seconds = DEFAULT_REQUEST_SECONDS  # Moving average of start-to-report time
+        self._lock = threading.RLock()
+        
         # Initialize tool framework
         self.tool_registry = ToolRegistry()
         self.tool_service = ToolExecutionService(self.tool_registry)
@@ -65,13 +104,23 @@ class ResearchOrchestratorAgent:
         agent_type = message.payload.get("agent_type", "unknown")
         results = message.payload.get("results", {})
         
-        self.research_results[agent_type] = results
-        print(f"Orchestrator stored research results from {agent_type}: {results}")
-        
-        # Check if we have results from all research agents
-        if self.all_research_results_collected():
-            print("All research results collected, sending to fact-checker...")
-            self.send_results_to_factchecker()
+        with self._lock:
+            if self._is_late_reply(message):
+                return
+            request_id = self._reply_request(message)
+            request = self.active_requests.get(request_id)
+            research_results = request["research_results"] if request else self.research_results
+            research_results[agent_type] = results
+            print(f"Orchestrator stored research results from {agent_type}: {results}")
+            
+            # Check if we have results from all research agents
+            if self.all_research_results_collected(research_results):
+                print("All research results collected, sending to fact-checker...")
+                if request:
+                    self.awaiting_factcheck.append(request_id)
+                else:
+                    self.send_results_to_factchecker()
+            self.dispatch_pending()
     
     def handle_tool_result(self, message: A2AMessage):
         """Handle results from tool execution"""
@@ -80,16 +129,19 @@ class ResearchOrchestratorAgent:
         print(f"Orchestrator received tool result from {tool_id}: {result}")
         # In a real implementation, we would incorporate the tool result into our research process
     
-    def all_research_results_collected(self) -> bool:
+    def all_research_results_collected(self, research_results: Optional[Dict[str, Any]] = None) -> bool:
         """Check if results from all research agents have been collected"""
+        if research_results is None:
+            research_results = self.research_results
         required_agents = ["tech", "economic"]
-        return all(agent in self.research_results for agent in required_agents)
+        return all(agent in research_results for agent in required_agents)
     
-    def send_results_to_factchecker(self):
+    def send_results_to_factchecker(self, request_id: Optional[str] = None):
         """Send aggregated results to fact-checker for validation"""
+        request = self.active_requests.get(request_id)
         factcheck_payload = {
-            "research_results": self.research_results,
-            "query": self.current_query  # This would need to be stored from the original request
+            "research_results": request["research_results"] if request else self.research_results,
+            "query": request["query"] if request else self.current_query
         }
         
         factcheck_msg = A2AMessage.create_message(
@@ -98,6 +150,8 @@ class ResearchOrchestratorAgent:
             self.agents["factcheck"],
             factcheck_payload
         )
+        if request:
+            self._tasks[factcheck_msg.id] = (request_id, self.agents["factcheck"], time.monotonic())
         
         print(f"Orchestrator sending fact-check request to {self.agents['factcheck']}")
         self.client.send_message(self.agents["factcheck"], factcheck_msg)
@@ -107,22 +161,126 @@ class ResearchOrchestratorAgent:
         validation_results = message.payload.get("validation_results", {})
         print(f"Orchestrator received fact-check validation: {validation_results}")
         
-        # Generate final report
-        final_report = self.generate_final_report(validation_results)
-        print("Final report generated:")
-        print(final_report)
+        with self._lock:
+            if self._is_late_reply(message):
+                return
+            request_id = self._reply_request(message)
+            request = self.active_requests.pop(request_id, None)
+            
+            # Generate final report
+            final_report = self.generate_final_report(validation_results, request["research_results"] if request else None)
+            print("Final report generated:")
+            print(final_report)
+            if request:
+                self.complete_request(request_id, request)
+            self.dispatch_pending()
+    
+    def process_research_request(self, query: str) -> Dict[str, Any]:
+        """
+        Process a research request from a user.
+        
+        Returns {"admitted": True, "request_id": ..., "queued": ...}, where queued means the
+        request waits for the research agents to have capacity, or {"admitted": False,
+        "retry_after": seconds} if too many requests are already waiting.
+        """
+        with self._lock:
+            self._reclaim_overdue()
+            if self.max_pending_requests is not None and len(self.pending_requests) >= self.max_pending_requests:
+                retry_after = self.retry_after()
+                print(f"Orchestrator rejected research request (retry after {retry_after:.1f}s): {query}")
+                return {"admitted": False, "retry_after": retry_after}
+            
+            request_id = str(uuid.uuid4())
+            self.pending_requests.append((request_id, query, time.monotonic(), 1))
+            self.dispatch_pending()
+            queued = request_id not in self.active_requests
+            if queued:
+                print(f"Orchestrator queued research request until research agents have capacity: {query}")
+            return {"admitted": True, "request_id": request_id, "queued": queued}
     
-    def process_research_request(self, query: str):
-        """Process a research request from a user"""
+    def dispatch_pending(self):
+        """Reclaim overdue requests, send waiting fact-check requests, then start admitted requests, as far as credits allow"""
+        with self._lock:
+            self._reclaim_overdue()
+            while self.awaiting_factcheck and self.flow_control.try_acquire([self.agents["factcheck"]]):
+                self.send_results_to_factchecker(self.awaiting_factcheck.popleft())
+            
+            research_agents = [agent_id for agent_type, agent_id in self.agents.items() if agent_type != "factcheck"]
+            while (self.pending_requests and len(self.active_requests) < self.max_active_requests
+                   and self.flow_control.try_acquire(research_agents)):
+                self.start_request(*self.pending_requests.popleft())
+    
+    def start_request(self, request_id: str, query: str, admitted_at: float, attempt: int = 1):
+        """Send an admitted request's research tasks"""
         self.current_query = query
         self.research_results = {}  # Reset results
+        self.active_requests[request_id] = {
+            "query": query,
+            "research_results": self.research_results,
+            "admitted_at": admitted_at,
+            "started_at": time.monotonic(),
+            "attempt": attempt
+        }
         
         # Create research tasks for specialized agents
         for agent_type, agent_id in self.agents.items():
             if agent_type != "factcheck":  # Don't send initial task to factchecker
-                self.send_research_task(agent_type, agent_id, query)
+                self.send_research_task(agent_type, agent_id, query, request_id)
+    
+    def complete_request(self, request_id: str, request: Dict[str, Any]):
+        """Record that a request's final report is done"""
+        elapsed = time.monotonic() - request["started_at"]
+        self._request_seconds = 0.8 * self._request_seconds + 0.2 * elapsed
+    
+    def retry_after(self) -> float:
+        """Seconds after which a rejected request is likely to be admitted: about when the next request finishes"""
+        return round(self._request_seconds / max(1, len(self.active_requests)), 3)
+    
+    def _reply_request(self, message: A2AMessage) -> Optional[str]:
+        """The request an agent's reply belongs to; returns the credit spent on it"""
+        task = self._tasks.pop((message.metadata or {}).get("in_reply_to"), None)
+        if task is None:
+            return None
+        request_id, agent_id, _ = task
+        self.flow_control.release(agent_id)
+        return request_id
+    
+    def _is_late_reply(self, message: A2AMessage) -> bool:
+        """Whether a reply answers a task that timed out; its request has been retried or dropped"""
+        if (message.metadata or {}).get("in_reply_to") in self._expired_tasks:
+            print(f"Orchestrator ignored late reply from {message.sender}")
+            return True
+        return False
+    
+    def _reclaim_overdue(self):
+        """Retry or drop requests with a task unanswered for request_timeout_seconds; caller holds the lock"""
+        if self.request_timeout_seconds is None:
+            return
+        now = time.monotonic()
+        overdue = {request_id for request_id, _, sent_at in self._tasks.values()
+                   if now - sent_at >= self.request_timeout_seconds}
+        for request_id in overdue:
+            # Give back the credits of the request's unanswered tasks, whichever timed out
+            silent_agents = []
+            for task_id, (task_request_id, agent_id, _) in list(self._tasks.items()):
+                if task_request_id == request_id:
+                    del self._tasks[task_id]
+                    self.flow_control.release(agent_id)
+                    self._expired_tasks[task_id] = None
+                    silent_agents.append(agent_id)
+            while len(self._expired_tasks) > EXPIRED_TASKS_KEPT:
+                del self._expired_tasks[next(iter(self._expired_tasks))]
+            
+            request = self.active_requests.pop(request_id, None)
+            if request is None:
+                continue
+            if request["attempt"] < self.max_request_attempts:
+                print(f"Orchestrator retrying research request, no reply from {', '.join(silent_agents)}: {request['query']}")
+                self.pending_requests.appendleft((request_id, request["query"], request["admitted_at"], request["attempt"] + 1))
+            else:
+                print(f"Orchestrator gave up on research request, no reply from {', '.join(silent_agents)}: {request['query']}")
     
-    def send_research_task(self, agent_type: str, agent_id: str, query: str):
+    def send_research_task(self, agent_type: str, agent_id: str, query: str, request_id: Optional[str] = None):
         """Send research task to specialized agent"""
         payload = {
             "query": query,
@@ -136,6 +294,8 @@ class ResearchOrchestratorAgent:
             agent_id,
             payload
         )
+        if request_id is not None:
+            self._tasks[msg.id] = (request_id, agent_id, time.monotonic())
         
         print(f"Orchestrator sending {agent_type} research task to {agent_id}")
         self.client.send_message(agent_id, msg)
@@ -157,12 +317,15 @@ class ResearchOrchestratorAgent:
         print(f"Orchestrator requesting tool execution: {tool_id}")
         self.client.send_message(receiver, tool_msg)
     
-    def generate_final_report(self, validation_results: Dict[str, Any]) -> str:
+    def generate_final_report(self, validation_results: Dict[str, Any],
+                              research_results: Optional[Dict[str, Any]] = None) -> str:
         """Generate final report combining all validated research results"""
+        if research_results is None:
+            research_results = self.research_results
         report_parts = ["FINAL RESEARCH REPORT", "="*20]
         
         # Add each agent's validated results
-        for agent_type, result in self.research_results.items():
+        for agent_type, result in research_results.items():
             report_parts.append(f"\n{agent_type.upper()} RESEARCH:")
             report_parts.append(f"Findings: {result.get('findings', 'Not available')}")
             report_parts.append(f"Sources: {result.get('sources', 'Not available')}")
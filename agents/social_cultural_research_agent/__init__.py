@@ -0,0 +1 @@
+# Package initialization for social/cultural research agent
\ No newline at end of file
@@ -0,0 +1,47 @@
+"""
+Social/Cultural Research Agent for Multi-Agent Research System
+Implements the Social/Cultural Research Agent using A2A protocol with tool capabilities
+"""
+from typing import Dict, Any
+from agents.base_research_agent import BaseResearchAgent, ResearchAgentSpec
+from llm_interface import ResearchPrompt
+
+SOCIAL_CULTURAL_RESEARCH = ResearchPrompt(
+    domain="social/cultural",
+    prompt_template="""
+        As a social and cultural research expert, analyze the social and cultural impacts of the following query: {query}
+        Context: {context}
+        
+        Provide your findings in the following JSON format:
+        {{
+          "findings": "detailed social and cultural analysis",
+          "sources": ["source1", "source2", "source3"],
+          "confidence": 0.0-1.0
+        }}
+        
+        Consider effects on communities, public attitudes, equity and access, and cultural norms related to the query.
+        """,
+    mock_findings="Social and cultural impacts of '{query}': Adoption would vary across communities, with effects on access, trust and everyday practices.",
+    mock_sources=("Social Survey Database A", "Sociology Journal B", "Cultural Studies Review C"),
+    mock_confidence=0.74
+)
+
+SOCIAL_CULTURAL_RESEARCH_AGENT = ResearchAgentSpec(
+    agent_id="social-cultural-research-agent",
+    agent_type="social",
+    name="Social/Cultural Research Agent",
+    log_name="Social/Cultural Research Agent",
+    description="Analyzes social and cultural impacts of queries using Gemini LLM, and uses sociological tools for enhanced research",
+    research=SOCIAL_CULTURAL_RESEARCH,
+    research_method="perform_social_research"
+)
+
+
+class SocialCulturalResearchAgent(BaseResearchAgent):
+    """Social/Cultural Research Agent - Analyzes social and cultural impacts of queries"""
+    
+    spec = SOCIAL_CULTURAL_RESEARCH_AGENT
+    
+    def perform_social_research(self, query: str, context: str) -> Dict[str, Any]:
+        """Perform social and cultural research using Gemini LLM"""
+        return self.llm_interface.perform_research(query, context, SOCIAL_CULTURAL_RESEARCH)
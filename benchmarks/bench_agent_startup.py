@@ -0,0 +1,66 @@
+"""
+Benchmark: starting many domain research agents
+Creates N declaratively defined research agents that each use the LLM and the tool service, once with a
+runtime per agent (what every agent building its own clients amounts to) and once with one shared runtime
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import contextlib
+import io
+import time
+from agents.base_research_agent import AgentRuntime, BaseResearchAgent, ResearchAgentSpec
+from llm_interface import ResearchPrompt
+
+
+def make_specs(count: int):
+    return [ResearchAgentSpec(
+        agent_id=f"domain-{i}-research-agent",
+        agent_type=f"domain-{i}",
+        name=f"Domain {i} Research Agent",
+        log_name=f"Domain {i} Research Agent",
+        description=f"Researches domain {i} aspects of queries",
+        research=ResearchPrompt(f"domain {i}", "Analyze {query}. {context}", "Domain findings for '{query}'", (), 0.5)
+    ) for i in range(count)]
+
+
+def start_agents(specs, shared: bool):
+    """Create the agents and have each make one tool call; returns (agents, runtimes)"""
+    shared_runtime = AgentRuntime() if shared else None
+    agents = []
+    for spec in specs:
+        agent = BaseResearchAgent(shared_runtime or AgentRuntime(), spec=spec)
+        agent.execute_tool("calculator", expression="2+2")
+        agents.append(agent)
+    return agents, {id(agent.runtime): agent.runtime for agent in agents}.values()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent startup benchmark")
+    parser.add_argument("--agents", type=int, default=20)
+    args = parser.parse_args()
+    
+    specs = make_specs(args.agents)
+    print(f"{args.agents} research agents, each calling one tool")
+    # Warm up so that neither mode pays for the first tool import
+    with contextlib.redirect_stdout(io.StringIO()):
+        for runtime in start_agents(specs[:1], True)[1]:
+            runtime.tool_service.shutdown()
+    print(f"{'runtime':>12} {'start ms':>9} {'LLM clients':>12} {'tool services':>14} {'setup lines':>12}")
+    for mode, shared in (("per agent", False), ("shared", True)):
+        output = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            agents, runtimes = start_agents(specs, shared)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        setup_lines = output.getvalue().count("Note: To use real Gemini LLM")
+        print(f"{mode:>12} {elapsed_ms:>9.1f} {len({id(agent.llm_interface) for agent in agents}):>12} "
+              f"{len(runtimes):>14} {setup_lines:>12}")
+        for runtime in runtimes:
+            runtime.tool_service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
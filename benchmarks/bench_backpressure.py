@@ -0,0 +1,120 @@
+"""
+Benchmark: backpressure under overload
+Offers research requests to the orchestrator faster than the research agents can answer them (simulated LLM
+latency) and compares dispatching everything at once with credit-based flow control and admission control:
+requests admitted and rejected, peak work held by the orchestrator and the router, and latency
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import contextlib
+import io
+import threading
+import time
+from agents.base_research_agent import AgentRuntime
+from agents.economic_research_agent.economic_research_agent import EconomicResearchAgent
+from agents.factcheck_agent.factcheck_agent import FactCheckAgent
+from agents.orchestrator_agent.research_orchestrator_agent import ResearchOrchestratorAgent
+from agents.tech_research_agent.tech_research_agent import TechResearchAgent
+from llm_interface import GeminiLLMInterface
+from main import MessageRouter
+
+
+class SimulatedLatencyLLM(GeminiLLMInterface):
+    """Mock LLM whose calls take a fixed time, as a real model would"""
+    
+    def __init__(self, research_seconds: float, factcheck_seconds: float):
+        super().__init__()
+        self.research_seconds = research_seconds
+        self.factcheck_seconds = factcheck_seconds
+    
+    def perform_research(self, *args):
+        time.sleep(self.research_seconds)
+        return super().perform_research(*args)
+    
+    def perform_fact_checking(self, research_results):
+        time.sleep(self.factcheck_seconds)
+        return super().perform_fact_checking(research_results)
+
+
+class TimedOrchestrator(ResearchOrchestratorAgent):
+    """Orchestrator recording the time from admission to final report of each request"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+    
+    def complete_request(self, request_id, request):
+        self.latencies.append(time.monotonic() - request["admitted_at"])
+        super().complete_request(request_id, request)
+
+
+def run(flow_control: bool, rate: float, seconds: float, latency: float):
+    router = MessageRouter(max_workers=4)
+    if not flow_control:
+        router.status = lambda receiver: None  # Agents that advertise no capacity are sent everything
+    runtime = AgentRuntime(llm_interface=SimulatedLatencyLLM(latency, latency / 4), transport=router)
+    if flow_control:
+        orchestrator = TimedOrchestrator(transport=router)
+    else:
+        orchestrator = TimedOrchestrator(transport=router, max_pending_requests=None, max_active_requests=10 ** 9)
+    for agent in (orchestrator, TechResearchAgent(runtime), EconomicResearchAgent(runtime), FactCheckAgent(runtime)):
+        router.register_agent(agent.agent_id, agent)
+    
+    admitted = rejected = peak_held = peak_queued = 0
+    
+    def offer():
+        nonlocal admitted, rejected, peak_held, peak_queued
+        start = time.monotonic()
+        for i in range(int(rate * seconds)):
+            time.sleep(max(0.0, start + i / rate - time.monotonic()))
+            if orchestrator.process_research_request(f"Research question {i}")["admitted"]:
+                admitted += 1
+            else:
+                rejected += 1
+            peak_held = max(peak_held, len(orchestrator.pending_requests) + len(orchestrator.active_requests))
+            peak_queued = max(peak_queued, router.queued_messages())
+    
+    producer = threading.Thread(target=offer)
+    start = time.monotonic()
+    producer.start()
+    while producer.is_alive() or orchestrator.pending_requests or orchestrator.active_requests:
+        router.process_messages()
+        time.sleep(0.001)
+    producer.join()
+    elapsed = time.monotonic() - start
+    latencies = sorted(orchestrator.latencies)
+    return {
+        "admitted": admitted,
+        "rejected": rejected,
+        "throughput": len(latencies) / elapsed,
+        "peak_held": peak_held,
+        "peak_queued": peak_queued,
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backpressure benchmark")
+    parser.add_argument("--rate", type=float, default=80.0, help="Research requests offered per second")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--latency-ms", type=float, default=25.0, help="Simulated LLM latency per research task")
+    args = parser.parse_args()
+    
+    print(f"{args.rate:.0f} requests/s offered for {args.seconds:.0f}s; research agents serve about "
+          f"{1000 / args.latency_ms:.0f} requests/s")
+    print(f"{'dispatch':>14} {'admitted':>9} {'rejected':>9} {'done/s':>7} {'peak held':>10} {'peak router queue':>18} "
+          f"{'p50 ms':>8} {'p99 ms':>8}")
+    for name, flow_control in (("everything", False), ("credits", True)):
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = run(flow_control, args.rate, args.seconds, args.latency_ms / 1000)
+        print(f"{name:>14} {result['admitted']:>9} {result['rejected']:>9} {result['throughput']:>7.1f} "
+              f"{result['peak_held']:>10} {result['peak_queued']:>18} {result['p50'] * 1000:>8.0f} "
+              f"{result['p99'] * 1000:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
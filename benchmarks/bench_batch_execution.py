@@ -0,0 +1,68 @@
+"""
+Benchmark: N single tool calls versus one batched call through the ToolExecutionService
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import contextlib
+import io
+import random
+import time
+from tools.tool_framework import ToolRegistry
+from tools.tool_execution_service import ToolExecutionService
+from tools.statistical_analysis_tool.statistical_analysis_tool import StatisticalAnalysisTool
+from tools.web_search_tool.web_search_tool import WebSearchTool
+
+
+def measure(label: str, single, batched, repeats: int):
+    single_time = min(timed(single) for _ in range(repeats))
+    batch_time = min(timed(batched) for _ in range(repeats))
+    print(f"{label}")
+    print(f"  single calls: {single_time * 1000:8.2f} ms")
+    print(f"  batched:      {batch_time * 1000:8.2f} ms  ({single_time / batch_time:.1f}x faster)")
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch execution benchmark")
+    parser.add_argument("--series", type=int, default=200)
+    parser.add_argument("--points", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        registry = ToolRegistry()
+        registry.register_tool(StatisticalAnalysisTool())
+        registry.register_tool(WebSearchTool())
+        service = ToolExecutionService(registry)
+    
+    rng = random.Random(42)
+    stat_requests = [{"tool_id": "statistical-analysis",
+                      "params": {"data": [rng.random() for _ in range(args.points)]}}
+                     for _ in range(args.series)]
+    search_requests = [{"tool_id": "web-search", "params": {"query": f"query {i}"}}
+                       for i in range(args.queries)]
+    
+    for label, requests in [(f"{args.series} statistical analyses of {args.points} points", stat_requests),
+                            (f"{args.queries} web searches", search_requests)]:
+        tool_id = requests[0]["tool_id"]
+        params_list = [request["params"] for request in requests]
+        measure(label,
+                lambda: [service.execute_tool(tool_id, **params) for params in params_list],
+                lambda: service.execute_tools_parallel(requests),
+                args.repeats)
+    
+    service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Benchmark: token-budgeted context packing
+Chunks, ranks (BM25) and packs documents of growing size into a fixed token budget, reporting
+the packed prompt context size and the time spent packing
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import random
+import time
+from tools.text_ranking import estimate_tokens, pack_context
+
+VOCABULARY = ("energy grid storage battery solar wind policy cost market demand supply carbon "
+              "emissions capacity transmission investment region adoption survey analysis").split()
+
+
+def make_document(words: int, seed: int = 0) -> str:
+    """Random prose with one relevant passage in the middle"""
+    rng = random.Random(seed)
+    half = " ".join(rng.choice(VOCABULARY) for _ in range(words // 2))
+    return f"{half} Perovskite tandem cells reached record efficiency in field trials. {half}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Context packing benchmark")
+    parser.add_argument("--words", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--token-budget", type=int, default=2000)
+    parser.add_argument("--query", default="perovskite tandem cell efficiency")
+    args = parser.parse_args()
+
+    print(f"{'doc words':>10} {'doc tokens':>11} {'packed tokens':>14} {'pack ms':>8} {'passage kept':>13}")
+    for words in args.words:
+        document = make_document(words)
+        start = time.perf_counter()
+        packed = pack_context(document, args.query, args.token_budget)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        kept = "Perovskite tandem cells" in packed
+        print(f"{words:>10} {estimate_tokens(document):>11} {estimate_tokens(packed):>14} "
+              f"{elapsed_ms:>8.1f} {str(kept):>13}")
+
+
+if __name__ == "__main__":
+    main()
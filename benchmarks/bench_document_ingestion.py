@@ -0,0 +1,68 @@
+"""
+Benchmark: bulk document ingestion throughput by worker count
+Parses a generated corpus of markdown, text and HTML files with the ingestion pool (parse cache off)
+and reports MB/s and documents/s for each worker count
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import shutil
+import tempfile
+import time
+from tools.document_parser_tool import ingestion
+
+PARAGRAPH = ("## Findings\n\nThe **survey** of [renewable](http://example.org) adoption shows regional "
+             "variation in cost, policy and grid capacity — données régionales.\n\n")
+
+
+def write_corpus(directory: str, documents: int, document_kb: int) -> int:
+    """Write the corpus, cycling through md, txt and html files; returns its size in bytes"""
+    body = PARAGRAPH * (document_kb * 1024 // len(PARAGRAPH.encode("utf-8")) + 1)
+    total = 0
+    for index in range(documents):
+        extension = ("md", "txt", "html")[index % 3]
+        text = f"<html><body><p>{body}</p></body></html>" if extension == "html" else body
+        path = os.path.join(directory, f"doc_{index:05d}.{extension}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        total += os.path.getsize(path)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Document ingestion benchmark")
+    parser.add_argument("--documents", type=int, default=400)
+    parser.add_argument("--document-kb", type=int, default=64)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--max-content-chars", type=int, default=100000)
+    args = parser.parse_args()
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        total_bytes = write_corpus(temp_dir, args.documents, args.document_kb)
+        start = time.perf_counter()
+        documents, _ = ingestion.find_documents(temp_dir, ["txt", "md", "html"], 1 << 30)
+        scan_ms = (time.perf_counter() - start) * 1000
+        print(f"{len(documents)} documents, {total_bytes / (1024 * 1024):.1f} MB, "
+              f"scanned in {scan_ms:.1f} ms (stat only), {os.cpu_count()} CPUs")
+        
+        print(f"{'workers':>8} {'seconds':>8} {'MB/s':>8} {'docs/s':>8} {'first result ms':>16}")
+        for workers in args.workers:
+            start = time.perf_counter()
+            first = None
+            count = 0
+            for _ in ingestion.iter_ingest(documents, args.max_content_chars, workers):
+                if first is None:
+                    first = time.perf_counter() - start
+                count += 1
+            elapsed = time.perf_counter() - start
+            print(f"{workers:>8} {elapsed:>8.2f} {total_bytes / (1024 * 1024) / elapsed:>8.1f} "
+                  f"{count / elapsed:>8.1f} {first * 1000:>16.1f}")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    main()
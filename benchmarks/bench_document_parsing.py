@@ -0,0 +1,93 @@
+"""
+Benchmark: streaming document parsing versus reading whole files
+Measures time and peak Python heap (tracemalloc) for text and markdown files of growing size,
+then the parse cache: a cold parse, a hit on an unchanged file and a hit after the file was touched
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import shutil
+import tempfile
+import time
+import tracemalloc
+from tools.document_parser_tool import parsing_engine
+from tools.document_parser_tool.parse_cache import ParseCache
+
+PARAGRAPH = ("## Findings\n\nThe **survey** of [renewable](http://example.org) adoption shows regional "
+             "variation in cost, policy and grid capacity — données régionales.\n\n")
+
+
+def whole_file_parse(file_path: str, max_content_chars: int):
+    """Read the file into one string and count words and pages from it"""
+    with open(file_path, encoding="utf-8") as f:
+        text = f.read()
+    return text[:max_content_chars], len(text.split()), text.count("\f") + 1
+
+
+def measure(func):
+    """Run func and return (seconds, peak traced MB)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Document parsing benchmark")
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--max-content-chars", type=int, default=100000)
+    args = parser.parse_args()
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        print(f"{'file MB':>8} {'format':>7} {'whole-file s':>13} {'peak MB':>8} {'streaming s':>12} {'peak MB':>8}")
+        for size_mb in args.sizes_mb:
+            path = os.path.join(temp_dir, f"doc_{size_mb}.md")
+            repeats = size_mb * 1024 * 1024 // len(PARAGRAPH.encode("utf-8")) + 1
+            with open(path, "w", encoding="utf-8") as f:
+                for _ in range(repeats // 1000):
+                    f.write(PARAGRAPH * 1000)
+                f.write(PARAGRAPH * (repeats % 1000))
+            
+            for format_name in ("txt", "md"):
+                whole_s, whole_mb = measure(lambda: whole_file_parse(path, args.max_content_chars))
+                stream_s, stream_mb = measure(
+                    lambda: parsing_engine.parse_document(path, format_name, args.max_content_chars))
+                print(f"{size_mb:>8} {format_name:>7} {whole_s:>13.2f} {whole_mb:>8.1f} {stream_s:>12.2f} {stream_mb:>8.1f}")
+            os.unlink(path)
+        
+        print(f"\n{'file MB':>8} {'cold parse ms':>14} {'cached ms':>10} {'touched ms':>11}  (md, parse cache)")
+        for size_mb in args.sizes_mb:
+            path = os.path.join(temp_dir, f"cached_{size_mb}.md")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(PARAGRAPH * (size_mb * 1024 * 1024 // len(PARAGRAPH.encode("utf-8")) + 1))
+            cache = ParseCache(os.path.join(temp_dir, "cache"), 256 * 1024 * 1024, 3600)
+            options = ("md", args.max_content_chars)
+            
+            def cached_parse():
+                parsed = cache.get(path, options)
+                if parsed is None:
+                    parsed = parsing_engine.parse_document(path, "md", args.max_content_chars)
+                    cache.put(path, options, parsed)
+                return parsed
+            
+            timings = []
+            for touch in (False, False, True):
+                if touch:
+                    os.utime(path)  # New mtime, same content: re-hashed, then served from the cache
+                start = time.perf_counter()
+                cached_parse()
+                timings.append((time.perf_counter() - start) * 1000)
+            print(f"{size_mb:>8} {timings[0]:>14.1f} {timings[1]:>10.2f} {timings[2]:>11.1f}")
+            os.unlink(path)
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: HTTP search backend latency under concurrent load
+Runs rounds of concurrent async searches against the stand-in service, which charges a delay for every
+new connection, and compares the keep-alive pool with opening a connection per request
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import time
+from tools.web_search_tool.http_backend import HttpSearchBackend
+from tools.web_search_tool.standin_server import StandInSearchServer
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run_rounds(backend: HttpSearchBackend, rounds: int, concurrency: int):
+    """Latencies in ms of rounds x concurrency searches, each round issued at once"""
+    async def timed(query):
+        start = time.perf_counter()
+        await backend.asearch(query, 10)
+        return (time.perf_counter() - start) * 1000
+    
+    latencies = []
+    for round_index in range(rounds):
+        latencies += await asyncio.gather(*(timed(f"query {round_index} {i}") for i in range(concurrency)))
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP search backend benchmark")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--max-connections", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--connect-latency-ms", type=float, default=30)
+    args = parser.parse_args()
+    
+    print(f"{args.rounds} rounds of {args.concurrency} concurrent searches, {args.latency_ms:.0f} ms service latency, "
+          f"{args.connect_latency_ms:.0f} ms connection setup")
+    print(f"{'mode':>12} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'total s':>8} {'connections':>12}")
+    for mode, keep_alive in (("keep-alive", True), ("per-request", False)):
+        with StandInSearchServer(latency_seconds=args.latency_ms / 1000,
+                                 connect_latency_seconds=args.connect_latency_ms / 1000) as server:
+            backend = HttpSearchBackend(server.url, max_connections=args.max_connections, keep_alive=keep_alive)
+            start = time.perf_counter()
+            latencies = asyncio.run(run_rounds(backend, args.rounds, args.concurrency))
+            total_s = time.perf_counter() - start
+            backend.close()
+            print(f"{mode:>12} {percentile(latencies, 0.5):>8.1f} {percentile(latencies, 0.95):>8.1f} "
+                  f"{max(latencies):>8.1f} {total_s:>8.2f} {server.connections:>12}")
+
+
+if __name__ == "__main__":
+    main()
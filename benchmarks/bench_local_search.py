@@ -0,0 +1,76 @@
+"""
+Benchmark: local search index build time and query latency
+Indexes a synthetic corpus with a Zipf-distributed vocabulary and measures build throughput,
+index size and query latency percentiles for rare, common and multi-term queries
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import itertools
+import random
+import shutil
+import tempfile
+import time
+from tools.web_search_tool.local_index import LocalSearchIndex
+
+
+def make_documents(count: int, words: int, vocabulary: int, seed: int = 0):
+    """Yield documents whose words follow a Zipf distribution over the vocabulary"""
+    rng = random.Random(seed)
+    terms = [f"term{i}" for i in range(vocabulary)]
+    cumulative = list(itertools.accumulate(1 / (rank + 1) for rank in range(vocabulary)))
+    for index in range(count):
+        yield {"url": f"doc://{index}", "title": f"Document {index}",
+               "content": " ".join(rng.choices(terms, cum_weights=cumulative, k=words))}
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local search index benchmark")
+    parser.add_argument("--documents", type=int, default=100000)
+    parser.add_argument("--words", type=int, default=80)
+    parser.add_argument("--vocabulary", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(temp_dir, "index.sqlite3")
+        index = LocalSearchIndex(path)
+        start = time.perf_counter()
+        index.add_documents(make_documents(args.documents, args.words, args.vocabulary))
+        build_s = time.perf_counter() - start
+        size_mb = sum(os.path.getsize(os.path.join(temp_dir, name)) for name in os.listdir(temp_dir)) / (1024 * 1024)
+        print(f"Indexed {args.documents} documents ({args.words} words each) in {build_s:.1f} s "
+              f"({args.documents / build_s:.0f} docs/s), index {size_mb:.0f} MB")
+        
+        rng = random.Random(1)
+        query_mixes = {
+            "rare term": lambda: f"term{rng.randrange(10000, args.vocabulary)}",
+            "common term": lambda: f"term{rng.randrange(0, 20)}",
+            "2 mixed terms": lambda: f"term{rng.randrange(0, 100)} term{rng.randrange(1000, args.vocabulary)}",
+            "3 common terms": lambda: " ".join(f"term{rng.randrange(0, 20)}" for _ in range(3)),
+        }
+        print(f"{'query':>15} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+        for name, make_query in query_mixes.items():
+            latencies = []
+            for _ in range(args.queries):
+                query = make_query()
+                start = time.perf_counter()
+                index.search(query, 10)
+                latencies.append((time.perf_counter() - start) * 1000)
+            print(f"{name:>15} {percentile(latencies, 0.5):>8.2f} {percentile(latencies, 0.95):>8.2f} "
+                  f"{max(latencies):>8.2f}")
+        index.close()
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: tech research agent replica pools
+Offers a burst of research tasks to the tech research agent behind the message router, with simulated LLM
+latency, and measures throughput as replicas are added under each dispatch strategy
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import contextlib
+import io
+import random
+import time
+from a2a_protocol import A2AMessage, MessageType
+from agents.base_research_agent import AgentRuntime
+from agents.tech_research_agent.tech_research_agent import TechResearchAgent
+from main import MessageRouter
+from replica_pool import DISPATCH_STRATEGIES
+
+
+class SimulatedLatencyTechAgent(TechResearchAgent):
+    """Tech research agent whose LLM calls take a random time around a mean latency"""
+    
+    def __init__(self, runtime, latency: float, rng: random.Random):
+        super().__init__(runtime)
+        self.latency = latency
+        self.rng = rng
+    
+    def perform_research(self, query, context):
+        time.sleep(self.rng.uniform(0.5, 1.5) * self.latency)
+        return super().perform_research(query, context)
+
+
+class Sink:
+    """Stand-in orchestrator counting the results it receives"""
+    
+    def __init__(self):
+        self.results = 0
+    
+    def receive_message(self, message):
+        self.results += 1
+
+
+def run(replicas: int, strategy: str, tasks: int, latency: float) -> float:
+    """Process the tasks; returns tasks completed per second"""
+    router = MessageRouter(max_workers=replicas + 1, strategy=strategy)
+    runtime = AgentRuntime(transport=router)
+    sink = Sink()
+    router.register_agent("research-orchestrator-agent", sink)
+    rng = random.Random(0)
+    for _ in range(replicas):
+        router.register_agent("tech-research-agent", SimulatedLatencyTechAgent(runtime, latency, rng))
+    for i in range(tasks):
+        router.send_message(A2AMessage.create_message(
+            MessageType.REQUEST_RESEARCH_TASK, "research-orchestrator-agent", "tech-research-agent",
+            {"query": f"Research question {i}", "context": ""}
+        ))
+    start = time.perf_counter()
+    router.process_messages()
+    elapsed = time.perf_counter() - start
+    assert sink.results == tasks
+    return tasks / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent replica pool benchmark")
+    parser.add_argument("--tasks", type=int, default=64)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Mean simulated LLM latency per task")
+    args = parser.parse_args()
+    
+    print(f"{args.tasks} research tasks, {args.latency_ms:.0f} ms mean simulated LLM latency")
+    print(f"{'strategy':>18} {'replicas':>8} {'tasks/s':>9} {'speedup':>8}")
+    for strategy in DISPATCH_STRATEGIES:
+        baseline = None
+        for replicas in (1, 2, 4, 8):
+            with contextlib.redirect_stdout(io.StringIO()):
+                throughput = run(replicas, strategy, args.tasks, args.latency_ms / 1000)
+            baseline = baseline or throughput
+            print(f"{strategy:>18} {replicas:>8} {throughput:>9.1f} {throughput / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
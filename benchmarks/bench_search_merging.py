@@ -0,0 +1,79 @@
+"""
+Benchmark: multi-query search result merging
+Simulates query variants whose results overlap (the same pages under different URL spellings and mirrored
+snippets) and compares concatenating the variants' results with merging them: results passed downstream,
+distinct URLs to fetch, snippet tokens, and merge time
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import random
+import time
+from tools.text_ranking import estimate_tokens
+from tools.web_search_tool.result_merging import merge_results
+
+
+def make_pages(count: int, rng: random.Random):
+    """Pages with a snippet of random words each"""
+    vocabulary = [f"word{i}" for i in range(5000)]
+    return [{"url": f"https://site{i % 50}.example/page/{i}", "snippet": " ".join(rng.choices(vocabulary, k=30))}
+            for i in range(count)]
+
+
+def spelling(page, rng: random.Random):
+    """The page as a search engine might return it: URL variants, tracking parameters, mirrors"""
+    url, snippet = page["url"], page["snippet"]
+    roll = rng.random()
+    if roll < 0.2:
+        url = url.replace("https://", "http://www.") + "/"
+    elif roll < 0.4:
+        url += f"?utm_source=search{rng.randrange(5)}"
+    elif roll < 0.5:
+        # Mirror: another host with a lightly edited snippet
+        url = url.replace(".example", "-mirror.example")
+        words = snippet.split()
+        words[rng.randrange(len(words))] = "edited"
+        snippet = " ".join(words)
+    return {"title": url, "url": url, "snippet": snippet}
+
+
+def variant_results(pages, variants: int, num_results: int, rng: random.Random):
+    """Result lists for query variants: noisy re-rankings of the same relevant pages"""
+    lists = []
+    for _ in range(variants):
+        ranked = sorted(range(len(pages)), key=lambda i: i + rng.gauss(0, len(pages) / 10))
+        lists.append([spelling(pages[i], rng) for i in ranked[:num_results]])
+    return lists
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search result merging benchmark")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--num-results", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+    
+    rng = random.Random(0)
+    pages = make_pages(args.pages, rng)
+    print(f"{args.num_results} results per query variant, {args.pages} relevant pages")
+    print(f"{'variants':>8} {'results':>16} {'URLs to fetch':>16} {'snippet tokens':>18} {'merge ms':>9}")
+    for variants in (1, 2, 4, 8):
+        lists = variant_results(pages, variants, args.num_results, rng)
+        concatenated = [result for results in lists for result in results]
+        start = time.perf_counter()
+        for _ in range(args.repeats):
+            merged, _ = merge_results(lists, args.num_results * variants)
+        merge_ms = (time.perf_counter() - start) * 1000 / args.repeats
+        
+        def tokens(results):
+            return sum(estimate_tokens(result["snippet"]) for result in results)
+        
+        print(f"{variants:>8} {len(concatenated):>7} -> {len(merged):>6} "
+              f"{len({result['url'] for result in concatenated}):>7} -> {len(merged):>6} "
+              f"{tokens(concatenated):>8} -> {tokens(merged):>7} {merge_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
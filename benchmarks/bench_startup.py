@@ -0,0 +1,149 @@
+"""
+Benchmark: cold tool discovery and ToolExecutionService startup with and without the discovery manifest
+Every measurement runs in a fresh interpreter so nothing is reused through sys.modules
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import subprocess
+import tempfile
+import textwrap
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TOOL_MODULE = '''
+from tools.tool_framework import Tool
+from bench_tools.{package}.engine import TABLE
+
+
+class BenchTool{index}(Tool):
+    def __init__(self):
+        super().__init__("bench-tool-{index}", "Bench Tool {index}", "Synthetic tool", "benchmark")
+    
+    def execute(self, **params):
+        return {{"result": TABLE[0]}}
+'''
+
+# Helper module with a noticeable import cost, standing in for parsers or numeric backends:
+# some pure-Python setup plus a wait standing in for loading data or shared libraries from disk
+ENGINE_MODULE = '''
+import time
+time.sleep({io_seconds})
+TABLE = [i * i for i in range({table_size})]
+'''
+
+# Sibling module the tool never imports (fixtures, sample data); only a directory scan loads it
+SAMPLE_DATA_MODULE = '''
+SAMPLES = [str(i) for i in range({table_size})]
+'''
+
+DISCOVER_SNIPPET = '''
+import sys, time, io, contextlib
+sys.path.insert(0, {repo!r})
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+from tools.tool_discovery import discover_all_tools
+with contextlib.redirect_stdout(io.StringIO()):
+    tools = discover_all_tools({base!r}, use_manifest={use_manifest}, max_workers={workers})
+print(time.perf_counter() - start, sum(len(v) for v in tools.values()))
+'''
+
+PROXY_SNIPPET = '''
+import sys, time, io, contextlib
+sys.path.insert(0, {repo!r})
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+from tools.tool_discovery import load_tool_proxies
+with contextlib.redirect_stdout(io.StringIO()):
+    proxies = load_tool_proxies({base!r})
+    # Use two of the tools, as a typical agent process would
+    for proxy in proxies[:2]:
+        proxy.execute()
+print(time.perf_counter() - start, len(proxies))
+'''
+
+SERVICE_SNIPPET = '''
+import sys, time, io, contextlib
+sys.path.insert(0, {repo!r})
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    from tools.tool_execution_service import ToolExecutionService
+    service = ToolExecutionService()
+print(time.perf_counter() - start, len(service.registry.get_all_tools()))
+'''
+
+
+def build_tool_tree(root: str, num_tools: int, table_size: int, io_seconds: float) -> str:
+    base = os.path.join(root, "bench_tools")
+    os.makedirs(base)
+    open(os.path.join(base, "__init__.py"), "w").close()
+    for index in range(num_tools):
+        package = f"bench_tool_{index}"
+        package_dir = os.path.join(base, package)
+        os.makedirs(package_dir)
+        open(os.path.join(package_dir, "__init__.py"), "w").close()
+        with open(os.path.join(package_dir, f"{package}.py"), "w") as f:
+            f.write(TOOL_MODULE.format(package=package, index=index))
+        with open(os.path.join(package_dir, "engine.py"), "w") as f:
+            f.write(ENGINE_MODULE.format(table_size=table_size, io_seconds=io_seconds))
+        with open(os.path.join(package_dir, "sample_data.py"), "w") as f:
+            f.write(SAMPLE_DATA_MODULE.format(table_size=table_size))
+    return base
+
+
+def run_snippet(snippet: str, cwd: str, repeats: int):
+    timings = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", snippet], cwd=cwd, capture_output=True,
+                                text=True, check=True).stdout.split()
+        timings.append(float(output[0]))
+    return min(timings), int(output[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tool discovery startup benchmark")
+    parser.add_argument("--tools", type=int, default=50)
+    parser.add_argument("--table-size", type=int, default=100000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--io-ms", type=float, default=10.0, help="Simulated disk wait per engine import")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as root:
+        base = build_tool_tree(root, args.tools, args.table_size, args.io_ms / 1000)
+        manifest_path = os.path.join(base, ".tool_manifest.json")
+        
+        print(f"Synthetic tree: {args.tools} tool packages, each with an imported engine "
+              f"({args.io_ms:g} ms disk wait) and unused sample data")
+        serial_scan = run_snippet(DISCOVER_SNIPPET.format(repo=REPO_ROOT, root=root, base=base, use_manifest=False,
+                                                          workers=1), root, args.repeats)
+        print(f"  full scan, serial imports:    {serial_scan[0] * 1000:8.1f} ms ({serial_scan[1]} tools)")
+        full_scan = run_snippet(DISCOVER_SNIPPET.format(repo=REPO_ROOT, root=root, base=base, use_manifest=False,
+                                                        workers=args.workers), root, args.repeats)
+        print(f"  full scan, {args.workers} import workers:  {full_scan[0] * 1000:8.1f} ms ({full_scan[1]} tools)")
+        first_scan = run_snippet(DISCOVER_SNIPPET.format(repo=REPO_ROOT, root=root, base=base, use_manifest=True,
+                                                         workers=args.workers), root, 1)
+        print(f"  first scan, writing manifest: {first_scan[0] * 1000:8.1f} ms ({first_scan[1]} tools)")
+        warm_scan = run_snippet(DISCOVER_SNIPPET.format(repo=REPO_ROOT, root=root, base=base, use_manifest=True,
+                                                        workers=args.workers), root, args.repeats)
+        print(f"  manifest reused:              {warm_scan[0] * 1000:8.1f} ms ({warm_scan[1]} tools)")
+        lazy = run_snippet(PROXY_SNIPPET.format(repo=REPO_ROOT, root=root, base=base), root, args.repeats)
+        print(f"  lazy proxies, 2 tools used:   {lazy[0] * 1000:8.1f} ms ({lazy[1]} tools)")
+        with open(manifest_path) as f:
+            print(f"  manifest entries:             {len(json.load(f)['files'])}")
+    
+    print("ToolExecutionService() in this repository")
+    repo_manifest = os.path.join(REPO_ROOT, "tools", ".tool_manifest.json")
+    if os.path.exists(repo_manifest):
+        os.remove(repo_manifest)
+    cold = run_snippet(SERVICE_SNIPPET.format(repo=REPO_ROOT), REPO_ROOT, 1)
+    print(f"  without manifest:             {cold[0] * 1000:8.1f} ms ({cold[1]} tools)")
+    warm = run_snippet(SERVICE_SNIPPET.format(repo=REPO_ROOT), REPO_ROOT, args.repeats)
+    print(f"  with manifest:                {warm[0] * 1000:8.1f} ms ({warm[1]} tools)")
+
+
+if __name__ == "__main__":
+    main()
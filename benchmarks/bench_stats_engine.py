@@ -0,0 +1,116 @@
+"""
+Benchmark: the vectorized statistics engine at 10k, 1M and 100M points
+Compares the blocked single-pass engine with pure Python and with separate NumPy reductions,
+then streams generated chunks through StreamingStatistics to show constant memory use
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import math
+import resource
+import time
+import numpy as np
+from tools.statistical_analysis_tool import stats_engine
+from tools.statistical_analysis_tool.streaming_stats import StreamingStatistics
+
+
+def python_describe(values: list):
+    """Descriptive statistics the way the tool computed them before the engine, plus variance and skew"""
+    count = len(values)
+    mean = sum(values) / count
+    m2 = sum((value - mean) ** 2 for value in values)
+    m3 = sum((value - mean) ** 3 for value in values)
+    ordered = sorted(values)
+    return mean, min(values), max(values), m2 / (count - 1), math.sqrt(count) * m3 / m2 ** 1.5, ordered[count // 2]
+
+
+def numpy_describe(values: np.ndarray):
+    """One NumPy reduction per statistic; every call is a separate pass over memory"""
+    mean = values.mean()
+    centered = values - mean
+    m2 = np.sum(centered ** 2)
+    m3 = np.sum(centered ** 3)
+    return (mean, values.min(), values.max(), values.var(ddof=1),
+            math.sqrt(len(values)) * m3 / m2 ** 1.5, np.quantile(values, [0.25, 0.5, 0.75]))
+
+
+def timed(func, repeat: int) -> float:
+    """Best wall time of repeat runs, in milliseconds"""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def format_ms(value) -> str:
+    return f"{value:>12.1f}" if value is not None else f"{'-':>12}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistics engine benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000, 100_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--python-limit", type=int, default=1_000_000,
+                        help="Largest size timed with pure Python (a list of 100M floats needs several GB)")
+    parser.add_argument("--matrix-limit", type=int, default=10_000_000,
+                        help="Largest size for regression baselines, ranks and correlation matrices")
+    parser.add_argument("--stream-points", type=int, nargs="+", default=[10_000_000, 100_000_000],
+                        help="Stream lengths for the streaming run (generated chunk by chunk)")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(0)
+    print(f"{'points':>11} {'python':>12} {'numpy':>12} {'engine':>12} {'polyfit':>12} {'trend':>12} "
+          f"{'spearman':>12} {'corr 4 cols':>12}  (ms, best of {args.repeat})")
+    for size in args.sizes:
+        values = np.empty(size, dtype=np.float64)
+        rng.standard_normal(out=values)
+        values += 1e3
+        repeat = args.repeat if size < 50_000_000 else 1
+        
+        python_ms = None
+        if size <= args.python_limit:
+            as_list = values.tolist()
+            python_ms = timed(lambda: python_describe(as_list), 1)
+            del as_list
+        numpy_ms = timed(lambda: numpy_describe(values), repeat)
+        
+        def engine():
+            summary = stats_engine.moments(values)
+            stats_engine.describe(values, summary=summary)
+            return summary
+        engine_ms = timed(engine, repeat)
+        summary = engine()
+        trend_ms = timed(lambda: stats_engine.trend(values, summary), repeat)
+        
+        polyfit_ms = spearman_ms = matrix_ms = None
+        if size <= args.matrix_limit:
+            index = np.arange(size, dtype=np.float64)
+            polyfit_ms = timed(lambda: np.polyfit(index, values, 1), repeat)
+            del index
+            spearman_ms = timed(lambda: stats_engine.trend(stats_engine.rank(values)), repeat)
+            matrix = rng.standard_normal((size, 4))
+            matrix_ms = timed(lambda: stats_engine.correlation_matrix(matrix), repeat)
+            del matrix
+        print(f"{size:>11} {format_ms(python_ms)} {format_ms(numpy_ms)} {format_ms(engine_ms)} "
+              f"{format_ms(polyfit_ms)} {format_ms(trend_ms)} {format_ms(spearman_ms)} {format_ms(matrix_ms)}")
+        del values
+    
+    print(f"\n{'streamed':>11} {'seconds':>9} {'Mvalues/s':>10} {'sketch items':>13} {'peak RSS MB':>12}")
+    for total in args.stream_points:
+        stats = StreamingStatistics(seed=0)
+        start = time.perf_counter()
+        for offset in range(0, total, args.chunk_size):
+            stats.update(rng.standard_normal(min(args.chunk_size, total - offset)))
+        stats.result()
+        elapsed = time.perf_counter() - start
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"{total:>11} {elapsed:>9.2f} {total / elapsed / 1e6:>10.1f} {len(stats.sketch):>13} {peak_mb:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: tool construction cost with the shared configuration store
+Counts config file reads/writes and times constructing the built-in tools repeatedly
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import builtins
+import json
+import shutil
+import tempfile
+import time
+from tools.config.tool_config import ConfigStore, DEFAULT_CONFIGS
+from tools.web_search_tool.web_search_tool import WebSearchTool
+from tools.document_parser_tool.document_parser_tool import DocumentParsingTool
+from tools.statistical_analysis_tool.statistical_analysis_tool import StatisticalAnalysisTool
+
+TOOL_CLASSES = [WebSearchTool, DocumentParsingTool, StatisticalAnalysisTool]
+
+
+def count_config_opens(func, config_path: str):
+    """Run func and return (elapsed seconds, number of times the config file was opened)"""
+    opens = 0
+    real_open = builtins.open
+    
+    def counting_open(file, *args, **kwargs):
+        nonlocal opens
+        if isinstance(file, str) and os.path.abspath(file) == os.path.abspath(config_path):
+            opens += 1
+        return real_open(file, *args, **kwargs)
+    
+    builtins.open = counting_open
+    try:
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start, opens
+    finally:
+        builtins.open = real_open
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tool construction benchmark")
+    parser.add_argument("--rounds", type=int, default=1000)
+    args = parser.parse_args()
+    
+    temp_dir = tempfile.mkdtemp()
+    original_cwd = os.getcwd()
+    try:
+        # Tools use the default config path relative to the working directory
+        os.chdir(temp_dir)
+        os.makedirs("config")
+        config_path = os.path.join("config", "tools_config.json")
+        with open(config_path, "w") as f:
+            json.dump({}, f)  # Empty file: the first construction of each tool fills in defaults
+        
+        def construct():
+            for _ in range(args.rounds):
+                for tool_class in TOOL_CLASSES:
+                    tool_class()
+        
+        elapsed, opens = count_config_opens(construct, config_path)
+        constructions = args.rounds * len(TOOL_CLASSES)
+        print(f"{constructions} tool constructions: {elapsed / constructions * 1e6:.1f} us each, "
+              f"{opens} config file opens")
+        
+        elapsed, opens = count_config_opens(ConfigStore.flush_all, config_path)
+        with open(config_path) as f:
+            written = json.load(f)
+        print(f"flush: {elapsed * 1000:.2f} ms, {opens} config file opens, "
+              f"{sum(len(written.get(name, {})) for name in DEFAULT_CONFIGS)} keys written")
+    finally:
+        os.chdir(original_cwd)
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    main()
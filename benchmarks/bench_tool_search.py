@@ -0,0 +1,81 @@
+"""
+Benchmark: ToolRegistry lookups as the number of registered tools grows
+Compares linear scans over all tools with the category index and the keyword index behind search_tools
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import contextlib
+import io
+import random
+import time
+from typing import Dict, Any
+from tools.tool_framework import Tool, ToolRegistry, tokenize_keywords
+
+CATEGORIES = ["information-retrieval", "data-analysis", "validation", "domain-specific", "processing"]
+VOCABULARY = ["search", "parse", "document", "statistic", "regression", "news", "patent", "clinical",
+              "finance", "legal", "image", "audio", "translate", "summarize", "extract", "table",
+              "chart", "geo", "weather", "market", "citation", "graph", "code", "email"]
+
+
+class SyntheticTool(Tool):
+    """Tool with generated metadata"""
+    
+    def __init__(self, index: int, rng: random.Random):
+        words = rng.sample(VOCABULARY, 2)
+        description = " ".join(rng.sample(VOCABULARY, 6)) + f" variant{index}"
+        super().__init__(f"tool-{index}", f"{words[0]} {words[1]} tool {index}", description,
+                         CATEGORIES[index % len(CATEGORIES)])
+    
+    def execute(self, **params) -> Dict[str, Any]:
+        return {}
+
+
+def linear_search(registry: ToolRegistry, query: str, limit: int):
+    """Score every tool by keyword overlap, as a search without an index would"""
+    keywords = set(tokenize_keywords(query))
+    scored = []
+    for tool in registry.get_all_tools().values():
+        tool_keywords = set(tokenize_keywords(f"{tool.name} {tool.category} {tool.description}"))
+        score = len(keywords & tool_keywords)
+        if score:
+            scored.append((score, tool.tool_id, tool))
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [tool for _, _, tool in scored[:limit]]
+
+
+def time_per_call(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tool registry lookup benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    
+    rng = random.Random(0)
+    query = "patent citation variant42"
+    print(f"{'tools':>7} {'category scan':>14} {'category index':>15} {'linear search':>14} {'search_tools':>13}  (us/call)")
+    for size in args.sizes:
+        registry = ToolRegistry()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for index in range(size):
+                registry.register_tool(SyntheticTool(index, rng))
+        
+        category_scan = time_per_call(
+            lambda: [tool for tool in registry.get_all_tools().values() if tool.category == "validation"],
+            args.iterations)
+        category_index = time_per_call(lambda: registry.get_tools_by_category("validation"), args.iterations)
+        linear = time_per_call(lambda: linear_search(registry, query, 5), max(1, args.iterations // 10))
+        indexed = time_per_call(lambda: registry.search_tools(query, 5), args.iterations)
+        print(f"{size:>7} {category_scan:>14.1f} {category_index:>15.1f} {linear:>14.1f} {indexed:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
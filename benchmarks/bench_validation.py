@@ -0,0 +1,64 @@
+"""
+Benchmark: per-call validate + execute overhead of the tool framework
+Compares rebuilding parameter definitions on every call with the precompiled, cached validator
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import contextlib
+import io
+import time
+from typing import Dict, Any
+from tools.tool_framework import Tool, ToolRegistry, ParameterValidator
+from tools.statistical_analysis_tool.statistical_analysis_tool import StatisticalAnalysisTool
+
+
+class NoOpTool(StatisticalAnalysisTool):
+    """Statistical tool definitions with an empty execute, so only framework overhead is measured"""
+    
+    def execute(self, **params) -> Dict[str, Any]:
+        return {}
+
+
+def time_per_call(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parameter validation micro-benchmark")
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        tool = NoOpTool()
+        registry = ToolRegistry()
+        registry.register_tool(tool)
+    params = {"data": [1.0, 2.0, 3.0, 4.0, 5.0], "analysis_type": "descriptive"}
+    
+    def uncached_validate():
+        ParameterValidator(tool.get_params_definition()).validate(params)
+    
+    def uncached_definition():
+        tool.invalidate_definition_cache()
+        tool.get_definition()
+    
+    results = [
+        ("validate (rebuild definitions each call)", time_per_call(uncached_validate, args.iterations)),
+        ("validate (precompiled, cached)", time_per_call(lambda: tool.validate_parameters(params), args.iterations)),
+        ("get_definition (rebuilt each call)", time_per_call(uncached_definition, args.iterations)),
+        ("get_definition (cached)", time_per_call(tool.get_definition, args.iterations)),
+        ("registry.execute_tool, no-op tool", time_per_call(lambda: registry.execute_tool("statistical-analysis", **params), args.iterations)),
+    ]
+    
+    print(f"Per-call overhead over {args.iterations} iterations:")
+    for label, micros in results:
+        print(f"  {label:<45} {micros:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
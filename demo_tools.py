@@ -38,7 +38,7 @@ def main():
     
     # Test document parsing tool
     print("\n2. Testing Document Parsing Tool:")
-    doc_result = tool_service.execute_tool("document-parser", file_path="/path/to/doc.pdf", format="pdf")
+    doc_result = tool_service.execute_tool("document-parser", file_path="README.md", format="md")
     print(f"Result: {doc_result}")
     
     # Test statistical analysis tool
@@ -53,7 +53,7 @@ def main():
     tool_requests = [
         {"tool_id": "web-search", "params": {"query": "renewable energy", "num_results": 2}},
         {"tool_id": "statistical-analysis", "params": {"data": [10, 20, 30], "analysis_type": "descriptive"}},
-        {"tool_id": "document-parser", "params": {"file_path": "/path/to/research.pdf"}}
+        {"tool_id": "document-parser", "params": {"file_path": "tools/document_parser_tool/README.md", "format": "md"}}
     ]
     
     parallel_results = tool_service.execute_tools_parallel(tool_requests)
@@ -66,8 +66,8 @@ def main():
     
     print("\n" + "="*50)
     print("Execution history:")
-    history = tool_service.get_execution_history()
-    for i, record in enumerate(history[-5:], 1):  # Show last 5 executions
+    history = tool_service.get_execution_history(limit=5)  # Show last 5 executions
+    for i, record in enumerate(history, 1):
         print(f"{i}. Tool: {record['tool_id']}, Duration: {record['duration']:.2f}s")
     
     # Cleanup
@@ -4,9 +4,63 @@ Uses Google's Gemini LLM for research tasks
 """
 import google.generativeai as genai
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, NamedTuple, Tuple
 import json
 from urllib.parse import quote
+from tools.text_ranking import pack_context, DEFAULT_CONTEXT_TOKEN_BUDGET
+
+
+class ResearchPrompt(NamedTuple):
+    """
+    How to research one domain: a prompt template with {query} and {context} fields,
+    and the canned response used when no API key is set ({query} is filled in).
+    """
+    domain: str
+    prompt_template: str
+    mock_findings: str
+    mock_sources: Tuple[str, ...]
+    mock_confidence: float
+
+
+TECHNICAL_RESEARCH = ResearchPrompt(
+    domain="technical",
+    prompt_template="""
+        As a technical research expert, analyze the technical aspects of the following query: {query}
+        Context: {context}
+        
+        Provide your findings in the following JSON format:
+        {{
+          "findings": "detailed technical analysis",
+          "sources": ["source1", "source2", "source3"],
+          "confidence": 0.0-1.0
+        }}
+        
+        Be specific and provide factual information based on current technology trends and capabilities.
+        """,
+    mock_findings="Technical analysis of '{query}': This involves advanced computing methodologies and requires specific technical infrastructure.",
+    mock_sources=("Tech Database A", "Technical Journal B", "Patent Database C"),
+    mock_confidence=0.85
+)
+
+ECONOMIC_RESEARCH = ResearchPrompt(
+    domain="economic",
+    prompt_template="""
+        As an economic research expert, analyze the economic implications of the following query: {query}
+        Context: {context}
+        
+        Provide your findings in the following JSON format:
+        {{
+          "findings": "detailed economic analysis",
+          "sources": ["source1", "source2", "source3"],
+          "confidence": 0.0-1.0
+        }}
+        
+        Include information about costs, benefits, market impacts, and economic trends related to the query.
+        """,
+    mock_findings="Economic implications of '{query}': This would require an investment of approximately $X million with an estimated ROI of Y% over Z years.",
+    mock_sources=("Economic Database A", "Financial Journal B", "Market Analysis C"),
+    mock_confidence=0.78
+)
 
 
 class GeminiLLMInterface:
@@ -16,6 +70,8 @@ class GeminiLLMInterface:
         # Initialize the Gemini API with the API key
         api_key = os.environ.get('GOOGLE_API_KEY')
         model_name = os.environ.get('GEMINI_MODEL', 'gemini-pro')
+        # Upper bound on the (estimated) tokens of context placed in a prompt
+        self.context_token_budget = int(os.environ.get('LLM_CONTEXT_TOKEN_BUDGET', DEFAULT_CONTEXT_TOKEN_BUDGET))
         
         if not api_key:
             # For demo purposes, we'll show what would be needed
@@ -27,91 +83,35 @@ class GeminiLLMInterface:
             self.model = genai.GenerativeModel(model_name)
             self.use_mock = False
     
+    def prepare_context(self, query: str, context: str) -> str:
+        """Fit the context into the token budget, keeping the passages most relevant to the query"""
+        return pack_context(context or "", query, self.context_token_budget)
+    
     def perform_technical_research(self, query: str, context: str) -> Dict[str, Any]:
         """Use Gemini LLM to perform technical research on the query"""
-        if self.use_mock:
-            # Return a mock response for demonstration
-            return {
-                "findings": f"Technical analysis of '{query}': This involves advanced computing methodologies and requires specific technical infrastructure.",
-                "sources": ["Tech Database A", "Technical Journal B", "Patent Database C"],
-                "confidence": 0.85,
-                "timestamp": "2023-10-01T10:00:00Z"
-            }
-        
-        # Create the prompt for technical research
-        prompt = f"""
-        As a technical research expert, analyze the technical aspects of the following query: {query}
-        Context: {context}
-        
-        Provide your findings in the following JSON format:
-        {{
-          "findings": "detailed technical analysis",
-          "sources": ["source1", "source2", "source3"],
-          "confidence": 0.0-1.0
-        }}
-        
-        Be specific and provide factual information based on current technology trends and capabilities.
-        """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            # Extract the JSON from the response
-            text_response = response.text.strip()
-            
-            # Try to find JSON in the response
-            start_idx = text_response.find('{')
-            end_idx = text_response.rfind('}') + 1
-            
-            if start_idx != -1 and end_idx != -1:
-                json_str = text_response[start_idx:end_idx]
-                result = json.loads(json_str)
-                result["timestamp"] = "2023-10-01T10:00:00Z"  # Add timestamp
-                return result
-            else:
-                # If no JSON found, return a default structure
-                return {
-                    "findings": response.text,
-                    "sources": ["Generated by Gemini LLM"],
-                    "confidence": 0.7,
-                    "timestamp": "2023-10-01T10:00:00Z"
-                }
-        except Exception as e:
-            print(f"Error in technical research: {e}")
-            return {
-                "findings": f"Error in technical analysis: {str(e)}",
-                "sources": [],
-                "confidence": 0.0,
-                "timestamp": "2023-10-01T10:00:00Z"
-            }
+        return self.perform_research(query, context, TECHNICAL_RESEARCH)
     
     def perform_economic_research(self, query: str, context: str) -> Dict[str, Any]:
         """Use Gemini LLM to perform economic research on the query"""
+        return self.perform_research(query, context, ECONOMIC_RESEARCH)
+    
+    def perform_research(self, query: str, context: str, research: ResearchPrompt) -> Dict[str, Any]:
+        """Use Gemini LLM to research the query from the perspective of one domain"""
         if self.use_mock:
             # Return a mock response for demonstration
             return {
-                "findings": f"Economic implications of '{query}': This would require an investment of approximately $X million with an estimated ROI of Y% over Z years.",
-                "sources": ["Economic Database A", "Financial Journal B", "Market Analysis C"],
-                "confidence": 0.78,
+                "findings": research.mock_findings.format(query=query),
+                "sources": list(research.mock_sources),
+                "confidence": research.mock_confidence,
                 "timestamp": "2023-10-01T10:00:00Z"
             }
         
-        # Create the prompt for economic research
-        prompt = f"""
-        As an economic research expert, analyze the economic implications of the following query: {query}
-        Context: {context}
-        
-        Provide your findings in the following JSON format:
-        {{
-          "findings": "detailed economic analysis",
-          "sources": ["source1", "source2", "source3"],
-          "confidence": 0.0-1.0
-        }}
-        
-        Include information about costs, benefits, market impacts, and economic trends related to the query.
-        """
+        context = self.prepare_context(query, context)
+        prompt = research.prompt_template.format(query=query, context=context)
         
         try:
             response = self.model.generate_content(prompt)
+            # Extract the JSON from the response
             text_response = response.text.strip()
             
             # Try to find JSON in the response
@@ -132,9 +132,9 @@ class GeminiLLMInterface:
                     "timestamp": "2023-10-01T10:00:00Z"
                 }
         except Exception as e:
-            print(f"Error in economic research: {e}")
+            print(f"Error in {research.domain} research: {e}")
             return {
-                "findings": f"Error in economic analysis: {str(e)}",
+                "findings": f"Error in {research.domain} analysis: {str(e)}",
                 "sources": [],
                 "confidence": 0.0,
                 "timestamp": "2023-10-01T10:00:00Z"
@@ -10,43 +10,154 @@ from agents.orchestrator_agent.research_orchestrator_agent import ResearchOrches
 from agents.tech_research_agent.tech_research_agent import TechResearchAgent
 from agents.economic_research_agent.economic_research_agent import EconomicResearchAgent
 from agents.factcheck_agent.factcheck_agent import FactCheckAgent
-from a2a_protocol import A2AMessage, MessageType
+from a2a_protocol import A2AMessage, MessageType, get_agent_status
 from tools.web_search_tool.web_search_tool import WebSearchTool
 from tools.document_parser_tool.document_parser_tool import DocumentParsingTool
 from tools.statistical_analysis_tool.statistical_analysis_tool import StatisticalAnalysisTool
 from llm_interface import GeminiLLMInterface
+from replica_pool import ReplicaPool, LEAST_OUTSTANDING
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Dict, Optional
+import threading
 import time
 import argparse
 import os
 
 
 class MessageRouter:
-    """Simple message router to handle A2A messages between agents"""
-    def __init__(self):
+    """
+    Message router to handle A2A messages between agents.
+    
+    Several agents can be registered under one agent ID; they form a replica pool,
+    and each message goes to the least loaded replica (see ReplicaPool). An agent
+    instance is never given two messages at once. With max_workers > 1, messages for
+    different replicas are handled concurrently.
+    
+    The router also answers status requests for the agents behind it (the
+    /a2a/status of an agent ID): its capacity is the number of replicas times
+    replica_capacity, and its queued and in-progress messages are outstanding.
+    """
+    def __init__(self, max_workers: int = 1, strategy: str = LEAST_OUTSTANDING, replica_capacity: int = 1):
         self.message_queue = []
-        self.agents = {}
+        self.agents = {}  # Agent ID -> first registered replica
+        self.pools: Dict[str, ReplicaPool] = {}
+        self.max_workers = max_workers
+        self.strategy = strategy
+        self.replica_capacity = replica_capacity
+        self._queued = Counter()  # Receiver -> messages not yet handed to a replica
+        # Pools of unregistered agent IDs whose replicas still have messages in progress
+        self._draining_pools: Dict[str, ReplicaPool] = {}
+        self._lock = threading.Lock()
     
     def register_agent(self, agent_id, agent):
-        """Register an agent with the router"""
-        self.agents[agent_id] = agent
+        """Register an agent with the router; agents registered under the same ID become replicas"""
+        pool = self.pools.get(agent_id)
+        if pool is None:
+            # Reuse a draining pool, so a replica registered again keeps counting its unfinished messages
+            pool = self._draining_pools.pop(agent_id, None)
+            if pool is None:
+                pool = ReplicaPool(agent_id, self.strategy, self.replica_capacity)
+            self.pools[agent_id] = pool
+            self.agents[agent_id] = agent
+        pool.add(agent)
+    
+    def unregister_agent(self, agent_id, agent=None):
+        """Remove one replica of an agent ID, or all of them if no agent is given"""
+        pool = self.pools.get(agent_id)
+        if pool is None:
+            return
+        for replica in [agent] if agent is not None else list(pool.replicas):
+            pool.remove(replica)
+        if not len(pool):
+            del self.pools[agent_id]
+            del self.agents[agent_id]
+            if pool.total_outstanding():
+                self._draining_pools[agent_id] = pool
+        elif self.agents[agent_id] is agent:
+            self.agents[agent_id] = pool.replicas[0]
     
     def send_message(self, message):
         """Add a message to the queue"""
-        self.message_queue.append(message)
+        with self._lock:
+            self.message_queue.append(message)
+            self._queued[message.receiver] += 1
+    
+    def deliver(self, receiver, message) -> bool:
+        """A2A transport interface, so clients created with the router as transport send through it"""
+        self.send_message(message)
+        return True
+    
+    def queued_messages(self) -> int:
+        """Messages waiting for a replica of their receiver"""
+        with self._lock:
+            return sum(self._queued.values())
+    
+    def status(self, receiver) -> Optional[Dict[str, Any]]:
+        """The receiver's /a2a/status, or None for an unknown receiver"""
+        pool = self.pools.get(receiver)
+        if pool is None:
+            return None
+        with self._lock:
+            queued = self._queued[receiver]
+        return get_agent_status(receiver, pool.capacity, queued + pool.total_outstanding())
     
     def process_messages(self):
-        """Process all messages in the queue until empty"""
-        while self.message_queue:
-            # Process all current messages before checking for new ones
-            current_queue = self.message_queue[:]
-            self.message_queue = []  # Clear the queue for new messages
-            
-            for message in current_queue:
-                if message.receiver in self.agents:
+        """Process messages until the queue is empty and none are being handled"""
+        executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="router") if self.max_workers > 1 else None
+        pending = deque()
+        in_flight = set()
+        try:
+            while True:
+                with self._lock:
+                    pending.extend(self.message_queue)
+                    self.message_queue = []
+                
+                # Messages whose receiver has no free replica wait, in order, for the next round
+                waiting = deque()
+                blocked = set()
+                for message in pending:
+                    pool = self.pools.get(message.receiver)
+                    if pool is None:
+                        print(f"Router: Unknown receiver {message.receiver}")
+                        self._dequeued(message.receiver)
+                        continue
+                    replica = None if message.receiver in blocked else pool.acquire()
+                    if replica is None:
+                        blocked.add(message.receiver)
+                        waiting.append(message)
+                        continue
+                    self._dequeued(message.receiver)
                     print(f"Router: Forwarding {message.type} from {message.sender} to {message.receiver}")
-                    self.agents[message.receiver].receive_message(message)
-                else:
-                    print(f"Router: Unknown receiver {message.receiver}")
+                    if executor is None:
+                        self._deliver(pool, replica, message)
+                    else:
+                        in_flight.add(executor.submit(self._deliver, pool, replica, message))
+                pending = waiting
+                
+                if not in_flight:
+                    with self._lock:
+                        if not pending and not self.message_queue:
+                            break
+                    continue
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()  # Surface errors raised by agents
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+    
+    def _dequeued(self, receiver):
+        with self._lock:
+            self._queued[receiver] -= 1
+            if self._queued[receiver] <= 0:
+                del self._queued[receiver]
+    
+    def _deliver(self, pool: ReplicaPool, replica, message):
+        try:
+            replica.receive_message(message)
+        finally:
+            pool.release(replica)
 
 
 def main():
@@ -73,7 +184,7 @@ def main():
     router = MessageRouter()
     
     # Initialize all agents
-    orchestrator = ResearchOrchestratorAgent()
+    orchestrator = ResearchOrchestratorAgent(transport=router)
     tech_agent = TechResearchAgent()
     economic_agent = EconomicResearchAgent()
     factcheck_agent = FactCheckAgent()
@@ -0,0 +1,129 @@
+"""
+Agent Replica Pools for Multi-Agent Research System
+Several interchangeable instances behind one agent ID, with least-loaded replica selection
+"""
+import random
+import threading
+from typing import Any, Dict, List, Optional
+
+LEAST_OUTSTANDING = "least_outstanding"
+POWER_OF_TWO_CHOICES = "p2c"
+DISPATCH_STRATEGIES = (LEAST_OUTSTANDING, POWER_OF_TWO_CHOICES)
+
+
+class ReplicaPool:
+    """
+    Replicas of one agent and the requests outstanding on each.
+    
+    acquire() picks a replica for a request and release() returns it. A replica
+    takes at most replica_capacity requests at once (1 by default: agent instances
+    are not safe to call concurrently), so acquire() returns None while every
+    replica is busy. Replicas can be added and removed at any time; requests are
+    assigned when they are dispatched, so new replicas pick up waiting work at once
+    and removed replicas only finish what they already have. A removed replica is
+    counted as draining until those requests are released: they stay in
+    total_outstanding(), and a replica added back before then keeps its count.
+    
+    Strategies:
+    - "least_outstanding": the replica with the fewest outstanding requests
+      (ties rotate, so idle replicas share the work evenly)
+    - "p2c": the less loaded of two replicas chosen at random (power of two
+      choices), which avoids herding onto one replica when load information is stale
+    """
+    
+    def __init__(self, agent_id: str, strategy: str = LEAST_OUTSTANDING, replica_capacity: int = 1,
+                 seed: Optional[int] = None):
+        if strategy not in DISPATCH_STRATEGIES:
+            raise ValueError(f"Unknown dispatch strategy: {strategy} (available: {', '.join(DISPATCH_STRATEGIES)})")
+        self.agent_id = agent_id
+        self.strategy = strategy
+        self.replica_capacity = replica_capacity
+        self.replicas: List[Any] = []
+        # Keyed by id() so agents need not be hashable
+        self._outstanding: Dict[int, int] = {}
+        # Removed replicas with requests still outstanding; holding them keeps their id() from being reused
+        self._draining: Dict[int, Any] = {}
+        self.dispatched: Dict[int, int] = {}
+        self._next = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self.replicas)
+    
+    def add(self, replica: Any) -> bool:
+        """Add a replica; returns False if it is already in the pool"""
+        with self._lock:
+            if self._draining.pop(id(replica), None) is not None:
+                self.replicas.append(replica)  # Back before draining finished: its requests still count
+                return True
+            if id(replica) in self._outstanding:
+                return False
+            self.replicas.append(replica)
+            self._outstanding[id(replica)] = 0
+            self.dispatched[id(replica)] = 0
+            return True
+    
+    def remove(self, replica: Any) -> bool:
+        """Stop dispatching to a replica; its outstanding requests still complete"""
+        with self._lock:
+            if id(replica) not in self._outstanding or id(replica) in self._draining:
+                return False
+            self.replicas = [other for other in self.replicas if other is not replica]
+            if self._outstanding[id(replica)] > 0:
+                self._draining[id(replica)] = replica
+            else:
+                self._forget(replica)
+            return True
+    
+    def _forget(self, replica: Any):
+        """Drop a removed replica's counters; caller holds the lock"""
+        del self._outstanding[id(replica)]
+        del self.dispatched[id(replica)]
+    
+    @property
+    def capacity(self) -> int:
+        """Requests the pool can work on at once"""
+        return len(self.replicas) * self.replica_capacity
+    
+    def outstanding(self, replica: Any) -> int:
+        return self._outstanding.get(id(replica), 0)
+    
+    def total_outstanding(self) -> int:
+        with self._lock:
+            return sum(self._outstanding.values())
+    
+    def has_capacity(self) -> bool:
+        with self._lock:
+            return any(self._outstanding[id(replica)] < self.replica_capacity for replica in self.replicas)
+    
+    def acquire(self) -> Optional[Any]:
+        """Reserve a replica for one request, or None if all replicas are at capacity"""
+        with self._lock:
+            if not self.replicas:
+                return None
+            replica = None
+            if self.strategy == POWER_OF_TWO_CHOICES and len(self.replicas) > 1:
+                first, second = self._random.sample(self.replicas, 2)
+                replica = min((first, second), key=lambda candidate: self._outstanding[id(candidate)])
+                if self._outstanding[id(replica)] >= self.replica_capacity:
+                    replica = None  # Both choices are full; fall back to a scan for a free replica
+            if replica is None:
+                count = len(self.replicas)
+                start = self._next % count
+                self._next += 1
+                rotated = self.replicas[start:] + self.replicas[:start]
+                replica = min(rotated, key=lambda candidate: self._outstanding[id(candidate)])
+            if self._outstanding[id(replica)] >= self.replica_capacity:
+                return None
+            self._outstanding[id(replica)] += 1
+            self.dispatched[id(replica)] += 1
+            return replica
+    
+    def release(self, replica: Any):
+        """Mark one request on the replica as finished"""
+        with self._lock:
+            if self._outstanding.get(id(replica), 0) > 0:
+                self._outstanding[id(replica)] -= 1
+                if self._outstanding[id(replica)] == 0 and self._draining.pop(id(replica), None) is not None:
+                    self._forget(replica)
@@ -0,0 +1,92 @@
+"""
+Unit tests for base_research_agent.py
+"""
+import sys
+import os
+from unittest.mock import Mock, patch
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agents.base_research_agent import AgentRuntime, BaseResearchAgent, ResearchAgentSpec
+from agents.tech_research_agent.tech_research_agent import TechResearchAgent
+from agents.economic_research_agent.economic_research_agent import EconomicResearchAgent
+from agents.social_cultural_research_agent.social_cultural_research_agent import SocialCulturalResearchAgent
+from agents.factcheck_agent.factcheck_agent import FactCheckAgent
+from a2a_protocol import A2AMessage, A2ATransport, MessageType
+from llm_interface import ResearchPrompt
+
+LEGAL_SPEC = ResearchAgentSpec(
+    agent_id="legal-research-agent",
+    agent_type="legal",
+    name="Legal Research Agent",
+    log_name="Legal Research Agent",
+    description="Analyzes legal aspects of queries",
+    research=ResearchPrompt("legal", "Legal analysis of {query}. {context}", "Legal view of '{query}'", ("Law Review A",), 0.6)
+)
+
+
+class TestAgentRuntime:
+    """Test cases for AgentRuntime"""
+    
+    @patch('agents.base_research_agent.GeminiLLMInterface')
+    def test_agents_share_one_set_of_resources(self, mock_llm_class):
+        """Test that twenty agents on one runtime create one LLM client and share one transport"""
+        runtime = AgentRuntime(transport=A2ATransport())
+        
+        agents = [BaseResearchAgent(runtime, spec=LEGAL_SPEC) for _ in range(17)]
+        agents += [TechResearchAgent(runtime), EconomicResearchAgent(runtime), SocialCulturalResearchAgent(runtime)]
+        
+        assert mock_llm_class.call_count == 1
+        assert all(agent.llm_interface is runtime.llm_interface for agent in agents)
+        assert all(agent.client.transport is runtime.transport for agent in agents)
+        # Clients are per agent, so patching one agent's sender leaves the others alone
+        assert len({id(agent.client) for agent in agents}) == 20
+    
+    def test_tool_service_created_on_first_use(self):
+        service = Mock()
+        service.execute_tool.return_value = {"result": 42}
+        runtime = AgentRuntime(llm_interface=Mock())
+        
+        with patch('agents.base_research_agent.ToolExecutionService', return_value=service) as mock_service_class:
+            agent = BaseResearchAgent(runtime, spec=LEGAL_SPEC)
+            assert mock_service_class.call_count == 0
+            
+            assert agent.execute_tool("calculator", expression="6*7") == {"result": 42}
+            BaseResearchAgent(runtime, spec=LEGAL_SPEC).tool_service
+        
+        assert mock_service_class.call_count == 1
+        service.execute_tool.assert_called_once_with("calculator", expression="6*7")
+    
+    def test_shared_runtime_by_default(self):
+        assert TechResearchAgent().runtime is AgentRuntime.shared()
+        assert FactCheckAgent().llm_interface is AgentRuntime.shared().llm_interface
+
+
+class TestBaseResearchAgent:
+    """Test cases for agents defined by a ResearchAgentSpec"""
+    
+    @patch('builtins.print')
+    def test_agent_from_spec(self, mock_print):
+        """Test that an agent defined only by its spec researches and replies"""
+        transport = A2ATransport()
+        agent = BaseResearchAgent(AgentRuntime(transport=transport), spec=LEGAL_SPEC)
+        agent.llm_interface.use_mock = True
+        message = A2AMessage.create_message(
+            MessageType.REQUEST_RESEARCH_TASK,
+            "research-orchestrator-agent",
+            "legal-research-agent",
+            {"query": "drones", "context": "airspace"}
+        )
+        
+        agent.receive_message(message)
+        
+        response = transport.message_queue[-1]
+        assert response.receiver == "research-orchestrator-agent"
+        assert response.payload["agent_type"] == "legal"
+        assert response.payload["results"]["findings"] == "Legal view of 'drones'"
+        mock_print.assert_any_call("Legal Research Agent processing: drones")
+        assert agent.get_capabilities()["name"] == "Legal Research Agent"
+    
+    def test_spec_required(self):
+        with pytest.raises(ValueError, match="no ResearchAgentSpec"):
+            BaseResearchAgent(AgentRuntime(llm_interface=Mock()))
@@ -3,12 +3,13 @@ Unit tests for research_orchestrator_agent.py to improve test coverage
 """
 import sys
 import os
+import time
 from unittest.mock import Mock, patch
 import pytest
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from agents.orchestrator_agent.research_orchestrator_agent import ResearchOrchestratorAgent
-from a2a_protocol import A2AMessage, MessageType
+from a2a_protocol import A2AMessage, A2ATransport, MessageType, get_agent_status
 
 
 class TestResearchOrchestratorAgent:
@@ -268,4 +269,101 @@ class TestResearchOrchestratorAgent:
         assert "economic findings" in report
         assert "economic source" in report
         assert "Validation: verified" in report
-        assert "Validation: partially verified" in report
\ No newline at end of file
+        assert "Validation: partially verified" in report
+
+
+class CreditTransport(A2ATransport):
+    """Transport whose agents can each take one request at a time"""
+    
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+        self.replied = []
+    
+    def deliver(self, receiver, message):
+        self.sent.append(message)
+        return True
+    
+    def status(self, receiver):
+        outstanding = sum(message.receiver == receiver for message in self.sent if message not in self.replied)
+        return get_agent_status(receiver, 1, outstanding)
+    
+    def reply(self, task, msg_type, payload):
+        self.replied.append(task)
+        return A2AMessage.create_message(msg_type, task.receiver, task.sender, payload, {"in_reply_to": task.id})
+
+
+class TestOrchestratorFlowControl:
+    """Test cases for admission control and credit-based dispatch"""
+    
+    @patch('builtins.print')
+    def test_admission_queue_and_rejection(self, mock_print):
+        transport = CreditTransport()
+        agent = ResearchOrchestratorAgent(transport=transport, max_pending_requests=2)
+        
+        first = agent.process_research_request("query 1")
+        second = agent.process_research_request("query 2")
+        third = agent.process_research_request("query 3")
+        rejected = agent.process_research_request("query 4")
+        
+        assert first["admitted"] and not first["queued"]
+        assert second["queued"] and third["queued"]
+        assert rejected == {"admitted": False, "retry_after": 1.0}
+        # Only the first request's tasks were sent: one per research agent
+        assert [message.receiver for message in transport.sent] == ["tech-research-agent", "economic-research-agent"]
+    
+    @patch('builtins.print')
+    def test_replies_return_credits(self, mock_print):
+        """Test that queued requests start as replies come back, and fact-checks go first"""
+        transport = CreditTransport()
+        agent = ResearchOrchestratorAgent(transport=transport)
+        first = agent.process_research_request("query 1")
+        agent.process_research_request("query 2")
+        tech_task, economic_task = transport.sent
+        
+        agent.receive_message(transport.reply(tech_task, MessageType.RESPONSE_RESEARCH_RESULTS,
+                                              {"agent_type": "tech", "results": {"findings": "tech"}}))
+        assert len(transport.sent) == 2  # The economic agent has no credit yet
+        agent.receive_message(transport.reply(economic_task, MessageType.RESPONSE_RESEARCH_RESULTS,
+                                              {"agent_type": "economic", "results": {"findings": "economic"}}))
+        
+        factcheck_task = transport.sent[2]
+        assert factcheck_task.receiver == "factcheck-agent"
+        assert factcheck_task.payload["query"] == "query 1"
+        assert [message.payload["query"] for message in transport.sent[3:]] == ["query 2", "query 2"]
+        
+        agent.receive_message(transport.reply(factcheck_task, MessageType.RESPONSE_FACTCHECK_RESULTS,
+                                              {"validation_results": {"tech": "verified"}}))
+        assert first["request_id"] not in agent.active_requests
+        assert len(agent.active_requests) == 1
+        assert not agent.pending_requests
+    
+    @patch('builtins.print')
+    def test_lost_reply_is_reclaimed(self, mock_print):
+        """Test that a request with a lost reply is retried, then dropped, and its credits are returned"""
+        transport = CreditTransport()
+        agent = ResearchOrchestratorAgent(transport=transport, request_timeout_seconds=0.05, max_request_attempts=2)
+        first = agent.process_research_request("query 1")
+        agent.process_research_request("query 2")
+        tech_task, economic_task = transport.sent
+        # The economic agent answers; the tech agent's reply is lost
+        agent.receive_message(transport.reply(economic_task, MessageType.RESPONSE_RESEARCH_RESULTS,
+                                              {"agent_type": "economic", "results": {"findings": "economic"}}))
+        assert len(transport.sent) == 2
+        
+        time.sleep(0.06)
+        agent.dispatch_pending()
+        # Retried ahead of the queued request, with the tech credit given back
+        assert [message.payload["query"] for message in transport.sent[2:]] == ["query 1", "query 1"]
+        assert agent.active_requests[first["request_id"]]["attempt"] == 2
+        
+        time.sleep(0.06)
+        agent.dispatch_pending()
+        assert first["request_id"] not in agent.active_requests
+        assert [message.payload["query"] for message in transport.sent[4:]] == ["query 2", "query 2"]
+        
+        # A reply turning up after all does not count towards the next request or return a credit twice
+        agent.receive_message(transport.reply(tech_task, MessageType.RESPONSE_RESEARCH_RESULTS,
+                                              {"agent_type": "tech", "results": {"findings": "late"}}))
+        assert agent.research_results == {}
+        assert agent.flow_control.credits("tech-research-agent") == 0
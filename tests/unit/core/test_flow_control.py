@@ -0,0 +1,79 @@
+"""
+Test suite for credit-based flow control in the A2A protocol
+"""
+from a2a_protocol import A2AClient, A2ATransport, CreditLedger, get_agent_status
+
+
+class StatusTransport(A2ATransport):
+    """Transport whose receivers report the given number of outstanding requests"""
+    
+    def __init__(self, capacity, outstanding=None):
+        super().__init__()
+        self.capacity = capacity
+        self.outstanding = outstanding or {}
+        self.status_requests = 0
+    
+    def status(self, receiver):
+        if receiver not in self.capacity:
+            return None
+        self.status_requests += 1
+        return get_agent_status(receiver, self.capacity[receiver], self.outstanding.get(receiver, 0))
+
+
+class TestAgentStatus:
+    """Test cases for get_agent_status"""
+    
+    def test_credits(self):
+        assert get_agent_status("tech-research-agent", 4, 1) == {
+            "id": "tech-research-agent",
+            "status": "available",
+            "capacity": 4,
+            "outstanding": 1,
+            "credits": 3
+        }
+        busy = get_agent_status("tech-research-agent", 2, 5)
+        assert busy["credits"] == 0
+        assert busy["status"] == "busy"
+
+
+class TestCreditLedger:
+    """Test cases for CreditLedger"""
+    
+    def test_spend_and_release(self):
+        transport = StatusTransport({"tech-research-agent": 2})
+        ledger = CreditLedger(A2AClient("research-orchestrator-agent", transport))
+        
+        assert ledger.try_acquire(["tech-research-agent"])
+        assert ledger.try_acquire(["tech-research-agent"])
+        transport.outstanding["tech-research-agent"] = 2
+        assert not ledger.try_acquire(["tech-research-agent"])
+        ledger.release("tech-research-agent")
+        assert ledger.credits("tech-research-agent") == 1
+        assert ledger.try_acquire(["tech-research-agent"])
+    
+    def test_status_only_requested_when_out_of_credits(self):
+        """Test that credits come from the advertised status, which is re-read only when they run out"""
+        transport = StatusTransport({"tech-research-agent": 3}, {"tech-research-agent": 1})
+        ledger = CreditLedger(A2AClient("research-orchestrator-agent", transport))
+        
+        assert ledger.try_acquire(["tech-research-agent"])
+        assert ledger.try_acquire(["tech-research-agent"])
+        assert transport.status_requests == 1
+        
+        # A replica joined: picked up on the next refresh
+        transport.capacity["tech-research-agent"] = 6
+        assert ledger.credits("tech-research-agent") == 5
+        assert transport.status_requests == 2
+    
+    def test_all_or_nothing(self):
+        transport = StatusTransport({"tech-research-agent": 1, "economic-research-agent": 0})
+        ledger = CreditLedger(A2AClient("research-orchestrator-agent", transport))
+        
+        assert not ledger.try_acquire(["tech-research-agent", "economic-research-agent"])
+        assert ledger.credits("tech-research-agent") == 1
+    
+    def test_receivers_without_status_are_not_limited(self):
+        ledger = CreditLedger(A2AClient("research-orchestrator-agent", StatusTransport({})))
+        
+        assert all(ledger.try_acquire(["tool-service"]) for _ in range(100))
+        assert ledger.credits("tool-service") is None
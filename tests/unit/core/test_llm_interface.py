@@ -4,7 +4,7 @@ Test suite for the LLM interface module
 import os
 import pytest
 from unittest.mock import patch, MagicMock
-from llm_interface import GeminiLLMInterface
+from llm_interface import GeminiLLMInterface, ResearchPrompt
 
 
 class TestGeminiLLMInterface:
@@ -131,4 +131,30 @@ class TestGeminiLLMInterface:
             
             assert "tech" in result
             assert result["tech"]["status"] == "error"
-            assert result["tech"]["issues"][0] == "Fact-checking error: API Error"
\ No newline at end of file
+            assert result["tech"]["issues"][0] == "Fact-checking error: API Error"
+
+    def test_long_context_packed_into_token_budget(self, llm_interface_with_api_key):
+        """Test that a large context is trimmed to the budget, keeping the relevant passage"""
+        filler = " ".join(f"filler{i}" for i in range(20000))
+        context = f"{filler} Quantum error correction needs many physical qubits. {filler}"
+        llm_interface_with_api_key.context_token_budget = 500
+        
+        llm_interface_with_api_key.perform_technical_research("quantum error correction", context)
+        
+        prompt = llm_interface_with_api_key.model.generate_content.call_args[0][0]
+        assert "Quantum error correction needs many physical qubits" in prompt
+        assert len(prompt) < 500 * 4 + 1000
+
+    def test_perform_research_with_domain_prompt(self, llm_interface_with_api_key, llm_interface_without_api_key):
+        """Test that a domain's prompt template and mock response are used"""
+        research = ResearchPrompt("legal", "Legal analysis of {query}. Context: {context} {{json}}",
+                                  "Legal view of '{query}'", ("Law Review A",), 0.6)
+        
+        mock_result = llm_interface_without_api_key.perform_research("drones", "", research)
+        llm_interface_with_api_key.perform_research("drones", "airspace rules", research)
+        
+        prompt = llm_interface_with_api_key.model.generate_content.call_args[0][0]
+        assert prompt == "Legal analysis of drones. Context: airspace rules {json}"
+        assert mock_result["findings"] == "Legal view of 'drones'"
+        assert mock_result["sources"] == ["Law Review A"]
+        assert mock_result["confidence"] == 0.6
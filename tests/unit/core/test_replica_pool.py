@@ -0,0 +1,90 @@
+"""
+Test suite for the agent replica pools
+"""
+import pytest
+from replica_pool import ReplicaPool
+
+
+class TestReplicaPool:
+    """Test cases for ReplicaPool"""
+    
+    def test_least_outstanding_spreads_load(self):
+        pool = ReplicaPool("tech-research-agent", replica_capacity=2)
+        replicas = ["a", "b", "c"]
+        for replica in replicas:
+            pool.add(replica)
+        
+        acquired = [pool.acquire() for _ in range(6)]
+        
+        assert sorted(acquired) == ["a", "a", "b", "b", "c", "c"]
+        assert pool.acquire() is None
+        pool.release("b")
+        assert pool.acquire() == "b"
+    
+    def test_idle_replicas_take_turns(self):
+        """Test that ties rotate, so sequential requests do not all go to the first replica"""
+        pool = ReplicaPool("tech-research-agent")
+        for replica in ["a", "b", "c"]:
+            pool.add(replica)
+        
+        served = []
+        for _ in range(6):
+            replica = pool.acquire()
+            served.append(replica)
+            pool.release(replica)
+        
+        assert sorted(served) == ["a", "a", "b", "b", "c", "c"]
+    
+    def test_power_of_two_choices(self):
+        pool = ReplicaPool("tech-research-agent", strategy="p2c", replica_capacity=3, seed=1)
+        for replica in ["a", "b", "c", "d"]:
+            pool.add(replica)
+        
+        acquired = [pool.acquire() for _ in range(12)]
+        
+        assert sorted(acquired) == sorted(["a", "b", "c", "d"] * 3)
+        assert pool.acquire() is None
+    
+    def test_replicas_join_and_leave(self):
+        """Test that a new replica gets the next request and a removed one gets none"""
+        pool = ReplicaPool("tech-research-agent")
+        pool.add("a")
+        assert pool.acquire() == "a"
+        assert pool.acquire() is None
+        
+        pool.add("b")
+        assert pool.acquire() == "b"
+        
+        pool.remove("a")
+        pool.release("a")  # Finishing a request on a removed replica is harmless
+        pool.release("b")
+        assert [pool.acquire(), pool.acquire()] == ["b", None]
+        assert pool.add("b") is False
+        assert len(pool) == 1
+    
+    def test_removed_replica_drains(self):
+        """Test that a replica removed and added back mid-request keeps counting that request"""
+        pool = ReplicaPool("tech-research-agent")
+        pool.add("a")
+        assert pool.acquire() == "a"
+        
+        pool.remove("a")
+        assert len(pool) == 0
+        assert pool.total_outstanding() == 1  # Still reported while the request runs
+        
+        assert pool.add("a") is True
+        assert pool.acquire() is None  # Busy with the request it had before removal
+        assert not pool.has_capacity()
+        pool.release("a")
+        assert pool.acquire() == "a"
+        assert pool.acquire() is None
+        
+        pool.remove("a")
+        pool.release("a")
+        assert pool.total_outstanding() == 0
+        assert pool.add("a") is True
+        assert pool.outstanding("a") == 0
+    
+    def test_unknown_strategy(self):
+        with pytest.raises(ValueError, match="Unknown dispatch strategy"):
+            ReplicaPool("tech-research-agent", strategy="random")
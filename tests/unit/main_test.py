@@ -4,6 +4,8 @@ Unit tests for main.py to improve test coverage
 import argparse
 import sys
 import os
+import threading
+import time
 from unittest.mock import patch, MagicMock, Mock
 import pytest
 
@@ -79,6 +81,124 @@ class TestMessageRouter:
         mock_print.assert_called()
 
 
+
+class SlowAgent:
+    """Agent that takes a fixed time per message and records overlapping calls"""
+    
+    def __init__(self, seconds=0.0, reply_to=None, router=None):
+        self.seconds = seconds
+        self.reply_to = reply_to
+        self.router = router
+        self.received = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+    
+    def receive_message(self, message):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.seconds)
+        self.received.append(message)
+        if self.reply_to:
+            self.router.deliver(self.reply_to, make_message("reply", self.reply_to))
+        with self.lock:
+            self.active -= 1
+
+
+def make_message(sender, receiver):
+    message = Mock()
+    message.type = "request:research:task"
+    message.sender = sender
+    message.receiver = receiver
+    return message
+
+
+class TestMessageRouterReplicas:
+    """Test cases for agent replica pools in the MessageRouter"""
+    
+    @patch('builtins.print')
+    def test_replicas_share_messages(self, mock_print):
+        router = MessageRouter()
+        replicas = [SlowAgent(), SlowAgent(), SlowAgent()]
+        for replica in replicas:
+            router.register_agent("tech-research-agent", replica)
+        
+        for _ in range(6):
+            router.send_message(make_message("orchestrator", "tech-research-agent"))
+        router.process_messages()
+        
+        assert router.agents["tech-research-agent"] is replicas[0]
+        assert [len(replica.received) for replica in replicas] == [2, 2, 2]
+    
+    @patch('builtins.print')
+    def test_concurrent_replicas(self, mock_print):
+        """Test that replicas work in parallel, each on one message at a time, and replies are routed"""
+        router = MessageRouter(max_workers=8)
+        sink = SlowAgent()
+        router.register_agent("orchestrator", sink)
+        replicas = [SlowAgent(0.05, reply_to="orchestrator", router=router) for _ in range(4)]
+        for replica in replicas:
+            router.register_agent("tech-research-agent", replica)
+        
+        for _ in range(12):
+            router.send_message(make_message("orchestrator", "tech-research-agent"))
+        start = time.perf_counter()
+        router.process_messages()
+        elapsed = time.perf_counter() - start
+        
+        assert len(sink.received) == 12
+        assert [len(replica.received) for replica in replicas] == [3, 3, 3, 3]
+        assert all(replica.max_active == 1 for replica in replicas)
+        assert elapsed < 12 * 0.05 / 2
+    
+    def test_unregister_agent(self):
+        router = MessageRouter()
+        first, second = SlowAgent(), SlowAgent()
+        router.register_agent("tech-research-agent", first)
+        router.register_agent("tech-research-agent", second)
+        
+        router.unregister_agent("tech-research-agent", first)
+        assert router.agents["tech-research-agent"] is second
+        assert len(router.pools["tech-research-agent"]) == 1
+        
+        router.unregister_agent("tech-research-agent")
+        assert "tech-research-agent" not in router.agents
+        assert "tech-research-agent" not in router.pools
+    
+    def test_reregistered_agent_keeps_message_in_progress(self):
+        """Test that an agent unregistered and registered again mid-message is not given a second one"""
+        router = MessageRouter()
+        agent = SlowAgent()
+        router.register_agent("tech-research-agent", agent)
+        pool = router.pools["tech-research-agent"]
+        assert pool.acquire() is agent  # A message is being handled
+        
+        router.unregister_agent("tech-research-agent")
+        router.register_agent("tech-research-agent", agent)
+        
+        assert router.status("tech-research-agent")["credits"] == 0
+        assert router.pools["tech-research-agent"].acquire() is None
+        pool.release(agent)
+        assert router.status("tech-research-agent")["credits"] == 1
+    
+    @patch('builtins.print')
+    def test_status(self, mock_print):
+        """Test that an agent ID's status counts its replicas and its queued messages"""
+        router = MessageRouter(replica_capacity=2)
+        router.register_agent("tech-research-agent", SlowAgent())
+        router.register_agent("tech-research-agent", SlowAgent())
+        for _ in range(3):
+            router.send_message(make_message("orchestrator", "tech-research-agent"))
+        
+        status = router.status("tech-research-agent")
+        assert (status["capacity"], status["outstanding"], status["credits"]) == (4, 3, 1)
+        assert router.queued_messages() == 3
+        assert router.status("unknown-agent") is None
+        
+        router.process_messages()
+        assert router.status("tech-research-agent")["credits"] == 4
+
 @patch('argparse.ArgumentParser')
 @patch('main.os.environ')
 @patch('main.ResearchOrchestratorAgent')
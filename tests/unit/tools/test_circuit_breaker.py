@@ -0,0 +1,92 @@
+"""
+Unit tests for circuit_breaker.py
+"""
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    """Manually advanced clock for deterministic timeouts"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker class"""
+    
+    def test_opens_after_threshold(self):
+        """Test that consecutive failures open the circuit"""
+        breaker = CircuitBreaker(failure_threshold=3, clock=FakeClock())
+        
+        for _ in range(2):
+            assert breaker.allow_request()
+            breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+        
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+    
+    def test_success_resets_failure_count(self):
+        """Test that a success between failures keeps the circuit closed"""
+        breaker = CircuitBreaker(failure_threshold=2, clock=FakeClock())
+        
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        
+        assert breaker.state == CircuitBreaker.CLOSED
+    
+    def test_half_open_after_recovery_timeout(self):
+        """Test the open -> half-open -> closed transition"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, half_open_max_calls=1, clock=clock)
+        breaker.record_failure()
+        
+        clock.now = 9.9
+        assert not breaker.allow_request()
+        
+        clock.now = 10.0
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()  # Only one trial call at a time
+        
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow_request()
+    
+    def test_half_open_failure_reopens(self):
+        """Test that a failed trial call reopens the circuit"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=10, clock=clock)
+        for _ in range(5):
+            breaker.record_failure()
+        
+        clock.now = 10.0
+        assert breaker.allow_request()
+        breaker.record_failure()
+        
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.to_dict()["state"] == "open"
+    
+    def test_release_frees_half_open_trial(self):
+        """Test that a trial call released without an outcome can be retried"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=clock)
+        breaker.record_failure()
+        
+        clock.now = 10.0
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+        breaker.release()
+        
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request()
@@ -0,0 +1,89 @@
+"""
+Unit tests for dataset_store.py
+"""
+import sys
+import os
+import tempfile
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.dataset_store import DatasetStore
+
+
+@pytest.fixture
+def store():
+    """Dataset store in a temporary directory"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield DatasetStore(temp_dir)
+
+
+class TestDatasetStore:
+    """Test cases for DatasetStore"""
+    
+    def test_put_returns_small_handle(self, store):
+        """Test that a handle describes the data without containing it"""
+        handle = store.put([1, 2, 3.5])
+        
+        assert set(handle) == {"dataset_id", "dtype", "shape", "length", "hash"}
+        assert handle["dtype"] == "<f8"
+        assert handle["shape"] == [3]
+        assert handle["length"] == 3
+        assert handle["hash"].startswith(handle["dataset_id"])
+    
+    def test_open_maps_read_only(self, store):
+        """Test that opened datasets are read-only memory maps of the stored values"""
+        handle = store.put(np.arange(1000).reshape(250, 4))
+        
+        array = store.open(handle, verify=True)
+        
+        assert isinstance(array, np.memmap)
+        assert array.shape == (250, 4)
+        assert array[10, 2] == 42.0
+        with pytest.raises(ValueError):
+            array[0, 0] = 1.0
+    
+    def test_identical_content_stored_once(self, store):
+        """Test that storing the same data twice reuses the file"""
+        first = store.put([1.0, 2.0])
+        path = os.path.join(store.root_path, f"{first['dataset_id']}.npy")
+        mtime = os.stat(path).st_mtime_ns
+        
+        second = store.put(np.array([1.0, 2.0]))
+        
+        assert second == first
+        assert os.stat(path).st_mtime_ns == mtime
+        assert store.put([2.0, 1.0])["dataset_id"] != first["dataset_id"]
+        assert len(os.listdir(store.root_path)) == 2
+    
+    def test_mismatched_or_missing_dataset(self, store):
+        """Test that handles must match a stored dataset"""
+        handle = store.put([1.0, 2.0, 3.0])
+        
+        with pytest.raises(ValueError):
+            store.open(dict(handle, shape=[4]))
+        with pytest.raises(ValueError):
+            store.open(dict(handle, dataset_id="../../etc/passwd"))
+        assert store.delete(handle)
+        assert not store.delete(handle)
+        with pytest.raises(KeyError):
+            store.open(handle)
+    
+    def test_tampered_content_fails_verification(self, store):
+        """Test that verify=True detects contents that no longer match the hash"""
+        handle = store.put([1.0, 2.0, 3.0])
+        path = os.path.join(store.root_path, f"{handle['dataset_id']}.npy")
+        np.save(path, np.array([1.0, 2.0, 4.0]))
+        
+        assert store.open(handle)[2] == 4.0
+        with pytest.raises(ValueError):
+            store.open(handle, verify=True)
+    
+    def test_chunks(self, store):
+        """Test reading a dataset in consecutive blocks"""
+        handle = store.put(np.arange(10))
+        
+        chunks = list(store.chunks(handle, chunk_size=4))
+        
+        assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+        assert np.concatenate(chunks).tolist() == list(range(10))
@@ -3,11 +3,40 @@ Unit tests for document_parser_tool.py to improve test coverage
 """
 import sys
 import os
+import json
+import tempfile
+import zipfile
 from unittest.mock import Mock, patch
 import pytest
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tools.document_parser_tool.document_parser_tool import DocumentParsingTool
+from tools.document_parser_tool import parsing_engine
+from tools.document_parser_tool.parse_cache import ParseCache
+from tools.document_parser_tool import parse_cache
+from tools.document_parser_tool import ingestion
+
+
+@pytest.fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        yield directory
+
+
+@pytest.fixture(autouse=True)
+def parse_cache_dir():
+    """Keep the tools' parse caches in a temporary directory"""
+    with tempfile.TemporaryDirectory() as directory:
+        with patch("tools.document_parser_tool.document_parser_tool.ParseCache",
+                   lambda cache_dir, *args, **kwargs: ParseCache(directory, *args, **kwargs)):
+            yield directory
+
+
+def write_file(directory, name, content, mode="w"):
+    path = os.path.join(directory, name)
+    with open(path, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+        f.write(content)
+    return path
 
 
 class TestDocumentParsingTool:
@@ -41,52 +70,420 @@ class TestDocumentParsingTool:
         """Test parameter definition with custom supported formats from config"""
         tool = DocumentParsingTool()
         # Manually set a custom config value to test the format
-        tool.config.set("supported_formats", ["pdf", "docx", "txt"])
+        tool.config.set("supported_formats", ["pdf", "docx", "txt", "md", "html"])
         
         params_def = tool.get_params_definition()
-        assert params_def["format"]["enum"] == ["pdf", "docx", "txt"]
-        assert "pdf, docx, txt" in params_def["format"]["description"]
+        assert params_def["format"]["enum"] == ["pdf", "docx", "txt", "md", "html"]
+        assert "pdf, docx, txt, md, html" in params_def["format"]["description"]
     
     @patch('builtins.print')
-    def test_execute(self, mock_print):
+    def test_execute(self, mock_print, temp_dir):
         """Test execution of DocumentParsingTool"""
         tool = DocumentParsingTool()
-        result = tool.execute(file_path="/path/to/doc.pdf", format="pdf")
+        path = write_file(temp_dir, "doc.txt", "Quarterly Report\n\nRevenue grew by ten percent.\fPage two text.\n")
+        result = tool.execute(file_path=path, format="txt")
         
         # Verify print was called
-        mock_print.assert_called_once_with("Parsing document: '/path/to/doc.pdf' (format: pdf)")
+        mock_print.assert_called_once_with(f"Parsing document: '{path}' (format: txt)")
         
         # Verify result structure
-        assert result["file_path"] == "/path/to/doc.pdf"
-        assert result["format"] == "pdf"
-        assert "parsed_content" in result
-        assert "metadata" in result
-        assert result["metadata"]["word_count"] == 150
-        assert result["metadata"]["page_count"] == 1
-        assert result["metadata"]["title"] == "Mock Title from /path/to/doc.pdf"
+        assert result["file_path"] == path
+        assert result["format"] == "txt"
+        assert result["parsed_content"].startswith("Quarterly Report")
+        assert result["metadata"]["word_count"] == 10
+        assert result["metadata"]["page_count"] == 2
+        assert result["metadata"]["title"] == "Quarterly Report"
+        assert result["metadata"]["truncated"] is False
     
     @patch('builtins.print')
-    def test_execute_with_default_format(self, mock_print):
+    def test_execute_with_default_format(self, mock_print, temp_dir):
         """Test execution of DocumentParsingTool with default format"""
         tool = DocumentParsingTool()
-        result = tool.execute(file_path="/path/to/doc.txt")
+        path = write_file(temp_dir, "doc.txt", "plain words")
+        result = tool.execute(file_path=path)
         
         # Verify print was called with default format
-        mock_print.assert_called_once_with("Parsing document: '/path/to/doc.txt' (format: txt)")
+        mock_print.assert_called_once_with(f"Parsing document: '{path}' (format: txt)")
         
         # Verify result structure
         assert result["format"] == "txt"
+        assert result["parsed_content"] == "plain words"
     
     @patch('builtins.print')
-    def test_execute_with_minimal_params(self, mock_print):
-        """Test execution with minimal parameters (only required ones)"""
+    def test_execute_missing_file(self, mock_print):
+        """Test that a missing document raises instead of returning made-up content"""
         tool = DocumentParsingTool()
-        result = tool.execute(file_path="/minimal/path")
         
-        # Verify print was called
+        with pytest.raises(FileNotFoundError):
+            tool.execute(file_path="/minimal/path")
         mock_print.assert_called_once_with("Parsing document: '/minimal/path' (format: txt)")
+    
+    @patch('builtins.print')
+    def test_execute_truncates_content(self, mock_print, temp_dir):
+        """Test that only max_content_chars of text is returned while counts cover the whole file"""
+        tool = DocumentParsingTool()
+        path = write_file(temp_dir, "long.txt", "word " * 50_000)
         
-        # Verify result structure
-        assert result["file_path"] == "/minimal/path"
-        assert result["format"] == "txt"
-        assert "parsed_content" in result
\ No newline at end of file
+        with patch.dict(tool.config.config, {"max_content_chars": 100}):
+            result = tool.execute(file_path=path)
+        
+        assert len(result["parsed_content"]) == 100
+        assert result["metadata"]["word_count"] == 50_000
+        assert result["metadata"]["truncated"] is True
+    
+    @patch('builtins.print')
+    def test_execute_packs_context_for_query(self, mock_print, temp_dir):
+        """Test that a query adds the most relevant passages within the token budget"""
+        tool = DocumentParsingTool()
+        filler = " ".join(f"filler{i}" for i in range(3000))
+        path = write_file(temp_dir, "long.txt", f"{filler} Tidal power output is predictable. {filler}")
+        
+        result = tool.execute(file_path=path, query="tidal power", token_budget=200)
+        
+        assert "Tidal power output is predictable" in result["context"]
+        assert len(result["context"]) <= 200 * 4
+        assert "context" not in tool.execute(file_path=path)
+    
+    @patch('builtins.print')
+    def test_execute_rejects_oversized_file(self, mock_print, temp_dir):
+        """Test the max_file_size_mb limit"""
+        tool = DocumentParsingTool()
+        path = write_file(temp_dir, "big.txt", "x" * 2048)
+        
+        with patch.dict(tool.config.config, {"max_file_size_mb": 0.001}):
+            with pytest.raises(ValueError):
+                tool.execute(file_path=path)
+    
+    def test_iter_pages(self, temp_dir):
+        """Test lazy page-by-page iteration"""
+        tool = DocumentParsingTool()
+        path = write_file(temp_dir, "pages.txt", "one\ftwo\fthree")
+        
+        pages = tool.iter_pages(path)
+        
+        assert next(pages) == "one"
+        assert list(pages) == ["two", "three"]
+
+
+class TestParsingEngine:
+    """Test cases for the streaming parsing engine"""
+    
+    def test_multibyte_characters_across_chunks(self, temp_dir):
+        """Test that UTF-8 sequences split by chunk boundaries decode correctly"""
+        text = "naïve café — 日本語 " * 100
+        path = write_file(temp_dir, "utf8.txt", text)
+        
+        chunks = list(parsing_engine.iter_decoded(path, chunk_bytes=7))
+        
+        assert "".join(chunks) == text
+        assert len(chunks) > 100
+    
+    def test_word_count_independent_of_chunk_size(self, temp_dir):
+        """Test that words cut by chunk boundaries are counted once"""
+        path = write_file(temp_dir, "words.txt", "alpha beta  gamma\ndelta\tepsilon " * 37)
+        
+        for chunk_bytes in (1, 3, 16, 1 << 16):
+            parsed = parsing_engine.parse_document(path, "txt", 0, chunk_bytes=chunk_bytes)
+            assert parsed["metadata"]["word_count"] == 5 * 37
+            assert parsed["content"] == ""
+    
+    def test_empty_file(self, temp_dir):
+        """Test that an empty file parses to no pages"""
+        path = write_file(temp_dir, "empty.txt", "")
+        
+        parsed = parsing_engine.parse_document(path, "txt", 100)
+        
+        assert parsed["content"] == ""
+        assert parsed["metadata"] == {"word_count": 0, "page_count": 0, "char_count": 0,
+                                      "title": None, "truncated": False}
+    
+    def test_markdown(self, temp_dir):
+        """Test that markdown markup is stripped and code blocks are kept"""
+        path = write_file(temp_dir, "doc.md",
+                          "# Results\n\nSee [the paper](http://x.org) and **bold** `code`.\n\n"
+                          "- item one\n---\n```\n# not a heading\n```\n")
+        
+        parsed = parsing_engine.parse_document(path, "md", 1000, chunk_bytes=5)
+        
+        assert parsed["metadata"]["title"] == "Results"
+        assert parsed["content"] == "Results\n\nSee the paper and bold code.\n\nitem one\n\n# not a heading\n"
+    
+    def test_html(self, temp_dir):
+        """Test visible-text extraction and the title from HTML fed in small chunks"""
+        path = write_file(temp_dir, "page.html",
+                          "<html><head><title>Study &amp; Results</title><style>p {color: red}</style></head>"
+                          "<body><h1>Heading</h1><p>First para.</p><script>var x = 1;</script>"
+                          "<p>Second&nbsp;para.</p></body></html>")
+        
+        parsed = parsing_engine.parse_document(path, "html", 1000, chunk_bytes=8)
+        
+        assert parsed["metadata"]["title"] == "Study & Results"
+        assert parsed["metadata"]["word_count"] == 5
+        assert "color" not in parsed["content"] and "var x" not in parsed["content"]
+        assert parsed["content"].split() == ["Heading", "First", "para.", "Second", "para."]
+    
+    def test_docx_pages(self, temp_dir):
+        """Test paragraph text and page breaks streamed from a DOCX archive"""
+        ns = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+        body = ('<w:p><w:r><w:t>Title line</w:t></w:r></w:p>'
+                '<w:p><w:r><w:t>First</w:t><w:tab/><w:t>page</w:t></w:r></w:p>'
+                '<w:p><w:r><w:br w:type="page"/><w:lastRenderedPageBreak/><w:t>Second page</w:t></w:r></w:p>')
+        path = os.path.join(temp_dir, "doc.docx")
+        with zipfile.ZipFile(path, "w") as archive:
+            archive.writestr("word/document.xml", f'<w:document {ns}><w:body>{body}</w:body></w:document>')
+        
+        pages = list(parsing_engine.iter_pages(path, "docx"))
+        parsed = parsing_engine.parse_document(path, "docx", 1000)
+        
+        assert pages == ["Title line\nFirst\tpage\n", "Second page\n"]
+        assert parsed["metadata"]["page_count"] == 2
+        assert parsed["metadata"]["title"] == "Title line"
+    
+    def test_pluggable_parser(self, temp_dir):
+        """Test registering a parser for a new format"""
+        path = write_file(temp_dir, "data.csv", "a,b\n1,2\n")
+        
+        def parse_csv(file_path, chunk_bytes):
+            for number, line in enumerate(open(file_path), 1):
+                yield parsing_engine.Segment(number, line.replace(",", " "))
+        
+        with patch.dict(parsing_engine.PARSERS):
+            parsing_engine.register_parser("csv", parse_csv)
+            parsed = parsing_engine.parse_document(path, "csv", 1000)
+        
+        assert parsed["metadata"]["page_count"] == 2
+        assert parsed["metadata"]["word_count"] == 4
+        with pytest.raises(ValueError):
+            parsing_engine.parse_document(path, "csv", 1000)
+
+
+class TestParseCache:
+    """Test cases for the content-hash keyed parse cache"""
+    
+    @pytest.fixture
+    def cache(self, temp_dir):
+        self.now = 1000.0
+        return ParseCache(os.path.join(temp_dir, "cache"), max_bytes=1 << 20, ttl_seconds=60,
+                          clock=lambda: self.now)
+    
+    @patch('builtins.print')
+    def test_unchanged_document_not_reparsed(self, mock_print, temp_dir):
+        """Test that parsing the same file twice parses it once"""
+        tool = DocumentParsingTool()
+        path = write_file(temp_dir, "doc.txt", "cached words here")
+        
+        with patch.object(parsing_engine, "parse_document", wraps=parsing_engine.parse_document) as mock_parse:
+            first = tool.execute(file_path=path)
+            second = tool.execute(file_path=path)
+        
+        assert mock_parse.call_count == 1
+        assert second == first
+        assert tool.cache.hits == 1
+    
+    def test_stat_stamp_skips_hashing(self, cache, temp_dir):
+        """Test that an unchanged file is recognized without reading it again"""
+        path = write_file(temp_dir, "doc.txt", "some text")
+        cache.put(path, ("txt", 100), {"content": "some text"})
+        
+        with patch("tools.document_parser_tool.parse_cache.file_content_hash") as mock_hash:
+            assert cache.get(path, ("txt", 100)) == {"content": "some text"}
+            assert cache.get(path, ("txt", 5)) is None
+        assert not mock_hash.called
+        
+        # A new cache instance finds the stamps persisted next to the entries
+        cache.flush()
+        reopened = ParseCache(cache.cache_dir, 1 << 20, 60, clock=lambda: self.now)
+        with patch("tools.document_parser_tool.parse_cache.file_content_hash") as mock_hash:
+            assert reopened.get(path, ("txt", 100)) == {"content": "some text"}
+        assert not mock_hash.called
+    
+    def test_content_change_misses_and_touch_hits(self, cache, temp_dir):
+        """Test that edits invalidate the entry while a touched but identical file still hits"""
+        path = write_file(temp_dir, "doc.txt", "version one")
+        cache.put(path, ("txt",), {"content": "version one"})
+        
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+        assert cache.get(path, ("txt",)) == {"content": "version one"}
+        
+        write_file(temp_dir, "doc.txt", "version two")
+        assert cache.get(path, ("txt",)) is None
+        
+        copy = write_file(temp_dir, "copy.txt", "version one")
+        assert cache.get(copy, ("txt",)) == {"content": "version one"}
+    
+    def test_entries_expire(self, cache, temp_dir):
+        """Test that entries older than the TTL are dropped"""
+        path = write_file(temp_dir, "doc.txt", "text")
+        cache.put(path, ("txt",), {"content": "text"})
+        
+        self.now += 61
+        
+        assert cache.get(path, ("txt",)) is None
+        assert cache.misses == 1
+    
+    def test_size_bound_evicts_least_recently_used(self, cache, temp_dir):
+        """Test that the cache directory stays within max_bytes, dropping the oldest entries first"""
+        cache.max_bytes = 5000
+        paths = [write_file(temp_dir, f"doc{i}.txt", f"document {i}") for i in range(4)]
+        for i, path in enumerate(paths):
+            self.now += 1
+            cache.put(path, ("txt",), {"content": str(i) * 1500})
+            if i == 2:
+                self.now += 1
+                assert cache.get(paths[0], ("txt",)) is not None  # Refresh the first entry
+        
+        assert cache.get(paths[0], ("txt",)) is not None
+        assert cache.get(paths[1], ("txt",)) is None
+        assert cache.get(paths[3], ("txt",)) is not None
+        entry_bytes = sum(os.path.getsize(os.path.join(cache.cache_dir, name))
+                          for name in os.listdir(cache.cache_dir) if name != "stamps.json")
+        assert entry_bytes <= 5000
+    
+    def test_index_writes_coalesced(self, cache, temp_dir):
+        """Test that storing many documents writes the hash index once, not once per document"""
+        cache.index_write_delay = 60
+        paths = [write_file(temp_dir, f"doc{i}.txt", f"document {i}") for i in range(20)]
+        
+        with patch("tools.document_parser_tool.parse_cache._write_json_atomically",
+                   wraps=parse_cache._write_json_atomically) as mock_write:
+            for path in paths:
+                cache.put(path, ("txt",), {"content": path})
+            cache.flush()
+            cache.flush()
+        
+        index_writes = [call for call in mock_write.call_args_list if call[0][0].endswith("stamps.json")]
+        assert len(index_writes) == 1
+    
+    def test_evicted_and_expired_entries_forget_their_files(self, cache, temp_dir):
+        """Test that the remembered file hashes shrink with the entries"""
+        cache.max_bytes = 5000
+        paths = [write_file(temp_dir, f"doc{i}.txt", f"document {i}") for i in range(4)]
+        for path in paths:
+            self.now += 1
+            cache.put(path, ("txt",), {"content": "x" * 1500})
+        
+        remembered = set(cache._load_stamps())
+        assert os.path.abspath(paths[0]) not in remembered
+        assert os.path.abspath(paths[3]) in remembered
+        
+        self.now += 61
+        assert cache.get(paths[3], ("txt",)) is None
+        assert os.path.abspath(paths[3]) not in cache._load_stamps()
+        cache.flush()
+        with open(os.path.join(cache.cache_dir, "stamps.json")) as f:
+            assert os.path.abspath(paths[3]) not in json.load(f)
+    
+    @patch('builtins.print')
+    def test_caching_disabled(self, mock_print, parse_cache_dir, temp_dir):
+        """Test that enable_caching=false parses every time and writes nothing"""
+        tool = DocumentParsingTool()
+        path = write_file(temp_dir, "doc.txt", "words")
+        
+        with patch.dict(tool.config.config, {"enable_caching": False}):
+            tool._on_config_changed({"enable_caching": False})
+            with patch.object(parsing_engine, "parse_document", wraps=parsing_engine.parse_document) as mock_parse:
+                tool.execute(file_path=path)
+                tool.execute(file_path=path)
+        
+        assert mock_parse.call_count == 2
+        assert os.listdir(parse_cache_dir) == []
+
+
+class TestBulkIngestion:
+    """Test cases for ingesting a directory or glob of documents"""
+    
+    @pytest.fixture
+    def corpus(self, temp_dir):
+        write_file(temp_dir, "a.txt", "alpha beta gamma")
+        write_file(temp_dir, "b.md", "# Title\n\nsome *marked* text")
+        os.makedirs(os.path.join(temp_dir, "nested"))
+        write_file(temp_dir, os.path.join("nested", "c.html"), "<html><body><p>nested words</p></body></html>")
+        write_file(temp_dir, "data.csv", "1,2,3")
+        write_file(temp_dir, ".hidden.txt", "not ingested")
+        return temp_dir
+    
+    def test_find_documents_uses_extension_and_size(self, corpus):
+        """Test that files are filtered by format and size without being opened"""
+        write_file(corpus, "big.txt", "x" * 2048)
+        
+        with patch("builtins.open", side_effect=AssertionError("file opened")):
+            documents, skipped = ingestion.find_documents(corpus, ["txt", "md", "html"], 1024)
+        
+        assert sorted(os.path.basename(document.path) for document in documents) == ["a.txt", "b.md", "c.html"]
+        assert {document.format for document in documents} == {"txt", "md", "html"}
+        reasons = {os.path.basename(entry["file_path"]): entry["skipped"] for entry in skipped}
+        assert reasons["data.csv"] == "Unsupported format"
+        assert "MB limit" in reasons["big.txt"]
+        assert ".hidden.txt" not in reasons
+    
+    def test_make_batches(self):
+        """Test that small files share batches and the largest files come first"""
+        documents = [ingestion.DocumentFile(f"doc{i}.txt", "txt", size) for i, size in enumerate([10, 500, 20, 30])]
+        
+        batches = ingestion.make_batches(documents, batch_bytes=100, batch_files=2)
+        
+        assert [[document.size for document in batch] for batch in batches] == [[500], [30, 20], [10]]
+    
+    @patch('builtins.print')
+    def test_execute_directory(self, mock_print, corpus):
+        """Test bulk ingestion of a directory through execute"""
+        tool = DocumentParsingTool()
+        
+        result = tool.execute(file_path=corpus, max_workers=1)
+        
+        assert result["format"] == "bulk"
+        assert result["metadata"]["document_count"] == 3
+        assert result["metadata"]["skipped_count"] == 1
+        assert result["metadata"]["word_count"] == 9
+        contents = {os.path.basename(document["file_path"]): document["parsed_content"]
+                    for document in result["documents"]}
+        assert contents["b.md"].startswith("Title")
+        assert contents["c.html"].strip() == "nested words"
+        mock_print.assert_any_call(f"Ingesting 3 documents from '{corpus}' (1 skipped)")
+    
+    @patch('builtins.print')
+    def test_execute_glob(self, mock_print, corpus):
+        """Test bulk ingestion of a glob pattern"""
+        tool = DocumentParsingTool()
+        
+        result = tool.execute(file_path=os.path.join(corpus, "**", "*.html"), max_workers=1)
+        
+        assert [os.path.basename(document["file_path"]) for document in result["documents"]] == ["c.html"]
+    
+    @patch('builtins.print')
+    def test_process_pool_matches_in_process(self, mock_print, corpus):
+        """Test that worker processes return the same results as parsing in-process"""
+        documents, _ = ingestion.find_documents(corpus, ["txt", "md", "html"], 1 << 20)
+        
+        in_process = list(ingestion.iter_ingest(documents, 1000, max_workers=1, batch_files=1))
+        pooled = list(ingestion.iter_ingest(documents, 1000, max_workers=2, batch_files=1))
+        
+        by_path = lambda results: sorted(results, key=lambda result: result["file_path"])
+        assert by_path(pooled) == by_path(in_process)
+    
+    @patch('builtins.print')
+    def test_failed_documents_reported(self, mock_print, temp_dir):
+        """Test that a document that fails to parse does not stop the others"""
+        tool = DocumentParsingTool()
+        write_file(temp_dir, "good.txt", "fine")
+        write_file(temp_dir, "broken.docx", b"not a zip file", mode="wb")
+        
+        result = tool.execute(file_path=temp_dir, max_workers=1)
+        
+        assert result["metadata"]["document_count"] == 1
+        assert result["failed"][0]["file_path"].endswith("broken.docx")
+        assert "BadZipFile" in result["failed"][0]["error"]
+    
+    @patch('builtins.print')
+    def test_cached_documents_not_reparsed(self, mock_print, corpus):
+        """Test that a second ingestion is served from the parse cache"""
+        tool = DocumentParsingTool()
+        first = tool.execute(file_path=corpus, max_workers=1)
+        
+        with patch.object(parsing_engine, "parse_document") as mock_parse:
+            second = tool.execute(file_path=corpus, max_workers=1)
+        
+        mock_parse.assert_not_called()
+        assert sorted(document["parsed_content"] for document in second["documents"]) == \
+            sorted(document["parsed_content"] for document in first["documents"])
@@ -0,0 +1,68 @@
+"""
+Unit tests for execution_stats.py
+"""
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.execution_stats import LatencyHistogram, ToolStats
+
+
+class TestLatencyHistogram:
+    """Test cases for LatencyHistogram class"""
+    
+    def test_empty_histogram(self):
+        """Test percentiles of an empty histogram"""
+        histogram = LatencyHistogram()
+        
+        assert histogram.percentile(50) is None
+        assert histogram.mean() is None
+    
+    def test_percentiles_within_bucket_error(self):
+        """Test that percentiles are accurate to within the bucket growth factor"""
+        histogram = LatencyHistogram(growth_factor=1.05)
+        for i in range(1, 1001):
+            histogram.record(i / 1000.0)  # 1ms .. 1s
+        
+        assert histogram.total_count == 1000
+        assert histogram.percentile(50) == pytest.approx(0.5, rel=0.05)
+        assert histogram.percentile(95) == pytest.approx(0.95, rel=0.05)
+        assert histogram.percentile(99) == pytest.approx(0.99, rel=0.05)
+        assert histogram.mean() == pytest.approx(0.5005)
+    
+    def test_memory_is_constant(self):
+        """Test that recording samples does not grow the histogram"""
+        histogram = LatencyHistogram()
+        num_buckets = len(histogram.counts)
+        for i in range(10000):
+            histogram.record((i % 100) * 0.01)
+        
+        assert len(histogram.counts) == num_buckets
+    
+    def test_out_of_range_samples(self):
+        """Test samples outside the configured latency range"""
+        histogram = LatencyHistogram(min_latency=0.001, max_latency=1.0)
+        histogram.record(0.0)
+        histogram.record(50.0)
+        
+        assert histogram.percentile(1) <= 0.001
+        assert histogram.percentile(100) == 50.0
+
+
+class TestToolStats:
+    """Test cases for ToolStats class"""
+    
+    def test_record_and_summary(self):
+        """Test recording successes and failures"""
+        stats = ToolStats("test-tool")
+        stats.record(0.1, True, 1000.0)
+        stats.record(0.2, False, 1001.0)
+        
+        summary = stats.to_dict()
+        assert summary["tool_id"] == "test-tool"
+        assert summary["count"] == 2
+        assert summary["error_count"] == 1
+        assert summary["error_rate"] == 0.5
+        assert summary["last_executed"] == 1001.0
+        assert summary["latency"]["max"] == 0.2
@@ -0,0 +1,144 @@
+"""
+Unit tests for the HTTP search backend in tools/web_search_tool
+"""
+import sys
+import os
+import asyncio
+import socket
+import struct
+import time
+from unittest.mock import patch
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.web_search_tool.http_backend import HttpSearchBackend, SearchServiceError
+from tools.web_search_tool.standin_server import StandInSearchServer
+from tools.web_search_tool.web_search_tool import WebSearchTool
+
+
+@pytest.fixture
+def server():
+    """Stand-in search service without latency or errors"""
+    with StandInSearchServer() as server:
+        yield server
+
+
+class TestHttpSearchBackend:
+    """Test cases for HttpSearchBackend against the stand-in service"""
+    
+    def test_search_streams_results(self, server):
+        backend = HttpSearchBackend(server.url)
+        
+        results = backend.search("solar power", 4)
+        
+        assert len(results) == 4
+        assert results[0]["title"] == "Result 1 for solar power"
+        assert results[3]["url"] == "https://standin.example/solar-power/4"
+        backend.close()
+    
+    def test_sequential_requests_reuse_connection(self, server):
+        """Test that keep-alive connections are reused across requests"""
+        backend = HttpSearchBackend(server.url)
+        
+        for i in range(5):
+            backend.search(f"query {i}", 2)
+        
+        assert server.requests == 5
+        assert server.connections == 1
+        assert backend.connections_opened == 1
+        backend.close()
+    
+    def test_search_many_bounded_by_pool(self, server):
+        """Test that a concurrent batch opens at most max_connections connections"""
+        server.latency_seconds = 0.02
+        backend = HttpSearchBackend(server.url, max_connections=3)
+        
+        results = backend.search_many([(f"query {i}", 2) for i in range(12)])
+        
+        assert [result[0]["title"] for result in results] == [f"Result 1 for query {i}" for i in range(12)]
+        assert server.connections <= 3
+        backend.close()
+    
+    def test_async_fan_out_shares_pool(self, server):
+        """Test that concurrent coroutines run in parallel over at most max_connections connections"""
+        server.latency_seconds = 0.05
+        backend = HttpSearchBackend(server.url, max_connections=4)
+        
+        async def fan_out():
+            return await asyncio.gather(*(backend.asearch(f"query {i}", 3) for i in range(16)))
+        
+        start = time.perf_counter()
+        results = asyncio.run(fan_out())
+        elapsed = time.perf_counter() - start
+        
+        assert [len(result) for result in results] == [3] * 16
+        assert results[5][0]["title"] == "Result 1 for query 5"
+        assert server.connections <= 4
+        assert elapsed < 16 * 0.05
+        backend.close()
+    
+    def test_error_status_raises(self, server):
+        """Test that an error status surfaces and the next request succeeds"""
+        server.error_rate = 1.0
+        backend = HttpSearchBackend(server.url)
+        
+        with pytest.raises(SearchServiceError, match="HTTP 503"):
+            backend.search("failing", 2)
+        with pytest.raises(SearchServiceError, match="HTTP 503"):
+            asyncio.run(backend.asearch("failing", 2))
+        
+        server.error_rate = 0.0
+        assert len(backend.search("recovered", 2)) == 2
+        backend.close()
+    
+    def test_timeout_enforced(self, server):
+        server.latency_seconds = 0.5
+        backend = HttpSearchBackend(server.url, timeout_seconds=0.1)
+        
+        with pytest.raises(TimeoutError):
+            backend.search("slow", 2)
+        with pytest.raises(TimeoutError):
+            asyncio.run(backend.asearch("slow", 2))
+        backend.close()
+    
+    def test_client_disconnect_is_quiet(self, capfd):
+        """Test that a client hanging up mid-response does not print server tracebacks"""
+        with StandInSearchServer(latency_seconds=0.05) as server:
+            host, port = server.url.split("/")[2].split(":")
+            for _ in range(3):
+                client = socket.create_connection((host, int(port)))
+                client.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+                client.sendall(b"GET /search?q=solar&n=5000 HTTP/1.1\r\nHost: standin\r\n\r\n")
+                client.close()
+            time.sleep(0.3)
+            
+            backend = HttpSearchBackend(server.url)
+            assert len(backend.search("solar", 3)) == 3
+            backend.close()
+        
+        assert "Traceback" not in capfd.readouterr().err
+    
+    def test_invalid_endpoint(self):
+        with pytest.raises(ValueError, match="Invalid search service endpoint"):
+            HttpSearchBackend("localhost:8080")
+    
+    @patch('builtins.print')
+    def test_web_search_tool_http_backend(self, mock_print, server):
+        """Test the Web Search Tool configured for the HTTP backend"""
+        tool = WebSearchTool()
+        settings = {"backend": "http", "endpoint": server.url, "max_connections": 2}
+        with patch.dict(tool.config.config, settings):
+            tool._on_config_changed(settings)
+            assert isinstance(tool.backend, HttpSearchBackend)
+            
+            sync_result = tool.execute(query="wind", num_results=2)
+            async_result = asyncio.run(tool.aexecute(query="tides", num_results=2))
+            batch = tool.execute_batch([{"query": "wind", "num_results": 2}, {"query": "geothermal", "num_results": 1}])
+            
+            tool._on_config_changed({"backend": "mock"})
+        
+        assert sync_result["results"][0]["title"] == "Result 1 for wind"
+        assert async_result["num_results_returned"] == 2
+        assert batch[0] == sync_result
+        assert batch[1]["results"][0]["title"] == "Result 1 for geothermal"
+        assert server.requests == 3
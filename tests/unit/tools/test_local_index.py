@@ -0,0 +1,122 @@
+"""
+Unit tests for the local search index in tools/web_search_tool
+"""
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.web_search_tool import local_index
+from tools.web_search_tool.local_index import LocalSearchIndex, document_from_parse_result
+from tools.text_ranking import BM25Index, tokenize
+
+DOCUMENTS = [
+    {"url": "doc://solar", "title": "Solar power", "content": "Solar panels convert sunlight into electricity."},
+    {"url": "doc://wind", "title": "Wind power", "content": "Wind turbines convert moving air into electricity."},
+    {"url": "doc://storage", "title": "Grid storage", "content": "Batteries store solar and wind electricity for the grid."},
+    {"url": "doc://tides", "title": "Tidal energy", "content": "Tides are predictable, unlike wind."},
+]
+
+
+@pytest.fixture
+def index():
+    """Local search index in a temporary directory"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        index = LocalSearchIndex(os.path.join(temp_dir, "index.sqlite3"))
+        yield index
+        index.close()
+
+
+class TestLocalSearchIndex:
+    """Test cases for LocalSearchIndex"""
+    
+    def test_search_ranks_with_bm25(self, index):
+        """Test that scores and order match an in-memory BM25 over the same documents"""
+        index.add_documents(DOCUMENTS)
+        expected = BM25Index(tokenize(f"{document['title']} {document['content']}") for document in DOCUMENTS)
+        expected_scores = expected.scores(tokenize("solar electricity"))
+        
+        results = index.search("solar electricity", 10)
+        
+        assert [result["url"] for result in results] == ["doc://solar", "doc://storage", "doc://wind"]
+        for result in results:
+            position = [document["url"] for document in DOCUMENTS].index(result["url"])
+            assert result["score"] == pytest.approx(expected_scores[position], abs=1e-4)
+        assert results[0]["title"] == "Solar power"
+        assert results[0]["snippet"].startswith("Solar panels")
+    
+    def test_num_results_and_unknown_terms(self, index):
+        index.add_documents(DOCUMENTS)
+        
+        assert len(index.search("electricity", 2)) == 2
+        assert index.search("geothermal", 5) == []
+        assert index.search("", 5) == []
+    
+    def test_incremental_add_and_replace(self, index):
+        """Test that documents can be added later and re-adding a url replaces it"""
+        index.add_documents(DOCUMENTS[:2])
+        index.add_documents(DOCUMENTS[2:])
+        assert len(index) == 4
+        
+        index.add_documents([{"url": "doc://wind", "title": "Wind power", "content": "Offshore geothermal hybrids."}])
+        
+        assert len(index) == 4
+        assert [result["url"] for result in index.search("geothermal", 5)] == ["doc://wind"]
+        assert "doc://wind" not in [result["url"] for result in index.search("turbines", 5)]
+    
+    def test_replace_and_remove_latest_document(self, index):
+        """Test that a document indexed after the newest one was replaced or removed is found"""
+        index.add_documents([{"url": "u1", "title": "", "content": "alpha beta"}])
+        index.add_documents([{"url": "u1", "title": "", "content": "alpha gamma"}])
+        
+        assert len(index) == 1
+        assert [result["url"] for result in index.search("gamma", 5)] == ["u1"]
+        assert index.search("beta", 5) == []
+        
+        index.remove("u1")
+        index.add_documents([{"url": "u2", "title": "", "content": "alpha delta"}])
+        assert [result["url"] for result in index.search("alpha", 5)] == ["u2"]
+    
+    def test_remove(self, index):
+        index.add_documents(DOCUMENTS)
+        
+        assert index.remove("doc://solar") is True
+        assert index.remove("doc://solar") is False
+        assert "doc://solar" not in [result["url"] for result in index.search("solar", 5)]
+        assert len(index) == 3
+    
+    def test_optimize_merges_segments_and_drops_removed(self, index):
+        """Test that merging segments keeps the results and purges removed postings"""
+        with patch.object(local_index, "INDEX_BATCH_SIZE", 1):
+            index.add_documents(DOCUMENTS)
+        index.remove("doc://wind")
+        before = index.search("wind electricity", 5)
+        
+        index.optimize()
+        
+        assert index.search("wind electricity", 5) == before
+        rows = index._connection.execute("SELECT COUNT(*), COUNT(DISTINCT term) FROM postings").fetchone()
+        assert rows[0] == rows[1]
+        assert index._connection.execute("SELECT COUNT(*) FROM deleted").fetchone()[0] == 0
+    
+    def test_index_persists(self, index):
+        index.add_documents(DOCUMENTS)
+        index.close()
+        
+        reopened = LocalSearchIndex(index.path)
+        
+        assert len(reopened) == 4
+        assert reopened.search("tides", 1)[0]["url"] == "doc://tides"
+        reopened.close()
+    
+    def test_document_from_parse_result(self):
+        parsed = {"file_path": "notes/report.md", "parsed_content": "Findings",
+                  "metadata": {"title": "Quarterly report"}}
+        
+        document = document_from_parse_result(parsed)
+        
+        assert document["url"] == f"file://{os.path.abspath('notes/report.md')}"
+        assert document["title"] == "Quarterly report"
+        assert document["content"] == "Findings"
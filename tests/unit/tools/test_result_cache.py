@@ -0,0 +1,67 @@
+"""
+Unit tests for result_cache.py
+"""
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.result_cache import ResultCache
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestResultCache:
+    """Test cases for ResultCache"""
+    
+    def test_hit_and_expiry(self):
+        """Test that entries are served until their TTL passes"""
+        clock = FakeClock()
+        cache = ResultCache(ttl_seconds=10, clock=clock)
+        cache.put("key", {"value": 1})
+        
+        clock.now = 9.9
+        assert cache.get("key") == {"value": 1}
+        clock.now = 10.0
+        assert cache.get("key") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert len(cache) == 0
+    
+    def test_ttl_change_applies_to_existing_entries(self):
+        """Test that shortening the TTL expires entries stored under the old TTL"""
+        clock = FakeClock()
+        cache = ResultCache(ttl_seconds=60, clock=clock)
+        cache.put("key", "value")
+        clock.now = 30
+        
+        cache.ttl_seconds = 20
+        
+        assert cache.get("key") is None
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = ResultCache(ttl_seconds=60, max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+    
+    def test_disabled_cache_stores_nothing(self):
+        """Test that a TTL of zero disables caching"""
+        cache = ResultCache(ttl_seconds=0)
+        cache.put("key", "value")
+        
+        assert cache.get("key") is None
+        assert len(cache) == 0
@@ -0,0 +1,89 @@
+"""
+Unit tests for search result merging in tools/web_search_tool
+"""
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.web_search_tool.result_merging import (
+    canonicalize_url, minhash, estimated_similarity, NearDuplicateIndex, merge_results
+)
+
+SOLAR = "Solar panels convert sunlight into electricity using photovoltaic cells made from silicon, and costs have fallen sharply over the past decade."
+SOLAR_EDITED = "Solar panels convert sunlight into electricity using photovoltaic cells made of silicon, and costs have fallen sharply over the last decade."
+WIND = "Wind turbines convert moving air into electricity and are often built offshore where winds are stronger and steadier."
+
+
+def result(url, snippet):
+    return {"title": url, "url": url, "snippet": snippet}
+
+
+class TestCanonicalizeUrl:
+    """Test cases for canonicalize_url"""
+    
+    def test_equivalent_spellings(self):
+        variants = [
+            "https://www.Example.com/energy/solar/",
+            "http://example.com:80/energy/solar",
+            "https://example.com:443/energy/solar#costs",
+            "https://example.com/energy/solar?utm_source=news&utm_medium=email&fbclid=abc"
+        ]
+        
+        assert len({canonicalize_url(url) for url in variants}) == 1
+    
+    def test_meaningful_differences_kept(self):
+        assert canonicalize_url("https://example.com/a?page=2&sort=new") == \
+            canonicalize_url("https://example.com/a?sort=new&page=2")
+        assert canonicalize_url("https://example.com/a?page=2") != canonicalize_url("https://example.com/a?page=3")
+        assert canonicalize_url("https://example.com/a") != canonicalize_url("https://example.com/A")
+        assert canonicalize_url("https://example.com:8443/a") != canonicalize_url("https://example.com/a")
+
+
+class TestNearDuplicates:
+    """Test cases for MinHash near-duplicate detection"""
+    
+    def test_similarity_estimates(self):
+        assert estimated_similarity(minhash(SOLAR), minhash(SOLAR)) == 1.0
+        assert estimated_similarity(minhash(SOLAR), minhash(SOLAR_EDITED)) >= 0.7
+        assert estimated_similarity(minhash(SOLAR), minhash(WIND)) < 0.4
+        assert minhash("...") is None
+    
+    def test_index_finds_near_duplicates_only(self):
+        index = NearDuplicateIndex(0.7)
+        index.add(minhash(SOLAR), "solar")
+        
+        assert index.find(minhash(SOLAR_EDITED)) == "solar"
+        assert index.find(minhash(WIND)) is None
+
+
+class TestMergeResults:
+    """Test cases for merge_results"""
+    
+    def test_reciprocal_rank_fusion_order(self):
+        """Test that results found by several queries outrank those found by one"""
+        first = [result("https://a.example/1", "alpha beta gamma"), result("https://b.example/1", "delta epsilon zeta")]
+        second = [result("https://c.example/1", "eta theta iota"), result("https://b.example/1", "delta epsilon zeta")]
+        
+        merged, duplicates = merge_results([first, second], 10, rrf_k=60)
+        
+        assert [item["url"] for item in merged] == ["https://b.example/1", "https://a.example/1", "https://c.example/1"]
+        assert merged[0]["rrf_score"] == pytest.approx(2 / 62, abs=1e-6)
+        assert merged[1]["rrf_score"] == pytest.approx(1 / 61, abs=1e-6)
+        assert duplicates == 1
+    
+    def test_duplicate_urls_and_snippets_merged(self):
+        """Test that URL spellings and near-duplicate snippets collapse into the best-ranked copy"""
+        first = [result("https://news.example/solar?utm_source=feed", SOLAR), result("https://wind.example/", WIND)]
+        second = [result("https://www.news.example/solar", SOLAR), result("https://mirror.example/solar", SOLAR_EDITED)]
+        
+        merged, duplicates = merge_results([first, second], 10)
+        
+        assert [item["url"] for item in merged] == ["https://news.example/solar?utm_source=feed", "https://wind.example/"]
+        assert duplicates == 2
+    
+    def test_num_results_and_empty_lists(self):
+        lists = [[result(f"https://example.com/{i}", f"topic{i} words") for i in range(5)]]
+        
+        assert len(merge_results(lists, 3)[0]) == 3
+        assert merge_results([[], []], 3) == ([], 0)
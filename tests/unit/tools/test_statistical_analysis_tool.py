@@ -3,11 +3,16 @@ Unit tests for statistical_analysis_tool.py to improve test coverage
 """
 import sys
 import os
-from unittest.mock import Mock, patch
+import tempfile
+from unittest.mock import Mock, PropertyMock, patch
+import numpy as np
 import pytest
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tools.statistical_analysis_tool.statistical_analysis_tool import StatisticalAnalysisTool
+from tools.statistical_analysis_tool import stats_engine
+from tools.statistical_analysis_tool.streaming_stats import KLLSketch, RunningMoments
+from tools.dataset_store import DatasetStore
 
 
 class TestStatisticalAnalysisTool:
@@ -30,7 +35,7 @@ class TestStatisticalAnalysisTool:
         
         assert "data" in params_def
         assert params_def["data"]["type"] == "array"
-        assert params_def["data"]["required"] == True
+        assert params_def["data"]["required"] == False  # A dataset handle can be passed instead
         assert "analysis_type" in params_def
         assert params_def["analysis_type"]["type"] == "string"
         assert params_def["analysis_type"]["required"] == False
@@ -128,4 +133,285 @@ class TestStatisticalAnalysisTool:
         assert stats["mean"] == 42
         assert stats["min"] == 42
         assert stats["max"] == 42
-        assert stats["range"] == 0  # 42-42
\ No newline at end of file
+        assert stats["range"] == 0  # 42-42
+    
+    @patch('builtins.print')
+    def test_execute_batch(self, mock_print):
+        """Test native batch execution over several series"""
+        tool = StatisticalAnalysisTool()
+        params_list = [{"data": [1, 2, 3]}, {"data": [10, 20], "analysis_type": "correlation"}, {"data": []}]
+        
+        results = tool.execute_batch(params_list)
+        
+        mock_print.assert_called_once_with("Performing batch analysis of 3 series with 5 values")
+        assert len(results) == 3
+        assert results[0]["statistics"]["mean"] == 2.0
+        assert results[1]["analysis_type"] == "correlation"
+        assert results[1]["statistics"]["range"] == 10
+        assert results[2]["statistics"]["count"] == 0
+        assert tool.supports_batch
+    
+    @patch('builtins.print')
+    def test_execute_descriptive_spread_statistics(self, mock_print):
+        """Test variance, standard deviation, quantiles and skewness of a series"""
+        tool = StatisticalAnalysisTool()
+        result = tool.execute(data=[2, 4, 4, 4, 5, 5, 7, 9])
+        
+        stats = result["statistics"]
+        assert stats["variance"] == pytest.approx(32 / 7)
+        assert stats["std"] == pytest.approx((32 / 7) ** 0.5)
+        assert stats["quantiles"] == {"p25": 4.0, "p50": 4.5, "p75": 5.5}
+        assert stats["skewness"] == pytest.approx(0.65625)
+    
+    @patch('builtins.print')
+    def test_execute_correlation_with_index(self, mock_print):
+        """Test that a flat series is correlated with its position"""
+        tool = StatisticalAnalysisTool()
+        result = tool.execute(data=[1, 4, 9, 16, 25], analysis_type="correlation")
+        
+        assert result["correlation"]["spearman"] == pytest.approx(1.0)
+        assert 0.9 < result["correlation"]["pearson"] < 1.0
+    
+    @patch('builtins.print')
+    def test_execute_correlation_matrix(self, mock_print):
+        """Test correlation matrices between the columns of multivariate rows"""
+        tool = StatisticalAnalysisTool()
+        rows = [[1, 10, 5], [2, 20, 3], [3, 30, 4], [4, 40, 1]]
+        result = tool.execute(data=rows, analysis_type="correlation")
+        
+        assert result["statistics"]["count"] == 4
+        assert result["statistics"]["variables"] == 3
+        assert result["statistics"]["columns"][1]["mean"] == 25.0
+        pearson = result["correlation"]["pearson"]
+        assert pearson[0][1] == pytest.approx(1.0)
+        assert pearson[0][2] == pearson[2][0]
+        assert result["correlation"]["spearman"][0][2] == pytest.approx(-0.8)
+    
+    @patch('builtins.print')
+    def test_execute_regression(self, mock_print):
+        """Test OLS regression against the index and on multivariate rows"""
+        tool = StatisticalAnalysisTool()
+        
+        trend = tool.execute(data=[3, 5, 7, 9], analysis_type="regression")["regression"]
+        assert trend["coefficients"] == [pytest.approx(2.0)]
+        assert trend["intercept"] == pytest.approx(3.0)
+        assert trend["r_squared"] == pytest.approx(1.0)
+        
+        rows = [[0, 1, 1], [1, 0, 3], [1, 1, 4], [2, 1, 6], [0, 2, 1]]
+        fit = tool.execute(data=rows, analysis_type="regression")["regression"]
+        expected = np.linalg.lstsq(np.c_[np.ones(5), np.array(rows)[:, :2]], np.array(rows)[:, 2], rcond=None)[0]
+        assert fit["intercept"] == pytest.approx(expected[0])
+        assert fit["coefficients"] == pytest.approx(list(expected[1:]))
+        assert fit["n"] == 5
+    
+    @patch('builtins.print')
+    def test_execute_undefined_results(self, mock_print):
+        """Test that statistics undefined for too little data are None rather than errors"""
+        tool = StatisticalAnalysisTool()
+        
+        single = tool.execute(data=[42], analysis_type="correlation")
+        assert single["statistics"]["variance"] is None
+        assert single["correlation"] == {"pearson": None, "spearman": None}
+        assert tool.execute(data=[], analysis_type="regression")["regression"] is None
+        assert tool.execute(data=[5, 5, 5], analysis_type="correlation")["correlation"]["pearson"] is None
+
+
+class TestStatsEngine:
+    """Test cases for the vectorized statistics engine"""
+    
+    def test_blocked_moments_match_two_pass(self):
+        """Test that merging per-block moments matches the two-pass formulas"""
+        values = np.random.default_rng(0).gamma(2.0, size=10_001) + 1e6
+        
+        count, mean, m2, m3, minimum, maximum = stats_engine.moments(values, block_size=1000)
+        
+        centered = values - values.mean()
+        assert count == 10_001
+        assert mean == pytest.approx(values.mean(), rel=1e-15)
+        assert m2 == pytest.approx(np.sum(centered ** 2), rel=1e-9)
+        assert m3 == pytest.approx(np.sum(centered ** 3), rel=1e-6)
+        assert (minimum, maximum) == (values.min(), values.max())
+    
+    def test_rank_averages_ties(self):
+        """Test that tied values share their average rank"""
+        ranks = stats_engine.rank(np.array([3.0, 1.0, 3.0, 2.0, 3.0]))
+        
+        assert ranks.tolist() == [4.0, 1.0, 4.0, 2.0, 4.0]
+    
+    def test_correlation_matrix_matches_numpy(self):
+        """Test Pearson against numpy.corrcoef and Spearman as Pearson on ranks"""
+        matrix = np.random.default_rng(1).normal(size=(200, 4))
+        
+        pearson = stats_engine.correlation_matrix(matrix)
+        spearman = stats_engine.correlation_matrix(matrix, "spearman")
+        
+        assert np.allclose(pearson, np.corrcoef(matrix.T))
+        ranks = np.column_stack([stats_engine.rank(column) for column in matrix.T])
+        assert np.allclose(spearman, np.corrcoef(ranks.T))
+        with pytest.raises(ValueError):
+            stats_engine.correlation_matrix(matrix, "kendall")
+    
+    def test_trend_matches_ols_on_index(self):
+        """Test that the closed-form fit against the index matches general OLS"""
+        values = np.random.default_rng(2).normal(size=5000).cumsum()
+        
+        trend = stats_engine.trend(values, block_size=512)
+        fit = stats_engine.ols(np.arange(5000, dtype=np.float64), values)
+        
+        assert trend["coefficients"] == pytest.approx(fit["coefficients"])
+        assert trend["intercept"] == pytest.approx(fit["intercept"])
+        assert trend["r_squared"] == pytest.approx(fit["r_squared"])
+        assert trend["std_error"] == pytest.approx(fit["std_error"])
+        assert trend["r"] == pytest.approx(np.corrcoef(np.arange(5000), values)[0, 1])
+    
+    def test_ols_needs_enough_observations(self):
+        """Test that OLS rejects fits with no residual degrees of freedom"""
+        with pytest.raises(ValueError):
+            stats_engine.ols(np.ones((2, 2)), np.ones(2))
+
+
+class TestStreamingStatistics:
+    """Test cases for streaming mode and the mergeable sketches behind it"""
+    
+    def test_running_moments_match_batch(self):
+        """Test that chunked updates and merges give the batch moments"""
+        values = np.random.default_rng(3).normal(5.0, 2.0, size=9_999)
+        first, second = RunningMoments(), RunningMoments()
+        for chunk in np.array_split(values[:5000], 7):
+            first.update(chunk)
+        second.update(values[5000:])
+        
+        first.merge(RunningMoments.from_dict(second.to_dict()))
+        
+        assert first.summary == pytest.approx(stats_engine.moments(values))
+    
+    def test_kll_sketch_rank_error_and_size(self):
+        """Test that sketch quantiles are within the expected rank error in bounded memory"""
+        values = np.random.default_rng(4).lognormal(size=200_000)
+        sketch = KLLSketch(k=200, seed=0)
+        for chunk in np.array_split(values, 100):
+            sketch.update(chunk)
+        
+        ordered = np.sort(values)
+        for q, estimate in zip([0.1, 0.5, 0.9], sketch.quantiles([0.1, 0.5, 0.9])):
+            assert abs(np.searchsorted(ordered, estimate) / len(values) - q) < 0.02
+        assert len(sketch) < 3 * 200
+        assert sketch.count == 200_000
+    
+    def test_kll_sketch_merge(self):
+        """Test that merged sketches summarize the union of their inputs"""
+        left, right = KLLSketch(k=100, seed=1), KLLSketch(k=100, seed=2)
+        left.update(np.arange(0, 50_000, dtype=np.float64))
+        right.update(np.arange(50_000, 100_000, dtype=np.float64))
+        
+        left.merge(KLLSketch.from_dict(right.to_dict()))
+        
+        assert left.count == 100_000
+        assert abs(left.quantiles([0.5])[0] - 50_000) < 2_000
+        with pytest.raises(ValueError):
+            left.merge(KLLSketch(k=50))
+    
+    @patch('builtins.print')
+    def test_execute_streaming_generator(self, mock_print):
+        """Test that an iterator of chunks is analyzed without a max_data_points limit"""
+        tool = StatisticalAnalysisTool()
+        chunks = (np.full(1000, float(n)) for n in range(10))
+        
+        result = tool.execute(data=chunks)
+        
+        mock_print.assert_called_once_with("Performing streaming descriptive analysis")
+        stats = result["statistics"]
+        assert result["streaming"] is True
+        assert stats["count"] == 10_000
+        assert stats["mean"] == pytest.approx(4.5)
+        assert (stats["min"], stats["max"]) == (0.0, 9.0)
+        assert stats["quantiles"]["p50"] in (4.0, 5.0)
+        assert "input_data" not in result
+    
+    @patch('builtins.print')
+    def test_execute_streaming_merges_partial_results(self, mock_print):
+        """Test combining streaming analyses computed on different workers"""
+        tool = StatisticalAnalysisTool()
+        part_a = tool.execute(data=[[1, 2, 3], [4]], streaming=True)
+        part_b = tool.execute(data=iter([5, 6, 7, 8]))
+        
+        merged = tool.execute(data=[], streaming=True, partial_results=[part_a["state"], part_b["state"]])
+        
+        stats = merged["statistics"]
+        assert stats["count"] == 8
+        assert stats["mean"] == pytest.approx(4.5)
+        assert stats["variance"] == pytest.approx(6.0)
+        assert stats["range"] == 7.0
+    
+    @patch('builtins.print')
+    def test_execute_streaming_rejects_other_analyses(self, mock_print):
+        """Test that only descriptive statistics are available in streaming mode"""
+        tool = StatisticalAnalysisTool()
+        
+        with pytest.raises(ValueError):
+            tool.execute(data=iter([1, 2]), analysis_type="correlation")
+
+
+class TestDatasetHandles:
+    """Test cases for analyzing datasets passed by handle"""
+    
+    @pytest.fixture
+    def store(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = DatasetStore(temp_dir)
+            with patch.object(StatisticalAnalysisTool, "datasets", new_callable=PropertyMock, return_value=store):
+                yield store
+    
+    @patch('builtins.print')
+    def test_execute_with_dataset_handle(self, mock_print, store):
+        """Test that a stored dataset is analyzed and only its handle is returned"""
+        tool = StatisticalAnalysisTool()
+        handle = store.put(np.arange(1, 6))
+        
+        result = tool.execute(dataset=handle, analysis_type="regression")
+        
+        mock_print.assert_called_once_with(
+            f"Performing regression analysis on dataset {handle['dataset_id']} with 5 values")
+        assert result["dataset"] == handle
+        assert "input_data" not in result
+        assert result["statistics"]["mean"] == 3.0
+        assert result["regression"]["coefficients"] == [pytest.approx(1.0)]
+    
+    @patch('builtins.print')
+    def test_store_data_returns_handle(self, mock_print, store):
+        """Test that inline data can be written to the store instead of being echoed back"""
+        tool = StatisticalAnalysisTool()
+        
+        result = tool.execute(data=[[1, 2], [3, 4], [5, 7]], analysis_type="correlation", store_data=True)
+        
+        assert "input_data" not in result
+        assert store.open(result["dataset"]).tolist() == [[1, 2], [3, 4], [5, 7]]
+        assert result["correlation"]["pearson"][0][1] == pytest.approx(np.corrcoef([1, 3, 5], [2, 4, 7])[0, 1])
+    
+    @patch('builtins.print')
+    def test_streaming_over_dataset(self, mock_print, store):
+        """Test streaming statistics over a stored dataset read in chunks"""
+        tool = StatisticalAnalysisTool()
+        handle = store.put(np.arange(100_000))
+        
+        result = tool.execute(dataset=handle, streaming=True)
+        
+        assert result["statistics"]["count"] == 100_000
+        assert result["statistics"]["max"] == 99_999
+        assert result["dataset"] == handle
+    
+    @patch('builtins.print')
+    def test_batch_counts_dataset_values(self, mock_print, store):
+        """Test that batches mix inline data and dataset handles"""
+        tool = StatisticalAnalysisTool()
+        handle = store.put(np.arange(8))
+        
+        results = tool.execute_batch([{"data": [1, 2]}, {"dataset": handle}])
+        
+        mock_print.assert_called_once_with("Performing batch analysis of 2 series with 10 values")
+        assert results[1]["statistics"]["count"] == 8
+    
+    def test_data_or_dataset_required(self, store):
+        """Test that a request needs either inline data or a dataset"""
+        with pytest.raises(ValueError):
+            StatisticalAnalysisTool().execute(analysis_type="descriptive")
@@ -0,0 +1,104 @@
+"""
+Unit tests for text_ranking.py
+"""
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools import text_ranking
+from tools.text_ranking import BM25Index, chunk_text, estimate_tokens, pack_context, tokenize
+
+
+def numbered_words(count):
+    return " ".join(f"w{i:04d}" for i in range(count))
+
+
+class TestChunking:
+    """Test cases for chunk_text"""
+    
+    def test_chunks_cover_text_with_overlap(self):
+        """Test that chunks stay within the size, overlap their neighbours and cover every word"""
+        text = numbered_words(1000)
+        
+        chunks = chunk_text(text, chunk_tokens=50, overlap_tokens=10)
+        
+        assert all(chunk.tokens <= 50 for chunk in chunks)
+        assert all(chunk.text == text[chunk.start:chunk.end] for chunk in chunks)
+        assert chunks[0].start == 0 and chunks[-1].end == len(text)
+        for previous, chunk in zip(chunks, chunks[1:]):
+            assert previous.start < chunk.start < previous.end
+        assert set(" ".join(chunk.text for chunk in chunks).split()) == set(text.split())
+    
+    def test_words_not_split(self):
+        """Test that chunk boundaries fall between words"""
+        text = "alpha beta gamma delta " * 50
+        
+        for chunk in chunk_text(text, chunk_tokens=7, overlap_tokens=2):
+            assert set(chunk.text.split()) <= {"alpha", "beta", "gamma", "delta"}
+    
+    def test_overlap_must_be_smaller_than_chunk(self):
+        with pytest.raises(ValueError):
+            chunk_text("some text", chunk_tokens=10, overlap_tokens=10)
+    
+    def test_empty_text(self):
+        assert chunk_text("   ") == []
+
+
+class TestBM25Index:
+    """Test cases for BM25Index"""
+    
+    def test_scores_favor_rarer_and_more_frequent_terms(self):
+        """Test the BM25 ordering on a small collection"""
+        documents = [tokenize(text) for text in [
+            "solar panels convert sunlight",
+            "solar solar solar farms and panels",
+            "wind turbines and grid storage",
+        ]]
+        index = BM25Index(documents)
+        
+        scores = index.scores(tokenize("solar farms"))
+        
+        assert scores[1] > scores[0] > scores[2] == 0
+        assert index.idf("farms") > index.idf("solar")
+        assert len(index) == 3
+    
+    def test_unknown_terms_score_zero(self):
+        index = BM25Index([["a", "b"], ["c"]])
+        
+        assert index.scores(["z"]) == [0.0, 0.0]
+
+
+class TestPackContext:
+    """Test cases for pack_context"""
+    
+    def test_short_text_unchanged(self):
+        """Test that text within the budget is passed through"""
+        assert pack_context("a short document", "query", token_budget=100) == "a short document"
+    
+    def test_packed_context_fits_budget_and_keeps_relevant_passage(self):
+        """Test that the relevant passage survives while the rest is dropped to fit the budget"""
+        filler = numbered_words(5000)
+        text = f"{filler} Battery recycling recovers lithium and cobalt. {filler}"
+        
+        packed = pack_context(text, "lithium battery recycling", token_budget=300,
+                              chunk_tokens=60, overlap_tokens=10)
+        
+        assert estimate_tokens(packed) <= 300
+        assert "Battery recycling recovers lithium" in packed
+    
+    def test_packed_chunks_in_document_order(self):
+        """Test that selected chunks keep their original order and gaps are marked"""
+        text = " ".join(["apple"] * 100 + ["filler"] * 2000 + ["banana"] * 100 + ["filler"] * 2000)
+        
+        packed = pack_context(text, "banana apple", token_budget=400, chunk_tokens=100, overlap_tokens=0)
+        
+        assert packed.index("apple") < packed.index("banana")
+        assert text_ranking.CHUNK_SEPARATOR in packed
+    
+    def test_prompt_size_tracks_budget_not_document(self):
+        """Test that packed size stays bounded as the document grows"""
+        sizes = [estimate_tokens(pack_context(numbered_words(words), "w0042", token_budget=500))
+                 for words in (2000, 20000, 100000)]
+        
+        assert all(250 < size <= 500 for size in sizes)
@@ -0,0 +1,216 @@
+"""
+Unit tests for the shared configuration store in tool_config.py
+"""
+import sys
+import os
+import json
+import tempfile
+import time
+from unittest.mock import patch
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.config.tool_config import ToolConfig, ConfigStore
+
+
+@pytest.fixture
+def config_path():
+    """Path of a config file with two sections, in a temporary directory"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "tools_config.json")
+        with open(path, 'w') as f:
+            json.dump({"tool_a": {"limit": 5}, "tool_b": {"enabled": True}}, f)
+        yield path
+        ConfigStore.for_path(path).flush()
+
+
+def read_file(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+class TestConfigStore:
+    """Test cases for ConfigStore and ToolConfig"""
+    
+    def test_file_read_once_per_process(self, config_path):
+        """Test that ToolConfig instances for the same file share one in-memory store"""
+        with patch.object(ConfigStore, '_read_file', autospec=True,
+                          side_effect=ConfigStore._read_file) as mock_read:
+            first = ToolConfig("tool_a", config_path)
+            second = ToolConfig("tool_a", config_path)
+            other = ToolConfig("tool_b", config_path)
+        
+        assert mock_read.call_count == 1
+        assert first.get("limit") == 5
+        assert other.get("enabled") is True
+        first.set("limit", 7)
+        assert second.get("limit") == 7
+        assert second.version == first.version == 1
+    
+    def test_set_same_value_is_noop(self, config_path):
+        """Test that setting an unchanged value neither bumps the version nor schedules a write"""
+        config = ToolConfig("tool_a", config_path)
+        
+        with patch.object(ConfigStore, '_write_atomically') as mock_write:
+            config.set("limit", 5)
+            config.flush()
+        
+        assert config.version == 0
+        assert not mock_write.called
+    
+    def test_writes_coalesced(self, config_path):
+        """Test that many changes are written to the file in a single atomic write"""
+        config = ToolConfig("tool_a", config_path)
+        
+        with patch.object(ConfigStore, '_write_atomically', autospec=True,
+                          side_effect=ConfigStore._write_atomically) as mock_write:
+            for value in range(10):
+                config.set("limit", value)
+            config.set("mode", "fast")
+            assert read_file(config_path)["tool_a"] == {"limit": 5}
+            config.flush()
+        
+        assert mock_write.call_count == 1
+        assert read_file(config_path)["tool_a"] == {"limit": 9, "mode": "fast"}
+    
+    def test_flush_keeps_external_changes(self, config_path):
+        """Test that a flush only overwrites the keys changed in this process"""
+        config = ToolConfig("tool_a", config_path)
+        config.set("limit", 8)
+        
+        with open(config_path, 'w') as f:
+            json.dump({"tool_a": {"limit": 5}, "tool_b": {"enabled": False}}, f)
+        config.flush()
+        
+        assert read_file(config_path) == {"tool_a": {"limit": 8}, "tool_b": {"enabled": False}}
+    
+    def test_delayed_write(self, config_path):
+        """Test that pending changes are written without an explicit flush"""
+        store = ConfigStore.for_path(config_path)
+        store.write_delay = 0.01
+        
+        ToolConfig("tool_b", config_path).set("enabled", False)
+        
+        deadline = time.time() + 2
+        while read_file(config_path)["tool_b"]["enabled"] and time.time() < deadline:
+            time.sleep(0.01)
+        assert read_file(config_path)["tool_b"] == {"enabled": False}
+    
+    def test_missing_file_created_on_flush(self):
+        """Test that a config file is created on the first flush if it does not exist"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "config", "tools_config.json")
+            config = ToolConfig("tool_a", path)
+            assert config.get("limit") is None
+            
+            config.set("limit", 3)
+            config.flush()
+            
+            assert read_file(path) == {"tool_a": {"limit": 3}}
+            assert os.listdir(os.path.dirname(path)) == ["tools_config.json"]
+
+
+class TestConfigChangeNotifications:
+    """Test cases for picking up config file edits and notifying subscribers"""
+    
+    def _edit_file(self, path, content):
+        with open(path, 'w') as f:
+            json.dump(content, f)
+        # Make sure the edit is visible even on filesystems with coarse timestamps
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    
+    def test_external_edit_picked_up(self, config_path):
+        """Test that an edit to the file updates every ToolConfig and notifies subscribers"""
+        config = ToolConfig("tool_a", config_path)
+        other = ToolConfig("tool_b", config_path)
+        received = []
+        config.subscribe(received.append)
+        
+        self._edit_file(config_path, {"tool_a": {"limit": 50}, "tool_b": {"enabled": True}})
+        changes = config.check_for_changes()
+        
+        assert changes == {"limit": 50}
+        assert config.get("limit") == 50
+        assert config.version == 1
+        assert other.version == 0
+        assert received == [{"limit": 50}]
+        assert config.check_for_changes() == {}
+    
+    def test_unwritten_changes_survive_reload(self, config_path):
+        """Test that pending local changes are not lost when the file is reloaded"""
+        config = ToolConfig("tool_a", config_path)
+        config.set("mode", "fast")
+        
+        self._edit_file(config_path, {"tool_a": {"limit": 6}, "tool_b": {"enabled": True}})
+        config.check_for_changes()
+        config.flush()
+        
+        assert config.config == {"limit": 6, "mode": "fast"}
+        assert read_file(config_path)["tool_a"] == {"limit": 6, "mode": "fast"}
+    
+    def test_reads_during_reload(self, config_path):
+        """Test that a reader never sees a section half-way through a reload"""
+        seen = []
+        
+        class ObservedSection(dict):
+            """Section that reads a value after every change, as a concurrent reader could"""
+            def __setitem__(self, key, value):
+                super().__setitem__(key, value)
+                seen.append(self.get("limit"))
+            
+            def pop(self, *args):
+                result = super().pop(*args)
+                seen.append(self.get("limit"))
+                return result
+            
+            def clear(self):
+                super().clear()
+                seen.append(self.get("limit"))
+            
+            def update(self, *args, **kwargs):
+                super().update(*args, **kwargs)
+                seen.append(self.get("limit"))
+        
+        store = ConfigStore.for_path(config_path)
+        store._sections["tool_a"] = ObservedSection(store.section("tool_a"), mode="slow")
+        config = ToolConfig("tool_a", config_path)
+        
+        self._edit_file(config_path, {"tool_a": {"limit": 6, "retries": 2}, "tool_b": {"enabled": True}})
+        config.check_for_changes()
+        
+        assert config.config == {"limit": 6, "retries": 2}
+        assert seen and None not in seen
+    
+    def test_set_notifies_subscribers(self, config_path):
+        """Test that subscribers hear about changes made in this process"""
+        config = ToolConfig("tool_a", config_path)
+        received = []
+        config.subscribe(received.append)
+        
+        config.set("limit", 9)
+        config.set("limit", 9)
+        config.unsubscribe(received.append)
+        config.set("limit", 10)
+        
+        assert received == [{"limit": 9}]
+    
+    def test_bound_method_subscribers_held_weakly(self, config_path):
+        """Test that subscribing does not keep the subscriber alive"""
+        class Subscriber:
+            def __init__(self):
+                self.received = []
+            
+            def on_change(self, changes):
+                self.received.append(changes)
+        
+        config = ToolConfig("tool_a", config_path)
+        subscriber = Subscriber()
+        config.subscribe(subscriber.on_change)
+        config.set("limit", 11)
+        assert subscriber.received == [{"limit": 11}]
+        
+        del subscriber
+        config.set("limit", 12)  # Must not fail on the collected subscriber
+        assert config.get("limit") == 12
+
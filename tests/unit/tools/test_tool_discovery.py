@@ -9,8 +9,11 @@ import importlib.util
 import pytest
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from tools.tool_discovery import discover_tools_in_directory, discover_all_tools, load_tool_instances
-from tools.tool_framework import Tool
+from tools.tool_discovery import (discover_tools_in_directory, discover_all_tools, load_tool_instances,
+                                  DiscoveryManifest, MANIFEST_FILE_NAME, load_tool_proxies,
+                                  ImportTimings, IMPORT_TIMINGS, ToolWatcher)
+from tools.tool_framework import Tool, ToolRegistry
+from tools import tool_discovery
 
 
 # Create a simple test tool class for testing
@@ -30,6 +33,26 @@ class TestTool(Tool):
         return {"result": "test"}
 
 
+MANIFEST_TOOL_SOURCE = """
+from tools.tool_framework import Tool
+
+class ManifestTool(Tool):
+    def __init__(self):
+        super().__init__(
+            tool_id="manifest-tool",
+            name="Manifest Tool",
+            description="A tool recorded in the manifest",
+            category="testing"
+        )
+    
+    def get_params_definition(self):
+        return {}
+    
+    def execute(self, **params):
+        return {"result": "manifest"}
+"""
+
+
 class TestToolDiscovery:
     """Test cases for tool discovery functions"""
     
@@ -209,4 +232,346 @@ class SubdirTool(Tool):
                 # Should return an empty list due to instantiation error
                 assert len(tools) == 0
                 # Print should have been called for the instantiation error
-                assert mock_print.called
\ No newline at end of file
+                assert mock_print.called
+
+class TestDiscoveryManifest:
+    """Test cases for the discovery manifest"""
+    
+    def _make_tree(self, base_dir):
+        sub_dir = os.path.join(base_dir, "manifest_subdir")
+        os.makedirs(sub_dir)
+        with open(os.path.join(sub_dir, "manifest_tool.py"), 'w') as f:
+            f.write(MANIFEST_TOOL_SOURCE)
+        with open(os.path.join(sub_dir, "helpers.py"), 'w') as f:
+            f.write("VALUE = 1\n")
+        return sub_dir
+    
+    def test_manifest_written_on_first_scan(self):
+        """Test that discovery records every scanned file in the manifest"""
+        with tempfile.TemporaryDirectory() as base_dir:
+            sub_dir = self._make_tree(base_dir)
+            all_tools = discover_all_tools(base_dir)
+            
+            assert [cls.__name__ for cls in all_tools["manifest_subdir"]] == ["ManifestTool"]
+            manifest = DiscoveryManifest(os.path.join(base_dir, MANIFEST_FILE_NAME))
+            tool_entry = manifest.lookup(os.path.join(sub_dir, "manifest_tool.py"))
+            helper_entry = manifest.lookup(os.path.join(sub_dir, "helpers.py"))
+            assert [(tool["class_name"], tool["tool_id"]) for tool in tool_entry["tools"]] == \
+                [("ManifestTool", "manifest-tool")]
+            assert tool_entry["tools"][0]["category"] == "testing"
+            assert helper_entry["tools"] == []
+    
+    def test_unchanged_file_without_tools_is_skipped(self):
+        """Test that files recorded without tools are not imported again"""
+        with tempfile.TemporaryDirectory() as base_dir:
+            sub_dir = self._make_tree(base_dir)
+            discover_all_tools(base_dir)
+            manifest = DiscoveryManifest(os.path.join(base_dir, MANIFEST_FILE_NAME))
+            
+            with patch('tools.tool_discovery._import_tool_module',
+                       wraps=tool_discovery._import_tool_module) as mock_import:
+                tool_classes = discover_tools_in_directory(sub_dir, manifest)
+            
+            assert all(not call.args[0].endswith("helpers.py") for call in mock_import.call_args_list)
+            assert len(tool_classes) == 1
+    
+    def test_changed_file_is_rescanned(self):
+        """Test that a modified file is scanned again and its manifest entry refreshed"""
+        with tempfile.TemporaryDirectory() as base_dir:
+            sub_dir = self._make_tree(base_dir)
+            discover_all_tools(base_dir)
+            
+            helper_path = os.path.join(sub_dir, "helpers.py")
+            with open(helper_path, 'w') as f:
+                f.write("VALUE = 22\n")
+            manifest = DiscoveryManifest(os.path.join(base_dir, MANIFEST_FILE_NAME))
+            assert manifest.lookup(helper_path) is None
+            
+            discover_all_tools(base_dir)
+            manifest = DiscoveryManifest(os.path.join(base_dir, MANIFEST_FILE_NAME))
+            assert manifest.lookup(helper_path) is not None
+    
+    def test_deleted_file_is_pruned(self):
+        """Test that entries for deleted files are dropped from the manifest"""
+        with tempfile.TemporaryDirectory() as base_dir:
+            sub_dir = self._make_tree(base_dir)
+            discover_all_tools(base_dir)
+            os.remove(os.path.join(sub_dir, "helpers.py"))
+            
+            discover_all_tools(base_dir)
+            manifest = DiscoveryManifest(os.path.join(base_dir, MANIFEST_FILE_NAME))
+            assert len(manifest.files) == 1
+    
+    def test_discover_without_manifest(self):
+        """Test that discovery can run without reading or writing a manifest"""
+        with tempfile.TemporaryDirectory() as base_dir:
+            self._make_tree(base_dir)
+            all_tools = discover_all_tools(base_dir, use_manifest=False)
+            
+            assert len(all_tools["manifest_subdir"]) == 1
+            assert not os.path.exists(os.path.join(base_dir, MANIFEST_FILE_NAME))
+    
+    @patch('builtins.print')
+    def test_unreadable_manifest_is_ignored(self, mock_print):
+        """Test that a corrupt manifest is ignored and rebuilt"""
+        with tempfile.TemporaryDirectory() as base_dir:
+            self._make_tree(base_dir)
+            with open(os.path.join(base_dir, MANIFEST_FILE_NAME), 'w') as f:
+                f.write("not json")
+            
+            all_tools = discover_all_tools(base_dir)
+            
+            assert len(all_tools["manifest_subdir"]) == 1
+            assert len(DiscoveryManifest(os.path.join(base_dir, MANIFEST_FILE_NAME)).files) == 2
+
+
+class TestLoadToolProxies:
+    """Test cases for lazy tool proxies built from the manifest"""
+    
+    def _make_tree(self, base_dir):
+        sub_dir = os.path.join(base_dir, "proxy_subdir")
+        os.makedirs(sub_dir)
+        with open(os.path.join(sub_dir, "proxy_tool.py"), 'w') as f:
+            f.write(MANIFEST_TOOL_SOURCE)
+        return sub_dir
+    
+    def test_proxies_from_warm_manifest_do_not_import(self):
+        """Test that an unchanged tool module is not imported until the proxy is used"""
+        with tempfile.TemporaryDirectory() as base_dir:
+            self._make_tree(base_dir)
+            load_tool_proxies(base_dir)
+            
+            with patch('tools.tool_discovery._import_tool_module',
+                       wraps=tool_discovery._import_tool_module) as mock_import:
+                proxies = load_tool_proxies(base_dir)
+                assert not mock_import.called
+                
+                assert len(proxies) == 1
+                assert proxies[0].tool_id == "manifest-tool"
+                assert proxies[0].get_definition().name == "Manifest Tool"
+                assert not mock_import.called
+                
+                assert proxies[0].execute() == {"result": "manifest"}
+                assert mock_import.call_count == 1
+    
+    def test_config_change_drops_tool_metadata(self):
+        """Test that recorded tool metadata is discarded when the tool configuration file changes"""
+        with tempfile.TemporaryDirectory() as base_dir:
+            sub_dir = self._make_tree(base_dir)
+            helper_path = os.path.join(sub_dir, "helpers.py")
+            with open(helper_path, 'w') as f:
+                f.write("VALUE = 1\n")
+            config_path = os.path.join(base_dir, "tools_config.json")
+            with open(config_path, 'w') as f:
+                f.write("{}")
+            manifest_path = os.path.join(base_dir, MANIFEST_FILE_NAME)
+            
+            manifest = DiscoveryManifest(manifest_path, config_path)
+            manifest.record(os.path.join(sub_dir, "proxy_tool.py"), "proxy_tool",
+                            [{"class_name": "ManifestTool", "tool_id": "manifest-tool"}])
+            manifest.record(helper_path, "helpers", [])
+            manifest.save()
+            assert len(DiscoveryManifest(manifest_path, config_path).files) == 2
+            
+            with open(config_path, 'w') as f:
+                f.write('{"proxy_tool": {}}')
+            
+            assert list(DiscoveryManifest(manifest_path, config_path).files) == [os.path.abspath(helper_path)]
+
+
+class TestParallelDiscovery:
+    """Test cases for concurrent imports and import timings"""
+    
+    def _make_tree(self, base_dir, num_dirs):
+        for index in range(num_dirs):
+            sub_dir = os.path.join(base_dir, f"parallel_dir_{index}")
+            os.makedirs(sub_dir)
+            with open(os.path.join(sub_dir, f"parallel_tool_{index}.py"), 'w') as f:
+                f.write(MANIFEST_TOOL_SOURCE.replace("ManifestTool", f"ParallelTool{index}"))
+    
+    def test_parallel_matches_serial(self):
+        """Test that concurrent discovery finds the same tools in the same order as serial discovery"""
+        with tempfile.TemporaryDirectory() as base_dir:
+            self._make_tree(base_dir, 6)
+            
+            serial = discover_all_tools(base_dir, use_manifest=False, max_workers=1)
+            parallel = discover_all_tools(base_dir, use_manifest=False, max_workers=4)
+            
+            assert list(parallel) == list(serial) == [f"parallel_dir_{index}" for index in range(6)]
+            assert parallel == serial
+            assert not any(base_dir in entry for entry in sys.path)
+    
+    @patch('builtins.print')
+    def test_parallel_import_failure_reported(self, mock_print):
+        """Test that import failures in worker threads are printed and recorded"""
+        with tempfile.TemporaryDirectory() as base_dir:
+            self._make_tree(base_dir, 3)
+            with open(os.path.join(base_dir, "parallel_dir_1", "broken_tool.py"), 'w') as f:
+                f.write("if True\n    pass\n")
+            
+            IMPORT_TIMINGS.clear()
+            all_tools = discover_all_tools(base_dir, use_manifest=False, max_workers=3)
+            
+            assert [len(all_tools[f"parallel_dir_{index}"]) for index in range(3)] == [1, 1, 1]
+            assert any(call.args[0].startswith("Could not import module broken_tool:")
+                       for call in mock_print.call_args_list)
+            assert "broken_tool" in IMPORT_TIMINGS.format_report().splitlines()[-1]
+    
+    def test_import_times_recorded(self):
+        """Test that discovery records an import time for each imported module"""
+        with tempfile.TemporaryDirectory() as base_dir:
+            self._make_tree(base_dir, 2)
+            IMPORT_TIMINGS.clear()
+            
+            discover_all_tools(base_dir, use_manifest=False)
+            
+            assert len(IMPORT_TIMINGS.timings) == 2
+            assert all(name.endswith(("parallel_tool_0", "parallel_tool_1")) for name in IMPORT_TIMINGS.timings)
+
+
+class TestImportTimings:
+    """Test cases for the import timing report"""
+    
+    def test_slowest_and_report(self):
+        """Test that the report lists the slowest imports first and names failures"""
+        timings = ImportTimings()
+        timings.record("fast_module", 0.001)
+        timings.record("slow_module", 0.250)
+        timings.record("medium_module", 0.020)
+        timings.record("broken_module", 0.005, failed=True)
+        
+        assert timings.slowest(2) == [("slow_module", 0.250), ("medium_module", 0.020)]
+        report = timings.format_report(limit=2)
+        assert report.splitlines()[0] == "Tool imports: 4 modules, 276.0 ms total import time"
+        assert "slow_module" in report.splitlines()[1]
+        assert "fast_module" not in report
+        assert report.splitlines()[-1] == "  failed: broken_module"
+
+
+class TestToolWatcher:
+    """Test cases for hot reloading tools"""
+    
+    def _write(self, file_path, source):
+        with open(file_path, 'w') as f:
+            f.write(source)
+        # Make sure the change is visible even on filesystems with coarse timestamps
+        stat = os.stat(file_path)
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    
+    def _setup(self, base_dir):
+        sub_dir = os.path.join(base_dir, "watched_subdir")
+        os.makedirs(sub_dir)
+        tool_path = os.path.join(sub_dir, "watched_tool.py")
+        self._write(tool_path, MANIFEST_TOOL_SOURCE)
+        registry = ToolRegistry()
+        for tool in load_tool_proxies(base_dir):
+            registry.register_tool(tool)
+        return sub_dir, tool_path, registry
+    
+    @patch('builtins.print')
+    def test_changed_module_swapped_in(self, mock_print):
+        """Test that a changed module is re-imported while the old tool object keeps working"""
+        with tempfile.TemporaryDirectory() as base_dir:
+            sub_dir, tool_path, registry = self._setup(base_dir)
+            watcher = ToolWatcher(registry, base_dir)
+            old_tool = registry.get_tool("manifest-tool")
+            assert old_tool.execute() == {"result": "manifest"}
+            
+            self._write(tool_path, MANIFEST_TOOL_SOURCE.replace('"manifest"}', '"reloaded"}'))
+            changed = watcher.check()
+            
+            assert changed == ["manifest-tool"]
+            assert registry.get_tool("manifest-tool") is not old_tool
+            assert registry.execute_tool("manifest-tool") == {"result": "reloaded"}
+            # A call that already looked up the old tool finishes on the old version
+            assert old_tool.execute() == {"result": "manifest"}
+    
+    @patch('builtins.print')
+    def test_new_and_deleted_modules(self, mock_print):
+        """Test that new modules register their tools and deleted modules unregister them"""
+        with tempfile.TemporaryDirectory() as base_dir:
+            sub_dir, tool_path, registry = self._setup(base_dir)
+            watcher = ToolWatcher(registry, base_dir)
+            
+            new_path = os.path.join(sub_dir, "new_tool.py")
+            self._write(new_path, MANIFEST_TOOL_SOURCE.replace("manifest-tool", "new-tool"))
+            assert watcher.check() == ["new-tool"]
+            assert registry.get_tool("new-tool") is not None
+            
+            os.remove(new_path)
+            assert watcher.check() == ["new-tool"]
+            assert registry.get_tool("new-tool") is None
+            assert registry.get_tool("manifest-tool") is not None
+    
+    @patch('builtins.print')
+    def test_broken_module_keeps_old_version(self, mock_print):
+        """Test that a module that fails to import leaves the previous tool registered"""
+        with tempfile.TemporaryDirectory() as base_dir:
+            sub_dir, tool_path, registry = self._setup(base_dir)
+            watcher = ToolWatcher(registry, base_dir)
+            old_tool = registry.get_tool("manifest-tool")
+            
+            self._write(tool_path, "if True\n    pass\n")
+            
+            assert watcher.check() == []
+            assert registry.get_tool("manifest-tool") is old_tool
+            assert any(call.args[0].startswith("Could not reload module") for call in mock_print.call_args_list)
+    
+    def test_touched_module_not_reloaded(self):
+        """Test that a module whose timestamp changed without content changes is left alone"""
+        with tempfile.TemporaryDirectory() as base_dir:
+            sub_dir, tool_path, registry = self._setup(base_dir)
+            watcher = ToolWatcher(registry, base_dir)
+            old_tool = registry.get_tool("manifest-tool")
+            
+            self._write(tool_path, MANIFEST_TOOL_SOURCE)
+            
+            assert watcher.check() == []
+            assert registry.get_tool("manifest-tool") is old_tool
+
+    
+    @patch('builtins.print')
+    def test_replaced_tool_closed_after_running_calls(self, mock_print):
+        """Test that a swapped-out tool is closed once the calls running on it finish"""
+        with tempfile.TemporaryDirectory() as base_dir:
+            sub_dir, tool_path, registry = self._setup(base_dir)
+            watcher = ToolWatcher(registry, base_dir)
+            old_tool = registry.get_tool("manifest-tool")
+            old_tool.close = Mock()
+            
+            with old_tool.in_use():
+                self._write(tool_path, MANIFEST_TOOL_SOURCE.replace('"manifest"}', '"reloaded"}'))
+                assert watcher.check() == ["manifest-tool"]
+                old_tool.close.assert_not_called()
+            old_tool.close.assert_called_once()
+            
+            new_tool = registry.get_tool("manifest-tool")
+            new_tool.close = Mock()
+            os.remove(tool_path)
+            assert watcher.check() == ["manifest-tool"]
+            new_tool.close.assert_called_once()
+    
+    @patch('builtins.print')
+    def test_changed_helper_reloads_tool_modules(self, mock_print):
+        """Test that editing a helper module swaps in tools built from the new helper code"""
+        with tempfile.TemporaryDirectory() as base_dir:
+            sub_dir = os.path.join(base_dir, "watched_subdir")
+            os.makedirs(sub_dir)
+            helper_path = os.path.join(sub_dir, "watched_helper.py")
+            self._write(helper_path, 'VALUE = "manifest"\n')
+            self._write(os.path.join(sub_dir, "watched_tool.py"), MANIFEST_TOOL_SOURCE.replace(
+                "from tools.tool_framework import Tool", "from tools.tool_framework import Tool\nimport watched_helper"
+            ).replace('"manifest"}', 'watched_helper.VALUE}'))
+            registry = ToolRegistry()
+            try:
+                for tool in load_tool_proxies(base_dir):
+                    registry.register_tool(tool)
+                watcher = ToolWatcher(registry, base_dir)
+                assert registry.execute_tool("manifest-tool") == {"result": "manifest"}
+                
+                self._write(helper_path, 'VALUE = "reloaded"\n')
+                
+                assert watcher.check() == ["manifest-tool"]
+                assert registry.execute_tool("manifest-tool") == {"result": "reloaded"}
+            finally:
+                sys.modules.pop("watched_helper", None)
@@ -1,6 +1,9 @@
 """
 Test suite for the tool execution service
 """
+import asyncio
+import threading
+import time
 import pytest
 from unittest.mock import MagicMock, patch
 from tools.tool_execution_service import ToolExecutionService
@@ -21,6 +24,61 @@ class MockTool(Tool):
         return {"result": "success", "params": kwargs}
 
 
+class MockAsyncTool(Tool):
+    """Mock tool with a native async implementation"""
+    
+    def __init__(self, tool_id: str, name: str, delay: float = 0.0):
+        super().__init__(tool_id, name, f"Mock async tool for testing: {name}", "test")
+        self.delay = delay
+        self.sync_calls = 0
+    
+    def execute(self, **kwargs) -> Dict[str, Any]:
+        self.sync_calls += 1
+        return {"result": "sync", "params": kwargs}
+    
+    async def aexecute(self, **kwargs) -> Dict[str, Any]:
+        await asyncio.sleep(self.delay)
+        return {"result": "async", "params": kwargs, "thread": threading.current_thread().name}
+
+
+class FlakyTool(Tool):
+    """Idempotent mock tool whose first call hangs"""
+    
+    idempotent = True
+    
+    def __init__(self, tool_id: str, slow_delay: float):
+        super().__init__(tool_id, "Flaky Tool", "Mock tool with a slow first call", "test")
+        self.slow_delay = slow_delay
+        self.calls = 0
+        self.lock = threading.Lock()
+    
+    def execute(self, **kwargs) -> Dict[str, Any]:
+        with self.lock:
+            self.calls += 1
+            call_number = self.calls
+        if call_number == 1:
+            time.sleep(self.slow_delay)
+            return {"result": "slow"}
+        return {"result": "fast"}
+
+
+class MockBatchTool(Tool):
+    """Mock tool with a native batch implementation"""
+    
+    def __init__(self, tool_id: str, name: str):
+        super().__init__(tool_id, name, f"Mock batch tool for testing: {name}", "test")
+        self.batch_sizes = []
+        self.single_calls = 0
+    
+    def execute(self, **kwargs) -> Dict[str, Any]:
+        self.single_calls += 1
+        return {"result": "single", "params": kwargs}
+    
+    def execute_batch(self, params_list):
+        self.batch_sizes.append(len(params_list))
+        return [{"result": "batch", "params": params} for params in params_list]
+
+
 class TestToolExecutionService:
     def test_init(self, tool_execution_service, tool_registry):
         """Test initialization of tool execution service"""
@@ -39,7 +97,8 @@ class TestToolExecutionService:
         assert len(tool_execution_service.execution_history) == 1
         history_record = tool_execution_service.execution_history[0]
         assert history_record["tool_id"] == "test-tool"
-        assert history_record["result"] == {"result": "success", "params": {"param1": "value1"}}
+        assert history_record["params"] == {"param1": "value1"}
+        assert history_record["result"] == "{'params': {'param1': 'value1'}, 'result': 'success'}"
     
     def test_execute_tool_not_found(self, tool_execution_service):
         """Test execution of non-existent tool"""
@@ -73,6 +132,320 @@ class TestToolExecutionService:
         assert len(history) == 1
         assert history[0]["tool_id"] == "test-tool"
     
+    def test_execution_history_is_bounded(self, tool_registry):
+        """Test that only the most recent executions are kept in history"""
+        service = ToolExecutionService(tool_registry, history_size=3)
+        service.add_tool(MockTool("test-tool", "Test Tool"))
+        
+        for i in range(10):
+            service.execute_tool("test-tool", index=i)
+        
+        history = service.get_execution_history()
+        assert len(history) == 3
+        assert [record["params"]["index"] for record in history] == [7, 8, 9]
+        assert service.get_execution_history(limit=1)[0]["params"]["index"] == 9
+    
+    def test_execution_history_keeps_summaries(self, tool_execution_service):
+        """Test that history records do not hold on to large parameters and results"""
+        tool_execution_service.add_tool(MockTool("test-tool", "Test Tool"))
+        document = "word " * 100000
+        
+        tool_execution_service.execute_tool("test-tool", text=document, values=list(range(100000)), limit=5)
+        
+        record = tool_execution_service.get_execution_history()[0]
+        assert record["params"]["limit"] == 5
+        assert len(record["params"]["text"]) <= 80
+        assert len(record["params"]["values"]) <= 80
+        assert len(record["result"]) <= 200
+    
+    def test_get_execution_stats(self, tool_execution_service):
+        """Test aggregated per-tool execution statistics"""
+        tool_execution_service.add_tool(MockTool("test-tool", "Test Tool"))
+        tool_execution_service.add_tool(MockTool("failing-tool", "Failing Tool", should_fail=True))
+        
+        for _ in range(4):
+            tool_execution_service.execute_tool("test-tool")
+        tool_execution_service.execute_tool("failing-tool")
+        
+        stats = tool_execution_service.get_execution_stats("test-tool")
+        assert stats["count"] == 4
+        assert stats["error_count"] == 0
+        assert stats["latency"]["p50"] is not None
+        assert stats["latency"]["p50"] <= stats["latency"]["p95"] <= stats["latency"]["p99"]
+        
+        all_stats = tool_execution_service.get_execution_stats()
+        assert set(all_stats.keys()) == {"test-tool", "failing-tool"}
+        assert all_stats["failing-tool"]["error_count"] == 1
+        assert all_stats["failing-tool"]["error_rate"] == 1.0
+    
+    def test_get_execution_stats_unknown_tool(self, tool_execution_service):
+        """Test statistics for a tool that has never been executed"""
+        stats = tool_execution_service.get_execution_stats("never-run")
+        
+        assert stats["count"] == 0
+        assert stats["latency"]["p95"] is None
+    
+    def test_is_async(self):
+        """Test detection of native async tools"""
+        assert MockAsyncTool("async-tool", "Async Tool").is_async
+        assert not MockTool("test-tool", "Test Tool").is_async
+    
+    def test_aexecute_tool_async_and_sync(self, tool_execution_service):
+        """Test async execution of native-async and sync tools"""
+        tool_execution_service.add_tool(MockAsyncTool("async-tool", "Async Tool"))
+        tool_execution_service.add_tool(MockTool("test-tool", "Test Tool"))
+        
+        async_result = asyncio.run(tool_execution_service.aexecute_tool("async-tool", param1="value1"))
+        sync_result = asyncio.run(tool_execution_service.aexecute_tool("test-tool", param1="value1"))
+        
+        assert async_result["result"] == "async"
+        assert async_result["params"] == {"param1": "value1"}
+        assert sync_result == {"result": "success", "params": {"param1": "value1"}}
+        assert tool_execution_service.get_execution_stats("async-tool")["count"] == 1
+        assert tool_execution_service.get_execution_stats("test-tool")["count"] == 1
+    
+    def test_aexecute_tool_not_found(self, tool_execution_service):
+        """Test async execution of a non-existent tool"""
+        result = asyncio.run(tool_execution_service.aexecute_tool("non-existent-tool"))
+        
+        assert result is None
+    
+    def test_aexecute_tools_parallel(self, tool_execution_service):
+        """Test concurrent async fan-out keeps request order and overlaps waits"""
+        tool_execution_service.add_tool(MockAsyncTool("async-tool", "Async Tool", delay=0.05))
+        tool_execution_service.add_tool(MockTool("test-tool", "Test Tool"))
+        requests = [{"tool_id": "async-tool", "params": {"n": i}} for i in range(200)]
+        requests.append({"tool_id": "test-tool", "params": {"n": 200}})
+        
+        start = time.time()
+        results = asyncio.run(tool_execution_service.aexecute_tools_parallel(requests))
+        
+        assert time.time() - start < 2.0  # 200 x 50ms would take 10s serially
+        assert [r["result"]["params"]["n"] for r in results] == list(range(201))
+    
+    def test_execute_tools_parallel_uses_event_loop_for_async_tools(self, tool_execution_service):
+        """Test that sync callers dispatch native-async tools to the service event loop"""
+        async_tool = MockAsyncTool("async-tool", "Async Tool")
+        tool_execution_service.add_tool(async_tool)
+        tool_execution_service.add_tool(MockTool("test-tool", "Test Tool"))
+        requests = [
+            {"tool_id": "async-tool", "params": {"n": 1}},
+            {"tool_id": "test-tool", "params": {"n": 2}},
+            {"tool_id": "async-tool", "params": {"n": 1}}
+        ]
+        
+        results = tool_execution_service.execute_tools_parallel(requests)
+        tool_execution_service.shutdown()
+        
+        assert [r["request"] for r in results] == requests
+        assert results[0]["result"]["thread"] == "tool-execution-loop"
+        assert results[1]["result"] == {"result": "success", "params": {"n": 2}}
+        assert async_tool.sync_calls == 0
+    
+    def test_circuit_breaker_fails_fast(self, tool_execution_service):
+        """Test that an unhealthy tool is short-circuited after repeated failures"""
+        failing_tool = MockTool("failing-tool", "Failing Tool", should_fail=True)
+        failing_tool.execute = MagicMock(side_effect=Exception("Tool execution failed"))
+        tool_execution_service.add_tool(failing_tool)
+        threshold = tool_execution_service.get_circuit_breaker("failing-tool").failure_threshold
+        
+        for _ in range(threshold):
+            assert tool_execution_service.execute_tool("failing-tool")["error"] == "Tool execution failed"
+        result = tool_execution_service.execute_tool("failing-tool")
+        
+        assert result["circuit_state"] == "open"
+        assert failing_tool.execute.call_count == threshold
+        stats = tool_execution_service.get_execution_stats("failing-tool")
+        assert stats["error_count"] == threshold
+        assert stats["rejected_count"] == 1
+        assert tool_execution_service.get_circuit_breaker_states()["failing-tool"]["state"] == "open"
+    
+    @patch('builtins.print')
+    def test_circuit_breaker_counts_error_results(self, mock_print, tool_execution_service):
+        """Test that a tool returning an error opens the circuit, for single and async calls alike"""
+        error_tool = MockTool("error-tool", "Error Tool")
+        error_tool.execute = MagicMock(return_value={"error": "backend unavailable"})
+        tool_execution_service.add_tool(error_tool)
+        threshold = tool_execution_service.get_circuit_breaker("error-tool").failure_threshold
+        
+        for _ in range(threshold - 1):
+            tool_execution_service.execute_tool("error-tool")
+        asyncio.run(tool_execution_service.aexecute_tool("error-tool"))
+        
+        assert tool_execution_service.execute_tool("error-tool")["circuit_state"] == "open"
+        assert error_tool.execute.call_count == threshold
+    
+    def test_cancelled_half_open_trial_frees_its_slot(self, tool_execution_service):
+        """Test that cancelling a half-open trial call lets the next call try again"""
+        tool_execution_service.add_tool(MockAsyncTool("async-tool", "Async Tool", delay=5))
+        breaker = tool_execution_service.get_circuit_breaker("async-tool")
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        breaker.recovery_timeout = 0
+        
+        async def cancel_trial():
+            trial = asyncio.ensure_future(tool_execution_service.aexecute_tool("async-tool"))
+            await asyncio.sleep(0.01)
+            trial.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await trial
+        asyncio.run(cancel_trial())
+        
+        assert breaker.state == "half_open"
+        assert breaker.allow_request()
+    
+    def test_circuit_breaker_async_fails_fast(self, tool_execution_service):
+        """Test that async execution respects an open circuit"""
+        tool_execution_service.add_tool(MockAsyncTool("async-tool", "Async Tool"))
+        breaker = tool_execution_service.get_circuit_breaker("async-tool")
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        
+        result = asyncio.run(tool_execution_service.aexecute_tool("async-tool"))
+        
+        assert result["circuit_state"] == "open"
+    
+    def test_reloaded_tool_gets_fresh_circuit_breaker(self, tool_execution_service):
+        """Test that swapping in a new version of a tool closes its circuit"""
+        tool_execution_service.add_tool(MockTool("reload-tool", "Reload Tool"))
+        breaker = tool_execution_service.get_circuit_breaker("reload-tool")
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        
+        tool_execution_service.registry.replace_tool(MockTool("reload-tool", "Reload Tool"))
+        tool_execution_service._on_tools_changed(["reload-tool"])
+        
+        assert tool_execution_service.execute_tool("reload-tool")["result"] == "success"
+    
+    @patch('builtins.print')
+    def test_config_change_retunes_service(self, mock_print, tool_execution_service):
+        """Test that pool size and breaker settings follow configuration changes"""
+        tool_execution_service.add_tool(MockTool("mock-tool", "Mock Tool"))
+        breaker = tool_execution_service.get_circuit_breaker("mock-tool")
+        old_executor = tool_execution_service.executor
+        
+        changes = {"max_workers": 9, "circuit_failure_threshold": 2}
+        with patch.dict(tool_execution_service.config.config, changes):
+            tool_execution_service._on_config_changed(changes)
+            
+            assert tool_execution_service.max_workers == 9
+            assert tool_execution_service.executor is not old_executor
+            assert breaker.failure_threshold == 2
+            results = tool_execution_service.execute_tools_parallel(
+                [{"tool_id": "mock-tool", "params": {"n": n}} for n in range(3)])
+            assert [r["result"]["params"]["n"] for r in results] == [0, 1, 2]
+    
+    def test_hedged_execution(self, tool_execution_service):
+        """Test that a slow call to an idempotent tool is hedged by a backup call"""
+        flaky_tool = FlakyTool("flaky-tool", slow_delay=1.0)
+        tool_execution_service.add_tool(flaky_tool)
+        # Seed a fast latency history so p95 is small
+        with tool_execution_service.lock:
+            stats = tool_execution_service._get_tool_stats("flaky-tool")
+            for _ in range(20):
+                stats.record(0.01, True, time.time())
+        
+        with patch.dict(tool_execution_service.config.config, {"enable_hedging": True}):
+            start = time.time()
+            result = tool_execution_service.execute_tool("flaky-tool")
+            elapsed = time.time() - start
+        
+        assert result == {"result": "fast"}
+        assert elapsed < 0.5
+        assert flaky_tool.calls == 2
+        assert tool_execution_service.get_execution_stats("flaky-tool")["hedged_count"] == 1
+    
+    def test_no_hedging_without_latency_history(self, tool_execution_service):
+        """Test that calls are not hedged before enough samples are collected"""
+        flaky_tool = FlakyTool("flaky-tool", slow_delay=0.05)
+        tool_execution_service.add_tool(flaky_tool)
+        
+        with patch.dict(tool_execution_service.config.config, {"enable_hedging": True}):
+            result = tool_execution_service.execute_tool("flaky-tool")
+        
+        assert result == {"result": "slow"}
+        assert flaky_tool.calls == 1
+    
+    def test_no_hedging_for_streamed_params(self, tool_execution_service):
+        """Test that calls reading from an iterator are never duplicated by a hedge"""
+        flaky_tool = FlakyTool("flaky-tool", slow_delay=0.2)
+        tool_execution_service.add_tool(flaky_tool)
+        with tool_execution_service.lock:
+            stats = tool_execution_service._get_tool_stats("flaky-tool")
+            for _ in range(20):
+                stats.record(0.01, True, time.time())
+        
+        with patch.dict(tool_execution_service.config.config, {"enable_hedging": True}):
+            result = tool_execution_service.execute_tool("flaky-tool", chunks=iter([1, 2]))
+        
+        assert result == {"result": "slow"}
+        assert flaky_tool.calls == 1
+    
+    def test_execute_tool_batch(self, tool_execution_service):
+        """Test executing several parameter sets with one batch call"""
+        batch_tool = MockBatchTool("batch-tool", "Batch Tool")
+        tool_execution_service.add_tool(batch_tool)
+        
+        results = tool_execution_service.execute_tool_batch("batch-tool", [{"n": i} for i in range(5)])
+        
+        assert [r["params"]["n"] for r in results] == list(range(5))
+        assert batch_tool.batch_sizes == [5]
+        assert tool_execution_service.get_execution_stats("batch-tool")["count"] == 5
+        assert len(tool_execution_service.get_execution_history()) == 5
+    
+    def test_execute_tools_parallel_batches_same_tool(self, tool_execution_service):
+        """Test that queued requests for a batch-capable tool are combined"""
+        batch_tool = MockBatchTool("batch-tool", "Batch Tool")
+        tool_execution_service.add_tool(batch_tool)
+        tool_execution_service.add_tool(MockTool("test-tool", "Test Tool"))
+        requests = [
+            {"tool_id": "batch-tool", "params": {"n": 0}},
+            {"tool_id": "test-tool", "params": {"n": 1}},
+            {"tool_id": "batch-tool", "params": {"n": 2}},
+            {"tool_id": "batch-tool", "params": {"n": 3}}
+        ]
+        
+        results = tool_execution_service.execute_tools_parallel(requests)
+        
+        assert [r["request"] for r in results] == requests
+        assert results[0]["result"] == {"result": "batch", "params": {"n": 0}}
+        assert results[1]["result"] == {"result": "success", "params": {"n": 1}}
+        assert results[3]["result"]["params"] == {"n": 3}
+        assert batch_tool.batch_sizes == [3]
+        assert batch_tool.single_calls == 0
+    
+    def test_single_request_not_batched(self, tool_execution_service):
+        """Test that a lone request for a batch-capable tool runs normally"""
+        batch_tool = MockBatchTool("batch-tool", "Batch Tool")
+        tool_execution_service.add_tool(batch_tool)
+        
+        results = tool_execution_service.execute_tools_parallel([{"tool_id": "batch-tool", "params": {}}])
+        
+        assert results[0]["result"]["result"] == "single"
+        assert batch_tool.batch_sizes == []
+    
+    def test_aexecute_tools_parallel_batches_same_tool(self, tool_execution_service):
+        """Test request batching on the async fan-out path"""
+        batch_tool = MockBatchTool("batch-tool", "Batch Tool")
+        tool_execution_service.add_tool(batch_tool)
+        requests = [{"tool_id": "batch-tool", "params": {"n": i}} for i in range(4)]
+        
+        results = asyncio.run(tool_execution_service.aexecute_tools_parallel(requests))
+        
+        assert [r["result"]["params"]["n"] for r in results] == list(range(4))
+        assert batch_tool.batch_sizes == [4]
+    
+    def test_batch_failure_counts_against_circuit(self, tool_execution_service):
+        """Test that a failing batch is reported per request and trips the breaker"""
+        batch_tool = MockBatchTool("batch-tool", "Batch Tool")
+        batch_tool.execute_batch = MagicMock(side_effect=Exception("Batch failed"))
+        tool_execution_service.add_tool(batch_tool)
+        
+        results = tool_execution_service.execute_tool_batch("batch-tool", [{}, {}])
+        
+        assert results == [{"error": "Batch failed"}, {"error": "Batch failed"}]
+        assert tool_execution_service.get_circuit_breaker("batch-tool").to_dict()["consecutive_failures"] == 1
+    
     def test_get_tool_definition(self, tool_execution_service):
         """Test getting tool definition"""
         # Register a mock tool
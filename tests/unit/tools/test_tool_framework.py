@@ -0,0 +1,311 @@
+"""
+Unit tests for parameter validation, definition caching, lazy proxies and registry indexes in tool_framework.py
+"""
+import sys
+import os
+import tempfile
+import threading
+from unittest.mock import patch
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.tool_framework import Tool, ToolRegistry, ParameterValidator, ToolProxy, tokenize_keywords
+from tools.config.tool_config import ToolConfig
+
+
+PARAMS_DEFINITION = {
+    "query": {"type": "string", "required": True},
+    "limit": {"type": "integer", "required": False, "default": 5},
+    "mode": {"type": "string", "required": False, "enum": ["fast", "slow"]},
+    "values": {"type": "array", "required": False, "max_items": 3}
+}
+
+
+class ConfiguredTool(Tool):
+    """Tool whose parameter definitions depend on its config"""
+    
+    def __init__(self, config_path: str):
+        super().__init__("configured-tool", "Configured Tool", "Tool backed by ToolConfig", "test")
+        self.config = ToolConfig("configured_tool", config_path)
+        self.definition_builds = 0
+    
+    def get_params_definition(self):
+        self.definition_builds += 1
+        return {
+            "mode": {
+                "type": "string",
+                "required": True,
+                "enum": self.config.get("modes", ["a"])
+            }
+        }
+    
+    def execute(self, **params):
+        return {"params": params}
+
+
+class TestParameterValidator:
+    """Test cases for ParameterValidator class"""
+    
+    def test_valid_params(self):
+        """Test that valid parameters pass"""
+        validator = ParameterValidator(PARAMS_DEFINITION)
+        
+        assert validator.validate({"query": "q", "limit": 2, "mode": "fast", "values": [1, 2]}) is None
+        assert validator.required_params == ["query"]
+    
+    @pytest.mark.parametrize("params,message", [
+        ({}, "missing required parameter 'query'"),
+        ({"query": 1}, "parameter 'query' must be of type string"),
+        ({"query": "q", "limit": True}, "parameter 'limit' must be of type integer"),
+        ({"query": "q", "mode": "medium"}, "parameter 'mode' must be one of ['fast', 'slow']"),
+        ({"query": "q", "values": [1, 2, 3, 4]}, "parameter 'values' has more than 3 items"),
+    ])
+    def test_invalid_params(self, params, message):
+        """Test type, enum, max_items and required checks"""
+        validator = ParameterValidator(PARAMS_DEFINITION)
+        
+        assert validator.validate(params) == message
+    
+    def test_iterator_accepted_as_array(self):
+        """Test that a stream passes the array check and is not counted against max_items"""
+        validator = ParameterValidator(PARAMS_DEFINITION)
+        
+        assert validator.validate({"query": "q", "values": iter(range(10))}) is None
+        assert validator.validate({"query": "q", "values": "abc"}) == "parameter 'values' must be of type array"
+    
+    def test_apply_defaults(self):
+        """Test that defaults are filled in without mutating the input"""
+        validator = ParameterValidator(PARAMS_DEFINITION)
+        params = {"query": "q"}
+        
+        assert validator.apply_defaults(params) == {"query": "q", "limit": 5}
+        assert params == {"query": "q"}
+        complete = {"query": "q", "limit": 1}
+        assert validator.apply_defaults(complete) is complete
+
+
+class TestDefinitionCaching:
+    """Test cases for cached definitions and validators on Tool"""
+    
+    def test_definition_and_validator_cached(self):
+        """Test that definitions are built once across repeated calls"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tool = ConfiguredTool(os.path.join(temp_dir, "tools_config.json"))
+            
+            for _ in range(10):
+                tool.validate_parameters({"mode": "a"})
+                tool.get_definition()
+            
+            assert tool.definition_builds == 2  # One for the validator, one for the definition
+            assert tool.get_definition() is tool.get_definition()
+    
+    def test_cache_invalidated_on_config_change(self):
+        """Test that a config change rebuilds the validator"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tool = ConfiguredTool(os.path.join(temp_dir, "tools_config.json"))
+            assert not tool.validate_parameters({"mode": "b"})
+            
+            tool.config.set("modes", ["a", "b"])
+            
+            assert tool.validate_parameters({"mode": "b"})
+            assert tool.get_definition().parameters["mode"]["enum"] == ["a", "b"]
+            tool.config.flush()
+    
+    @patch('builtins.print')
+    def test_registry_applies_defaults(self, mock_print):
+        """Test that the registry validates and applies defaults before executing"""
+        class EchoTool(Tool):
+            def __init__(self):
+                super().__init__("echo", "Echo", "Echoes parameters", "test")
+            
+            def get_params_definition(self):
+                return PARAMS_DEFINITION
+            
+            def execute(self, **params):
+                return params
+        
+        registry = ToolRegistry()
+        registry.register_tool(EchoTool())
+        
+        assert registry.execute_tool("echo", query="q") == {"query": "q", "limit": 5}
+        assert registry.execute_tool("echo", query="q", mode="other") is None
+        mock_print.assert_called_with("Invalid parameters for tool 'echo': parameter 'mode' must be one of ['fast', 'slow']")
+
+
+class EchoTool(Tool):
+    """Tool that echoes its parameters"""
+    
+    idempotent = True
+    
+    def __init__(self):
+        super().__init__("echo-tool", "Echo Tool", "Echoes its parameters", "test")
+    
+    def get_params_definition(self):
+        return {"text": {"type": "string", "required": True}}
+    
+    def execute(self, **params):
+        return {"echo": params["text"]}
+
+
+ECHO_METADATA = {
+    "tool_id": "echo-tool",
+    "name": "Echo Tool",
+    "description": "Echoes its parameters",
+    "category": "test",
+    "idempotent": True,
+    "parameters": {"text": {"type": "string", "required": True}}
+}
+
+
+class TestToolProxy:
+    """Test cases for lazily loaded tool proxies"""
+    
+    def _make_proxy(self):
+        loads = []
+        
+        def loader():
+            loads.append(1)
+            return EchoTool()
+        
+        return ToolProxy(ECHO_METADATA, loader), loads
+    
+    def test_metadata_served_without_loading(self):
+        """Test that definitions and metadata do not load the tool"""
+        proxy, loads = self._make_proxy()
+        
+        definition = proxy.get_definition()
+        
+        assert definition.tool_id == "echo-tool"
+        assert definition.required_params == ["text"]
+        assert proxy.category == "test"
+        assert proxy.idempotent is True
+        assert not proxy.is_loaded
+        assert loads == []
+    
+    @patch('builtins.print')
+    def test_tool_loaded_on_first_execute(self, mock_print):
+        """Test that the registry loads the real tool once, on first execution"""
+        proxy, loads = self._make_proxy()
+        registry = ToolRegistry()
+        registry.register_tool(proxy)
+        
+        assert registry.execute_tool("echo-tool", text="hi") == {"echo": "hi"}
+        assert registry.execute_tool("echo-tool", text="again") == {"echo": "again"}
+        
+        assert proxy.is_loaded
+        assert isinstance(proxy.get_tool(), EchoTool)
+        assert loads == [1]
+    
+    def test_concurrent_first_use_loads_once(self):
+        """Test that concurrent first calls share a single load"""
+        proxy, loads = self._make_proxy()
+        barrier = threading.Barrier(8)
+        
+        def call():
+            barrier.wait()
+            proxy.execute(text="x")
+        
+        threads = [threading.Thread(target=call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert loads == [1]
+    
+    def test_unknown_attributes_forwarded(self):
+        """Test that attributes specific to the real tool are read from it"""
+        proxy, loads = self._make_proxy()
+        
+        assert proxy.get_tool().tool_id == "echo-tool"
+        with pytest.raises(AttributeError):
+            proxy.missing_attribute
+
+
+class CatalogTool(Tool):
+    """Tool with configurable metadata for registry index tests"""
+    
+    def __init__(self, tool_id, name, description, category, required=()):
+        super().__init__(tool_id, name, description, category)
+        self.required = required
+    
+    def get_params_definition(self):
+        return {param: {"type": "string", "required": True} for param in self.required}
+    
+    def execute(self, **params):
+        return {}
+
+
+@pytest.fixture
+def catalog_registry():
+    """Registry with a few tools covering several categories and signatures"""
+    registry = ToolRegistry()
+    with patch('builtins.print'):
+        registry.register_tool(CatalogTool("web-search", "Web Search Tool", "Performs web searches",
+                                           "information-retrieval", ("query",)))
+        registry.register_tool(CatalogTool("doc-parser", "Document Parser", "Parses PDF and DOCX documents",
+                                           "processing", ("file_path",)))
+        registry.register_tool(CatalogTool("stats", "Statistical Analysis", "Analyzes numeric data series",
+                                           "data-analysis", ("data",)))
+        registry.register_tool(CatalogTool("news-search", "News Search", "Searches news articles",
+                                           "information-retrieval", ("query",)))
+    return registry
+
+
+class TestRegistryIndexes:
+    """Test cases for the ToolRegistry secondary indexes and search"""
+    
+    def test_tokenize_keywords(self):
+        """Test keyword normalization"""
+        assert tokenize_keywords("Searches the Queries, in PDFs") == ["search", "query", "pdf"]
+        assert tokenize_keywords("Class analysis of files") == ["class", "analysis", "file"]
+    
+    def test_get_tools_by_category(self, catalog_registry):
+        """Test that category lookups use the index and follow unregistration"""
+        ids = [tool.tool_id for tool in catalog_registry.get_tools_by_category("information-retrieval")]
+        assert ids == ["web-search", "news-search"]
+        
+        catalog_registry.unregister_tool("web-search")
+        
+        ids = [tool.tool_id for tool in catalog_registry.get_tools_by_category("information-retrieval")]
+        assert ids == ["news-search"]
+        assert catalog_registry.get_tools_by_category("unknown") == []
+    
+    def test_required_param_lookups(self, catalog_registry):
+        """Test lookups by required-parameter signature"""
+        exact = catalog_registry.get_tools_by_required_params(["query"])
+        callable_tools = catalog_registry.get_tools_callable_with(["query", "data", "limit"])
+        
+        assert [tool.tool_id for tool in exact] == ["web-search", "news-search"]
+        assert sorted(tool.tool_id for tool in callable_tools) == ["news-search", "stats", "web-search"]
+    
+    def test_search_tools_ranked(self, catalog_registry):
+        """Test that search ranks name matches and rare keywords highest"""
+        results = catalog_registry.search_tools("search news articles")
+        
+        assert [tool.tool_id for tool in results] == ["news-search", "web-search"]
+        assert [tool.tool_id for tool in catalog_registry.search_tools("parse pdf documents")] == ["doc-parser"]
+        assert catalog_registry.search_tools("search", category="processing") == []
+        assert catalog_registry.search_tools("nothing matches") == []
+    
+    def test_replace_tool_reindexes(self, catalog_registry):
+        """Test that replacing a tool updates its index entries"""
+        catalog_registry.replace_tool(CatalogTool("stats", "Regression Tool", "Fits regressions",
+                                                  "modeling", ("x", "y")))
+        
+        assert catalog_registry.get_tools_by_category("data-analysis") == []
+        assert [tool.tool_id for tool in catalog_registry.get_tools_by_category("modeling")] == ["stats"]
+        assert [tool.tool_id for tool in catalog_registry.search_tools("regression")] == ["stats"]
+        assert catalog_registry.search_tools("numeric") == []
+        assert catalog_registry.get_tools_by_required_params(["y", "x"])[0].tool_id == "stats"
+    
+    def test_proxies_indexed_without_loading(self):
+        """Test that registering a tool proxy does not load the real tool"""
+        proxy = ToolProxy(ECHO_METADATA, lambda: pytest.fail("proxy should not load"))
+        registry = ToolRegistry()
+        with patch('builtins.print'):
+            registry.register_tool(proxy)
+        
+        assert registry.search_tools("echo") == [proxy]
+        assert registry.get_tools_by_required_params(["text"]) == [proxy]
+
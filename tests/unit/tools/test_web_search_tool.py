@@ -0,0 +1,204 @@
+"""
+Unit tests for the WebSearchTool in tools/web_search_tool
+"""
+import sys
+import os
+import tempfile
+import asyncio
+import threading
+from unittest.mock import patch
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.web_search_tool.web_search_tool import WebSearchTool
+from tools.web_search_tool import search_backends
+from tools.web_search_tool.search_backends import MockSearchBackend, LocalIndexBackend
+
+
+class TestWebSearchCaching:
+    """Test cases for WebSearchTool result caching"""
+    
+    @patch('builtins.print')
+    def test_repeated_query_served_from_cache(self, mock_print):
+        """Test that a repeated query does not fetch results again"""
+        tool = WebSearchTool()
+        with patch.object(tool, '_fetch_results', wraps=tool._fetch_results) as mock_fetch:
+            first = tool.execute(query="cached query", num_results=2)
+            second = tool.execute(query="cached query", num_results=2)
+            tool.execute(query="cached query", num_results=3)
+        
+        assert first == second
+        assert mock_fetch.call_count == 2
+        assert mock_print.call_count == 3
+    
+    def test_cache_retuned_on_config_change(self):
+        """Test that cache settings follow configuration changes"""
+        tool = WebSearchTool()
+        tool.cache.put(("query", 1), {"results": []})
+        
+        with patch.dict(tool.config.config, {"cache_duration_minutes": 5}):
+            tool._on_config_changed({"cache_duration_minutes": 5})
+            assert tool.cache.ttl_seconds == 300
+            assert len(tool.cache) == 1
+        
+        with patch.dict(tool.config.config, {"enable_caching": False}):
+            tool._on_config_changed({"enable_caching": False})
+            assert tool.cache.ttl_seconds == 0
+            assert len(tool.cache) == 0
+
+
+class TestSearchBackends:
+    """Test cases for WebSearchTool search backends"""
+    
+    @patch('builtins.print')
+    def test_mock_backend_by_default(self, mock_print):
+        tool = WebSearchTool()
+        
+        result = tool.execute(query="solar", num_results=5)
+        
+        assert isinstance(tool.backend, MockSearchBackend)
+        assert result["num_results_returned"] == 3
+        assert result["results"][0]["title"] == "Mock Result 1 for solar"
+        with pytest.raises(NotImplementedError):
+            tool.index_documents([])
+    
+    @patch('builtins.print')
+    def test_local_backend(self, mock_print):
+        """Test switching to the local index and searching documents indexed through the tool"""
+        tool = WebSearchTool()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            settings = {"backend": "local", "index_path": os.path.join(temp_dir, "index.sqlite3")}
+            with patch.dict(tool.config.config, settings):
+                tool._on_config_changed(settings)
+                assert isinstance(tool.backend, LocalIndexBackend)
+                
+                tool.index_documents([
+                    {"url": "doc://a", "title": "Heat pumps", "content": "Heat pumps move heat efficiently."},
+                    {"url": "doc://b", "title": "Boilers", "content": "Gas boilers burn fuel."}
+                ])
+                result = tool.execute(query="heat pumps", num_results=5)
+                
+                tool._on_config_changed({"backend": "mock"})
+        
+        assert result["num_results_returned"] == 1
+        assert result["results"][0]["url"] == "doc://a"
+    
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError, match="Unknown search backend"):
+            search_backends.create_backend("missing", {})
+    
+    @patch('builtins.print')
+    def test_register_backend(self, mock_print):
+        """Test plugging in a custom backend"""
+        class StaticBackend(search_backends.SearchBackend):
+            name = "static"
+            
+            def search(self, query, num_results):
+                return [{"title": "Static", "url": "https://example.org", "snippet": query}]
+        
+        tool = WebSearchTool()
+        with patch.dict(search_backends.SEARCH_BACKENDS, {"static": lambda config: StaticBackend()}):
+            with patch.dict(tool.config.config, {"backend": "static"}):
+                tool._on_config_changed({"backend": "static"})
+                result = tool.execute(query="anything")
+                tool._on_config_changed({"backend": "mock"})
+        
+        assert result["results"][0]["snippet"] == "anything"
+    
+    @patch('builtins.print')
+    def test_backend_swapped_during_search(self, mock_print):
+        """Test that a running search keeps its backend open and its late result is not cached"""
+        class BlockingBackend(search_backends.SearchBackend):
+            name = "blocking"
+            
+            def __init__(self):
+                self.started, self.proceed = threading.Event(), threading.Event()
+                self.closed = False
+            
+            def search(self, query, num_results):
+                self.started.set()
+                self.proceed.wait(5)
+                assert not self.closed
+                return [{"title": "Old", "url": "https://old.example", "snippet": query}]
+            
+            def close(self):
+                self.closed = True
+        
+        tool = WebSearchTool()
+        old_backend = BlockingBackend()
+        tool.backend = old_backend
+        results = []
+        search = threading.Thread(target=lambda: results.append(tool.execute(query="swap", num_results=1)))
+        search.start()
+        assert old_backend.started.wait(5)
+        
+        tool._on_config_changed({"backend": "mock"})
+        assert isinstance(tool.backend, MockSearchBackend)
+        assert not old_backend.closed
+        
+        old_backend.proceed.set()
+        search.join(5)
+        assert results[0]["results"][0]["title"] == "Old"
+        assert old_backend.closed
+        # The late result of the old backend is not served from the cache
+        assert tool.execute(query="swap", num_results=1)["results"][0]["title"] == "Mock Result 1 for swap"
+
+
+class OverlappingBackend(search_backends.SearchBackend):
+    """Backend whose queries share results, recording the queries it receives"""
+    
+    name = "overlapping"
+    
+    def __init__(self):
+        self.queries = []
+    
+    def search(self, query, num_results):
+        self.queries.append(query)
+        pages = {"solar": [("https://energy.example/solar", "Photovoltaic panels turn sunlight into power"),
+                           ("https://energy.example/costs", "Module prices fell by ninety percent")],
+                 "solar power": [("https://www.energy.example/solar/", "Photovoltaic panels turn sunlight into power"),
+                                 ("https://grid.example/storage", "Batteries shift midday generation to evening")]}
+        return [{"title": url, "url": url, "snippet": snippet} for url, snippet in pages.get(query, [])][:num_results]
+
+
+class TestMultiQuerySearch:
+    """Test cases for WebSearchTool query variants"""
+    
+    def _tool(self):
+        tool = WebSearchTool()
+        backend = OverlappingBackend()
+        tool.backend = backend
+        return tool, backend
+    
+    @patch('builtins.print')
+    def test_variants_merged_without_duplicates(self, mock_print):
+        tool, backend = self._tool()
+        
+        result = tool.execute(query="solar", query_variants=["solar power", "solar"], num_results=5)
+        
+        assert backend.queries == ["solar", "solar power"]
+        assert result["queries"] == ["solar", "solar power"]
+        assert [item["url"] for item in result["results"]] == [
+            "https://energy.example/solar", "https://energy.example/costs", "https://grid.example/storage"]
+        assert result["num_results_returned"] == 3
+        assert result["duplicates_removed"] == 1
+        assert "variants" in mock_print.call_args[0][0]
+    
+    @patch('builtins.print')
+    def test_variants_async_and_batch(self, mock_print):
+        """Test that aexecute and execute_batch merge the same way, reusing cached variants"""
+        tool, backend = self._tool()
+        
+        async_result = asyncio.run(tool.aexecute(query="solar", query_variants=["solar power"], num_results=5))
+        batch = tool.execute_batch([{"query": "solar", "query_variants": ["solar power"], "num_results": 5},
+                                    {"query": "solar", "num_results": 5}])
+        
+        assert batch[0] == async_result
+        assert batch[1]["num_results_returned"] == 2
+        assert backend.queries == ["solar", "solar power"]
+    
+    def test_variant_limit_validated(self):
+        tool = WebSearchTool()
+        
+        assert tool.validate_parameters({"query": "solar", "query_variants": ["v"] * 8})
+        assert not tool.validate_parameters({"query": "solar", "query_variants": ["v"] * 9})
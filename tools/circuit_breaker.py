@@ -0,0 +1,88 @@
+"""
+Circuit Breaker for the Multi-Agent Research System
+Fails tool calls fast while a tool is unhealthy instead of paying full latency for each failure
+"""
+import threading
+import time
+from typing import Dict, Any, Callable
+
+
+class CircuitBreaker:
+    """Per-tool circuit breaker with closed, open and half-open states"""
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds to stay open before allowing trial calls
+            half_open_max_calls: Concurrent trial calls allowed while half-open
+            clock: Monotonic time source (overridable for tests)
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the recovery timeout passes"""
+        with self._lock:
+            self._update_state()
+            return self._state
+    
+    def _update_state(self):
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+    
+    def allow_request(self) -> bool:
+        """Return whether a call may proceed; half-open admits a limited number of trial calls"""
+        with self._lock:
+            self._update_state()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+            return False
+    
+    def release(self):
+        """Give back a call admitted by allow_request() that ends without an outcome, such as a cancelled one"""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+    
+    def record_success(self):
+        """Record a successful call, closing the circuit"""
+        with self._lock:
+            self._consecutive_failures = 0
+            self._state = self.CLOSED
+    
+    def record_failure(self):
+        """Record a failed call, opening the circuit when the threshold is reached"""
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a serializable summary of the breaker"""
+        with self._lock:
+            self._update_state()
+            return {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "recovery_timeout": self.recovery_timeout
+            }
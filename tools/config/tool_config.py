@@ -1,9 +1,243 @@
 """
 Configuration management for tools in the Multi-Agent Research System
 """
+import atexit
+import inspect
 import json
 import os
-from typing import Dict, Any, Optional
+import tempfile
+import threading
+import weakref
+from typing import Dict, Any, Optional, List, Tuple, Callable
+
+
+class ConfigStore:
+    """
+    Process-wide, in-memory view of one configuration file.
+    
+    The file is read once; every ToolConfig for the same file shares the store and
+    reads its section from memory. Changes are coalesced: set() marks the key dirty
+    and schedules a single write after ``write_delay`` seconds, which re-reads the file,
+    applies the pending keys on top and replaces it atomically (temp file + rename).
+    Pending changes are also written by flush() and at interpreter exit.
+    
+    Edits made to the file by other processes or by hand are picked up by polling its
+    size and mtime every ``poll_interval`` seconds once anything has subscribed.
+    Subscribers of a section are called with the changed keys and their new values,
+    both for those edits and for set() calls in this process.
+    """
+    
+    _stores: Dict[str, "ConfigStore"] = {}
+    _stores_lock = threading.Lock()
+    
+    def __init__(self, config_file_path: str, write_delay: float = 0.5, poll_interval: float = 2.0):
+        self.config_file_path = config_file_path
+        self.write_delay = write_delay
+        self.poll_interval = poll_interval
+        self._lock = threading.RLock()
+        self._file_stamp = self._stat_file()
+        self._sections: Dict[str, Dict[str, Any]] = self._read_file()
+        self._versions: Dict[str, int] = {}
+        self._dirty_keys = set()  # (section, key) pairs not yet written
+        self._write_timer: Optional[threading.Timer] = None
+        # section -> list of callbacks; bound methods are held weakly so subscribers can be collected
+        self._subscribers: Dict[str, List[Any]] = {}
+        self._poll_stop = threading.Event()
+        self._poll_thread: Optional[threading.Thread] = None
+    
+    @classmethod
+    def for_path(cls, config_file_path: str) -> "ConfigStore":
+        """Return the shared store for a configuration file, loading it on first use"""
+        key = os.path.abspath(config_file_path)
+        with cls._stores_lock:
+            store = cls._stores.get(key)
+            if store is None:
+                store = cls._stores[key] = cls(config_file_path)
+            return store
+    
+    @classmethod
+    def flush_all(cls):
+        """Write pending changes of every store"""
+        with cls._stores_lock:
+            stores = list(cls._stores.values())
+        for store in stores:
+            store.flush()
+    
+    def _stat_file(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.config_file_path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+    
+    def _read_file(self) -> Dict[str, Dict[str, Any]]:
+        if os.path.exists(self.config_file_path):
+            with open(self.config_file_path, 'r') as f:
+                return json.load(f)
+        return {}
+    
+    def section(self, section_name: str) -> Dict[str, Any]:
+        """Return the live dictionary holding one section's configuration"""
+        with self._lock:
+            return self._sections.setdefault(section_name, {})
+    
+    def version(self, section_name: str) -> int:
+        """Return a counter that changes whenever the section changes"""
+        return self._versions.get(section_name, 0)
+    
+    def set(self, section_name: str, key: str, value: Any) -> bool:
+        """
+        Set a value and schedule a write.
+        
+        Returns:
+            False if the key already held an equal value, in which case nothing happens
+        """
+        with self._lock:
+            section = self._sections.setdefault(section_name, {})
+            if key in section and section[key] == value:
+                return False
+            section[key] = value
+            self._versions[section_name] = self._versions.get(section_name, 0) + 1
+            self._dirty_keys.add((section_name, key))
+            if self._write_timer is None:
+                self._write_timer = threading.Timer(self.write_delay, self.flush)
+                self._write_timer.daemon = True
+                self._write_timer.start()
+        self._notify({section_name: {key: value}})
+        return True
+    
+    def _apply_file_content(self, all_configs: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Bring the in-memory sections in line with the file, keeping unwritten local changes.
+        
+        Sections are updated in place, key by key, so every ToolConfig sharing them sees the
+        change and a reader never finds a section emptied half-way through a reload.
+        Caller holds the lock.
+        
+        Returns:
+            The changed keys and their new values, per section
+        """
+        changes = {}
+        for section_name in set(all_configs) | set(self._sections):
+            updated = dict(all_configs.get(section_name, {}))
+            for dirty_section, key in self._dirty_keys:
+                if dirty_section == section_name:
+                    updated[key] = self._sections[section_name][key]
+            current = self._sections.setdefault(section_name, {})
+            if updated == current:
+                continue
+            changed = {key: value for key, value in updated.items() if current.get(key, object()) != value}
+            removed = [key for key in current if key not in updated]
+            # Change only the affected keys: readers use the section without the lock
+            for key, value in changed.items():
+                current[key] = value
+            for key in removed:
+                current.pop(key)
+            changed.update({key: None for key in removed})
+            self._versions[section_name] = self._versions.get(section_name, 0) + 1
+            changes[section_name] = changed
+        return changes
+    
+    def check_for_changes(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Reload the file if its size or mtime changed and notify subscribers.
+        
+        Returns:
+            The changed keys and their new values, per section (removed keys map to None)
+        """
+        with self._lock:
+            stamp = self._stat_file()
+            if stamp == self._file_stamp:
+                return {}
+            try:
+                all_configs = self._read_file()
+            except ValueError:
+                return {}  # Caught mid-write by a non-atomic editor; retry on the next poll
+            self._file_stamp = stamp
+            changes = self._apply_file_content(all_configs)
+        self._notify(changes)
+        return changes
+    
+    def flush(self):
+        """Write pending changes now"""
+        with self._lock:
+            if self._write_timer is not None:
+                self._write_timer.cancel()
+                self._write_timer = None
+            if not self._dirty_keys:
+                return
+            # Merge into the file's current content so sections changed elsewhere are kept
+            all_configs = self._read_file()
+            changes = self._apply_file_content(all_configs)
+            for section_name, key in self._dirty_keys:
+                all_configs.setdefault(section_name, {})[key] = self._sections[section_name][key]
+            self._write_atomically(all_configs)
+            self._file_stamp = self._stat_file()
+            self._dirty_keys.clear()
+        self._notify(changes)
+    
+    def _write_atomically(self, all_configs: Dict[str, Any]):
+        # Ensure the config directory exists
+        directory = os.path.dirname(os.path.abspath(self.config_file_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tools_config.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(all_configs, f, indent=2)
+            os.replace(temp_path, self.config_file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    
+    def subscribe(self, section_name: str, callback: Callable[[Dict[str, Any]], None]):
+        """
+        Call callback with the changed keys whenever the section changes.
+        
+        Bound methods are referenced weakly, so subscribing does not keep their object alive.
+        Starts polling the file for outside edits.
+        """
+        reference = weakref.WeakMethod(callback) if inspect.ismethod(callback) else (lambda: callback)
+        with self._lock:
+            self._subscribers.setdefault(section_name, []).append(reference)
+            if self._poll_thread is None:
+                self._poll_stop.clear()
+                self._poll_thread = threading.Thread(target=self._poll, name="config-watcher", daemon=True)
+                self._poll_thread.start()
+    
+    def unsubscribe(self, section_name: str, callback: Callable[[Dict[str, Any]], None]):
+        """Stop calling callback for changes to the section"""
+        with self._lock:
+            references = self._subscribers.get(section_name, [])
+            references[:] = [reference for reference in references if reference() not in (None, callback)]
+    
+    def _notify(self, changes: Dict[str, Dict[str, Any]]):
+        for section_name, changed in changes.items():
+            with self._lock:
+                references = self._subscribers.get(section_name, [])
+                references[:] = [reference for reference in references if reference() is not None]
+                callbacks = [reference() for reference in references]
+            for callback in callbacks:
+                if callback is None:
+                    continue
+                try:
+                    callback(changed)
+                except Exception as e:
+                    print(f"Error in config subscriber for '{section_name}': {e}")
+    
+    def _poll(self):
+        while not self._poll_stop.wait(self.poll_interval):
+            self.check_for_changes()
+    
+    def stop_polling(self):
+        """Stop the background poll thread"""
+        self._poll_stop.set()
+        with self._lock:
+            thread, self._poll_thread = self._poll_thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+
+atexit.register(ConfigStore.flush_all)
 
 
 class ToolConfig:
@@ -12,39 +246,41 @@ class ToolConfig:
     def __init__(self, tool_name: str, config_file_path: str = "config/tools_config.json"):
         self.tool_name = tool_name
         self.config_file_path = config_file_path
+        self._store = ConfigStore.for_path(config_file_path)
         self.config = self._load_config()
     
+    @property
+    def version(self) -> int:
+        """Incremented on every change so dependents can invalidate cached state"""
+        return self._store.version(self.tool_name)
+    
     def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from file"""
-        if os.path.exists(self.config_file_path):
-            with open(self.config_file_path, 'r') as f:
-                all_configs = json.load(f)
-                return all_configs.get(self.tool_name, {})
-        return {}
+        """Load configuration from the shared store (the file is only read once per process)"""
+        return self._store.section(self.tool_name)
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value by key"""
         return self.config.get(key, default)
     
     def set(self, key: str, value: Any):
-        """Set configuration value by key"""
-        self.config[key] = value
-        self._save_config()
+        """Set configuration value by key; the file is written shortly after, or on flush()"""
+        self._store.set(self.tool_name, key, value)
     
-    def _save_config(self):
-        """Save configuration to file"""
-        all_configs = {}
-        if os.path.exists(self.config_file_path):
-            with open(self.config_file_path, 'r') as f:
-                all_configs = json.load(f)
-        
-        all_configs[self.tool_name] = self.config
-        
-        # Ensure the config directory exists
-        os.makedirs(os.path.dirname(self.config_file_path), exist_ok=True)
-        
-        with open(self.config_file_path, 'w') as f:
-            json.dump(all_configs, f, indent=2)
+    def flush(self):
+        """Write pending configuration changes to the file now"""
+        self._store.flush()
+    
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]):
+        """Call callback with the changed keys and new values whenever this configuration changes"""
+        self._store.subscribe(self.tool_name, callback)
+    
+    def unsubscribe(self, callback: Callable[[Dict[str, Any]], None]):
+        """Stop notifying callback of changes"""
+        self._store.unsubscribe(self.tool_name, callback)
+    
+    def check_for_changes(self) -> Dict[str, Any]:
+        """Pick up outside edits to the config file now instead of waiting for the next poll"""
+        return self._store.check_for_changes().get(self.tool_name, {})
 
 
 # Default configuration values that would be used if no config file exists
@@ -53,17 +289,45 @@ DEFAULT_CONFIGS = {
         "default_num_results": 5,
         "enable_caching": True,
         "cache_duration_minutes": 60,
-        "timeout_seconds": 30
+        "timeout_seconds": 30,
+        "backend": "mock",  # "mock", "local" (BM25 over index_path) or "http" (service at endpoint)
+        "index_path": "data/search_index.sqlite3",
+        "endpoint": "http://localhost:8080/search",
+        "max_connections": 10,
+        "max_query_variants": 8,
+        "rrf_k": 60,  # Reciprocal-rank fusion constant for multi-query searches
+        "near_duplicate_similarity": 0.7  # Snippets at least this similar (word Jaccard) count as duplicates
     },
     "document_parser_tool": {
-        "supported_formats": ["pdf", "docx", "txt", "rtf"],
+        "supported_formats": ["pdf", "docx", "txt", "md", "html"],
         "max_file_size_mb": 10,
+        "max_content_chars": 100000,
         "enable_caching": True,
-        "cache_duration_minutes": 1440  # 24 hours
+        "cache_duration_minutes": 1440,  # 24 hours
+        "cache_dir": ".parse_cache",
+        "max_cache_mb": 256,
+        "ingest_workers": 0,  # 0 = one worker process per CPU
+        "ingest_batch_mb": 4,
+        "context_token_budget": 2000,
+        "chunk_tokens": 256,
+        "chunk_overlap_tokens": 32
     },
     "statistical_analysis_tool": {
         "max_data_points": 10000,
         "precision": 2,
-        "supported_analysis_types": ["descriptive", "correlation"]
+        "supported_analysis_types": ["descriptive", "correlation", "regression"],
+        "sketch_k": 200,
+        "dataset_store_path": "data/datasets"
+    },
+    "tool_execution_service": {
+        "circuit_failure_threshold": 5,
+        "circuit_recovery_timeout_seconds": 30,
+        "circuit_half_open_max_calls": 1,
+        "enable_hedging": False,
+        "hedge_percentile": 95,
+        "hedge_min_samples": 20,
+        "max_workers": 5,
+        "enable_hot_reload": False,
+        "hot_reload_poll_seconds": 2
     }
 }
\ No newline at end of file
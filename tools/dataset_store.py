@@ -0,0 +1,125 @@
+"""
+Dataset Store for the Multi-Agent Research System
+Numeric series written once as .npy files and passed between agents as small handles
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import numpy as np
+from typing import Dict, Any, Iterator
+
+DEFAULT_DATASET_STORE_PATH = "data/datasets"
+
+# Bytes hashed per update when fingerprinting a dataset
+HASH_BLOCK_BYTES = 1 << 24
+
+
+def _content_hash(array: np.ndarray) -> str:
+    """SHA-256 of the array's dtype, shape and raw bytes, read in blocks so memory-mapped data is not loaded whole"""
+    digest = hashlib.sha256(f"{array.dtype.str}{array.shape}".encode())
+    flat = array.reshape(-1)
+    step = max(1, HASH_BLOCK_BYTES // max(1, array.itemsize))
+    for start in range(0, flat.shape[0], step):
+        digest.update(memoryview(np.ascontiguousarray(flat[start:start + step])).cast("B"))
+    return digest.hexdigest()
+
+
+class DatasetStore:
+    """
+    Content-addressed store of numeric arrays in a directory of .npy files.
+    
+    put() writes an array once and returns a handle: a small dict with the dataset id,
+    dtype, shape, length and content hash that can travel in A2A messages, tool
+    parameters and results instead of the data. open() maps the file read-only, so
+    readers share the operating system's page cache instead of copying the data.
+    """
+    
+    _stores: Dict[str, "DatasetStore"] = {}
+    _stores_lock = threading.Lock()
+    
+    def __init__(self, root_path: str = DEFAULT_DATASET_STORE_PATH):
+        self.root_path = root_path
+    
+    @classmethod
+    def for_path(cls, root_path: str = DEFAULT_DATASET_STORE_PATH) -> "DatasetStore":
+        """Return the shared store for a directory"""
+        key = os.path.abspath(root_path)
+        with cls._stores_lock:
+            store = cls._stores.get(key)
+            if store is None:
+                store = cls._stores[key] = cls(root_path)
+            return store
+    
+    def _path_for(self, dataset_id: str) -> str:
+        if not dataset_id or not all(c in "0123456789abcdef" for c in dataset_id):
+            raise ValueError(f"Invalid dataset id: {dataset_id!r}")
+        return os.path.join(self.root_path, f"{dataset_id}.npy")
+    
+    def put(self, data: Any, dtype: Any = np.float64) -> Dict[str, Any]:
+        """
+        Store data (a list, nested list or array) and return its handle.
+        
+        Identical content is stored once: writing the same data again returns the
+        existing dataset's handle without rewriting the file.
+        """
+        array = np.ascontiguousarray(data, dtype=dtype)
+        content_hash = _content_hash(array)
+        handle = {
+            "dataset_id": content_hash[:32],
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "length": int(array.shape[0]) if array.ndim else 1,
+            "hash": content_hash
+        }
+        path = self._path_for(handle["dataset_id"])
+        if not os.path.exists(path):
+            os.makedirs(self.root_path, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.root_path, prefix=".dataset.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    np.save(f, array, allow_pickle=False)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        return handle
+    
+    def open(self, handle: Dict[str, Any], verify: bool = False) -> np.ndarray:
+        """
+        Map a stored dataset read-only.
+        
+        Args:
+            handle: Handle returned by put()
+            verify: Re-hash the contents and compare them with the handle (reads the whole file)
+        
+        Raises:
+            KeyError: If the dataset is not in the store
+            ValueError: If the file does not match the handle
+        """
+        path = self._path_for(handle.get("dataset_id", ""))
+        if not os.path.exists(path):
+            raise KeyError(f"Dataset not found: {handle.get('dataset_id')}")
+        array = np.load(path, mmap_mode="r", allow_pickle=False)
+        if array.dtype.str != handle.get("dtype") or list(array.shape) != list(handle.get("shape", [])):
+            raise ValueError(f"Dataset {handle['dataset_id']} does not match its handle")
+        if verify and _content_hash(array) != handle.get("hash"):
+            raise ValueError(f"Dataset {handle['dataset_id']} failed its content hash check")
+        return array
+    
+    def chunks(self, handle: Dict[str, Any], chunk_size: int = 1 << 20) -> Iterator[np.ndarray]:
+        """Yield consecutive row blocks of a stored dataset"""
+        array = self.open(handle)
+        for start in range(0, array.shape[0], chunk_size):
+            yield array[start:start + chunk_size]
+    
+    def contains(self, handle: Dict[str, Any]) -> bool:
+        return os.path.exists(self._path_for(handle.get("dataset_id", "")))
+    
+    def delete(self, handle: Dict[str, Any]) -> bool:
+        """Remove a dataset; returns False if it was not stored"""
+        try:
+            os.unlink(self._path_for(handle.get("dataset_id", "")))
+            return True
+        except FileNotFoundError:
+            return False
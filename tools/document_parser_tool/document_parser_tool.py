@@ -3,11 +3,17 @@ Document Parsing Tool for the Multi-Agent Research System
 """
 from tools.tool_framework import Tool
 from tools.config.tool_config import ToolConfig, DEFAULT_CONFIGS
-from typing import Dict, Any
+from tools.document_parser_tool import ingestion, parsing_engine
+from tools.document_parser_tool.parse_cache import ParseCache
+from tools import text_ranking
+from typing import Dict, Any, Iterator
+import os
 
 
 class DocumentParsingTool(Tool):
-    """Tool for parsing documents - example implementation"""
+    """Tool for parsing documents with the streaming parsing engine"""
+    
+    idempotent = True  # Parsing only reads the file
     
     def __init__(self):
         super().__init__(
@@ -21,6 +27,33 @@ class DocumentParsingTool(Tool):
         for key, value in DEFAULT_CONFIGS["document_parser_tool"].items():
             if self.config.get(key) is None:
                 self.config.set(key, value)
+        self.cache = ParseCache(self.config.get("cache_dir", ".parse_cache"),
+                                self._cache_max_bytes(), self._cache_ttl_seconds())
+        # Re-tune the cache when its settings change
+        self.config.subscribe(self._on_config_changed)
+    
+    def _cache_ttl_seconds(self) -> float:
+        if not self.config.get("enable_caching", True):
+            return 0
+        return self.config.get("cache_duration_minutes", 1440) * 60
+    
+    def _cache_max_bytes(self) -> int:
+        return int(self.config.get("max_cache_mb", 256) * 1024 * 1024)
+    
+    def _on_config_changed(self, changes: Dict[str, Any]):
+        if "enable_caching" in changes or "cache_duration_minutes" in changes:
+            self.cache.ttl_seconds = self._cache_ttl_seconds()
+        if "max_cache_mb" in changes:
+            self.cache.max_bytes = self._cache_max_bytes()
+        if "cache_dir" in changes:
+            self.cache.flush()
+            self.cache = ParseCache(self.config.get("cache_dir", ".parse_cache"),
+                                    self._cache_max_bytes(), self._cache_ttl_seconds())
+    
+    def close(self):
+        """Stop following configuration changes and write the cache index"""
+        self.config.unsubscribe(self._on_config_changed)
+        self.cache.flush()
     
     def get_params_definition(self):
         supported_formats = self.config.get("supported_formats", ["txt"])
@@ -28,14 +61,30 @@ class DocumentParsingTool(Tool):
             "file_path": {
                 "type": "string",
                 "required": True,
-                "description": "Path to the document file"
+                "description": "Path to the document file, or a directory or glob to ingest in bulk"
             },
             "format": {
                 "type": "string",
                 "required": False,
                 "default": "txt",
                 "enum": supported_formats,
-                "description": f"Document format ({', '.join(supported_formats)})"
+                "description": f"Document format ({', '.join(supported_formats)}); "
+                               "in bulk mode it is taken from each file's extension"
+            },
+            "query": {
+                "type": "string",
+                "required": False,
+                "description": "Research query; when given, the passages most relevant to it are packed into \"context\""
+            },
+            "token_budget": {
+                "type": "integer",
+                "required": False,
+                "description": "Token budget for the packed context (defaults to context_token_budget)"
+            },
+            "max_workers": {
+                "type": "integer",
+                "required": False,
+                "description": "Worker processes for bulk ingestion (defaults to ingest_workers, 0 = one per CPU)"
             }
         }
     
@@ -43,16 +92,95 @@ class DocumentParsingTool(Tool):
         file_path = params.get("file_path", "")
         format_type = params.get("format", "txt")
         
+        if ingestion.is_bulk_path(file_path):
+            return self._ingest(file_path, params.get("max_workers"))
+        
         print(f"Parsing document: '{file_path}' (format: {format_type})")
         
-        # Mock response
-        return {
+        self._check_file(file_path)
+        parsed = self._parse(file_path, format_type, self.config.get("max_content_chars", 100000))
+        result = {
             "file_path": file_path,
             "format": format_type,
-            "parsed_content": f"This is mock parsed content from {file_path}",
+            "parsed_content": parsed["content"],
+            "metadata": parsed["metadata"]
+        }
+        if params.get("query"):
+            result["context"] = self.pack_context(parsed["content"], params["query"], params.get("token_budget"))
+        return result
+    
+    def pack_context(self, content: str, query: str, token_budget: int = None) -> str:
+        """Chunk parsed content and keep the chunks most relevant to the query within a token budget"""
+        return text_ranking.pack_context(
+            content,
+            query,
+            token_budget or self.config.get("context_token_budget", text_ranking.DEFAULT_CONTEXT_TOKEN_BUDGET),
+            self.config.get("chunk_tokens", text_ranking.DEFAULT_CHUNK_TOKENS),
+            self.config.get("chunk_overlap_tokens", text_ranking.DEFAULT_OVERLAP_TOKENS)
+        )
+    
+    def _parse(self, file_path: str, format_type: str, max_content_chars: int) -> Dict[str, Any]:
+        """Parse a document, from the parse cache when its contents were parsed before"""
+        options = (format_type, max_content_chars)
+        parsed = self.cache.get(file_path, options)
+        if parsed is None:
+            parsed = parsing_engine.parse_document(file_path, format_type, max_content_chars)
+            self.cache.put(file_path, options, parsed)
+        return parsed
+    
+    def _ingest(self, path: str, max_workers: int = None) -> Dict[str, Any]:
+        documents, skipped, failed = [], [], []
+        for result in self.iter_ingest(path, max_workers):
+            if "skipped" in result:
+                skipped.append(result)
+            elif "error" in result:
+                failed.append(result)
+            else:
+                documents.append(result)
+        return {
+            "file_path": path,
+            "format": "bulk",
+            "documents": documents,
+            "failed": failed,
+            "skipped": skipped,
             "metadata": {
-                "word_count": 150,
-                "page_count": 1,
-                "title": f"Mock Title from {file_path}"
+                "document_count": len(documents),
+                "failed_count": len(failed),
+                "skipped_count": len(skipped),
+                "word_count": sum(document["metadata"]["word_count"] for document in documents)
             }
-        }
\ No newline at end of file
+        }
+    
+    def iter_ingest(self, path: str, max_workers: int = None) -> Iterator[Dict[str, Any]]:
+        """
+        Parse every supported document in a directory or glob across a process pool.
+        
+        Files of unsupported formats or over max_file_size_mb are reported first, as
+        {"file_path", "format", "skipped"}, without being read. Parsed documents follow
+        in completion order, in the single-file result form, or as {"file_path",
+        "format", "error"} if parsing failed.
+        """
+        max_size_mb = self.config.get("max_file_size_mb", 10)
+        documents, skipped = ingestion.find_documents(path, self.config.get("supported_formats", ["txt"]),
+                                                      max_size_mb * 1024 * 1024)
+        print(f"Ingesting {len(documents)} documents from '{path}' ({len(skipped)} skipped)")
+        yield from skipped
+        yield from ingestion.iter_ingest(
+            documents,
+            self.config.get("max_content_chars", 100000),
+            max_workers or self.config.get("ingest_workers", 0) or None,
+            self.cache,
+            batch_bytes=int(self.config.get("ingest_batch_mb", 4) * 1024 * 1024)
+        )
+    
+    def iter_pages(self, file_path: str, format_type: str = "txt") -> Iterator[str]:
+        """Yield the document's text page by page without reading it all into memory"""
+        self._check_file(file_path)
+        return parsing_engine.iter_pages(file_path, format_type)
+    
+    def _check_file(self, file_path: str):
+        """Raise if the file is missing or larger than max_file_size_mb"""
+        size = os.path.getsize(file_path)  # Raises FileNotFoundError for missing files
+        max_size_mb = self.config.get("max_file_size_mb", 10)
+        if size > max_size_mb * 1024 * 1024:
+            raise ValueError(f"Document is larger than the {max_size_mb} MB limit: {file_path}")
@@ -0,0 +1,197 @@
+"""
+Document Ingestion for the Multi-Agent Research System
+Bulk parsing of a directory or glob of documents across a pool of worker processes
+"""
+import glob
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from tools.document_parser_tool import parsing_engine
+from tools.document_parser_tool.parse_cache import ParseCache, file_content_hash
+
+# File extension -> document format
+FORMAT_EXTENSIONS = {
+    ".txt": "txt",
+    ".text": "txt",
+    ".md": "md",
+    ".markdown": "md",
+    ".html": "html",
+    ".htm": "html",
+    ".docx": "docx",
+    ".pdf": "pdf"
+}
+
+GLOB_CHARACTERS = "*?["
+
+# A worker task holds files up to this many bytes (or DEFAULT_BATCH_FILES files), so
+# small documents share one round trip to the pool while large ones get a task each
+DEFAULT_BATCH_BYTES = 4 * 1024 * 1024
+DEFAULT_BATCH_FILES = 32
+
+
+class DocumentFile(NamedTuple):
+    """A file accepted for ingestion: its path, format (from the extension) and size"""
+    path: str
+    format: str
+    size: int
+
+
+def is_bulk_path(path: str) -> bool:
+    """True if path names a directory, or contains glob wildcards and is not itself a file"""
+    if os.path.isfile(path):
+        return False
+    return os.path.isdir(path) or any(character in path for character in GLOB_CHARACTERS)
+
+
+def format_for_path(path: str) -> Optional[str]:
+    return FORMAT_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def _candidate_paths(path: str) -> List[str]:
+    if os.path.isdir(path):
+        found = []
+        for directory, subdirectories, names in os.walk(path):
+            subdirectories[:] = [name for name in subdirectories if not name.startswith(".")]
+            found.extend(os.path.join(directory, name) for name in names if not name.startswith("."))
+        return sorted(found)
+    return sorted(glob.glob(path, recursive=True))
+
+
+def find_documents(path: str, supported_formats: Sequence[str],
+                   max_file_bytes: int) -> Tuple[List[DocumentFile], List[Dict[str, Any]]]:
+    """
+    Expand a directory (recursively, skipping hidden entries) or glob into documents to ingest.
+    
+    Formats come from the file extension and sizes from stat(), so no file is opened.
+    Returns the accepted files and, for the rest, {"file_path", "format", "skipped"}
+    entries giving the reason.
+    """
+    accepted = []
+    skipped = []
+    for file_path in _candidate_paths(path):
+        try:
+            stat = os.stat(file_path)
+        except OSError as e:
+            skipped.append({"file_path": file_path, "format": None, "skipped": str(e)})
+            continue
+        if not os.path.isfile(file_path):
+            continue
+        format_name = format_for_path(file_path)
+        if format_name is None or format_name not in supported_formats:
+            skipped.append({"file_path": file_path, "format": format_name, "skipped": "Unsupported format"})
+        elif stat.st_size > max_file_bytes:
+            skipped.append({"file_path": file_path, "format": format_name,
+                            "skipped": f"Larger than the {max_file_bytes / (1024 * 1024):g} MB limit"})
+        else:
+            accepted.append(DocumentFile(file_path, format_name, stat.st_size))
+    return accepted, skipped
+
+
+def make_batches(documents: Iterable[DocumentFile], batch_bytes: int = DEFAULT_BATCH_BYTES,
+                 batch_files: int = DEFAULT_BATCH_FILES) -> List[List[DocumentFile]]:
+    """Group documents into worker tasks, largest first so big files do not finish last"""
+    batches = []
+    batch: List[DocumentFile] = []
+    size = 0
+    for document in sorted(documents, key=lambda document: document.size, reverse=True):
+        if batch and (size + document.size > batch_bytes or len(batch) >= batch_files):
+            batches.append(batch)
+            batch, size = [], 0
+        batch.append(document)
+        size += document.size
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def parse_batch(batch: List[DocumentFile], max_content_chars: int) -> List[Tuple[DocumentFile, Dict[str, Any], list, str]]:
+    """
+    Parse a batch of documents (runs in a worker process).
+    
+    Returns (document, result, stamp, content hash) for each file; result is either a
+    parse result or {"error": message}. The content hash is taken after parsing, while
+    the file is still in the page cache, so the parent can fill the parse cache
+    without reading the file again.
+    """
+    results = []
+    for document in batch:
+        stamp, content_hash = None, None
+        try:
+            stamp = ParseCache.file_stamp(document.path)
+            result = parsing_engine.parse_document(document.path, document.format, max_content_chars)
+            content_hash = file_content_hash(document.path)
+        except Exception as e:
+            result = {"error": f"{type(e).__name__}: {e}"}
+        results.append((document, result, stamp, content_hash))
+    return results
+
+
+def _document_result(document: DocumentFile, result: Dict[str, Any]) -> Dict[str, Any]:
+    if "error" in result:
+        return {"file_path": document.path, "format": document.format, "error": result["error"]}
+    return {"file_path": document.path, "format": document.format,
+            "parsed_content": result["content"], "metadata": result["metadata"]}
+
+
+def _pool_context():
+    # Workers are forked from a clean server process, with the parsing engine already
+    # imported, instead of from the (threaded) agent process
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return None
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def iter_ingest(documents: Sequence[DocumentFile], max_content_chars: int, max_workers: Optional[int] = None,
+                cache: Optional[ParseCache] = None, batch_bytes: int = DEFAULT_BATCH_BYTES,
+                batch_files: int = DEFAULT_BATCH_FILES) -> Iterator[Dict[str, Any]]:
+    """
+    Parse documents across a process pool, yielding each result as soon as its batch completes.
+    
+    Documents found in the parse cache (recognized by their stat stamp, without reading
+    them) are yielded first. The rest are parsed by max_workers processes (one per CPU
+    by default; 1 parses in this process), and their results are added to the cache,
+    whose index of file hashes is written once at the end. Closing the generator early
+    cancels the batches that have not started.
+    """
+    pending = []
+    for document in documents:
+        options = (document.format, max_content_chars)
+        content_hash = cache.known_hash(document.path) if cache is not None and cache.enabled else None
+        cached = cache.get(document.path, options, content_hash) if content_hash else None
+        if cached is None:
+            pending.append(document)
+        else:
+            yield _document_result(document, cached)
+    
+    batches = make_batches(pending, batch_bytes, batch_files)
+    workers = min(max_workers or os.cpu_count() or 1, len(batches))
+    try:
+        if workers <= 1:
+            for batch in batches:
+                yield from _finish_batch(parse_batch(batch, max_content_chars), max_content_chars, cache)
+            return
+        
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context())
+        try:
+            futures = [pool.submit(parse_batch, batch, max_content_chars) for batch in batches]
+            for future in as_completed(futures):
+                yield from _finish_batch(future.result(), max_content_chars, cache)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+    finally:
+        if cache is not None:
+            cache.flush()  # One index write for the whole ingestion
+
+
+def _finish_batch(results, max_content_chars: int, cache: Optional[ParseCache]) -> Iterator[Dict[str, Any]]:
+    if cache is not None and cache.enabled:
+        cache.remember({document.path: (stamp, content_hash)
+                        for document, _, stamp, content_hash in results if content_hash})
+        for document, result, _, content_hash in results:
+            if content_hash and "error" not in result:
+                cache.put(document.path, (document.format, max_content_chars), result, content_hash)
+    for document, result, _, _ in results:
+        yield _document_result(document, result)
@@ -0,0 +1,272 @@
+"""
+Parse Cache for the Multi-Agent Research System
+Persistent, size-bounded cache of parsed documents keyed by file content
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+# Bump when the parsing engine's output changes so older entries are not reused
+PARSER_VERSION = 1
+
+HASH_BLOCK_BYTES = 1 << 20
+
+INDEX_FILE_NAME = "stamps.json"
+
+
+def file_content_hash(file_path: str) -> str:
+    """SHA-256 of a file's contents, read in blocks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_json_atomically(path: str, data: Any):
+    directory = os.path.dirname(path)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".parse_cache.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class ParseCache:
+    """
+    On-disk cache of parse results, keyed by the SHA-256 of the document's contents.
+    
+    A file's hash is remembered together with its size, modification time and inode, so
+    an unchanged file is recognized from one stat() call without being read again. If
+    the stamp differs the file is re-hashed, so touched-but-identical files and copies
+    of a document still hit the cache. Entries expire ttl_seconds after they were
+    written, and the least recently used entries are evicted once the cache directory
+    grows beyond max_bytes; the remembered hashes of evicted and expired entries are
+    forgotten with them.
+    
+    The remembered hashes are written to the index file index_write_delay seconds after
+    they change (one write for any number of changes) or by flush(). The index is only a
+    shortcut: changes lost at exit just mean those files are hashed again.
+    """
+    
+    def __init__(self, cache_dir: str, max_bytes: int, ttl_seconds: float, clock: Callable[[], float] = time.time,
+                 index_write_delay: float = 1.0):
+        """
+        Args:
+            cache_dir: Directory holding the cache entries (created on first write)
+            max_bytes: Upper bound on the total size of the entries
+            ttl_seconds: Seconds an entry stays valid; 0 or less disables the cache
+            clock: Wall-clock time source (overridable for tests)
+            index_write_delay: Seconds to collect changes to the remembered hashes before writing them
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.index_write_delay = index_write_delay
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stamps: Optional[Dict[str, list]] = None
+        self._paths_by_hash: Dict[str, Set[str]] = {}
+        self._index_dirty = False
+        self._index_timer: Optional[threading.Timer] = None
+        self._total_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_bytes > 0
+    
+    def _load_stamps(self) -> Dict[str, list]:
+        """The remembered {path: [size, mtime, inode, content hash]}; caller holds the lock"""
+        if self._stamps is None:
+            try:
+                with open(os.path.join(self.cache_dir, INDEX_FILE_NAME), "r", encoding="utf-8") as f:
+                    self._stamps = json.load(f)
+            except (OSError, ValueError):
+                self._stamps = {}
+            for path, known in self._stamps.items():
+                self._paths_by_hash.setdefault(known[3], set()).add(path)
+        return self._stamps
+    
+    @staticmethod
+    def file_stamp(file_path: str) -> list:
+        """Size, modification time and inode of a file, from one stat() call"""
+        stat = os.stat(file_path)
+        return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+    
+    def known_hash(self, file_path: str, stamp: Optional[list] = None) -> Optional[str]:
+        """Remembered content hash of a file if its stamp is unchanged, without reading the file"""
+        stamp = stamp or self.file_stamp(file_path)
+        with self._lock:
+            known = self._load_stamps().get(os.path.abspath(file_path))
+        if known is not None and known[:3] == stamp:
+            return known[3]
+        return None
+    
+    def remember(self, hashes: Dict[str, Tuple[list, str]]):
+        """Record content hashes computed elsewhere, as {file_path: (stamp, content_hash)}"""
+        with self._lock:
+            stamps = self._load_stamps()
+            for file_path, (stamp, content_hash) in hashes.items():
+                path = os.path.abspath(file_path)
+                previous = stamps.get(path)
+                if previous is not None:
+                    self._paths_by_hash.get(previous[3], set()).discard(path)
+                stamps[path] = list(stamp) + [content_hash]
+                self._paths_by_hash.setdefault(content_hash, set()).add(path)
+            if self.enabled and hashes:
+                self._index_changed()
+    
+    def _forget_hashes(self, content_hashes):
+        """Drop the remembered stamps of files with these contents; caller holds the lock"""
+        stamps = self._load_stamps()
+        for content_hash in content_hashes:
+            for path in self._paths_by_hash.pop(content_hash, ()):
+                stamps.pop(path, None)
+                self._index_changed()
+    
+    def _index_changed(self):
+        """Schedule one index write for this and any further changes; caller holds the lock"""
+        self._index_dirty = True
+        if self._index_timer is None:
+            self._index_timer = threading.Timer(self.index_write_delay, self.flush)
+            self._index_timer.daemon = True
+            self._index_timer.start()
+    
+    def flush(self):
+        """Write the remembered hashes now if they changed"""
+        with self._lock:
+            if self._index_timer is not None:
+                self._index_timer.cancel()
+                self._index_timer = None
+            # Nothing to describe if the entries are gone (e.g. a removed temporary directory)
+            if self._index_dirty and os.path.isdir(self.cache_dir):
+                _write_json_atomically(os.path.join(self.cache_dir, INDEX_FILE_NAME), self._stamps)
+            self._index_dirty = False
+    
+    def content_hash(self, file_path: str) -> str:
+        """Hash of a file's contents, re-reading the file only if its stat stamp changed"""
+        stamp = self.file_stamp(file_path)
+        known = self.known_hash(file_path, stamp)
+        if known is not None:
+            return known
+        content_hash = file_content_hash(file_path)
+        self.remember({file_path: (stamp, content_hash)})
+        return content_hash
+    
+    def _entry_path(self, content_hash: str, options: Tuple) -> str:
+        # The content hash leads the name so evicted entries can be traced back to it
+        options_text = "-".join(str(option) for option in options)
+        options_key = hashlib.sha256(f"{PARSER_VERSION}:{options_text}".encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{content_hash}.{options_key}.json")
+    
+    @staticmethod
+    def _entry_hash(path: str) -> str:
+        return os.path.basename(path).split(".")[0]
+    
+    def get(self, file_path: str, options: Tuple, content_hash: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return the cached parse result of file_path with these parser options, or None"""
+        if not self.enabled:
+            return None
+        path = self._entry_path(content_hash or self.content_hash(file_path), options)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        
+        now = self._clock()
+        if now - entry["stored_at"] >= self.ttl_seconds:
+            self._remove(path)
+            with self._lock:
+                self._forget_hashes([self._entry_hash(path)])
+                self.misses += 1
+            return None
+        try:
+            os.utime(path, (now, now))  # Recency for LRU eviction
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return entry["result"]
+    
+    def put(self, file_path: str, options: Tuple, result: Dict[str, Any], content_hash: Optional[str] = None):
+        """Store the parse result of file_path with these parser options"""
+        if not self.enabled:
+            return
+        path = self._entry_path(content_hash or self.content_hash(file_path), options)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+        now = self._clock()
+        _write_json_atomically(path, {"stored_at": now, "result": result})
+        os.utime(path, (now, now))
+        size = os.path.getsize(path)
+        with self._lock:
+            self._total_bytes = self._scan_total() if self._total_bytes is None else (
+                self._total_bytes + size - previous_size)
+            if self._total_bytes > self.max_bytes:
+                self._evict(keep=path)
+    
+    def _entries(self):
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return []
+        entries = []
+        for name in names:
+            if name.endswith(".json") and name != INDEX_FILE_NAME:
+                try:
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, os.path.join(self.cache_dir, name)))
+        return entries
+    
+    def _scan_total(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+    
+    def _evict(self, keep: str):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        entries = sorted(self._entries())
+        self._total_bytes = sum(size for _, size, _ in entries)
+        evicted = set()
+        for _, size, path in entries:
+            if self._total_bytes <= self.max_bytes:
+                break
+            if path != keep and self._remove(path):
+                self._total_bytes -= size
+                evicted.add(path)
+        # Forget the files whose contents no longer have any entry
+        remaining = {self._entry_hash(path) for _, _, path in entries if path not in evicted}
+        self._forget_hashes({self._entry_hash(path) for path in evicted} - remaining)
+    
+    def _remove(self, path: str) -> bool:
+        try:
+            os.unlink(path)
+            return True
+        except FileNotFoundError:
+            return False
+    
+    def clear(self):
+        """Delete every entry and forget the remembered file hashes"""
+        with self._lock:
+            if self._index_timer is not None:
+                self._index_timer.cancel()
+                self._index_timer = None
+            for _, _, path in self._entries():
+                self._remove(path)
+            self._remove(os.path.join(self.cache_dir, INDEX_FILE_NAME))
+            self._stamps = {}
+            self._paths_by_hash = {}
+            self._index_dirty = False
+            self._total_bytes = 0
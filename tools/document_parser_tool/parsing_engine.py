@@ -0,0 +1,371 @@
+"""
+Document Parsing Engine for the Multi-Agent Research System
+Streaming parsers that yield document text lazily in bounded chunks
+"""
+import codecs
+import mmap
+import os
+import re
+import zipfile
+from html.parser import HTMLParser
+from typing import Callable, Dict, Any, Iterator, List, NamedTuple, Optional
+from xml.etree.ElementTree import iterparse
+
+# Bytes decoded per step when reading plain-text files
+DEFAULT_CHUNK_BYTES = 1 << 16
+
+# Characters of a single line buffered before it is passed on unfinished
+MAX_LINE_CHARS = 1 << 16
+
+TITLE_MAX_CHARS = 200
+
+
+class Segment(NamedTuple):
+    """A piece of document text and the (1-based) page it belongs to"""
+    page: int
+    text: str
+
+
+# format -> callable(file_path, chunk_bytes) returning an iterator of Segments
+PARSERS: Dict[str, Callable[[str, int], Iterator[Segment]]] = {}
+
+
+def register_parser(format_name: str, parser: Callable[[str, int], Iterator[Segment]]):
+    """
+    Register (or replace) the parser for a document format.
+    
+    A parser takes the file path and a chunk size in bytes and yields Segments in
+    document order. It should read the file incrementally so memory use does not
+    grow with the file size.
+    """
+    PARSERS[format_name] = parser
+
+
+def iter_decoded(file_path: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES, encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Decode a file in chunks through a memory map.
+    
+    Only one chunk of bytes is copied out of the page cache at a time, and multi-byte
+    characters split across chunk boundaries are handled by an incremental decoder.
+    Invalid bytes are replaced rather than raising.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for start in range(0, len(mapped), chunk_bytes):
+                text = decoder.decode(mapped[start:start + chunk_bytes])
+                if text:
+                    yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _paged(chunks: Iterator[str]) -> Iterator[Segment]:
+    """Split decoded text into pages at form feeds, the page separator of plain-text exports"""
+    page = 1
+    for chunk in chunks:
+        parts = chunk.split("\f")
+        for index, part in enumerate(parts):
+            if index:
+                page += 1
+            if part:
+                yield Segment(page, part)
+
+
+def _line_blocks(chunks: Iterator[str]) -> Iterator[str]:
+    """Re-cut text chunks so each block ends at a line end, capping the length of a pending line"""
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        cut = pending.rfind("\n") + 1
+        if cut:
+            yield pending[:cut]
+            pending = pending[cut:]
+        elif len(pending) > MAX_LINE_CHARS:
+            yield pending
+            pending = ""
+    if pending:
+        yield pending
+
+
+def parse_text(file_path: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Iterator[Segment]:
+    """Plain text: decoded as is, paged at form feeds"""
+    return _paged(iter_decoded(file_path, chunk_bytes))
+
+
+MARKDOWN_PATTERNS = [
+    (re.compile(r"^[ \t]{0,3}([-*_])([ \t]*\1){2,}[ \t]*$", re.M), ""),   # horizontal rules
+    (re.compile(r"!\[([^\]\n]*)\]\([^)\n]*\)"), r"\1"),                 # images -> alt text
+    (re.compile(r"\[([^\]\n]*)\]\([^)\n]*\)"), r"\1"),                  # links -> link text
+    (re.compile(r"^[ \t]{0,3}(#{1,6}|>+|[-*+]|\d+[.)])[ \t]+", re.M), ""),  # headings, quotes, list markers
+    (re.compile(r"\*\*|__|`"), ""),                                          # bold and inline code markers
+]
+MARKDOWN_FENCE = re.compile(r"^[ \t]{0,3}(?:```|~~~).*(?:\n|$)", re.M)
+
+
+def parse_markdown(file_path: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Iterator[Segment]:
+    """Markdown: markup stripped from whole blocks of lines, fenced code kept verbatim"""
+    def plain_blocks():
+        in_code = False
+        for block in _line_blocks(iter_decoded(file_path, chunk_bytes)):
+            position = 0
+            # Fence lines toggle between prose, which is cleaned, and code, which is not
+            for fence in MARKDOWN_FENCE.finditer(block):
+                yield block[position:fence.start()] if in_code else _strip_markdown(block[position:fence.start()])
+                in_code = not in_code
+                position = fence.end()
+            yield block[position:] if in_code else _strip_markdown(block[position:])
+    return _paged(text for text in plain_blocks() if text)
+
+
+def _strip_markdown(text: str) -> str:
+    for pattern, replacement in MARKDOWN_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+class _HTMLTextExtractor(HTMLParser):
+    """Collects visible text from HTML fed to it incrementally"""
+    
+    BLOCK_TAGS = frozenset(["p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6",
+                            "section", "article", "header", "footer", "blockquote", "pre", "table"])
+    SKIP_TAGS = frozenset(["script", "style", "noscript", "template"])
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.pieces: List[str] = []
+        self.title: Optional[str] = None
+        self._skip_depth = 0
+        self._in_title = False
+        self._title_parts: List[str] = []
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag in self.BLOCK_TAGS:
+            self.pieces.append("\n")
+    
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == "title":
+            self._in_title = False
+            self.title = " ".join("".join(self._title_parts).split())[:TITLE_MAX_CHARS] or None
+        elif tag in self.BLOCK_TAGS:
+            self.pieces.append("\n")
+    
+    def handle_data(self, data):
+        if self._in_title:
+            self._title_parts.append(data)
+        elif not self._skip_depth:
+            self.pieces.append(data)
+    
+    def take(self) -> str:
+        """Return and forget the text collected so far"""
+        text = "".join(self.pieces)
+        self.pieces.clear()
+        return text
+
+
+class HTMLSegments:
+    """Iterator of Segments for an HTML file; exposes the <title> once it has been read"""
+    
+    def __init__(self, file_path: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES):
+        self.extractor = _HTMLTextExtractor()
+        self._segments = self._parse(file_path, chunk_bytes)
+    
+    @property
+    def title(self) -> Optional[str]:
+        return self.extractor.title
+    
+    def _parse(self, file_path: str, chunk_bytes: int) -> Iterator[Segment]:
+        for chunk in iter_decoded(file_path, chunk_bytes):
+            self.extractor.feed(chunk)
+            text = self.extractor.take()
+            if text:
+                yield Segment(1, text)
+        self.extractor.close()
+        text = self.extractor.take()
+        if text:
+            yield Segment(1, text)
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self) -> Segment:
+        return next(self._segments)
+
+
+def parse_html(file_path: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Iterator[Segment]:
+    """HTML: visible text, with block elements on their own lines and scripts and styles dropped"""
+    return HTMLSegments(file_path, chunk_bytes)
+
+
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def parse_docx(file_path: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Iterator[Segment]:
+    """
+    DOCX: paragraph text streamed from word/document.xml with iterparse.
+    
+    Pages follow explicit and rendered page breaks; finished elements are cleared so
+    memory stays bounded for large documents.
+    """
+    page = 1
+    text_on_page = False
+    with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as document:
+        parts: List[str] = []
+        for event, element in iterparse(document, events=("start", "end")):
+            tag = element.tag
+            if event == "start":
+                if tag == WORD_NAMESPACE + "lastRenderedPageBreak" or (
+                        tag == WORD_NAMESPACE + "br" and element.get(WORD_NAMESPACE + "type") == "page"):
+                    # Word also records a rendered break right after an explicit one; count it once
+                    if text_on_page:
+                        if parts:
+                            yield Segment(page, "".join(parts))
+                            parts = []
+                        page += 1
+                        text_on_page = False
+                continue
+            if tag == WORD_NAMESPACE + "t":
+                parts.append(element.text or "")
+                text_on_page = True
+            elif tag == WORD_NAMESPACE + "tab":
+                parts.append("\t")
+            elif tag == WORD_NAMESPACE + "p":
+                parts.append("\n")
+                if sum(len(part) for part in parts) >= chunk_bytes:
+                    yield Segment(page, "".join(parts))
+                    parts = []
+                element.clear()
+        if parts:
+            yield Segment(page, "".join(parts))
+
+
+def parse_pdf(file_path: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Iterator[Segment]:
+    """
+    PDF: text of each page via the optional pypdf package.
+    
+    Pages are extracted one at a time. Register a different parser for "pdf" to use
+    another library.
+    """
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise ImportError("PDF parsing needs the optional 'pypdf' package (pip install pypdf), "
+                          "or register another parser for 'pdf'")
+    reader = PdfReader(file_path)
+    for number, page in enumerate(reader.pages, 1):
+        text = page.extract_text() or ""
+        if text:
+            yield Segment(number, text if text.endswith("\n") else text + "\n")
+
+
+register_parser("txt", parse_text)
+register_parser("md", parse_markdown)
+register_parser("markdown", parse_markdown)
+register_parser("html", parse_html)
+register_parser("htm", parse_html)
+register_parser("docx", parse_docx)
+register_parser("pdf", parse_pdf)
+
+
+def iter_segments(file_path: str, format_name: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Iterator[Segment]:
+    """Yield the text of a document lazily in (page, text) segments"""
+    parser = PARSERS.get(format_name)
+    if parser is None:
+        raise ValueError(f"No parser registered for format '{format_name}'")
+    return parser(file_path, chunk_bytes)
+
+
+def iter_pages(file_path: str, format_name: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Iterator[str]:
+    """Yield a document page by page; only the current page is held in memory"""
+    current_page, parts = None, []
+    for segment in iter_segments(file_path, format_name, chunk_bytes):
+        if segment.page != current_page and current_page is not None:
+            yield "".join(parts)
+            parts = []
+        current_page = segment.page
+        parts.append(segment.text)
+    if parts:
+        yield "".join(parts)
+
+
+class DocumentStats:
+    """Word, page and character counts plus a title, accumulated over streamed segments"""
+    
+    def __init__(self):
+        self.word_count = 0
+        self.page_count = 0
+        self.char_count = 0
+        self.title: Optional[str] = None
+        self._in_word = False
+        self._title_line = ""
+    
+    def add(self, segment: Segment):
+        text = segment.text
+        if segment.page != self.page_count:
+            self._in_word = False  # Page breaks separate words
+        self.page_count = max(self.page_count, segment.page)
+        self.char_count += len(text)
+        if not text:
+            return
+        words = len(text.split())
+        # A word cut by the segment boundary was already counted with the previous segment
+        if self._in_word and not text[0].isspace():
+            words -= 1
+        self.word_count += max(words, 0)
+        self._in_word = not text[-1].isspace()
+        if self.title is None:
+            self._take_title(text)
+    
+    def _take_title(self, text: str):
+        """Use the first non-empty line as the title"""
+        for line in text.splitlines(keepends=True):
+            self._title_line += line
+            if line.endswith(("\n", "\r")) or len(self._title_line) >= TITLE_MAX_CHARS:
+                title = " ".join(self._title_line.split())
+                self._title_line = ""
+                if title:
+                    self.title = title[:TITLE_MAX_CHARS]
+                    return
+    
+    def to_dict(self) -> Dict[str, Any]:
+        title = self.title
+        if title is None and self._title_line.strip():
+            title = " ".join(self._title_line.split())[:TITLE_MAX_CHARS]
+        return {"word_count": self.word_count, "page_count": self.page_count,
+                "char_count": self.char_count, "title": title}
+
+
+def parse_document(file_path: str, format_name: str, max_content_chars: int,
+                   chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Dict[str, Any]:
+    """
+    Parse a document in a single streaming pass.
+    
+    Returns the first max_content_chars characters of text as "content" and the
+    document's statistics as "metadata" (with "truncated" set when text was left out),
+    holding no more than one chunk plus the kept content in memory.
+    """
+    stats = DocumentStats()
+    kept: List[str] = []
+    kept_chars = 0
+    segments = iter_segments(file_path, format_name, chunk_bytes)
+    for segment in segments:
+        stats.add(segment)
+        if kept_chars < max_content_chars:
+            piece = segment.text[:max_content_chars - kept_chars]
+            kept.append(piece)
+            kept_chars += len(piece)
+    
+    metadata = stats.to_dict()
+    if getattr(segments, "title", None):
+        metadata["title"] = segments.title
+    metadata["truncated"] = stats.char_count > kept_chars
+    return {"content": "".join(kept), "metadata": metadata}
@@ -0,0 +1,114 @@
+"""
+Execution statistics for the Multi-Agent Research System
+Constant-memory latency histograms and per-tool aggregates used by the tool execution service
+"""
+import math
+from typing import Dict, Any, List, Optional
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with a fixed number of buckets.
+    
+    Bucket boundaries grow geometrically from ``min_latency`` to ``max_latency``, so
+    memory use is constant no matter how many samples are recorded. Percentiles are
+    approximated by the upper bound of the bucket they fall into, which keeps the
+    relative error below ``growth_factor - 1``.
+    """
+    
+    def __init__(self, min_latency: float = 0.0001, max_latency: float = 600.0,
+                 growth_factor: float = 1.1):
+        self.min_latency = min_latency
+        self.max_latency = max_latency
+        self.growth_factor = growth_factor
+        self._log_growth = math.log(growth_factor)
+        num_buckets = int(math.ceil(math.log(max_latency / min_latency) / self._log_growth)) + 1
+        # counts[0] holds everything at or below min_latency, the last bucket everything above max
+        self.counts: List[int] = [0] * (num_buckets + 1)
+        self.total_count = 0
+        self.total_latency = 0.0
+        self.min_seen: Optional[float] = None
+        self.max_seen: Optional[float] = None
+    
+    def _bucket_index(self, latency: float) -> int:
+        if latency <= self.min_latency:
+            return 0
+        index = int(math.ceil(math.log(latency / self.min_latency) / self._log_growth))
+        return min(index, len(self.counts) - 1)
+    
+    def _bucket_upper_bound(self, index: int) -> float:
+        return self.min_latency * (self.growth_factor ** index)
+    
+    def record(self, latency: float):
+        """Record a single latency sample in seconds"""
+        self.counts[self._bucket_index(latency)] += 1
+        self.total_count += 1
+        self.total_latency += latency
+        self.min_seen = latency if self.min_seen is None else min(self.min_seen, latency)
+        self.max_seen = latency if self.max_seen is None else max(self.max_seen, latency)
+    
+    def percentile(self, pct: float) -> Optional[float]:
+        """Return the approximate latency at the given percentile (0-100)"""
+        if self.total_count == 0:
+            return None
+        rank = max(1, int(math.ceil(pct / 100.0 * self.total_count)))
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                if index == len(self.counts) - 1:
+                    return self.max_seen  # Overflow bucket has no upper bound
+                # Never report more than the largest latency actually observed
+                return min(self._bucket_upper_bound(index), self.max_seen)
+        return self.max_seen
+    
+    def mean(self) -> Optional[float]:
+        """Return the mean latency of all recorded samples"""
+        if self.total_count == 0:
+            return None
+        return self.total_latency / self.total_count
+
+
+class ToolStats:
+    """Constant-memory aggregate statistics for one tool"""
+    
+    def __init__(self, tool_id: str):
+        self.tool_id = tool_id
+        self.count = 0
+        self.error_count = 0
+        self.rejected_count = 0  # Calls failed fast by an open circuit breaker
+        self.hedged_count = 0  # Calls that fired a backup request
+        self.last_executed: Optional[float] = None
+        self.latency = LatencyHistogram()
+    
+    def record(self, duration: float, success: bool, timestamp: float):
+        """Record the outcome of a single execution"""
+        self.count += 1
+        if not success:
+            self.error_count += 1
+        self.last_executed = timestamp
+        self.latency.record(duration)
+    
+    def record_rejection(self, timestamp: float):
+        """Record a call rejected without executing; excluded from latency percentiles"""
+        self.rejected_count += 1
+        self.last_executed = timestamp
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a serializable summary of these statistics"""
+        return {
+            "tool_id": self.tool_id,
+            "count": self.count,
+            "error_count": self.error_count,
+            "error_rate": self.error_count / self.count if self.count else 0.0,
+            "rejected_count": self.rejected_count,
+            "hedged_count": self.hedged_count,
+            "last_executed": self.last_executed,
+            "latency": {
+                "mean": self.latency.mean(),
+                "min": self.latency.min_seen,
+                "max": self.latency.max_seen,
+                "p50": self.latency.percentile(50),
+                "p95": self.latency.percentile(95),
+                "p99": self.latency.percentile(99)
+            }
+        }
@@ -3,11 +3,17 @@ Statistical Analysis Tool for the Multi-Agent Research System
 """
 from tools.tool_framework import Tool
 from tools.config.tool_config import ToolConfig, DEFAULT_CONFIGS
-from typing import Dict, Any
+from tools.dataset_store import DatasetStore, DEFAULT_DATASET_STORE_PATH
+from tools.statistical_analysis_tool import stats_engine
+from tools.statistical_analysis_tool.streaming_stats import StreamingStatistics
+import numpy as np
+from typing import Dict, Any, Iterator, List
 
 
 class StatisticalAnalysisTool(Tool):
-    """Tool for performing statistical analysis - example implementation"""
+    """Tool for performing statistical analysis with the NumPy statistics engine"""
+    
+    idempotent = True  # Pure computation over the inputs
     
     def __init__(self):
         super().__init__(
@@ -27,8 +33,8 @@ class StatisticalAnalysisTool(Tool):
         return {
             "data": {
                 "type": "array",
-                "required": True,
-                "description": "Array of numerical values to analyze",
+                "required": False,
+                "description": "Array of numerical values to analyze, or array of rows (one value per variable) for multivariate correlation and regression",
                 "max_items": self.config.get("max_data_points", 10000)
             },
             "analysis_type": {
@@ -37,31 +43,160 @@ class StatisticalAnalysisTool(Tool):
                 "default": "descriptive",
                 "enum": supported_analysis_types,
                 "description": f"Type of analysis to perform ({', '.join(supported_analysis_types)})"
+            },
+            "streaming": {
+                "type": "boolean",
+                "required": False,
+                "default": False,
+                "description": "Treat data as a stream of chunks (numbers or arrays of numbers) and compute "
+                               "descriptive statistics in constant memory; implied when data is an iterator"
+            },
+            "partial_results": {
+                "type": "array",
+                "required": False,
+                "description": "States returned by earlier streaming analyses (e.g. on other workers) to merge in"
+            },
+            "dataset": {
+                "type": "object",
+                "required": False,
+                "description": "Handle of a dataset in the dataset store, analyzed in place of data without copying it"
+            },
+            "store_data": {
+                "type": "boolean",
+                "required": False,
+                "default": False,
+                "description": "Write data to the dataset store and return its handle instead of echoing the input"
             }
         }
     
+    @property
+    def datasets(self) -> DatasetStore:
+        """Dataset store holding the series passed by handle"""
+        return DatasetStore.for_path(self.config.get("dataset_store_path", DEFAULT_DATASET_STORE_PATH))
+    
     def execute(self, **params) -> Dict[str, Any]:
-        data = params.get("data", [])
         analysis_type = params.get("analysis_type", "descriptive")
+        dataset = params.get("dataset")
         
-        print(f"Performing {analysis_type} analysis on data with {len(data)} values")
-        
-        # Mock statistical analysis
-        if data:
-            mean_val = sum(data) / len(data)
-            min_val = min(data)
-            max_val = max(data)
+        if self._is_streaming(params):
+            print(f"Performing streaming {analysis_type} analysis")
+        elif dataset is not None:
+            print(f"Performing {analysis_type} analysis on dataset {dataset.get('dataset_id')} "
+                  f"with {dataset.get('length')} values")
         else:
-            mean_val, min_val, max_val = 0, 0, 0
+            print(f"Performing {analysis_type} analysis on data with {len(params.get('data', []))} values")
+        
+        return self._run(params)
+    
+    def execute_batch(self, params_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # One log line and one pass over the requests instead of N full tool invocations
+        total_values = sum(self._value_count(params) for params in params_list)
+        print(f"Performing batch analysis of {len(params_list)} series with {total_values} values")
+        
+        return [self._run(params) for params in params_list]
+    
+    def _value_count(self, params: Dict[str, Any]) -> int:
+        """Number of values in a request, or 0 for streams of unknown length"""
+        if params.get("dataset") is not None:
+            return params["dataset"].get("length", 0)
+        if self._is_streaming(params):
+            return 0
+        return len(params.get("data", []))
+    
+    def _run(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyze one request, reading datasets from the store and storing data if asked to"""
+        analysis_type = params.get("analysis_type", "descriptive")
+        data = params.get("data", [])
+        dataset = params.get("dataset")
+        if "data" not in params and dataset is None:
+            raise ValueError("Either data or dataset is required")
+        
+        if self._is_streaming(params):
+            chunks = self.datasets.chunks(dataset) if dataset is not None else data
+            result = self._analyze_stream(chunks, analysis_type, params.get("partial_results") or [])
+            if dataset is not None:
+                result["dataset"] = dataset
+            return result
+        
+        if dataset is None and not params.get("store_data"):
+            return self._analyze(data, analysis_type)
+        
+        if dataset is None:
+            dataset = self.datasets.put(data)
+        result = self._analyze(self.datasets.open(dataset), analysis_type)
+        # Only the handle goes back; the series itself stays in the store
+        del result["input_data"]
+        result["dataset"] = dataset
+        return result
+    
+    def _is_streaming(self, params: Dict[str, Any]) -> bool:
+        return bool(params.get("streaming")) or isinstance(params.get("data"), Iterator)
+    
+    def _analyze_stream(self, chunks, analysis_type: str, partial_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Descriptive statistics over an iterable of chunks without holding the data in memory.
+        
+        The result carries a "state" that can be passed back in partial_results to merge
+        analyses of different parts of a data set.
+        """
+        if analysis_type != "descriptive":
+            raise ValueError(f"Streaming mode supports only descriptive analysis, not {analysis_type}")
         
+        stats = StreamingStatistics(self.config.get("sketch_k", 200)).update_all(chunks)
+        for state in partial_results:
+            stats.merge(StreamingStatistics.from_dict(state))
         return {
             "analysis_type": analysis_type,
-            "input_data": data,
-            "statistics": {
-                "count": len(data),
-                "mean": mean_val,
-                "min": min_val,
-                "max": max_val,
-                "range": max_val - min_val if data else 0
+            "streaming": True,
+            "statistics": stats.result(),
+            "state": stats.to_dict()
+        }
+    
+    def _analyze(self, data: List[Any], analysis_type: str) -> Dict[str, Any]:
+        """
+        Compute the statistics for a single series.
+        
+        A flat array is one variable; correlation and regression then relate it to its
+        index. An array of rows holds one variable per column; regression fits the last
+        column on the others.
+        """
+        values = stats_engine.as_float_array(data)
+        result = {"analysis_type": analysis_type, "input_data": data}
+        
+        if values.ndim == 2:
+            result["statistics"] = {
+                "count": values.shape[0],
+                "variables": values.shape[1],
+                "columns": [stats_engine.describe(np.ascontiguousarray(column)) for column in values.T]
             }
-        }
\ No newline at end of file
+            if analysis_type == "correlation":
+                result["correlation"] = self._correlation_matrices(values)
+            elif analysis_type == "regression":
+                result["regression"] = (stats_engine.ols(values[:, :-1], values[:, -1])
+                                        if values.shape[0] > values.shape[1] else None)
+            return result
+        
+        summary = stats_engine.moments(values)
+        result["statistics"] = stats_engine.describe(values, summary=summary)
+        if analysis_type == "correlation":
+            result["correlation"] = self._index_correlation(values, summary)
+        elif analysis_type == "regression":
+            result["regression"] = stats_engine.trend(values, summary) if len(values) > 1 else None
+        return result
+    
+    def _index_correlation(self, values, summary) -> Dict[str, Any]:
+        """Pearson and Spearman correlation of a series with its index"""
+        if len(values) < 2:
+            return {"pearson": None, "spearman": None}
+        ranks = stats_engine.rank(values)
+        return {
+            "pearson": stats_engine.trend(values, summary)["r"],
+            "spearman": stats_engine.trend(ranks)["r"]
+        }
+    
+    def _correlation_matrices(self, values) -> Dict[str, Any]:
+        """Pearson and Spearman correlation matrices between the columns of values"""
+        if values.shape[0] < 2:
+            return {"pearson": None, "spearman": None}
+        return {method: stats_engine.matrix_to_list(stats_engine.correlation_matrix(values, method))
+                for method in ("pearson", "spearman")}
@@ -0,0 +1,219 @@
+"""
+Statistics Engine for the Multi-Agent Research System
+NumPy-vectorized descriptive statistics, correlation matrices and OLS regression
+"""
+import numpy as np
+from typing import Dict, Any, Optional, Sequence, Tuple
+
+# Values per block in the single-pass moment computation. A block of float64 (512 KiB)
+# stays in cache while its sum, extremes and centered moments are taken.
+BLOCK_SIZE = 1 << 16
+
+DEFAULT_QUANTILES = (0.25, 0.5, 0.75)
+
+
+def as_float_array(data: Any) -> np.ndarray:
+    """Return data as a C-contiguous float64 array, without copying if it already is one"""
+    return np.ascontiguousarray(data, dtype=np.float64)
+
+
+def _block_moments(block: np.ndarray):
+    """Count, mean, second and third central moment sums, min and max of one block"""
+    n = block.shape[0]
+    mean = np.add.reduce(block) / n
+    centered = block - mean
+    squared = centered * centered
+    return n, mean, np.add.reduce(squared), np.dot(squared, centered), block.min(), block.max()
+
+
+EMPTY_MOMENTS = (0, 0.0, 0.0, 0.0, np.inf, -np.inf)
+
+
+def merge_moments(a: Tuple, b: Tuple) -> Tuple:
+    """
+    Combine two (count, mean, M2, M3, min, max) summaries of disjoint data.
+    
+    Uses the pairwise update of Chan et al. (extended to M3 by Pebay), which keeps the
+    result as accurate as the two-pass textbook formulas.
+    """
+    n_a, mean_a, m2_a, m3_a, min_a, max_a = a
+    n_b, mean_b, m2_b, m3_b, min_b, max_b = b
+    total = n_a + n_b
+    if total == 0:
+        return EMPTY_MOMENTS
+    delta = mean_b - mean_a
+    m3 = (m3_a + m3_b
+          + delta ** 3 * n_a * n_b * (n_a - n_b) / (total * total)
+          + 3.0 * delta * (n_a * m2_b - n_b * m2_a) / total)
+    m2 = m2_a + m2_b + delta * delta * n_a * n_b / total
+    mean = mean_a + delta * n_b / total
+    return total, mean, m2, m3, min(min_a, min_b), max(max_a, max_b)
+
+
+def moments(values: np.ndarray, block_size: int = BLOCK_SIZE) -> Tuple:
+    """
+    Compute count, mean, M2, M3 (sums of squared and cubed deviations), min and max
+    in a single pass over values.
+    
+    Each cache-sized block is reduced on its own and merged into the running totals
+    with merge_moments().
+    """
+    summary = EMPTY_MOMENTS
+    for start in range(0, values.shape[0], block_size):
+        summary = merge_moments(summary, _block_moments(values[start:start + block_size]))
+    return summary
+
+
+def quantile_key(q: float) -> str:
+    """Result key for a quantile, e.g. p25 for 0.25"""
+    return f"p{round(q * 100):g}"
+
+
+def summarize(summary: Tuple, quantile_values: Dict[str, float]) -> Dict[str, Any]:
+    """
+    Descriptive statistics from a moments() summary and precomputed quantiles.
+    
+    Variance and standard deviation are sample estimates (n - 1) and are None for fewer
+    than two values; skewness is the population (biased) estimate and is None when the
+    values are constant. Empty input gives zeros for count, mean, min, max and range.
+    """
+    count, mean, m2, m3, minimum, maximum = summary
+    if count == 0:
+        return {"count": 0, "mean": 0, "min": 0, "max": 0, "range": 0,
+                "variance": None, "std": None, "skewness": None, "quantiles": {}}
+    
+    variance = m2 / (count - 1) if count > 1 else None
+    skewness = None
+    if m2 > 0:
+        skewness = float(np.sqrt(count) * m3 / m2 ** 1.5)
+    return {
+        "count": int(count),
+        "mean": float(mean),
+        "min": float(minimum),
+        "max": float(maximum),
+        "range": float(maximum - minimum),
+        "variance": float(variance) if variance is not None else None,
+        "std": float(np.sqrt(variance)) if variance is not None else None,
+        "skewness": skewness,
+        "quantiles": quantile_values
+    }
+
+
+def describe(values: np.ndarray, quantiles: Sequence[float] = DEFAULT_QUANTILES,
+             summary: Optional[Tuple] = None) -> Dict[str, Any]:
+    """
+    Descriptive statistics for a 1-D array (see summarize() for the measures).
+    Pass the result of moments() as summary to avoid a second pass.
+    """
+    summary = summary if summary is not None else moments(values)
+    quantile_values = {}
+    if summary[0] and quantiles:
+        quantile_values = {quantile_key(q): float(v) for q, v in zip(quantiles, np.quantile(values, quantiles))}
+    return summarize(summary, quantile_values)
+
+
+def trend(values: np.ndarray, summary: Optional[Tuple] = None,
+          block_size: int = BLOCK_SIZE) -> Dict[str, Any]:
+    """
+    OLS fit of a 1-D series against its index (0, 1, 2, ...), without building the index.
+    
+    The index mean and sum of squares have closed forms, so besides the series moments
+    (pass the result of moments() as summary to reuse it) only the cross term needs a
+    pass over the values. The returned "r" is the Pearson correlation with the index.
+    """
+    count, mean, m2, _, _, _ = summary if summary is not None else moments(values, block_size)
+    if count < 2:
+        raise ValueError(f"Regression against the index needs at least 2 values ({count} given)")
+    
+    index_mean = (count - 1) / 2.0
+    index_ss = count * (count * count - 1) / 12.0
+    cross = 0.0
+    for start in range(0, count, block_size):
+        block = values[start:start + block_size]
+        cross += float(np.dot(np.arange(start, start + block.shape[0]) - index_mean, block))
+    slope = cross / index_ss
+    residual_ss = max(m2 - slope * cross, 0.0)
+    return {
+        "intercept": float(mean - slope * index_mean),
+        "coefficients": [slope],
+        "r_squared": float(cross * cross / (index_ss * m2)) if m2 > 0 else None,
+        "std_error": float(np.sqrt(residual_ss / (count - 2))) if count > 2 else None,
+        "n": int(count),
+        "r": float(cross / np.sqrt(index_ss * m2)) if m2 > 0 else None
+    }
+
+
+def rank(values: np.ndarray) -> np.ndarray:
+    """Ranks starting at 1 for a 1-D array, with tied values sharing their average rank"""
+    order = np.argsort(values, kind="mergesort")
+    sorted_values = values[order]
+    is_first = np.empty(values.shape[0], dtype=bool)
+    is_first[:1] = True
+    np.not_equal(sorted_values[1:], sorted_values[:-1], out=is_first[1:])
+    # Dense rank of every value, then the start and end position of each run of ties
+    dense = np.empty(values.shape[0], dtype=np.intp)
+    dense[order] = np.cumsum(is_first)
+    bounds = np.append(np.flatnonzero(is_first), values.shape[0])
+    return 0.5 * (bounds[dense] + bounds[dense - 1] + 1)
+
+
+def correlation_matrix(matrix: np.ndarray, method: str = "pearson") -> np.ndarray:
+    """
+    Correlation matrix between the columns of an (observations x variables) array.
+    
+    Pearson is computed from one centered matrix product; Spearman is Pearson on the
+    column ranks. Constant columns give NaN correlations.
+    """
+    if method == "spearman":
+        matrix = np.column_stack([rank(column) for column in matrix.T])
+    elif method != "pearson":
+        raise ValueError(f"Unknown correlation method: {method}")
+    
+    centered = matrix - matrix.mean(axis=0)
+    cross = centered.T @ centered
+    scale = np.sqrt(np.diag(cross))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        result = cross / np.outer(scale, scale)
+    return np.clip(result, -1.0, 1.0, out=result)
+
+
+def ols(x: np.ndarray, y: np.ndarray) -> Dict[str, Any]:
+    """
+    Ordinary least squares fit of y on the columns of x, with an intercept.
+    
+    Args:
+        x: (n,) or (n, k) array of predictors
+        y: (n,) array of responses
+    
+    Returns:
+        Dictionary with the intercept, one coefficient per predictor, r_squared,
+        the residual standard error and the number of observations
+    """
+    if x.ndim == 1:
+        x = x[:, np.newaxis]
+    n, k = x.shape
+    if n <= k:
+        raise ValueError(f"Regression needs more observations than predictors ({n} <= {k})")
+    
+    # Solving on centered data keeps the intercept out of the least-squares problem
+    x_mean = x.mean(axis=0)
+    y_mean = y.mean()
+    x_centered = x - x_mean
+    y_centered = y - y_mean
+    coefficients, _, _, _ = np.linalg.lstsq(x_centered, y_centered, rcond=None)
+    residuals = y_centered - x_centered @ coefficients
+    residual_ss = float(residuals @ residuals)
+    total_ss = float(y_centered @ y_centered)
+    degrees_of_freedom = n - k - 1
+    return {
+        "intercept": float(y_mean - x_mean @ coefficients),
+        "coefficients": coefficients.tolist(),
+        "r_squared": 1.0 - residual_ss / total_ss if total_ss > 0 else None,
+        "std_error": float(np.sqrt(residual_ss / degrees_of_freedom)) if degrees_of_freedom > 0 else None,
+        "n": n
+    }
+
+
+def matrix_to_list(matrix: np.ndarray) -> list:
+    """Nested lists for a result matrix, with NaN entries as None"""
+    return [[None if np.isnan(value) else float(value) for value in row] for row in matrix]
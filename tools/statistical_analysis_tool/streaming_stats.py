@@ -0,0 +1,193 @@
+"""
+Streaming Statistics for the Multi-Agent Research System
+Constant-memory, mergeable running moments and quantile sketches for unbounded data
+"""
+import math
+import numpy as np
+from typing import Dict, Any, Iterable, List, Optional, Sequence
+from tools.statistical_analysis_tool import stats_engine
+
+
+class RunningMoments:
+    """
+    Count, mean, M2, M3, min and max of a stream, updated chunk by chunk.
+    
+    Every chunk is reduced with NumPy and folded into the totals with the same pairwise
+    update that merges partial results from other workers, so update() and merge() give
+    the same answer as a single pass over all the data.
+    """
+    
+    def __init__(self):
+        self.summary = stats_engine.EMPTY_MOMENTS
+    
+    @property
+    def count(self) -> int:
+        return self.summary[0]
+    
+    def update(self, values: np.ndarray):
+        """Add a 1-D float64 array of values"""
+        if values.shape[0]:
+            self.summary = stats_engine.merge_moments(self.summary, stats_engine.moments(values))
+    
+    def merge(self, other: "RunningMoments"):
+        """Fold in the moments of another, disjoint part of the data"""
+        self.summary = stats_engine.merge_moments(self.summary, other.summary)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        count, mean, m2, m3, minimum, maximum = self.summary
+        if count == 0:
+            return {"count": 0}
+        return {"count": int(count), "mean": float(mean), "m2": float(m2), "m3": float(m3),
+                "min": float(minimum), "max": float(maximum)}
+    
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "RunningMoments":
+        moments = cls()
+        if state.get("count"):
+            moments.summary = (state["count"], state["mean"], state["m2"], state["m3"],
+                               state["min"], state["max"])
+        return moments
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch (Karnin, Lang and Liberty, 2016).
+    
+    Values are kept in a stack of compactors; level h holds items of weight 2**h. When a
+    level outgrows its capacity it is sorted and every other item (from a random offset)
+    is promoted to the next level. Memory stays around 3 * k items however long the
+    stream is, and the rank error is about 1.7 / k with high probability. Sketches with
+    the same k merge by concatenating their levels and compacting again.
+    """
+    
+    CAPACITY_DECAY = 2.0 / 3.0
+    
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        """
+        Args:
+            k: Capacity of the top compactor; larger k is more accurate and uses more memory
+            seed: Seed for the compaction offsets (for reproducible sketches)
+        """
+        if k < 8:
+            raise ValueError("KLL sketch k must be at least 8")
+        self.k = k
+        self.count = 0
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+    
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * self.CAPACITY_DECAY ** depth)))
+    
+    def update(self, values: np.ndarray):
+        """Add a 1-D float64 array of values"""
+        if values.shape[0]:
+            self.levels[0] = np.concatenate((self.levels[0], values))
+            self.count += values.shape[0]
+            self._compress()
+    
+    def merge(self, other: "KLLSketch"):
+        """Fold in a sketch of another, disjoint part of the data"""
+        if other.k != self.k:
+            raise ValueError(f"Cannot merge KLL sketches with different k ({self.k} and {other.k})")
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            if items.shape[0]:
+                self.levels[level] = np.concatenate((self.levels[level], items))
+        self.count += other.count
+        self._compress()
+    
+    def _compress(self):
+        # Adding a level lowers the capacity of every level below it, so start over
+        # from the bottom until no compactor is over capacity
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if items.shape[0] <= self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(items)
+            # An odd item out stays behind so no weight is lost
+            keep = items[:items.shape[0] % 2]
+            promoted = items[keep.shape[0] + int(self._rng.integers(2))::2]
+            self.levels[level] = keep.copy()
+            self.levels[level + 1] = np.concatenate((self.levels[level + 1], promoted))
+            level = 0
+    
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """Approximate values at the given quantiles (0 to 1); empty sketches give NaN"""
+        if self.count == 0:
+            return [math.nan] * len(qs)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(level.shape[0], 2.0 ** height)
+                                  for height, level in enumerate(self.levels)])
+        order = np.argsort(items, kind="mergesort")
+        cumulative = np.cumsum(weights[order])
+        targets = np.asarray(qs, dtype=np.float64) * cumulative[-1]
+        positions = np.searchsorted(cumulative, targets, side="left")
+        return items[order][np.minimum(positions, items.shape[0] - 1)].tolist()
+    
+    def __len__(self) -> int:
+        """Number of items retained"""
+        return sum(level.shape[0] for level in self.levels)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"k": self.k, "count": int(self.count), "levels": [level.tolist() for level in self.levels]}
+    
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any], seed: Optional[int] = None) -> "KLLSketch":
+        sketch = cls(state["k"], seed)
+        sketch.count = state["count"]
+        sketch.levels = [np.asarray(level, dtype=np.float64) for level in state["levels"]] or [np.empty(0)]
+        return sketch
+
+
+class StreamingStatistics:
+    """
+    Descriptive statistics of a stream of chunks in constant memory.
+    
+    Moments, min and max are exact; quantiles come from a KLL sketch. Instances built on
+    different workers can be merged, directly or through to_dict()/from_dict().
+    """
+    
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        self.moments = RunningMoments()
+        self.sketch = KLLSketch(k, seed)
+    
+    def update(self, chunk: Any):
+        """Add a chunk: a single number or an array of numbers"""
+        values = stats_engine.as_float_array(chunk).reshape(-1)
+        self.moments.update(values)
+        self.sketch.update(values)
+    
+    def update_all(self, chunks: Iterable[Any]) -> "StreamingStatistics":
+        """Consume an iterable of chunks"""
+        for chunk in chunks:
+            self.update(chunk)
+        return self
+    
+    def merge(self, other: "StreamingStatistics") -> "StreamingStatistics":
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        return self
+    
+    def result(self, quantiles: Sequence[float] = stats_engine.DEFAULT_QUANTILES) -> Dict[str, Any]:
+        """Statistics in the same form as stats_engine.describe()"""
+        quantile_values = {}
+        if self.moments.count and quantiles:
+            quantile_values = {stats_engine.quantile_key(q): value
+                               for q, value in zip(quantiles, self.sketch.quantiles(quantiles))}
+        return stats_engine.summarize(self.moments.summary, quantile_values)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"moments": self.moments.to_dict(), "sketch": self.sketch.to_dict()}
+    
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "StreamingStatistics":
+        stats = cls(state["sketch"]["k"])
+        stats.moments = RunningMoments.from_dict(state["moments"])
+        stats.sketch = KLLSketch.from_dict(state["sketch"])
+        return stats
@@ -0,0 +1,170 @@
+"""
+Text Ranking for the Multi-Agent Research System
+Token-sized chunking, BM25 ranking and token-budgeted packing of document text for LLM prompts
+"""
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Sequence
+
+# Rough characters per LLM token for English prose; used to size chunks and budgets
+CHARS_PER_TOKEN = 4
+
+DEFAULT_CHUNK_TOKENS = 256
+DEFAULT_OVERLAP_TOKENS = 32
+DEFAULT_CONTEXT_TOKEN_BUDGET = 2000
+
+# Okapi BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Placed between packed chunks that were not adjacent in the document
+CHUNK_SEPARATOR = "\n...\n"
+
+TERM_PATTERN = re.compile(r"\w+")
+WORD_PATTERN = re.compile(r"\S+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word terms of a text, for ranking"""
+    return TERM_PATTERN.findall(text.lower())
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate LLM token count of a text"""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def bm25_idf(document_count: int, document_frequency: int) -> float:
+    """BM25 inverse document frequency (the non-negative variant)"""
+    return math.log(1 + (document_count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+
+class Chunk(NamedTuple):
+    """A slice of a text: its position among the chunks, character offsets and estimated tokens"""
+    index: int
+    start: int
+    end: int
+    tokens: int
+    text: str
+
+
+def chunk_text(text: str, chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+               overlap_tokens: int = DEFAULT_OVERLAP_TOKENS) -> List[Chunk]:
+    """
+    Split text into chunks of about chunk_tokens tokens, each overlapping the previous
+    one by about overlap_tokens.
+    
+    Chunks start and end on word boundaries; a single word longer than a chunk becomes
+    a chunk of its own.
+    """
+    if overlap_tokens >= chunk_tokens:
+        raise ValueError("overlap_tokens must be smaller than chunk_tokens")
+    words = [(match.start(), match.end()) for match in WORD_PATTERN.finditer(text)]
+    # Token cost of a word includes the whitespace before it
+    costs = [estimate_tokens(text[words[i - 1][1] if i else start:end]) for i, (start, end) in enumerate(words)]
+    
+    chunks = []
+    first = 0
+    while first < len(words):
+        last = first
+        tokens = costs[first]
+        while last + 1 < len(words) and tokens + costs[last + 1] <= chunk_tokens:
+            last += 1
+            tokens += costs[last]
+        start, end = words[first][0], words[last][1]
+        chunks.append(Chunk(len(chunks), start, end, estimate_tokens(text[start:end]), text[start:end]))
+        if last + 1 == len(words):
+            break
+        # Step back from the end of this chunk to start the next one inside the overlap
+        following = last + 1
+        overlap = 0
+        while following - 1 > first and overlap + costs[following - 1] <= overlap_tokens:
+            following -= 1
+            overlap += costs[following]
+        first = following
+    return chunks
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a fixed collection of tokenized documents.
+    
+    Term statistics are computed once, so scoring a query costs one pass over the
+    postings of its terms rather than over every document.
+    """
+    
+    def __init__(self, documents: Iterable[Sequence[str]], k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.lengths: List[int] = []
+        self.postings: Dict[str, Dict[int, int]] = {}
+        for doc_id, terms in enumerate(documents):
+            self.lengths.append(len(terms))
+            for term, count in Counter(terms).items():
+                self.postings.setdefault(term, {})[doc_id] = count
+        self.average_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0.0
+    
+    def __len__(self) -> int:
+        return len(self.lengths)
+    
+    def idf(self, term: str) -> float:
+        return bm25_idf(len(self.lengths), len(self.postings.get(term, ())))
+    
+    def scores(self, query_terms: Sequence[str]) -> List[float]:
+        """BM25 score of every document for the query (0 for documents sharing no term)"""
+        scores = [0.0] * len(self.lengths)
+        average_length = self.average_length or 1.0
+        for term in set(query_terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for doc_id, count in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / average_length)
+                scores[doc_id] += idf * count * (self.k1 + 1) / (count + norm)
+        return scores
+
+
+def rank_chunks(chunks: Sequence[Chunk], query: str) -> List[Chunk]:
+    """Chunks ordered by BM25 relevance to the query, earlier chunks first among ties"""
+    scores = BM25Index(tokenize(chunk.text) for chunk in chunks).scores(tokenize(query))
+    return [chunks[i] for i in sorted(range(len(chunks)), key=lambda i: (-scores[i], i))]
+
+
+def pack_context(text: str, query: str, token_budget: int = DEFAULT_CONTEXT_TOKEN_BUDGET,
+                 chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+                 overlap_tokens: int = DEFAULT_OVERLAP_TOKENS) -> str:
+    """
+    Fit text into token_budget tokens, keeping the parts most relevant to the query.
+    
+    Text within the budget is returned unchanged. Otherwise it is chunked, the chunks
+    are ranked with BM25 against the query and the best ones that fit are kept, in
+    document order; overlapping neighbours are joined and gaps marked with
+    CHUNK_SEPARATOR.
+    """
+    if estimate_tokens(text) <= token_budget:
+        return text
+    chunk_tokens = max(1, min(chunk_tokens, token_budget))
+    chunks = chunk_text(text, chunk_tokens, min(overlap_tokens, chunk_tokens - 1))
+    separator_tokens = estimate_tokens(CHUNK_SEPARATOR)
+    
+    selected = []
+    used = 0
+    for chunk in rank_chunks(chunks, query):
+        cost = chunk.tokens + (separator_tokens if selected else 0)
+        if used + cost <= token_budget:
+            selected.append(chunk)
+            used += cost
+    
+    pieces = []
+    end = None
+    for chunk in sorted(selected, key=lambda chunk: chunk.start):
+        if end is not None and chunk.start <= end:
+            pieces.append(text[end:chunk.end])
+        else:
+            if end is not None:
+                pieces.append(CHUNK_SEPARATOR)
+            pieces.append(chunk.text)
+        end = chunk.end
+    return "".join(pieces)
@@ -4,74 +4,442 @@ This module enables dynamic discovery and loading of tools from tool directories
 """
 import os
 import sys
+import json
+import functools
+import hashlib
 import importlib
+import importlib.util
 import inspect
-from typing import List, Type, Dict, Any
-from tools.tool_framework import Tool
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Type, Dict, Any, Optional, Tuple, Callable, Set
+from tools.tool_framework import Tool, ToolProxy, ToolRegistry
 
 
-def discover_tools_in_directory(tool_dir_path: str) -> List[Type[Tool]]:
+MANIFEST_FILE_NAME = ".tool_manifest.json"
+MANIFEST_VERSION = 2
+# Tool parameter definitions depend on tool configuration, so they are tied to this file
+TOOLS_CONFIG_PATH = "config/tools_config.json"
+# Upper bound on tool directories imported concurrently
+DEFAULT_DISCOVERY_WORKERS = 8
+
+
+class ImportTimings:
+    """Thread-safe record of how long each tool module took to import"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        # module name -> (seconds, whether the import failed)
+        self.timings: Dict[str, Tuple[float, bool]] = {}
+    
+    def record(self, module_name: str, seconds: float, failed: bool = False):
+        """Record the import time of one module"""
+        with self._lock:
+            self.timings[module_name] = (seconds, failed)
+    
+    def slowest(self, limit: int = 5) -> List[Tuple[str, float]]:
+        """Return the slowest imports as (module name, seconds), slowest first"""
+        with self._lock:
+            ranked = sorted(self.timings.items(), key=lambda item: item[1][0], reverse=True)
+        return [(module_name, seconds) for module_name, (seconds, _) in ranked[:limit]]
+    
+    def format_report(self, limit: int = 5) -> str:
+        """Return a one-paragraph startup report naming the slowest tool imports"""
+        with self._lock:
+            count = len(self.timings)
+            total = sum(seconds for seconds, _ in self.timings.values())
+            failed = sorted(name for name, (_, did_fail) in self.timings.items() if did_fail)
+        lines = [f"Tool imports: {count} modules, {total * 1000:.1f} ms total import time"]
+        for module_name, seconds in self.slowest(limit):
+            lines.append(f"  {seconds * 1000:8.1f} ms  {module_name}")
+        if failed:
+            lines.append(f"  failed: {', '.join(failed)}")
+        return "\n".join(lines)
+    
+    def clear(self):
+        """Forget all recorded timings"""
+        with self._lock:
+            self.timings.clear()
+
+
+# Process-wide import timings, covering discovery and lazy loads through tool proxies
+IMPORT_TIMINGS = ImportTimings()
+
+
+class DiscoveryManifest:
+    """
+    JSON index of discovered tool modules, reused across process starts.
+    
+    Each Python file under the tools directory is recorded with its size, mtime and
+    content hash, the module name it is imported under, and the metadata of the tools
+    it defines. While a file is unchanged, discovery skips files that define no tools
+    and can describe tool modules without importing them at all.
+    
+    Tool metadata includes parameter definitions built from tool configuration, so
+    entries with tools are dropped whenever the configuration file has changed.
+    """
+    
+    def __init__(self, path: Optional[str] = None, config_path: Optional[str] = TOOLS_CONFIG_PATH):
+        self.path = path
+        self.config_path = config_path
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()  # Directories may be scanned concurrently
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    self.files = data.get("files", {})
+                    if data.get("config_stamp") != self._config_stamp():
+                        self.files = {file_path: entry for file_path, entry in self.files.items()
+                                      if not entry["tools"]}
+                        self._dirty = True
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable tool manifest {path}: {e}")
+    
+    def _config_stamp(self) -> Optional[List[int]]:
+        """Size and mtime of the tool configuration file, or None if there is none"""
+        if not self.config_path:
+            return None
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+    
+    def lookup(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Return the manifest entry for a file if the file is unchanged, else None"""
+        entry = self.files.get(os.path.abspath(file_path))
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        if stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]:
+            return entry
+        # Size or mtime changed: the file is only unchanged if its content hash matches
+        if stat.st_size == entry["size"] and _file_hash(file_path) == entry["sha256"]:
+            with self._lock:
+                entry["mtime_ns"] = stat.st_mtime_ns
+                self._dirty = True
+            return entry
+        return None
+    
+    def record(self, file_path: str, module_name: str, tools: List[Dict[str, Any]]):
+        """Record the current state of a file and the tools it defines"""
+        stat = os.stat(file_path)
+        entry = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": _file_hash(file_path),
+            "module": module_name,
+            "tools": tools
+        }
+        with self._lock:
+            self.files[os.path.abspath(file_path)] = entry
+            self._dirty = True
+    
+    def prune(self, existing_files: set):
+        """Drop entries for files that no longer exist"""
+        for file_path in list(self.files):
+            if file_path not in existing_files:
+                del self.files[file_path]
+                self._dirty = True
+    
+    def save(self):
+        """Write the manifest atomically if it changed"""
+        if not self.path or not self._dirty:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tool_manifest.", suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"version": MANIFEST_VERSION, "config_stamp": self._config_stamp(),
+                           "files": self.files}, f, indent=2)
+            os.replace(temp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            print(f"Could not write tool manifest {self.path}: {e}")
+
+
+def _file_hash(file_path: str) -> str:
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _module_name_for(file_path: str) -> str:
+    """
+    Return the name a tool module is imported under.
+    
+    Files inside an importable package (e.g. tools/web_search_tool/web_search_tool.py) use
+    their dotted package path, so they share the module object with regular imports.
+    Other files get a stable private name derived from their location.
+    """
+    file_path = os.path.abspath(file_path)
+    directory, file_name = os.path.split(file_path)
+    parts = [file_name[:-3]]
+    search_roots = {os.path.abspath(entry or os.getcwd()) for entry in sys.path}
+    # Walk up through packages until reaching a directory on sys.path
+    while os.path.exists(os.path.join(directory, "__init__.py")):
+        directory, package = os.path.split(directory)
+        parts.insert(0, package)
+        if directory in search_roots:
+            return ".".join(parts)
+    
+    digest = hashlib.sha1(os.path.dirname(file_path).encode()).hexdigest()[:10]
+    return f"_discovered_tools_{digest}_{parts[-1]}"
+
+
+def _import_tool_module(file_path: str, module_name: str):
+    """Import a tool module, reusing it from sys.modules when already loaded from the same file"""
+    module = sys.modules.get(module_name)
+    if module is not None and os.path.abspath(getattr(module, "__file__", "") or "") == os.path.abspath(file_path):
+        return module
+    
+    if "." in module_name:
+        module = importlib.import_module(module_name)
+        if os.path.abspath(getattr(module, "__file__", "") or "") == os.path.abspath(file_path):
+            return module
+        # The dotted name resolves to a different file; fall back to loading by path
+        module_name = f"_discovered_tools_{os.path.basename(file_path)[:-3]}"
+    
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
+
+
+def _timed_import(file_path: str, module_name: str):
+    """Import a tool module, recording its import time in IMPORT_TIMINGS"""
+    already_loaded = module_name in sys.modules
+    start = time.perf_counter()
+    try:
+        module = _import_tool_module(file_path, module_name)
+    except BaseException:
+        IMPORT_TIMINGS.record(module_name, time.perf_counter() - start, failed=True)
+        raise
+    if not already_loaded:
+        IMPORT_TIMINGS.record(module.__name__, time.perf_counter() - start)
+    return module
+
+
+def _tool_classes_in_module(module) -> List[Type[Tool]]:
+    """Return the concrete Tool classes defined (not just imported) in a module"""
+    return [obj for name, obj in inspect.getmembers(module, inspect.isclass)
+            if issubclass(obj, Tool) and obj is not Tool
+            and obj.__module__ == module.__name__ and not inspect.isabstract(obj)]
+
+
+def _describe_tool(tool: Tool) -> Dict[str, Any]:
+    """Build the manifest metadata for a tool instance"""
+    return {
+        "class_name": type(tool).__name__,
+        "tool_id": tool.tool_id,
+        "name": tool.name,
+        "description": tool.description,
+        "category": tool.category,
+        "idempotent": tool.idempotent,
+        "parameters": tool.get_params_definition(),
+        "output_schema": tool.get_output_schema()
+    }
+
+
+def _describe_tool_class(tool_class: Type[Tool]) -> Dict[str, Any]:
+    """Build the manifest metadata for a Tool class"""
+    try:
+        return _describe_tool(tool_class())
+    except Exception as e:
+        print(f"Could not instantiate tool {tool_class.__name__} for the manifest: {e}")
+        return {"class_name": tool_class.__name__, "tool_id": None}
+
+
+def _load_tool(tool_dir_path: str, file_path: str, module_name: str, class_name: str) -> Tool:
+    """Import a tool module and instantiate one of its tools; used by tool proxies"""
+    # Package modules import by dotted name; only loose modules need their directory on sys.path
+    added_path = "." not in module_name and tool_dir_path not in sys.path
+    if added_path:
+        sys.path.insert(0, tool_dir_path)
+    try:
+        module = _timed_import(file_path, module_name)
+    finally:
+        if added_path and tool_dir_path in sys.path:
+            sys.path.remove(tool_dir_path)
+    return getattr(module, class_name)()
+
+
+def _scan_tool_file(tool_dir_path: str, file_name: str, manifest: Optional[DiscoveryManifest]) -> List[Type[Tool]]:
+    """Import one Python file from a tool directory and return its Tool classes"""
+    file_path = os.path.join(tool_dir_path, file_name)
+    module_name = file_name[:-3]  # Remove .py extension
+    
+    entry = manifest.lookup(file_path) if manifest else None
+    if entry is not None and not entry["tools"]:
+        return []  # Unchanged file that defines no tools
+    
+    try:
+        module = _timed_import(file_path, entry["module"] if entry else _module_name_for(file_path))
+        
+        if entry is not None:
+            found = [getattr(module, tool["class_name"], None) for tool in entry["tools"]]
+            if all(found):
+                return found
+        
+        # Find Tool classes in the module
+        found = _tool_classes_in_module(module)
+        if manifest is not None:
+            manifest.record(file_path, module.__name__, [_describe_tool_class(cls) for cls in found])
+        return found
+    
+    except (ImportError, SyntaxError) as e:
+        print(f"Could not import module {module_name}: {e}")
+        return []
+
+
+def discover_tools_in_directory(tool_dir_path: str, manifest: Optional[DiscoveryManifest] = None) -> List[Type[Tool]]:
     """
     Discover and import all Tool classes from a given directory.
     
     Args:
         tool_dir_path: Path to the tool directory
-        
+        manifest: Discovery manifest used to skip unchanged files; everything is scanned if omitted
+    
     Returns:
         List of Tool classes found in the directory
     """
     tool_classes = []
     
     # Add the tool directory to Python path temporarily
-    if tool_dir_path not in sys.path:
+    added_path = tool_dir_path not in sys.path
+    if added_path:
         sys.path.insert(0, tool_dir_path)
     
     # Find all Python files in the directory
-    for file_name in os.listdir(tool_dir_path):
+    for file_name in sorted(os.listdir(tool_dir_path)):
         if file_name.endswith('.py') and not file_name.startswith('__'):
-            module_name = file_name[:-3]  # Remove .py extension
-            
-            try:
-                # Import the module
-                spec = importlib.util.spec_from_file_location(module_name, 
-                    os.path.join(tool_dir_path, file_name))
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-                
-                # Find Tool classes in the module
-                for name, obj in inspect.getmembers(module, inspect.isclass):
-                    if issubclass(obj, Tool) and obj != Tool:
-                        tool_classes.append(obj)
-                        
-            except (ImportError, SyntaxError) as e:
-                print(f"Could not import module {module_name}: {e}")
+            tool_classes.extend(_scan_tool_file(tool_dir_path, file_name, manifest))
     
     # Remove the tool directory from Python path
-    if tool_dir_path in sys.path:
+    if added_path and tool_dir_path in sys.path:
         sys.path.remove(tool_dir_path)
     
     return tool_classes
 
 
-def discover_all_tools(tools_base_path: str = "tools") -> Dict[str, Type[Tool]]:
+def describe_tools_in_directory(tool_dir_path: str, manifest: DiscoveryManifest) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Describe the tools in a directory, importing only files that changed since the manifest was written.
+    
+    Args:
+        tool_dir_path: Path to the tool directory
+        manifest: Discovery manifest holding the recorded tool metadata
+    
+    Returns:
+        List of (file path, tool metadata) pairs; the metadata includes the module name
+    """
+    described = []
+    added_path = tool_dir_path not in sys.path
+    if added_path:
+        sys.path.insert(0, tool_dir_path)
+    
+    for file_name in sorted(os.listdir(tool_dir_path)):
+        if file_name.endswith('.py') and not file_name.startswith('__'):
+            file_path = os.path.join(tool_dir_path, file_name)
+            
+            entry = manifest.lookup(file_path)
+            if entry is None:
+                # New or changed file: scanning it records it in the manifest
+                _scan_tool_file(tool_dir_path, file_name, manifest)
+                entry = manifest.lookup(file_path)
+                if entry is None:
+                    continue
+            
+            for tool in entry["tools"]:
+                if tool.get("tool_id"):
+                    described.append((file_path, dict(tool, module=entry["module"])))
+    
+    if added_path and tool_dir_path in sys.path:
+        sys.path.remove(tool_dir_path)
+    
+    return described
+
+
+def _scan_tool_directories(tools_base_path: str, scan, max_workers: Optional[int] = None) -> List[Tuple[str, Any]]:
+    """
+    Apply scan to every tool directory under tools_base_path, several directories at a time.
+    
+    Returns:
+        List of (directory name, scan result) pairs in directory name order
+    """
+    dir_names = [dir_name for dir_name in sorted(os.listdir(tools_base_path))
+                 # Skip special directories like __pycache__
+                 if os.path.isdir(os.path.join(tools_base_path, dir_name)) and not dir_name.startswith('__')]
+    dir_paths = [os.path.join(tools_base_path, dir_name) for dir_name in dir_names]
+    if max_workers is None:
+        max_workers = DEFAULT_DISCOVERY_WORKERS
+    max_workers = max(1, min(max_workers, len(dir_paths)))
+    if max_workers == 1:
+        return list(zip(dir_names, map(scan, dir_paths)))
+    
+    # Put every tool directory on sys.path up front: changing sys.path while other
+    # threads are importing can make them skip path entries
+    added_paths = [dir_path for dir_path in dir_paths if dir_path not in sys.path]
+    sys.path[:0] = added_paths
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool-discovery") as executor:
+            return list(zip(dir_names, executor.map(scan, dir_paths)))
+    finally:
+        for dir_path in added_paths:
+            if dir_path in sys.path:
+                sys.path.remove(dir_path)
+
+
+def _python_files(tools_base_path: str, dir_names: List[str]) -> set:
+    """Return the absolute paths of the Python files in the given tool directories"""
+    return {os.path.abspath(os.path.join(tools_base_path, dir_name, file_name))
+            for dir_name in dir_names
+            for file_name in os.listdir(os.path.join(tools_base_path, dir_name)) if file_name.endswith('.py')}
+
+
+def discover_all_tools(tools_base_path: str = "tools", manifest_path: Optional[str] = None,
+                       use_manifest: bool = True, max_workers: Optional[int] = None) -> Dict[str, List[Type[Tool]]]:
     """
     Discover all tools from subdirectories within the tools base path.
     
+    Tool directories are imported concurrently by a bounded thread pool; import times
+    are recorded in IMPORT_TIMINGS.
+    
     Args:
         tools_base_path: Base path where tool directories are located
-        
+        manifest_path: Location of the discovery manifest (default: <tools_base_path>/.tool_manifest.json)
+        use_manifest: Whether to read and update the discovery manifest
+        max_workers: Maximum directories imported at once (default: DEFAULT_DISCOVERY_WORKERS; 1 is serial)
+    
     Returns:
         Dictionary mapping tool directory names to their Tool classes
     """
-    all_tools = {}
+    manifest = None
+    if use_manifest:
+        manifest = DiscoveryManifest(manifest_path or os.path.join(tools_base_path, MANIFEST_FILE_NAME))
     
-    for dir_name in os.listdir(tools_base_path):
-        dir_path = os.path.join(tools_base_path, dir_name)
-        
-        # Check if it's a directory and not a special directory like __pycache__
-        if os.path.isdir(dir_path) and not dir_name.startswith('__'):
-            tool_classes = discover_tools_in_directory(dir_path)
-            all_tools[dir_name] = tool_classes
+    all_tools = dict(_scan_tool_directories(
+        tools_base_path, lambda dir_path: discover_tools_in_directory(dir_path, manifest), max_workers))
+    
+    if manifest is not None:
+        manifest.prune(_python_files(tools_base_path, list(all_tools)))
+        manifest.save()
     
     return all_tools
 
@@ -94,4 +462,250 @@ def load_tool_instances() -> List[Tool]:
             except Exception as e:
                 print(f"Could not instantiate tool {tool_class.__name__}: {e}")
     
-    return tools
\ No newline at end of file
+    return tools
+
+
+def load_tool_proxies(tools_base_path: str = "tools", manifest_path: Optional[str] = None,
+                      max_workers: Optional[int] = None) -> List[ToolProxy]:
+    """
+    Build lazy proxies for all discovered tools.
+    
+    Tools are described from the discovery manifest; only files that changed since it
+    was written are imported. Each proxy imports and instantiates its tool on first use.
+    
+    Args:
+        tools_base_path: Base path where tool directories are located
+        manifest_path: Location of the discovery manifest (default: <tools_base_path>/.tool_manifest.json)
+        max_workers: Maximum directories scanned at once when files have to be imported
+    
+    Returns:
+        List of ToolProxy instances
+    """
+    manifest = DiscoveryManifest(manifest_path or os.path.join(tools_base_path, MANIFEST_FILE_NAME))
+    described = _scan_tool_directories(
+        tools_base_path, lambda dir_path: describe_tools_in_directory(dir_path, manifest), max_workers)
+    
+    proxies = []
+    for dir_name, tools in described:
+        dir_path = os.path.abspath(os.path.join(tools_base_path, dir_name))
+        for file_path, metadata in tools:
+            loader = functools.partial(_load_tool, dir_path, file_path, metadata["module"], metadata["class_name"])
+            proxies.append(ToolProxy(metadata, loader))
+    
+    manifest.prune(_python_files(tools_base_path, [dir_name for dir_name, _ in described]))
+    manifest.save()
+    return proxies
+
+
+def _exec_fresh_module(file_path: str, module_name: str):
+    """
+    Execute the current source of a file as a new module object and publish it in sys.modules.
+    
+    The previous module object is left untouched, so code still running from it (and
+    tool instances created from its classes) keeps seeing the old version.
+    """
+    with open(file_path, 'rb') as f:
+        source = f.read()
+    # Compile from source rather than a cached .pyc, whose timestamp check misses quick edits
+    code = compile(source, file_path, 'exec')
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    exec(code, module.__dict__)
+    
+    sys.modules[module_name] = module
+    parent_name, _, child_name = module_name.rpartition(".")
+    if parent_name in sys.modules:
+        setattr(sys.modules[parent_name], child_name, module)
+    return module
+
+
+def _forget_modules(file_paths: Set[str]):
+    """Drop the modules loaded from these files, under any name, so the next import executes them afresh"""
+    for module_name, module in list(sys.modules.items()):
+        module_file = getattr(module, "__file__", None)
+        if module_file and os.path.abspath(module_file) in file_paths:
+            del sys.modules[module_name]
+            parent_name, _, child_name = module_name.rpartition(".")
+            parent = sys.modules.get(parent_name)
+            if parent is not None and getattr(parent, child_name, None) is module:
+                delattr(parent, child_name)
+
+
+class ToolWatcher:
+    """
+    Polls tool directories and hot-swaps tools whose modules change.
+    
+    A changed tool module is re-executed. Its tools are instantiated and swapped into
+    the registry one by one; calls already running keep the tool object they started
+    with, and the replaced tool is closed once they finish. New files register their
+    tools, and tools from deleted files (or removed from a file) are unregistered and
+    closed. A module that fails to import or instantiate leaves the previous version
+    registered.
+    
+    A changed helper module (one defining no tools) is re-executed together with the
+    other helpers of its directory, and the directory's tool modules are then reloaded
+    so that new tools use the new helper code. Modules outside the tool directories,
+    and helpers imported from another tool directory, are not reloaded: tools keep
+    using the versions they imported until the process restarts.
+    """
+    
+    def __init__(self, registry: ToolRegistry, tools_base_path: str = "tools", poll_interval: float = 2.0,
+                 manifest_path: Optional[str] = None,
+                 on_change: Optional[Callable[[List[str]], None]] = None):
+        """
+        Args:
+            registry: Registry whose tools are kept up to date
+            tools_base_path: Base path where tool directories are located
+            poll_interval: Seconds between polls of the tool directories
+            manifest_path: Discovery manifest used to map files to tool IDs and kept up to date
+            on_change: Called with the IDs of tools that were swapped in or removed
+        """
+        self.registry = registry
+        self.tools_base_path = tools_base_path
+        self.poll_interval = poll_interval
+        self.on_change = on_change
+        self.manifest = DiscoveryManifest(manifest_path or os.path.join(tools_base_path, MANIFEST_FILE_NAME))
+        self._snapshot = self._scan()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """Return (size, mtime) for every Python file in the tool directories"""
+        snapshot = {}
+        for dir_name in sorted(os.listdir(self.tools_base_path)):
+            dir_path = os.path.join(self.tools_base_path, dir_name)
+            if not os.path.isdir(dir_path) or dir_name.startswith('__'):
+                continue
+            for file_name in os.listdir(dir_path):
+                if file_name.endswith('.py') and not file_name.startswith('__'):
+                    file_path = os.path.abspath(os.path.join(dir_path, file_name))
+                    try:
+                        stat = os.stat(file_path)
+                    except OSError:
+                        continue  # Deleted between listing and stat
+                    snapshot[file_path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+    
+    def check(self) -> List[str]:
+        """
+        Poll once and apply any changes.
+        
+        Returns:
+            IDs of the tools that were swapped in, registered or unregistered
+        """
+        snapshot = self._scan()
+        changed_ids = []
+        
+        changed_files = [file_path for file_path, stamp in snapshot.items() if self._snapshot.get(file_path) != stamp]
+        # Helpers first: reloading one reloads its directory's tool modules, which are then up to date
+        changed_files.sort(key=lambda file_path: not self._is_helper(file_path))
+        for file_path in changed_files:
+            changed_ids.extend(self._reload_file(file_path))
+        for file_path in set(self._snapshot) - set(snapshot):
+            changed_ids.extend(self._remove_file(file_path))
+        
+        self._snapshot = snapshot
+        self.manifest.prune(set(snapshot))
+        self.manifest.save()
+        if changed_ids and self.on_change:
+            self.on_change(changed_ids)
+        return changed_ids
+    
+    def _recorded_tool_ids(self, file_path: str) -> List[str]:
+        entry = self.manifest.files.get(file_path)
+        return [tool["tool_id"] for tool in entry["tools"] if tool.get("tool_id")] if entry else []
+    
+    def _is_helper(self, file_path: str) -> bool:
+        """Whether a known module defines no tools"""
+        entry = self.manifest.files.get(file_path)
+        return entry is not None and not entry["tools"]
+    
+    def _reload_file(self, file_path: str, force: bool = False) -> List[str]:
+        """Re-execute a changed module and swap its tools into the registry"""
+        entry = self.manifest.files.get(file_path)
+        if not force and entry is not None and entry["sha256"] == _file_hash(file_path):
+            return []  # Touched but not modified
+        
+        directory = os.path.dirname(file_path)
+        siblings = {path: sibling for path, sibling in self.manifest.files.items()
+                    if os.path.dirname(path) == directory and path != file_path}
+        is_helper = self._is_helper(file_path)
+        if is_helper:
+            # Let the new helper, and the tool modules reloaded below, import fresh copies of the other helpers
+            _forget_modules({file_path} | {path for path, sibling in siblings.items() if not sibling["tools"]})
+        
+        module_name = entry["module"] if entry else _module_name_for(file_path)
+        tool_dir_path = os.path.dirname(file_path)
+        added_path = "." not in module_name and tool_dir_path not in sys.path
+        if added_path:
+            sys.path.insert(0, tool_dir_path)
+        start = time.perf_counter()
+        try:
+            module = _exec_fresh_module(file_path, module_name)
+            tools = [tool_class() for tool_class in _tool_classes_in_module(module)]
+        except Exception as e:
+            IMPORT_TIMINGS.record(module_name, time.perf_counter() - start, failed=True)
+            print(f"Could not reload module {module_name}: {e}")
+            return []
+        finally:
+            if added_path and tool_dir_path in sys.path:
+                sys.path.remove(tool_dir_path)
+        IMPORT_TIMINGS.record(module_name, time.perf_counter() - start)
+        
+        changed_ids = []
+        for tool in tools:
+            previous = self.registry.replace_tool(tool)
+            if previous is None:
+                print(f"Tool registered: {tool.name} (ID: {tool.tool_id})")
+            else:
+                previous.retire()
+                print(f"Tool reloaded: {tool.name} (ID: {tool.tool_id})")
+            changed_ids.append(tool.tool_id)
+        
+        current_ids = {tool.tool_id for tool in tools}
+        for tool_id in self._recorded_tool_ids(file_path):
+            if tool_id not in current_ids and self._unregister(tool_id):
+                changed_ids.append(tool_id)
+        
+        self.manifest.record(file_path, module.__name__, [_describe_tool(tool) for tool in tools])
+        
+        if is_helper and not tools:
+            for path, sibling in siblings.items():
+                if sibling["tools"]:
+                    changed_ids.extend(self._reload_file(path, force=True))
+        return changed_ids
+    
+    def _unregister(self, tool_id: str) -> bool:
+        """Unregister a tool and close it once its running calls finish"""
+        tool = self.registry.unregister_tool(tool_id)
+        if tool is None:
+            return False
+        tool.retire()
+        print(f"Tool removed: {tool_id}")
+        return True
+    
+    def _remove_file(self, file_path: str) -> List[str]:
+        """Unregister the tools of a deleted module"""
+        return [tool_id for tool_id in self._recorded_tool_ids(file_path) if self._unregister(tool_id)]
+    
+    def _run(self):
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Tool watcher error: {e}")
+    
+    def start(self):
+        """Start polling in a background thread"""
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="tool-watcher", daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        """Stop polling and wait for the background thread to exit"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
@@ -2,94 +2,511 @@
 Tool Execution Service for Multi-Agent Research System
 Handles execution of tools requested by agents
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple, Iterator
 from tools.tool_framework import ToolRegistry, Tool
-from tools.tool_discovery import load_tool_instances
+from tools.tool_discovery import load_tool_proxies, IMPORT_TIMINGS, ToolWatcher
+from tools.execution_stats import ToolStats
+from tools.circuit_breaker import CircuitBreaker
+from tools.config.tool_config import ToolConfig, DEFAULT_CONFIGS
+from collections import deque
+import asyncio
 import time
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 import queue
+import reprlib
+
+# Parameters and results are kept in the execution history only as short summaries, so the
+# history holds no references to parsed documents, search pages or dataset arrays
+_HISTORY_REPR = reprlib.Repr()
+_HISTORY_REPR.maxstring = 80
+_HISTORY_REPR.maxother = 80
+_HISTORY_REPR.maxlevel = 3
+
+
+def _summarize(value: Any) -> Any:
+    """Small scalars as they are, anything else as a truncated repr"""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str) and len(value) <= _HISTORY_REPR.maxstring:
+        return value
+    return _HISTORY_REPR.repr(value)
 
 
 class ToolExecutionService:
     """Service to execute tools requested by agents"""
     
-    def __init__(self, registry: ToolRegistry = None):
+    def __init__(self, registry: ToolRegistry = None, history_size: int = 100):
         self.registry = registry if registry is not None else ToolRegistry()
-        self.execution_history = []
-        self.max_workers = 5  # Maximum concurrent tool executions
+        # Only the most recent executions are kept, with summarized params and results;
+        # long-term data lives in tool_stats
+        self.execution_history = deque(maxlen=history_size)
+        self.tool_stats: Dict[str, ToolStats] = {}
+        self.circuit_breakers: Dict[str, CircuitBreaker] = {}
+        self.config = ToolConfig("tool_execution_service")
+        self.max_workers = self._get_config_value("max_workers")  # Maximum concurrent tool executions
         self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        # Separate pool for hedged calls so backups never queue behind the work they hedge
+        self.hedge_executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tool-hedge")
         self.lock = threading.Lock()
+        # Event loop for native-async tools, started on first use
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self.tool_watcher: Optional[ToolWatcher] = None
+        # Pool sizes and breaker settings follow config changes without a restart
+        self.config.subscribe(self._on_config_changed)
         
         # Load tools automatically if no registry was provided
         if registry is None:
             self.load_default_tools()
+            if self._get_config_value("enable_hot_reload"):
+                self.start_tool_watcher()
     
     def load_default_tools(self):
-        """Load all available tools using the discovery mechanism"""
-        tool_instances = load_tool_instances()
-        for tool in tool_instances:
+        """Register lazy proxies for all discovered tools; each tool is imported on first use"""
+        imported_before = len(IMPORT_TIMINGS.timings)
+        for tool in load_tool_proxies():
             self.registry.register_tool(tool)
+        # Modules are only imported here when the discovery manifest was missing or stale
+        if len(IMPORT_TIMINGS.timings) > imported_before:
+            print(IMPORT_TIMINGS.format_report())
+    
+    def start_tool_watcher(self, tools_base_path: str = "tools", poll_interval: Optional[float] = None) -> ToolWatcher:
+        """Start hot reloading: changed tool modules are re-imported and swapped into the registry"""
+        if self.tool_watcher is None:
+            if poll_interval is None:
+                poll_interval = self._get_config_value("hot_reload_poll_seconds")
+            self.tool_watcher = ToolWatcher(self.registry, tools_base_path, poll_interval,
+                                            on_change=self._on_tools_changed)
+            self.tool_watcher.start()
+        return self.tool_watcher
+    
+    def _on_tools_changed(self, tool_ids: List[str]):
+        """Give reloaded tools a fresh circuit breaker; statistics are kept"""
+        with self.lock:
+            for tool_id in tool_ids:
+                self.circuit_breakers.pop(tool_id, None)
     
     def execute_tool(self, tool_id: str, **params) -> Optional[Dict[str, Any]]:
         """Execute a single tool with given parameters"""
         start_time = time.time()
         
-        result = self.registry.execute_tool(tool_id, **params)
+        call = self.registry.prepare_call(tool_id, params)
+        if call is None:
+            result = None
+        else:
+            tool, call_params = call
+            breaker = self.get_circuit_breaker(tool_id)
+            if not breaker.allow_request():
+                return self._reject_execution(tool_id)
+            try:
+                result = self._call_tool(tool, call_params)
+            except Exception as e:
+                print(f"Error executing tool '{tool_id}': {str(e)}")
+                result = {"error": str(e)}
+            except BaseException:
+                breaker.release()  # Cancelled or interrupted: no outcome, but a half-open trial slot is freed
+                raise
+            self._record_outcome(breaker, result)
+        
+        self._record_execution(tool_id, params, result, start_time)
+        
+        return result
+    
+    def _call_tool(self, tool: Tool, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a tool, firing a hedged backup call if the first one is slower than usual.
+        
+        The slower of the two calls is not stopped: a call that has started cannot be
+        cancelled, so it runs to completion on the hedge pool and its result is dropped.
+        This is why only idempotent tools are hedged.
+        """
+        def run():
+            # Counted per call, so a retired tool stays open until a losing hedged call finishes too
+            with tool.in_use():
+                return tool.execute(**params)
+        
+        hedge_delay = self._get_hedge_delay(tool, params)
+        if hedge_delay is None:
+            return run()
+        
+        primary = self._submit(run, hedge=True)
+        done, _ = wait([primary], timeout=hedge_delay)
+        if done:
+            return primary.result()
+        
+        self._record_hedge(tool.tool_id)
+        backup = self._submit(run, hedge=True)
+        pending = {primary, backup}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        other.cancel()  # Only takes effect if the other call has not started yet
+                    return future.result()
+                error = future.exception()
+        raise error
+    
+    def _get_hedge_delay(self, tool: Tool, params: Dict[str, Any]) -> Optional[float]:
+        """Return how long to wait before hedging a call, or None if it should not be hedged"""
+        if not tool.idempotent or not self._get_config_value("enable_hedging"):
+            return None
+        if any(isinstance(value, Iterator) for value in params.values()):
+            return None  # A backup call would read from the same, partly consumed stream
+        with self.lock:
+            stats = self.tool_stats.get(tool.tool_id)
+            if stats is None or stats.count < self._get_config_value("hedge_min_samples"):
+                return None
+            return stats.latency.percentile(self._get_config_value("hedge_percentile"))
+    
+    def _submit(self, fn, *args, hedge: bool = False, **kwargs) -> Future:
+        """Submit work to the current pool, retrying if the pool was replaced by a resize meanwhile"""
+        while True:
+            executor = self.hedge_executor if hedge else self.executor
+            try:
+                return executor.submit(fn, *args, **kwargs)
+            except RuntimeError:
+                if executor is (self.hedge_executor if hedge else self.executor):
+                    raise  # The service itself has been shut down
+    
+    def _resize_executors(self, max_workers: int):
+        """Replace both pools with pools of the new size; work already submitted finishes on the old ones"""
+        with self.lock:
+            if max_workers == self.max_workers:
+                return
+            old_executors = (self.executor, self.hedge_executor)
+            self.max_workers = max_workers
+            self.executor = ThreadPoolExecutor(max_workers=max_workers)
+            self.hedge_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool-hedge")
+        for executor in old_executors:
+            executor.shutdown(wait=False)
+        print(f"Tool execution pool resized to {max_workers} workers")
+    
+    def _on_config_changed(self, changes: Dict[str, Any]):
+        """Apply a configuration change to the running service"""
+        if "max_workers" in changes:
+            self._resize_executors(self._get_config_value("max_workers"))
+        if any(key.startswith("circuit_") for key in changes):
+            with self.lock:
+                breakers = list(self.circuit_breakers.values())
+            for breaker in breakers:
+                breaker.failure_threshold = self._get_config_value("circuit_failure_threshold")
+                breaker.recovery_timeout = self._get_config_value("circuit_recovery_timeout_seconds")
+                breaker.half_open_max_calls = self._get_config_value("circuit_half_open_max_calls")
+    
+    def _get_config_value(self, key: str) -> Any:
+        """Read a service setting, falling back to the built-in default"""
+        return self.config.get(key, DEFAULT_CONFIGS["tool_execution_service"][key])
+    
+    def get_circuit_breaker(self, tool_id: str) -> CircuitBreaker:
+        """Get the circuit breaker for a tool, creating it from config on first use"""
+        with self.lock:
+            breaker = self.circuit_breakers.get(tool_id)
+            if breaker is None:
+                breaker = self.circuit_breakers[tool_id] = CircuitBreaker(
+                    failure_threshold=self._get_config_value("circuit_failure_threshold"),
+                    recovery_timeout=self._get_config_value("circuit_recovery_timeout_seconds"),
+                    half_open_max_calls=self._get_config_value("circuit_half_open_max_calls"))
+            return breaker
+    
+    def get_circuit_breaker_states(self) -> Dict[str, Dict[str, Any]]:
+        """Get the state of every tool's circuit breaker"""
+        with self.lock:
+            breakers = dict(self.circuit_breakers)
+        return {tool_id: breaker.to_dict() for tool_id, breaker in breakers.items()}
+    
+    def _reject_execution(self, tool_id: str) -> Dict[str, Any]:
+        """Fail a call fast because the tool's circuit is open"""
+        print(f"Circuit open for tool '{tool_id}', failing fast")
+        with self.lock:
+            self._get_tool_stats(tool_id).record_rejection(time.time())
+        return {"error": f"Circuit breaker open for tool '{tool_id}'", "circuit_state": CircuitBreaker.OPEN}
+    
+    def _record_hedge(self, tool_id: str):
+        with self.lock:
+            self._get_tool_stats(tool_id).hedged_count += 1
+    
+    def _get_tool_stats(self, tool_id: str) -> ToolStats:
+        """Get the aggregate statistics for a tool; caller must hold the lock"""
+        stats = self.tool_stats.get(tool_id)
+        if stats is None:
+            stats = self.tool_stats[tool_id] = ToolStats(tool_id)
+        return stats
+    
+    @staticmethod
+    def _succeeded(result: Any) -> bool:
+        """Whether a tool result counts as a success, for both the statistics and the circuit breaker"""
+        return result is not None and not (isinstance(result, dict) and "error" in result)
+    
+    def _record_outcome(self, breaker: CircuitBreaker, result: Any):
+        if self._succeeded(result):
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+    
+    def _record_execution(self, tool_id: str, params: Dict[str, Any], result: Any, start_time: float):
+        """Record an execution in the bounded history and the per-tool aggregates"""
+        end_time = time.time()
+        duration = end_time - start_time
+        success = self._succeeded(result)
         
         execution_record = {
             "tool_id": tool_id,
-            "params": params,
-            "result": result,
-            "timestamp": time.time(),
-            "duration": time.time() - start_time
+            "params": {key: _summarize(value) for key, value in params.items()},
+            "result": _summarize(result),
+            "success": success,
+            "timestamp": end_time,
+            "duration": duration
         }
         
         with self.lock:
             self.execution_history.append(execution_record)
+            self._get_tool_stats(tool_id).record(duration, success, end_time)
+    
+    def execute_tool_batch(self, tool_id: str, params_list: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Execute a tool for several parameter sets with one execute_batch call.
+        
+        Args:
+            tool_id: Tool to execute
+            params_list: One parameter dictionary per call
+        
+        Returns:
+            One result per parameter set, in order
+        """
+        start_time = time.time()
+        
+        tool = self.registry.get_tool(tool_id)
+        breaker = self.get_circuit_breaker(tool_id) if tool is not None else None
+        if breaker is not None and not breaker.allow_request():
+            return [self._reject_execution(tool_id) for _ in params_list]
+        
+        try:
+            results = self.registry.execute_tool_batch(tool_id, params_list)
+        except BaseException:
+            if breaker is not None:
+                breaker.release()
+            raise
+        
+        if breaker is not None:
+            executed = [result for result in results if result is not None]
+            if executed and not any(self._succeeded(result) for result in executed):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        
+        # Each call in the batch is charged its share of the batch's duration
+        share = (time.time() - start_time) / max(len(params_list), 1)
+        for params, result in zip(params_list, results):
+            self._record_execution(tool_id, params, result, time.time() - share)
+        
+        return results
+    
+    def _plan_batches(self, tool_requests: list) -> Tuple[Dict[str, List[int]], List[int]]:
+        """
+        Group queued requests for the same batch-capable tool.
+        
+        Returns:
+            Request indexes per tool to run as one batch, and indexes to run individually
+        """
+        by_tool: Dict[str, List[int]] = {}
+        single: List[int] = []
+        for index, request in enumerate(tool_requests):
+            tool = self.registry.get_tool(request.get("tool_id"))
+            if tool is not None and tool.supports_batch:
+                by_tool.setdefault(tool.tool_id, []).append(index)
+            else:
+                single.append(index)
+        
+        batches = {}
+        for tool_id, indexes in by_tool.items():
+            if len(indexes) > 1:
+                batches[tool_id] = indexes
+            else:
+                single.extend(indexes)
+        return batches, sorted(single)
+    
+    async def aexecute_tool(self, tool_id: str, **params) -> Optional[Dict[str, Any]]:
+        """
+        Execute a single tool asynchronously.
+        
+        Native-async tools are awaited directly on the running event loop; synchronous
+        tools are run on the service's thread pool.
+        """
+        start_time = time.time()
+        
+        call = self.registry.prepare_call(tool_id, params)
+        if call is None:
+            result = None
+        else:
+            tool, call_params = call
+            breaker = self.get_circuit_breaker(tool_id)
+            if not breaker.allow_request():
+                return self._reject_execution(tool_id)
+            try:
+                result = await self._acall_tool(tool, call_params)
+            except Exception as e:
+                print(f"Error executing tool '{tool_id}': {str(e)}")
+                result = {"error": str(e)}
+            except BaseException:
+                breaker.release()  # Cancelled or interrupted: no outcome, but a half-open trial slot is freed
+                raise
+            self._record_outcome(breaker, result)
+        
+        self._record_execution(tool_id, params, result, start_time)
         
         return result
     
+    async def _acall_tool(self, tool: Tool, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of _call_tool; the slower call is cancelled only if it is native-async"""
+        async def arun():
+            with tool.in_use():
+                return await tool.aexecute(**params)
+        
+        def run():
+            with tool.in_use():
+                return tool.execute(**params)
+        
+        def start_call():
+            if tool.is_async:
+                return asyncio.ensure_future(arun())
+            return asyncio.wrap_future(self._submit(run))
+        
+        hedge_delay = self._get_hedge_delay(tool, params)
+        if hedge_delay is None:
+            return await start_call()
+        
+        primary = start_call()
+        done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+        if done:
+            return primary.result()
+        
+        self._record_hedge(tool.tool_id)
+        pending = {primary, start_call()}
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        other.cancel()  # Stops a native-async call; one on the thread pool runs on
+                    return future.result()
+                error = future.exception()
+        raise error
+    
+    async def aexecute_tools_parallel(self, tool_requests: list) -> list:
+        """Execute multiple tools concurrently on the running event loop"""
+        results = [None] * len(tool_requests)
+        batches, single = self._plan_batches(tool_requests)
+        
+        async def run(index):
+            request = tool_requests[index]
+            try:
+                result = await self.aexecute_tool(request.get("tool_id"), **request.get("params", {}))
+                results[index] = {"request": request, "result": result}
+            except Exception as e:
+                results[index] = {"request": request, "error": str(e)}
+        
+        async def run_batch(tool_id, indexes):
+            params_list = [tool_requests[index].get("params", {}) for index in indexes]
+            try:
+                batch_results = await asyncio.wrap_future(
+                    self._submit(self.execute_tool_batch, tool_id, params_list))
+                for index, result in zip(indexes, batch_results):
+                    results[index] = {"request": tool_requests[index], "result": result}
+            except Exception as e:
+                for index in indexes:
+                    results[index] = {"request": tool_requests[index], "error": str(e)}
+        
+        await asyncio.gather(*(run(index) for index in single),
+                             *(run_batch(tool_id, indexes) for tool_id, indexes in batches.items()))
+        return results
+    
     def execute_tools_parallel(self, tool_requests: list) -> list:
-        """Execute multiple tools in parallel"""
-        results = []
+        """
+        Execute multiple tools in parallel.
+        
+        Requests for the same batch-capable tool are combined into one execute_batch call.
+        """
+        results = [None] * len(tool_requests)
+        batches, single = self._plan_batches(tool_requests)
         
-        # Submit all tool requests to executor
-        future_to_request = {}
-        for request in tool_requests:
+        # Native-async tools go to the event loop, everything else to the thread pool
+        future_to_indexes = {}
+        for index in single:
+            request = tool_requests[index]
             tool_id = request.get("tool_id")
             params = request.get("params", {})
-            future = self.executor.submit(self.execute_tool, tool_id, **params)
-            future_to_request[future] = request
+            tool = self.registry.get_tool(tool_id)
+            if tool is not None and tool.is_async:
+                future = asyncio.run_coroutine_threadsafe(
+                    self.aexecute_tool(tool_id, **params), self._get_event_loop())
+            else:
+                future = self._submit(self.execute_tool, tool_id, **params)
+            future_to_indexes[future] = [index]
+        for tool_id, indexes in batches.items():
+            params_list = [tool_requests[index].get("params", {}) for index in indexes]
+            future = self._submit(self.execute_tool_batch, tool_id, params_list)
+            future_to_indexes[future] = indexes
         
-        # Collect results
-        for future in as_completed(future_to_request):
-            request = future_to_request[future]
+        # Collect results in the original request order
+        for future in as_completed(future_to_indexes):
+            indexes = future_to_indexes[future]
             try:
-                result = future.result()
-                results.append({
-                    "request": request,
-                    "result": result
-                })
+                outcome = future.result()
+                # Batches return one result per request, single calls a bare result
+                batch_results = outcome if len(indexes) > 1 else [outcome]
+                for index, result in zip(indexes, batch_results):
+                    results[index] = {
+                        "request": tool_requests[index],
+                        "result": result
+                    }
             except Exception as e:
-                results.append({
-                    "request": request,
-                    "error": str(e)
-                })
+                for index in indexes:
+                    results[index] = {
+                        "request": tool_requests[index],
+                        "error": str(e)
+                    }
         
-        # Sort results to match original request order
-        sorted_results = []
-        for request in tool_requests:
-            for result in results:
-                if result["request"] == request:
-                    sorted_results.append(result)
-                    break
-        
-        return sorted_results
+        return results
+    
+    def _get_event_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the service's background event loop, starting it if needed"""
+        with self.lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name="tool-execution-loop", daemon=True)
+                self._loop_thread.start()
+            return self._loop
     
-    def get_execution_history(self) -> list:
-        """Get the history of tool executions"""
-        return self.execution_history.copy()
+    def get_import_report(self, limit: int = 5) -> str:
+        """Return a report of tool module import times, naming the slowest imports"""
+        return IMPORT_TIMINGS.format_report(limit)
+    
+    def get_execution_history(self, limit: Optional[int] = None) -> list:
+        """Get the most recent tool executions, oldest first"""
+        with self.lock:
+            history = list(self.execution_history)
+        return history[-limit:] if limit else history
+    
+    def get_execution_stats(self, tool_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get aggregated execution statistics.
+        
+        Args:
+            tool_id: Return statistics for a single tool; all tools if omitted
+        
+        Returns:
+            Count, error count and latency percentiles (p50/p95/p99) per tool
+        """
+        with self.lock:
+            if tool_id is not None:
+                stats = self.tool_stats.get(tool_id)
+                return stats.to_dict() if stats else ToolStats(tool_id).to_dict()
+            return {tid: stats.to_dict() for tid, stats in self.tool_stats.items()}
     
     def get_tool_definition(self, tool_id: str) -> Optional[Dict[str, Any]]:
         """Get the definition of a tool"""
@@ -113,4 +530,14 @@ class ToolExecutionService:
     
     def shutdown(self):
         """Shutdown the execution service"""
-        self.executor.shutdown(wait=True)
\ No newline at end of file
+        self.config.unsubscribe(self._on_config_changed)
+        if self.tool_watcher is not None:
+            self.tool_watcher.stop()
+            self.tool_watcher = None
+        self.executor.shutdown(wait=True)
+        self.hedge_executor.shutdown(wait=True)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            self._loop.close()
+            self._loop = None
\ No newline at end of file
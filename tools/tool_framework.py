@@ -3,9 +3,20 @@ Tool Framework for Multi-Agent Research System
 Defines the base classes and interfaces for tools that agents can use
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, List, Tuple, Callable, Iterable, Iterator
 from dataclasses import dataclass
+import asyncio
+import functools
+import heapq
 import json
+import math
+import re
+import threading
+
+
+# Guards the running-call counts of all Retirable objects; held only long enough to update a count
+_USE_LOCK = threading.Lock()
 
 
 @dataclass
@@ -18,7 +29,7 @@ class ToolDefinition:
     parameters: Dict[str, Any]
     output_schema: Dict[str, Any]
     required_params: List[str] = None
-
+    
     def __post_init__(self):
         if self.required_params is None:
             self.required_params = []
@@ -27,9 +38,124 @@ class ToolDefinition:
                     self.required_params.append(param_name)
 
 
-class Tool(ABC):
+# Type checks for the parameter types used in tool definitions; unknown types are not checked
+PARAM_TYPE_CHECKS = {
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+    # Iterators are accepted so tools can consume unbounded streams incrementally
+    "array": lambda value: isinstance(value, (list, tuple, Iterator)),
+    "object": lambda value: isinstance(value, dict)
+}
+
+
+class ParameterValidator:
+    """Parameter checks compiled once from a tool's parameter definitions"""
+    
+    def __init__(self, params_definition: Dict[str, Any]):
+        self.required_params: List[str] = []
+        self.defaults: Dict[str, Any] = {}
+        # (name, type_name, type_check, allowed_values, max_items) for each checked parameter
+        self._checks: List[Tuple[str, str, Any, Any, Optional[int]]] = []
+        
+        for name, info in params_definition.items():
+            if info.get("required", False):
+                self.required_params.append(name)
+            if "default" in info:
+                self.defaults[name] = info["default"]
+            
+            type_name = info.get("type")
+            type_check = PARAM_TYPE_CHECKS.get(type_name)
+            allowed_values = info.get("enum")
+            if allowed_values is not None:
+                try:
+                    allowed_values = frozenset(allowed_values)
+                except TypeError:
+                    allowed_values = tuple(allowed_values)
+            max_items = info.get("max_items")
+            if type_check or allowed_values is not None or max_items is not None:
+                self._checks.append((name, type_name, type_check, allowed_values, max_items))
+    
+    def validate(self, params: Dict[str, Any]) -> Optional[str]:
+        """Return a description of the first problem with params, or None if they are valid"""
+        for name in self.required_params:
+            if name not in params:
+                return f"missing required parameter '{name}'"
+        
+        for name, type_name, type_check, allowed_values, max_items in self._checks:
+            if name not in params:
+                continue
+            value = params[name]
+            if type_check is not None and not type_check(value):
+                return f"parameter '{name}' must be of type {type_name}"
+            if allowed_values is not None and value not in allowed_values:
+                return f"parameter '{name}' must be one of {sorted(allowed_values, key=str)}"
+            if max_items is not None and hasattr(value, "__len__") and len(value) > max_items:
+                return f"parameter '{name}' has more than {max_items} items"
+        return None
+    
+    def apply_defaults(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Return params with defaults filled in for missing optional parameters"""
+        missing = [name for name in self.defaults if name not in params]
+        if not missing:
+            return params
+        merged = dict(params)
+        for name in missing:
+            merged[name] = self.defaults[name]
+        return merged
+
+
+class Retirable:
+    """
+    Something that can be swapped out while calls are still using it, such as a tool or a search backend.
+    
+    Calls mark themselves with in_use() (or acquire() and release()); retire() closes the
+    object at once if it is idle, otherwise when the last of those calls finishes.
+    """
+    
+    def close(self):
+        """Release what the object holds; must be safe to call more than once"""
+        pass
+    
+    def acquire(self):
+        """Count a call as running until the matching release()"""
+        with _USE_LOCK:
+            # Kept in __dict__ so that proxies forwarding unknown attributes are not asked for them
+            self.__dict__["_running_calls"] = self.__dict__.get("_running_calls", 0) + 1
+    
+    def release(self):
+        """End a call counted by acquire(), closing the object if it was retired and this was the last call"""
+        with _USE_LOCK:
+            self._running_calls -= 1
+            close_now = self._running_calls == 0 and self.__dict__.get("_retired", False)
+        if close_now:
+            self.close()
+    
+    @contextmanager
+    def in_use(self):
+        """Count a call as running for the duration of the block"""
+        self.acquire()
+        try:
+            yield self
+        finally:
+            self.release()
+    
+    def retire(self):
+        """Close the object once the calls running on it finish; for one that has been swapped out"""
+        with _USE_LOCK:
+            self._retired = True
+            close_now = self.__dict__.get("_running_calls", 0) == 0
+        if close_now:
+            self.close()
+
+
+class Tool(Retirable, ABC):
     """Base class for all tools that agents can use"""
     
+    # Idempotent tools have no side effects, so a duplicate (hedged) call is safe
+    idempotent: bool = False
+    
     def __init__(self, tool_id: str, name: str, description: str, category: str):
         self.tool_id = tool_id
         self.name = name
@@ -41,37 +167,210 @@ class Tool(ABC):
         """Execute the tool with given parameters"""
         pass
     
+    async def aexecute(self, **kwargs) -> Dict[str, Any]:
+        """
+        Execute the tool asynchronously.
+        
+        I/O-bound tools should override this with a native coroutine so that waiting
+        does not hold a thread. The default runs execute() in the loop's executor.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(self.execute, **kwargs))
+    
+    def execute_batch(self, params_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute the tool once per parameter set and return the results in order.
+        
+        Tools that can amortize work across calls (shared setup, vectorized math,
+        one round trip for many queries) should override this.
+        """
+        return [self.execute(**params) for params in params_list]
+    
+    @property
+    def supports_batch(self) -> bool:
+        """Whether this tool provides a native execute_batch implementation"""
+        return type(self).execute_batch is not Tool.execute_batch
+    
+    @property
+    def is_async(self) -> bool:
+        """Whether this tool provides a native aexecute implementation"""
+        return type(self).aexecute is not Tool.aexecute
+    
     def validate_parameters(self, params: Dict[str, Any]) -> bool:
-        """Validate that required parameters are provided"""
-        # This is a basic validation; in a real implementation, you'd do more thorough checks
-        for param_name in self.get_required_params():
-            if param_name not in params:
-                return False
-        return True
+        """Validate parameters against the tool's compiled parameter definitions"""
+        return self.get_validator().validate(params) is None
+    
+    def get_validator(self) -> ParameterValidator:
+        """Return the compiled parameter validator, rebuilding it if the tool's config changed"""
+        cached = self.__dict__.get("_validator_cache")
+        version = self._get_config_version()
+        if cached is None or cached[0] != version:
+            cached = (version, ParameterValidator(self.get_params_definition()))
+            self._validator_cache = cached
+        return cached[1]
+    
+    def _get_config_version(self) -> Any:
+        """Version of the tool's configuration, used to invalidate cached definitions"""
+        return getattr(getattr(self, "config", None), "version", None)
+    
+    def invalidate_definition_cache(self):
+        """Drop the cached definition and validator so they are rebuilt on next use"""
+        self.__dict__.pop("_validator_cache", None)
+        self.__dict__.pop("_definition_cache", None)
     
     def get_required_params(self) -> List[str]:
         """Return list of required parameters"""
-        return [param for param, info in self.get_params_definition().items() 
-                if info.get("required", False)]
+        return list(self.get_validator().required_params)
     
     def get_params_definition(self) -> Dict[str, Any]:
         """Return definition of parameters this tool requires"""
         return {}
     
     def get_definition(self) -> ToolDefinition:
-        """Return the tool definition"""
-        return ToolDefinition(
-            tool_id=self.tool_id,
-            name=self.name,
-            description=self.description,
-            category=self.category,
-            parameters=self.get_params_definition(),
-            output_schema=self.get_output_schema()
-        )
+        """Return the tool definition, cached until the tool's config changes"""
+        cached = self.__dict__.get("_definition_cache")
+        version = self._get_config_version()
+        if cached is None or cached[0] != version:
+            cached = (version, ToolDefinition(
+                tool_id=self.tool_id,
+                name=self.name,
+                description=self.description,
+                category=self.category,
+                parameters=self.get_params_definition(),
+                output_schema=self.get_output_schema()
+            ))
+            self._definition_cache = cached
+        return cached[1]
     
     def get_output_schema(self) -> Dict[str, Any]:
         """Return the expected output schema of this tool"""
         return {"result": {"type": "any", "description": "Tool execution result"}}
+    
+    def close(self):
+        """
+        Release what the tool holds, such as connection pools, threads and config subscriptions.
+        
+        Called when the tool is retired. Must be safe to call more than once: a call that
+        looked the tool up just before it was swapped out may still run, and closes it again.
+        """
+        pass
+    
+
+
+class ToolProxy(Tool):
+    """
+    Stand-in for a tool that has not been imported yet.
+    
+    The proxy answers metadata queries (ID, name, category, parameter and output
+    definitions) from a description recorded at discovery time. The real tool is
+    imported and instantiated by the loader on first use, for example when it is
+    validated or executed; after that every call is forwarded to it.
+    """
+    
+    def __init__(self, metadata: Dict[str, Any], loader: Callable[[], Tool]):
+        super().__init__(
+            tool_id=metadata["tool_id"],
+            name=metadata.get("name", metadata["tool_id"]),
+            description=metadata.get("description", ""),
+            category=metadata.get("category", "")
+        )
+        self.idempotent = metadata.get("idempotent", False)
+        self._metadata = metadata
+        self._loader = loader
+        self._target: Optional[Tool] = None
+        self._load_lock = threading.Lock()
+    
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the real tool has been imported and instantiated"""
+        return self._target is not None
+    
+    def get_tool(self) -> Tool:
+        """Return the real tool, loading it on first use"""
+        target = self._target
+        if target is None:
+            with self._load_lock:
+                if self._target is None:
+                    self._target = self._loader()
+                    self.invalidate_definition_cache()
+                target = self._target
+        return target
+    
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes the proxy itself lacks, such as a tool's config
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.get_tool(), name)
+    
+    def execute(self, **kwargs) -> Dict[str, Any]:
+        return self.get_tool().execute(**kwargs)
+    
+    async def aexecute(self, **kwargs) -> Dict[str, Any]:
+        return await self.get_tool().aexecute(**kwargs)
+    
+    def execute_batch(self, params_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return self.get_tool().execute_batch(params_list)
+    
+    def close(self):
+        # A tool that was never loaded holds nothing
+        if self._target is not None:
+            self._target.close()
+    
+    @property
+    def supports_batch(self) -> bool:
+        return self.get_tool().supports_batch
+    
+    @property
+    def is_async(self) -> bool:
+        return self.get_tool().is_async
+    
+    def get_validator(self) -> ParameterValidator:
+        return self.get_tool().get_validator()
+    
+    def _get_config_version(self) -> Any:
+        # Looking up config on the proxy itself would load the tool
+        return self._target._get_config_version() if self._target is not None else None
+    
+    def invalidate_definition_cache(self):
+        super().invalidate_definition_cache()
+        if self._target is not None:
+            self._target.invalidate_definition_cache()
+    
+    def get_params_definition(self) -> Dict[str, Any]:
+        if self._target is not None:
+            return self._target.get_params_definition()
+        return self._metadata.get("parameters", {})
+    
+    def get_output_schema(self) -> Dict[str, Any]:
+        if self._target is not None:
+            return self._target.get_output_schema()
+        return self._metadata.get("output_schema") or super().get_output_schema()
+    
+    def get_definition(self) -> ToolDefinition:
+        if self._target is not None:
+            return self._target.get_definition()
+        return super().get_definition()
+
+
+# Relative weight of a keyword by where it appears in a tool's metadata
+KEYWORD_FIELD_WEIGHTS = {"name": 3.0, "category": 2.0, "description": 1.0}
+KEYWORD_STOPWORDS = frozenset({"a", "an", "and", "for", "from", "in", "of", "on", "or", "the", "to", "with"})
+
+
+def tokenize_keywords(text: str) -> List[str]:
+    """Split text into lowercase keywords, dropping stopwords and reducing plurals to the singular"""
+    keywords = []
+    for token in re.findall(r"[a-z0-9]+", text.lower()):
+        if token in KEYWORD_STOPWORDS:
+            continue
+        if len(token) > 4 and token.endswith("ies"):
+            token = token[:-3] + "y"
+        elif token.endswith(("ches", "shes", "sses", "xes", "zes")):
+            token = token[:-2]
+        elif len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+            token = token[:-1]
+        keywords.append(token)
+    return keywords
 
 
 class ToolRegistry:
@@ -79,12 +378,71 @@ class ToolRegistry:
     
     def __init__(self):
         self._tools: Dict[str, Tool] = {}
+        self._lock = threading.RLock()
+        # Secondary indexes, kept in step with _tools
+        self._by_category: Dict[str, Dict[str, Tool]] = {}
+        self._by_signature: Dict[Tuple[str, ...], Dict[str, Tool]] = {}
+        self._keyword_index: Dict[str, Dict[str, float]] = {}  # keyword -> {tool_id: weight}
+        self._indexed: Dict[str, Tuple[str, Tuple[str, ...], List[str]]] = {}  # tool_id -> index keys
+    
+    def _index_tool(self, tool: Tool):
+        """Add a tool to the secondary indexes; caller holds the lock"""
+        # The definition of a tool proxy comes from discovery metadata, so this does not load the tool
+        signature = tuple(sorted(tool.get_definition().required_params))
+        weights: Dict[str, float] = {}
+        for field, field_weight in KEYWORD_FIELD_WEIGHTS.items():
+            for keyword in tokenize_keywords(getattr(tool, field) or ""):
+                weights[keyword] = weights.get(keyword, 0.0) + field_weight
+        
+        self._by_category.setdefault(tool.category, {})[tool.tool_id] = tool
+        self._by_signature.setdefault(signature, {})[tool.tool_id] = tool
+        for keyword, weight in weights.items():
+            self._keyword_index.setdefault(keyword, {})[tool.tool_id] = weight
+        self._indexed[tool.tool_id] = (tool.category, signature, list(weights))
+    
+    def _unindex_tool(self, tool_id: str):
+        """Remove a tool from the secondary indexes; caller holds the lock"""
+        keys = self._indexed.pop(tool_id, None)
+        if keys is None:
+            return
+        category, signature, keywords = keys
+        for index, key in ((self._by_category, category), (self._by_signature, signature)):
+            index[key].pop(tool_id, None)
+            if not index[key]:
+                del index[key]
+        for keyword in keywords:
+            postings = self._keyword_index[keyword]
+            postings.pop(tool_id, None)
+            if not postings:
+                del self._keyword_index[keyword]
     
     def register_tool(self, tool: Tool):
         """Register a tool in the registry"""
-        self._tools[tool.tool_id] = tool
+        with self._lock:
+            self._unindex_tool(tool.tool_id)
+            self._tools[tool.tool_id] = tool
+            self._index_tool(tool)
         print(f"Tool registered: {tool.name} (ID: {tool.tool_id})")
     
+    def replace_tool(self, tool: Tool) -> Optional[Tool]:
+        """
+        Swap in a new version of a tool, returning the previous one.
+        
+        Calls already running keep the tool object they looked up, so they finish on the old version.
+        """
+        with self._lock:
+            previous = self._tools.get(tool.tool_id)
+            self._unindex_tool(tool.tool_id)
+            self._tools[tool.tool_id] = tool
+            self._index_tool(tool)
+        return previous
+    
+    def unregister_tool(self, tool_id: str) -> Optional[Tool]:
+        """Remove a tool from the registry, returning it if it was registered"""
+        with self._lock:
+            self._unindex_tool(tool_id)
+            return self._tools.pop(tool_id, None)
+    
     def get_tool(self, tool_id: str) -> Optional[Tool]:
         """Get a tool by its ID"""
         return self._tools.get(tool_id)
@@ -95,26 +453,133 @@ class ToolRegistry:
     
     def get_tools_by_category(self, category: str) -> List[Tool]:
         """Get all tools in a specific category"""
-        return [tool for tool in self._tools.values() if tool.category == category]
+        with self._lock:
+            return list(self._by_category.get(category, {}).values())
+    
+    def get_tools_by_required_params(self, required_params: Iterable[str]) -> List[Tool]:
+        """Get the tools whose required parameters are exactly the given ones"""
+        with self._lock:
+            return list(self._by_signature.get(tuple(sorted(required_params)), {}).values())
+    
+    def get_tools_callable_with(self, available_params: Iterable[str]) -> List[Tool]:
+        """Get the tools whose required parameters are all among the available ones"""
+        available = set(available_params)
+        with self._lock:
+            # Checks each distinct signature once, however many tools share it
+            return [tool for signature, tools in self._by_signature.items()
+                    if available.issuperset(signature) for tool in tools.values()]
+    
+    def search_tools(self, query: str, limit: int = 5, category: Optional[str] = None) -> List[Tool]:
+        """
+        Rank tools by how well their name, category and description match a keyword query.
+        
+        Scores sum, over the query keywords, the keyword's field weight in the tool times its
+        inverse document frequency, so rare keywords count more. Only the tools that contain
+        a query keyword are scored.
+        
+        Args:
+            query: Free-text query, e.g. "parse pdf documents"
+            limit: Maximum number of tools to return
+            category: Only return tools in this category
+        
+        Returns:
+            Matching tools, best match first
+        """
+        scores: Dict[str, float] = {}
+        with self._lock:
+            total = len(self._tools)
+            for keyword in set(tokenize_keywords(query)):
+                postings = self._keyword_index.get(keyword)
+                if not postings:
+                    continue
+                idf = math.log(1 + total / len(postings))
+                for tool_id, weight in postings.items():
+                    scores[tool_id] = scores.get(tool_id, 0.0) + weight * idf
+            if category is not None:
+                scores = {tool_id: score for tool_id, score in scores.items()
+                          if tool_id in self._by_category.get(category, {})}
+            best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+            return [self._tools[tool_id] for tool_id, _ in best]
     
     def get_tool_definition(self, tool_id: str) -> Optional[ToolDefinition]:
         """Get the definition of a tool by its ID"""
         tool = self.get_tool(tool_id)
         return tool.get_definition() if tool else None
     
-    def execute_tool(self, tool_id: str, **params) -> Optional[Dict[str, Any]]:
-        """Execute a tool with given parameters"""
+    def prepare_call(self, tool_id: str, params: Dict[str, Any]) -> Optional[Tuple[Tool, Dict[str, Any]]]:
+        """
+        Look up a tool and validate the parameters for a call to it.
+        
+        Returns:
+            The tool and the call parameters with defaults applied, or None if the call is invalid
+        """
         tool = self.get_tool(tool_id)
         if not tool:
             print(f"Tool with ID '{tool_id}' not found in registry")
             return None
         
-        if not tool.validate_parameters(params):
-            print(f"Invalid parameters for tool '{tool_id}'")
+        validator = tool.get_validator()
+        error = validator.validate(params)
+        if error is not None:
+            print(f"Invalid parameters for tool '{tool_id}': {error}")
+            return None
+        
+        return tool, validator.apply_defaults(params)
+    
+    def execute_tool(self, tool_id: str, **params) -> Optional[Dict[str, Any]]:
+        """Execute a tool with given parameters"""
+        call = self.prepare_call(tool_id, params)
+        if not call:
+            return None
+        tool, call_params = call
+        
+        try:
+            with tool.in_use():
+                return tool.execute(**call_params)
+        except Exception as e:
+            print(f"Error executing tool '{tool_id}': {str(e)}")
+            return {"error": str(e)}
+    
+    def execute_tool_batch(self, tool_id: str, params_list: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Execute a tool for several parameter sets with a single execute_batch call.
+        
+        Returns:
+            One result per parameter set, in order; None for invalid parameter sets
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(params_list)
+        tool = None
+        valid_indexes, valid_params = [], []
+        for index, params in enumerate(params_list):
+            call = self.prepare_call(tool_id, params)
+            if call:
+                tool, call_params = call
+                valid_indexes.append(index)
+                valid_params.append(call_params)
+        if not valid_params:
+            return results
+        
+        try:
+            with tool.in_use():
+                batch_results = tool.execute_batch(valid_params)
+        except Exception as e:
+            print(f"Error executing tool '{tool_id}': {str(e)}")
+            batch_results = [{"error": str(e)}] * len(valid_params)
+        
+        for index, result in zip(valid_indexes, batch_results):
+            results[index] = result
+        return results
+    
+    async def aexecute_tool(self, tool_id: str, **params) -> Optional[Dict[str, Any]]:
+        """Execute a tool asynchronously with given parameters"""
+        call = self.prepare_call(tool_id, params)
+        if not call:
             return None
+        tool, call_params = call
         
         try:
-            return tool.execute(**params)
+            with tool.in_use():
+                return await tool.aexecute(**call_params)
         except Exception as e:
             print(f"Error executing tool '{tool_id}': {str(e)}")
             return {"error": str(e)}
\ No newline at end of file
@@ -0,0 +1,357 @@
+"""
+HTTP Search Backend for the Multi-Agent Research System
+Client for a remote search service with keep-alive connection pools for threads and event loops
+"""
+import asyncio
+import http.client
+import json
+import ssl
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Any, AsyncIterator, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+from tools.web_search_tool.search_backends import SearchBackend
+
+DEFAULT_MAX_CONNECTIONS = 10
+
+MAX_HEADER_LINES = 100
+
+
+class SearchServiceError(Exception):
+    """The search service answered with an error status"""
+
+
+def _deadline_remaining(deadline: float) -> float:
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("Search request timed out")
+    return remaining
+
+
+def _decode_line(line: bytes) -> Optional[Dict[str, Any]]:
+    """One result from a line of an NDJSON response (blank lines are skipped)"""
+    line = line.strip()
+    return json.loads(line) if line else None
+
+
+def _decode_body(body: bytes) -> List[Dict[str, Any]]:
+    """Results from a plain JSON response of the form {"results": [...]}"""
+    return json.loads(body or b"{}").get("results", [])
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP connections shared by threads.
+    
+    At most max_connections requests are in flight; further callers wait for a free
+    connection. Connections are reused while the server keeps them open and are
+    dropped after any error.
+    """
+    
+    def __init__(self, host: str, port: int, use_tls: bool, max_connections: int, timeout_seconds: float,
+                 keep_alive: bool = True):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.timeout_seconds = timeout_seconds
+        self.keep_alive = keep_alive
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._idle: deque = deque()
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+    
+    def _open(self) -> http.client.HTTPConnection:
+        with self._lock:
+            self.connections_opened += 1
+        if self.use_tls:
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout_seconds,
+                                               context=ssl.create_default_context())
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout_seconds)
+    
+    @contextmanager
+    def connection(self) -> Iterator[Tuple[http.client.HTTPConnection, bool]]:
+        """Yield (connection, reused); the connection returns to the pool if the block completes"""
+        if not self._slots.acquire(timeout=self.timeout_seconds):
+            raise TimeoutError("Timed out waiting for a search service connection")
+        try:
+            with self._lock:
+                connection = self._idle.pop() if self._idle else None
+            reused = connection is not None
+            if connection is None:
+                connection = self._open()
+            try:
+                yield connection, reused
+            except BaseException:
+                connection.close()
+                raise
+            if self.keep_alive:
+                with self._lock:
+                    self._idle.append(connection)
+            else:
+                connection.close()
+        finally:
+            self._slots.release()
+    
+    def close(self):
+        with self._lock:
+            while self._idle:
+                self._idle.pop().close()
+
+
+class AsyncConnectionPool:
+    """Keep-alive HTTP connections (asyncio streams) shared by the tasks of one event loop"""
+    
+    def __init__(self, host: str, port: int, use_tls: bool, max_connections: int, keep_alive: bool = True):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.keep_alive = keep_alive
+        self._slots = asyncio.Semaphore(max_connections)
+        self._idle: deque = deque()
+        self.connections_opened = 0
+    
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]]:
+        """Yield (reader, writer, reused); the connection returns to the pool if the block completes"""
+        async with self._slots:
+            streams = None
+            while self._idle and streams is None:
+                reader, writer = self._idle.pop()
+                if reader.at_eof() or writer.is_closing():
+                    writer.close()
+                else:
+                    streams = reader, writer
+            reused = streams is not None
+            if streams is None:
+                self.connections_opened += 1
+                streams = await asyncio.open_connection(
+                    self.host, self.port, ssl=ssl.create_default_context() if self.use_tls else None)
+            reader, writer = streams
+            try:
+                yield reader, writer, reused
+            except BaseException:
+                # Includes cancellation (e.g. by a hedged call): the response may be half read
+                writer.close()
+                raise
+            if self.keep_alive and not writer.is_closing():
+                self._idle.append(streams)
+            else:
+                writer.close()
+    
+    def close(self):
+        while self._idle:
+            self._idle.pop()[1].close()
+
+
+class HttpSearchBackend(SearchBackend):
+    """
+    Search through a remote HTTP service.
+    
+    The service is called as GET <endpoint>?q=<query>&n=<num_results> and answers
+    either with NDJSON (one {"title", "url", "snippet"} object per line, typically
+    with chunked transfer encoding) or with JSON {"results": [...]}. NDJSON responses
+    are decoded line by line as they arrive, so a large response is never buffered
+    whole.
+    
+    Synchronous calls share a thread-safe keep-alive pool; coroutines share a pool
+    per event loop, so concurrent fan-out from the Tool Execution Service's loop does
+    not hold a thread per request. Each pool allows at most max_connections requests
+    in flight, and every request must finish within timeout_seconds.
+    """
+    
+    name = "http"
+    
+    def __init__(self, endpoint: str, max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 timeout_seconds: float = 30, keep_alive: bool = True):
+        parts = urlsplit(endpoint)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Invalid search service endpoint: {endpoint!r}")
+        self.endpoint = endpoint
+        self.use_tls = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.use_tls else 80)
+        self.path = parts.path or "/"
+        self.max_connections = max_connections
+        self.timeout_seconds = timeout_seconds
+        self.keep_alive = keep_alive
+        self.pool = ConnectionPool(self.host, self.port, self.use_tls, max_connections, timeout_seconds, keep_alive)
+        self._async_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncConnectionPool]" = \
+            weakref.WeakKeyDictionary()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+    
+    @property
+    def connections_opened(self) -> int:
+        """Connections opened so far by all of the backend's pools"""
+        return self.pool.connections_opened + sum(pool.connections_opened for pool in list(self._async_pools.values()))
+    
+    def _target(self, query: str, num_results: int) -> str:
+        return f"{self.path}?{urlencode({'q': query, 'n': num_results})}"
+    
+    def _headers(self) -> Dict[str, str]:
+        return {"Accept": "application/x-ndjson, application/json",
+                "Connection": "keep-alive" if self.keep_alive else "close"}
+    
+    # Synchronous requests
+    
+    def stream(self, query: str, num_results: int) -> Iterator[Dict[str, Any]]:
+        """Yield results as they arrive from the service"""
+        deadline = time.monotonic() + self.timeout_seconds
+        for attempt in range(2):
+            with self.pool.connection() as (connection, reused):
+                try:
+                    connection.request("GET", self._target(query, num_results), headers=self._headers())
+                    response = connection.getresponse()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    if reused and attempt == 0:
+                        connection.close()
+                        continue  # The server closed an idle keep-alive connection: retry on a new one
+                    raise
+                yield from self._read_response(response, deadline)
+                return
+    
+    def _read_response(self, response: http.client.HTTPResponse, deadline: float) -> Iterator[Dict[str, Any]]:
+        if response.status >= 400:
+            body = response.read()
+            raise SearchServiceError(f"Search service returned HTTP {response.status}: {body[:200]!r}")
+        if "ndjson" not in response.getheader("Content-Type", ""):
+            _deadline_remaining(deadline)
+            yield from _decode_body(response.read())
+            return
+        while True:
+            _deadline_remaining(deadline)
+            line = response.readline()
+            if not line:
+                return
+            result = _decode_line(line)
+            if result is not None:
+                yield result
+    
+    def search(self, query: str, num_results: int) -> List[Dict[str, Any]]:
+        return list(self.stream(query, num_results))[:num_results]
+    
+    def search_many(self, requests: List[Tuple[str, int]]) -> List[List[Dict[str, Any]]]:
+        """Run several searches concurrently, bounded by the connection pool"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_connections,
+                                                    thread_name_prefix="http-search")
+        return list(self._executor.map(lambda request: self.search(*request), requests))
+    
+    # Asynchronous requests
+    
+    def _async_pool(self) -> AsyncConnectionPool:
+        loop = asyncio.get_running_loop()
+        pool = self._async_pools.get(loop)
+        if pool is None:
+            pool = self._async_pools[loop] = AsyncConnectionPool(
+                self.host, self.port, self.use_tls, self.max_connections, self.keep_alive)
+        return pool
+    
+    async def astream(self, query: str, num_results: int) -> AsyncIterator[Dict[str, Any]]:
+        """Yield results as they arrive from the service, without blocking the event loop"""
+        deadline = time.monotonic() + self.timeout_seconds
+        pool = self._async_pool()
+        request = (f"GET {self._target(query, num_results)} HTTP/1.1\r\n"
+                   f"Host: {self.host}:{self.port}\r\n"
+                   + "".join(f"{name}: {value}\r\n" for name, value in self._headers().items())
+                   + "\r\n").encode("latin-1")
+        for attempt in range(2):
+            async with pool.connection() as (reader, writer, reused):
+                try:
+                    writer.write(request)
+                    await asyncio.wait_for(writer.drain(), _deadline_remaining(deadline))
+                    status_line = await asyncio.wait_for(reader.readline(), _deadline_remaining(deadline))
+                except (ConnectionResetError, BrokenPipeError):
+                    status_line = b""
+                if not status_line:
+                    writer.close()
+                    if reused and attempt == 0:
+                        continue  # The server closed an idle keep-alive connection: retry on a new one
+                    raise ConnectionResetError("Search service closed the connection")
+                async for result in self._aread_response(status_line, reader, writer, deadline):
+                    yield result
+                return
+    
+    async def _aread_response(self, status_line: bytes, reader: asyncio.StreamReader,
+                              writer: asyncio.StreamWriter, deadline: float) -> AsyncIterator[Dict[str, Any]]:
+        try:
+            status = int(status_line.split()[1])
+        except (IndexError, ValueError):
+            raise SearchServiceError(f"Malformed response from search service: {status_line[:100]!r}")
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await asyncio.wait_for(reader.readline(), _deadline_remaining(deadline))
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        body = self._abody(reader, headers, deadline)
+        if status >= 400:
+            content = b"".join([chunk async for chunk in body])
+            raise SearchServiceError(f"Search service returned HTTP {status}: {content[:200]!r}")
+        if "ndjson" not in headers.get("content-type", ""):
+            for result in _decode_body(b"".join([chunk async for chunk in body])):
+                yield result
+        else:
+            pending = b""
+            async for chunk in body:
+                pending += chunk
+                *lines, pending = pending.split(b"\n")
+                for line in lines:
+                    result = _decode_line(line)
+                    if result is not None:
+                        yield result
+            result = _decode_line(pending)
+            if result is not None:
+                yield result
+        if headers.get("connection", "").lower() == "close":
+            writer.close()
+    
+    async def _abody(self, reader: asyncio.StreamReader, headers: Dict[str, str],
+                     deadline: float) -> AsyncIterator[bytes]:
+        """Yield the raw body, decoding chunked transfer encoding"""
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            while True:
+                size_line = await asyncio.wait_for(reader.readline(), _deadline_remaining(deadline))
+                size = int(size_line.split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    # Trailer section ends with an empty line
+                    while (await asyncio.wait_for(reader.readline(), _deadline_remaining(deadline))) not in (
+                            b"\r\n", b"\n", b""):
+                        pass
+                    return
+                yield await asyncio.wait_for(reader.readexactly(size), _deadline_remaining(deadline))
+                await asyncio.wait_for(reader.readline(), _deadline_remaining(deadline))
+        elif "content-length" in headers:
+            length = int(headers["content-length"])
+            if length:
+                yield await asyncio.wait_for(reader.readexactly(length), _deadline_remaining(deadline))
+        else:
+            yield await asyncio.wait_for(reader.read(), _deadline_remaining(deadline))
+            headers["connection"] = "close"
+    
+    async def asearch(self, query: str, num_results: int) -> List[Dict[str, Any]]:
+        async def collect():
+            return [result async for result in self.astream(query, num_results)]
+        
+        # The timeout also covers waiting for a free connection
+        results = await asyncio.wait_for(collect(), self.timeout_seconds)
+        return results[:num_results]
+    
+    def close(self):
+        self.pool.close()
+        for loop, pool in list(self._async_pools.items()):
+            if loop.is_running():
+                loop.call_soon_threadsafe(pool.close)
+            elif not loop.is_closed():
+                pool.close()
+            # Connections of a closed loop can no longer be closed through it; they are released with the loop
+        self._async_pools.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
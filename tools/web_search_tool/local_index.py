@@ -0,0 +1,283 @@
+"""
+Local Search Index for the Multi-Agent Research System
+On-disk inverted index with BM25 ranking, stored in SQLite, for searching without network access
+"""
+import os
+import sqlite3
+import threading
+from collections import Counter
+import numpy as np
+from typing import Dict, Any, Iterable, List, Tuple
+from tools.text_ranking import BM25_B, BM25_K1, bm25_idf, tokenize
+
+DEFAULT_INDEX_PATH = "data/search_index.sqlite3"
+
+SNIPPET_CHARS = 240
+
+# Documents written per segment; each segment adds one postings row per term it contains
+INDEX_BATCH_SIZE = 5000
+
+# Segments after which the postings are merged, so queries read few rows per term
+MAX_SEGMENTS = 32
+
+POSTING_DTYPE = np.int32
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    snippet TEXT NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    segment INTEGER NOT NULL,
+    doc_ids BLOB NOT NULL,
+    tfs BLOB NOT NULL,
+    lengths BLOB NOT NULL,
+    PRIMARY KEY (term, segment)
+);
+CREATE TABLE IF NOT EXISTS deleted (
+    doc_id INTEGER PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS stats (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO stats (key, value) VALUES ('doc_count', 0), ('total_length', 0), ('segments', 0), ('last_doc_id', 0);
+"""
+
+
+def document_from_parse_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a DocumentParsingTool result into a document for the index"""
+    path = os.path.abspath(result["file_path"])
+    return {
+        "url": f"file://{path}",
+        "title": result.get("metadata", {}).get("title") or os.path.basename(path),
+        "content": result.get("parsed_content", "")
+    }
+
+
+def _pack(values: List[int]) -> bytes:
+    return np.asarray(values, dtype=POSTING_DTYPE).tobytes()
+
+
+def _unpack(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=POSTING_DTYPE)
+
+
+class LocalSearchIndex:
+    """
+    Inverted index of documents in a SQLite database, ranked with BM25.
+    
+    Documents are indexed in segments: each batch writes, per term, one row holding
+    the packed doc ids, term frequencies and document lengths of its postings. A
+    query reads the few rows of its terms and scores them with NumPy, so latency
+    depends on the postings of the query terms, not on the collection size.
+    Replacing or removing a document leaves a tombstone that queries mask out;
+    optimize() (run automatically after MAX_SEGMENTS segments) merges each term's
+    segments and drops the tombstoned postings.
+    """
+    
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        # Doc ids are never reused: a new document must not inherit the tombstone of a removed one.
+        # Indexes written before ids were allocated here start after their highest id.
+        self._connection.execute(
+            "UPDATE stats SET value = MAX(value, (SELECT COALESCE(MAX(doc_id), 0) FROM "
+            "(SELECT doc_id FROM documents UNION ALL SELECT doc_id FROM deleted))) WHERE key = 'last_doc_id'")
+        self._connection.commit()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._stat("doc_count")
+    
+    def _stat(self, key: str) -> int:
+        return self._connection.execute("SELECT value FROM stats WHERE key = ?", (key,)).fetchone()[0]
+    
+    def _add_stat(self, key: str, delta: int):
+        self._connection.execute("UPDATE stats SET value = value + ? WHERE key = ?", (delta, key))
+    
+    def add_documents(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """
+        Index documents given as {"url", "title", "content"} dicts.
+        
+        A document whose url is already indexed replaces the old version. Returns the
+        number of documents written.
+        """
+        written = 0
+        batch = []
+        for document in documents:
+            batch.append(document)
+            if len(batch) >= INDEX_BATCH_SIZE:
+                written += self._add_segment(batch)
+                batch = []
+        if batch:
+            written += self._add_segment(batch)
+        return written
+    
+    def _add_segment(self, documents: List[Dict[str, Any]]) -> int:
+        postings: Dict[str, Tuple[List[int], List[int], List[int]]] = {}
+        with self._lock:
+            with self._connection:
+                segment = self._stat("segments")
+                last_doc_id = self._stat("last_doc_id")
+                total_length = 0
+                for doc_id, document in enumerate(documents, start=last_doc_id + 1):
+                    self._remove(document["url"])
+                    terms = tokenize(f"{document.get('title', '')} {document.get('content', '')}")
+                    content = " ".join(document.get("content", "").split())
+                    self._connection.execute(
+                        "INSERT INTO documents (doc_id, url, title, snippet, length) VALUES (?, ?, ?, ?, ?)",
+                        (doc_id, document["url"], document.get("title", ""), content[:SNIPPET_CHARS], len(terms)))
+                    for term, count in Counter(terms).items():
+                        doc_ids, tfs, lengths = postings.setdefault(term, ([], [], []))
+                        doc_ids.append(doc_id)
+                        tfs.append(count)
+                        lengths.append(len(terms))
+                    total_length += len(terms)
+                
+                self._connection.executemany(
+                    "INSERT INTO postings (term, segment, doc_ids, tfs, lengths) VALUES (?, ?, ?, ?, ?)",
+                    ((term, segment, _pack(doc_ids), _pack(tfs), _pack(lengths))
+                     for term, (doc_ids, tfs, lengths) in sorted(postings.items())))
+                self._add_stat("doc_count", len(documents))
+                self._add_stat("total_length", total_length)
+                self._add_stat("segments", 1)
+                self._add_stat("last_doc_id", len(documents))
+            if segment + 1 >= MAX_SEGMENTS:
+                self._optimize()
+        return len(documents)
+    
+    def _remove(self, url: str) -> bool:
+        row = self._connection.execute("SELECT doc_id, length FROM documents WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return False
+        doc_id, length = row
+        self._connection.execute("DELETE FROM documents WHERE doc_id = ?", (doc_id,))
+        self._connection.execute("INSERT INTO deleted (doc_id) VALUES (?)", (doc_id,))
+        self._add_stat("doc_count", -1)
+        self._add_stat("total_length", -length)
+        return True
+    
+    def remove(self, url: str) -> bool:
+        """Remove a document; returns False if it was not indexed"""
+        with self._lock, self._connection:
+            return self._remove(url)
+    
+    def optimize(self):
+        """Merge every term's segments into one and drop the postings of removed documents"""
+        with self._lock:
+            self._optimize()
+    
+    def _optimize(self):
+        with self._connection:
+            deleted = self._deleted()
+            merged = []
+            current_term, parts = None, []
+            for term, doc_ids, tfs, lengths in self._connection.execute(
+                    "SELECT term, doc_ids, tfs, lengths FROM postings ORDER BY term, segment"):
+                if term != current_term and parts:
+                    merged.append(self._merge(current_term, parts, deleted))
+                    parts = []
+                current_term = term
+                parts.append((doc_ids, tfs, lengths))
+            if parts:
+                merged.append(self._merge(current_term, parts, deleted))
+            
+            self._connection.execute("DELETE FROM postings")
+            self._connection.executemany(
+                "INSERT INTO postings (term, segment, doc_ids, tfs, lengths) VALUES (?, 0, ?, ?, ?)",
+                (row for row in merged if row[1]))
+            self._connection.execute("DELETE FROM deleted")
+            self._connection.execute("UPDATE stats SET value = 1 WHERE key = 'segments'")
+    
+    @staticmethod
+    def _merge(term: str, parts, deleted: np.ndarray) -> Tuple[str, bytes, bytes, bytes]:
+        doc_ids, tfs, lengths = (np.concatenate([_unpack(part[column]) for part in parts]) for column in range(3))
+        live = ~np.isin(doc_ids, deleted)
+        return term, doc_ids[live].tobytes(), tfs[live].tobytes(), lengths[live].tobytes()
+    
+    def _deleted(self) -> np.ndarray:
+        return np.fromiter((row[0] for row in self._connection.execute("SELECT doc_id FROM deleted")),
+                           dtype=POSTING_DTYPE)
+    
+    def search(self, query: str, num_results: int = 10) -> List[Dict[str, Any]]:
+        """Top documents for the query by BM25 score, as {"title", "url", "snippet", "score"}"""
+        terms = sorted(set(tokenize(query)))
+        if not terms or num_results <= 0:
+            return []
+        with self._lock:
+            doc_count = self._stat("doc_count")
+            if doc_count == 0:
+                return []
+            average_length = self._stat("total_length") / doc_count or 1.0
+            deleted = self._deleted()
+            
+            segments: Dict[str, list] = {}
+            placeholders = ", ".join("?" * len(terms))
+            for term, doc_ids, tfs, lengths in self._connection.execute(
+                    f"SELECT term, doc_ids, tfs, lengths FROM postings WHERE term IN ({placeholders})", terms):
+                segments.setdefault(term, []).append((doc_ids, tfs, lengths))
+            
+            matched_ids, contributions = [], []
+            for term, parts in segments.items():
+                doc_ids, tfs, lengths = (np.concatenate([_unpack(part[column]) for part in parts])
+                                         for column in range(3))
+                if deleted.shape[0]:
+                    live = ~np.isin(doc_ids, deleted)
+                    doc_ids, tfs, lengths = doc_ids[live], tfs[live], lengths[live]
+                if not doc_ids.shape[0]:
+                    continue
+                tfs = tfs.astype(np.float64)
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / average_length)
+                matched_ids.append(doc_ids)
+                contributions.append(bm25_idf(doc_count, doc_ids.shape[0]) * tfs * (BM25_K1 + 1) / (tfs + norm))
+            if not matched_ids:
+                return []
+            
+            if len(matched_ids) == 1:
+                candidates, scores = matched_ids[0], contributions[0]
+            else:
+                all_ids = np.concatenate(matched_ids)
+                weights = np.concatenate(contributions)
+                max_id = int(all_ids.max())
+                if max_id <= 8 * all_ids.shape[0]:
+                    # Dense accumulation by doc id is linear; fall back to sorting for sparse ids
+                    totals = np.bincount(all_ids, weights=weights, minlength=max_id + 1)
+                    candidates = np.flatnonzero(np.bincount(all_ids, minlength=max_id + 1))
+                    scores = totals[candidates]
+                else:
+                    candidates, inverse = np.unique(all_ids, return_inverse=True)
+                    scores = np.bincount(inverse, weights=weights)
+            top = self._top(scores, candidates, num_results)
+            
+            results = []
+            for index in top:
+                title, url, snippet = self._connection.execute(
+                    "SELECT title, url, snippet FROM documents WHERE doc_id = ?", (int(candidates[index]),)).fetchone()
+                results.append({"title": title, "url": url, "snippet": snippet, "score": round(float(scores[index]), 4)})
+            return results
+    
+    @staticmethod
+    def _top(scores: np.ndarray, doc_ids: np.ndarray, count: int) -> np.ndarray:
+        """Indices of the highest scores, best first, lower doc ids first among ties"""
+        if scores.shape[0] > count:
+            threshold = np.partition(scores, scores.shape[0] - count)[scores.shape[0] - count]
+            selected = np.flatnonzero(scores >= threshold)
+        else:
+            selected = np.arange(scores.shape[0])
+        order = np.lexsort((doc_ids[selected], -scores[selected]))
+        return selected[order][:count]
+    
+    def close(self):
+        with self._lock:
+            self._connection.close()
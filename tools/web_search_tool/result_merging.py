@@ -0,0 +1,151 @@
+"""
+Search Result Merging for the Multi-Agent Research System
+URL canonicalization, MinHash near-duplicate detection and reciprocal-rank fusion of result lists
+"""
+import hashlib
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import numpy as np
+from tools.text_ranking import tokenize
+
+# Reciprocal-rank fusion constant: larger values flatten the advantage of top ranks
+DEFAULT_RRF_K = 60
+
+# Snippets whose estimated Jaccard similarity (over their words) reaches this are treated as the same text
+DEFAULT_NEAR_DUPLICATE_SIMILARITY = 0.7
+
+# MinHash signature length, split into LSH bands of MINHASH_PERMUTATIONS // LSH_BANDS values
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+
+# Largest prime below 2**32: (a * h + b) % MINHASH_PRIME stays within uint64 for 32-bit a, h and b
+MINHASH_PRIME = 4294967291
+_permutation_rng = np.random.default_rng(2024)
+_PERMUTATION_A = _permutation_rng.integers(1, MINHASH_PRIME, MINHASH_PERMUTATIONS, dtype=np.uint64)
+_PERMUTATION_B = _permutation_rng.integers(0, MINHASH_PRIME, MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+# Query parameters that only track the visit and never change the page
+TRACKING_PARAMETERS = frozenset(["fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid", "ref", "ref_src"])
+TRACKING_PREFIXES = ("utm_",)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Key under which different spellings of the same page compare equal.
+    
+    Lower-cases the host, ignores the scheme (http/https), a leading "www.", default
+    ports, the fragment, tracking parameters, query parameter order and a trailing
+    slash. The key is only for comparison; results keep their original URL.
+    """
+    parts = urlsplit(url.strip())
+    if not parts.netloc:
+        return url.strip()
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if name.lower() not in TRACKING_PARAMETERS and not name.lower().startswith(TRACKING_PREFIXES))
+    path = parts.path.rstrip("/")
+    return urlunsplit(("", host, path, urlencode(query), ""))
+
+
+def minhash(text: str) -> Optional[np.ndarray]:
+    """MinHash signature of the set of words of a text, or None for text without words"""
+    terms = set(tokenize(text))
+    if not terms:
+        return None
+    digests = b"".join(hashlib.blake2b(term.encode(), digest_size=4).digest() for term in terms)
+    hashes = np.frombuffer(digests, dtype=np.uint32).astype(np.uint64) % np.uint64(MINHASH_PRIME)
+    permuted = (hashes[:, None] * _PERMUTATION_A + _PERMUTATION_B) % np.uint64(MINHASH_PRIME)
+    return permuted.min(axis=0)
+
+
+def estimated_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Jaccard similarity estimated from two MinHash signatures"""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+class NearDuplicateIndex:
+    """
+    MinHash signatures, searchable for any at least min_similarity similar.
+    
+    Signatures are split into LSH bands; only signatures that agree exactly on a
+    whole band are compared, which finds pairs above about 0.5 similarity without
+    comparing every pair.
+    """
+    
+    def __init__(self, min_similarity: float = DEFAULT_NEAR_DUPLICATE_SIMILARITY):
+        self.min_similarity = min_similarity
+        self._rows = MINHASH_PERMUTATIONS // LSH_BANDS
+        self._bands: Dict[Tuple[int, bytes], List[Tuple[np.ndarray, Any]]] = {}
+    
+    def _keys(self, signature: np.ndarray):
+        for band in range(LSH_BANDS):
+            yield band, signature[band * self._rows:(band + 1) * self._rows].tobytes()
+    
+    def find(self, signature: np.ndarray) -> Optional[Any]:
+        """Item of the first stored signature at least min_similarity similar, or None"""
+        for key in self._keys(signature):
+            for candidate, item in self._bands.get(key, ()):
+                if estimated_similarity(candidate, signature) >= self.min_similarity:
+                    return item
+        return None
+    
+    def add(self, signature: np.ndarray, item: Any):
+        for key in self._keys(signature):
+            self._bands.setdefault(key, []).append((signature, item))
+
+
+def merge_results(result_lists: Sequence[List[Dict[str, Any]]], num_results: int, rrf_k: int = DEFAULT_RRF_K,
+                  near_duplicate_similarity: float = DEFAULT_NEAR_DUPLICATE_SIMILARITY) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Fuse ranked result lists into one, dropping duplicates.
+    
+    Results with the same canonical URL, or whose snippets are at least
+    near_duplicate_similarity similar (MinHash estimate), count as one. Each list
+    contributes 1 / (rrf_k + rank) for its best-ranked copy of a result, and results
+    are ordered by the sum (reciprocal-rank fusion). Each merged result is its best-ranked copy with an
+    added "rrf_score". Returns (the top num_results, number of duplicates dropped).
+    """
+    entries: List[Dict[str, Any]] = []
+    by_url: Dict[str, Dict[str, Any]] = {}
+    similar = NearDuplicateIndex(near_duplicate_similarity)
+    duplicates = 0
+    
+    # Visit rank by rank so that the first copy of a result seen is its best-ranked one
+    for rank in range(max((len(results) for results in result_lists), default=0)):
+        for list_index, results in enumerate(result_lists):
+            if rank >= len(results):
+                continue
+            result = results[rank]
+            key = canonicalize_url(result.get("url", ""))
+            entry = by_url.get(key) if key else None
+            signature = None
+            if entry is None:
+                signature = minhash(result.get("snippet") or result.get("title", ""))
+                if signature is not None:
+                    entry = similar.find(signature)
+            if entry is None:
+                entry = {"result": result, "score": 0.0, "lists": set()}
+                entries.append(entry)
+                if signature is not None:
+                    similar.add(signature, entry)
+            else:
+                duplicates += 1
+            if key:
+                by_url.setdefault(key, entry)
+            if list_index not in entry["lists"]:
+                entry["lists"].add(list_index)
+                entry["score"] += 1.0 / (rrf_k + rank + 1)
+    
+    entries.sort(key=lambda entry: entry["score"], reverse=True)
+    return [dict(entry["result"], rrf_score=round(entry["score"], 6)) for entry in entries[:num_results]], duplicates
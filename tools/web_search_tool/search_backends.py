@@ -0,0 +1,98 @@
+"""
+Search Backends for the Multi-Agent Research System
+Pluggable engines behind the Web Search Tool
+"""
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Any, Iterable, List, Tuple
+from tools.tool_framework import Retirable
+from tools.web_search_tool.local_index import DEFAULT_INDEX_PATH, LocalSearchIndex
+
+
+class SearchBackend(Retirable, ABC):
+    """
+    Engine that answers search queries with a list of {"title", "url", "snippet"} results.
+    
+    A backend replaced after a configuration change is retired: it is closed once the
+    searches running on it finish.
+    """
+    
+    name = "base"
+    
+    @abstractmethod
+    def search(self, query: str, num_results: int) -> List[Dict[str, Any]]:
+        """Return up to num_results results for the query, best first"""
+        pass
+    
+    async def asearch(self, query: str, num_results: int) -> List[Dict[str, Any]]:
+        """Async search; in-process backends answer directly, network backends override this"""
+        return self.search(query, num_results)
+    
+    def search_many(self, requests: List[Tuple[str, int]]) -> List[List[Dict[str, Any]]]:
+        """Results for several (query, num_results) requests, in order"""
+        return [self.search(query, num_results) for query, num_results in requests]
+    
+    def add_documents(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """Index {"url", "title", "content"} documents; read-only backends raise NotImplementedError"""
+        raise NotImplementedError(f"The '{self.name}' search backend cannot index documents")
+    
+    def close(self):
+        """Release the backend's resources"""
+        pass
+
+
+class MockSearchBackend(SearchBackend):
+    """Canned results for demos and tests (at most three per query)"""
+    
+    name = "mock"
+    
+    def search(self, query: str, num_results: int) -> List[Dict[str, Any]]:
+        return [{
+            "title": f"Mock Result {i+1} for {query}",
+            "url": f"https://example.com/result{i+1}",
+            "snippet": f"This is a mock snippet for the search result {i+1} related to {query}..."
+        } for i in range(min(num_results, 3))]
+
+
+class LocalIndexBackend(SearchBackend):
+    """BM25 search over a local on-disk index, for deployments without network access"""
+    
+    name = "local"
+    
+    def __init__(self, index_path: str = DEFAULT_INDEX_PATH):
+        self.index = LocalSearchIndex(index_path)
+    
+    def search(self, query: str, num_results: int) -> List[Dict[str, Any]]:
+        return self.index.search(query, num_results)
+    
+    def add_documents(self, documents: Iterable[Dict[str, Any]]) -> int:
+        return self.index.add_documents(documents)
+    
+    def close(self):
+        self.index.close()
+
+
+def _http_backend(config: Any) -> SearchBackend:
+    from tools.web_search_tool.http_backend import HttpSearchBackend
+    return HttpSearchBackend(config.get("endpoint", ""), config.get("max_connections", 10),
+                             config.get("timeout_seconds", 30))
+
+
+# name -> callable(config) returning a SearchBackend; config is the tool's ToolConfig
+SEARCH_BACKENDS: Dict[str, Callable[[Any], SearchBackend]] = {
+    "mock": lambda config: MockSearchBackend(),
+    "local": lambda config: LocalIndexBackend(config.get("index_path", DEFAULT_INDEX_PATH)),
+    "http": _http_backend
+}
+
+
+def register_backend(name: str, factory: Callable[[Any], SearchBackend]):
+    """Register (or replace) a search backend factory under a name usable in the "backend" setting"""
+    SEARCH_BACKENDS[name] = factory
+
+
+def create_backend(name: str, config: Any) -> SearchBackend:
+    """Create the backend registered under name"""
+    factory = SEARCH_BACKENDS.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown search backend: {name} (available: {', '.join(sorted(SEARCH_BACKENDS))})")
+    return factory(config)
@@ -0,0 +1,133 @@
+"""
+Stand-in Search Service for the Multi-Agent Research System
+Local HTTP/1.1 search server with simulated latency and errors, for tests and benchmarks
+"""
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+class _StandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # Accept bursts of concurrent connections
+    
+    def handle_error(self, request, client_address):
+        # Clients timing out or hanging up mid-response are expected; report anything else
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class _SearchRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive by default
+    disable_nagle_algorithm = True  # Result lines are written as they are produced
+    
+    def setup(self):
+        super().setup()
+        self.server.standin.on_connection()
+    
+    def log_message(self, format, *args):
+        pass  # Keep test and benchmark output quiet
+    
+    def log_error(self, format, *args):
+        pass
+    
+    def do_GET(self):
+        try:
+            self._respond()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # The client timed out or hung up
+    
+    def _respond(self):
+        standin = self.server.standin
+        params = parse_qs(urlsplit(self.path).query)
+        query = params.get("q", [""])[0]
+        num_results = int(params.get("n", ["10"])[0])
+        
+        if standin.latency_seconds:
+            time.sleep(standin.latency_seconds)
+        if standin.should_fail():
+            body = b'{"error": "simulated failure"}'
+            self.send_response(503)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for result in standin.results_for(query, num_results):
+            line = json.dumps(result).encode() + b"\n"
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class StandInSearchServer:
+    """
+    Local search service speaking the protocol HttpSearchBackend expects.
+    
+    Results are streamed as chunked NDJSON over keep-alive connections. Each request
+    waits latency_seconds, fails with HTTP 503 with probability error_rate, and each
+    new connection waits connect_latency_seconds first (standing in for the TCP and
+    TLS handshakes of a remote service). Counters record connections and requests.
+    """
+    
+    def __init__(self, latency_seconds: float = 0.0, error_rate: float = 0.0,
+                 connect_latency_seconds: float = 0.0, seed: Optional[int] = None):
+        self.latency_seconds = latency_seconds
+        self.error_rate = error_rate
+        self.connect_latency_seconds = connect_latency_seconds
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/search"
+    
+    def on_connection(self):
+        with self._lock:
+            self.connections += 1
+        if self.connect_latency_seconds:
+            time.sleep(self.connect_latency_seconds)
+    
+    def should_fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            return self._rng.random() < self.error_rate
+    
+    def results_for(self, query: str, num_results: int) -> List[Dict[str, Any]]:
+        return [{"title": f"Result {i+1} for {query}",
+                 "url": f"https://standin.example/{query.replace(' ', '-')}/{i+1}",
+                 "snippet": f"Stand-in snippet {i+1} about {query}."} for i in range(num_results)]
+    
+    def start(self) -> "StandInSearchServer":
+        self._server = _StandInHTTPServer(("127.0.0.1", 0), _SearchRequestHandler)
+        self._server.standin = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="standin-search", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+    
+    def __enter__(self) -> "StandInSearchServer":
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
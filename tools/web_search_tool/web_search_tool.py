@@ -3,11 +3,26 @@ Web Search Tool for the Multi-Agent Research System
 """
 from tools.tool_framework import Tool
 from tools.config.tool_config import ToolConfig, DEFAULT_CONFIGS
-from typing import Dict, Any
+from tools.result_cache import ResultCache
+from tools.web_search_tool.search_backends import SearchBackend, create_backend
+from tools.web_search_tool.result_merging import merge_results, DEFAULT_RRF_K, DEFAULT_NEAR_DUPLICATE_SIMILARITY
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, Iterator, List, Tuple
+import asyncio
+import threading
 
 
 class WebSearchTool(Tool):
-    """Tool for performing web searches - example implementation"""
+    """
+    Tool for performing web searches through a pluggable search backend.
+    
+    Each call uses the backend that was current when it started. When the backend
+    settings change, a new backend takes over and the old one is closed once its
+    calls finish. Cache keys carry the backend's generation, so results that a
+    retired backend returns late are never served.
+    """
+    
+    idempotent = True  # Searches have no side effects
     
     def __init__(self):
         super().__init__(
@@ -21,6 +36,41 @@ class WebSearchTool(Tool):
         for key, value in DEFAULT_CONFIGS["web_search_tool"].items():
             if self.config.get(key) is None:
                 self.config.set(key, value)
+        self.cache = ResultCache(self._cache_ttl_seconds())
+        self.backend = create_backend(self.config.get("backend", "mock"), self.config)
+        self._generation = 0  # Incremented whenever the backend is replaced
+        self._backend_lock = threading.Lock()
+        # Re-tune the cache and switch backends when their settings change
+        self.config.subscribe(self._on_config_changed)
+    
+    def _cache_ttl_seconds(self) -> float:
+        if not self.config.get("enable_caching", True):
+            return 0
+        return self.config.get("cache_duration_minutes", 60) * 60
+    
+    def _on_config_changed(self, changes: Dict[str, Any]):
+        if "enable_caching" in changes or "cache_duration_minutes" in changes:
+            self.cache.ttl_seconds = self._cache_ttl_seconds()
+            if self.cache.ttl_seconds <= 0:
+                self.cache.clear()
+        if changes.keys() & {"backend", "index_path", "endpoint", "max_connections", "timeout_seconds"}:
+            backend = create_backend(self.config.get("backend", "mock"), self.config)
+            with self._backend_lock:
+                previous, self.backend = self.backend, backend
+                self._generation += 1
+            previous.retire()
+            self.cache.clear()
+    
+    @contextmanager
+    def _backend_in_use(self) -> Iterator[Tuple[int, SearchBackend]]:
+        """The current backend and its generation, kept open until the block ends"""
+        with self._backend_lock:
+            generation, backend = self._generation, self.backend
+            backend.acquire()
+        try:
+            yield generation, backend
+        finally:
+            backend.release()
     
     def get_params_definition(self):
         return {
@@ -34,27 +84,146 @@ class WebSearchTool(Tool):
                 "required": False,
                 "default": self.config.get("default_num_results", 5),
                 "description": f"Number of results to return (default: {self.config.get('default_num_results', 5)})"
+            },
+            "query_variants": {
+                "type": "array",
+                "required": False,
+                "max_items": self.config.get("max_query_variants", 8),
+                "description": "Other phrasings of the query, searched in parallel; results are merged without duplicates"
             }
         }
     
     def execute(self, **params) -> Dict[str, Any]:
-        # This is a mock implementation - in a real system, you'd connect to a search API
         query = params.get("query", "")
         num_results = params.get("num_results", 5)
+        queries = self._queries(params)
         
-        # Mock response
+        if len(queries) > 1:
+            print(f"Performing multi-query web search for: '{query}' and {len(queries) - 1} variants "
+                  f"(limit: {num_results} results)")
+            with self._backend_in_use() as backend:
+                responses = self._search_all([(variant, num_results) for variant in queries], backend)
+            return self._merge(query, queries, num_results, [responses[(variant, num_results)] for variant in queries])
         print(f"Performing web search for: '{query}' (limit: {num_results} results)")
         
-        mock_results = []
-        for i in range(min(num_results, 3)):  # Limit to 3 for demo
-            mock_results.append({
-                "title": f"Mock Result {i+1} for {query}",
-                "url": f"https://example.com/result{i+1}",
-                "snippet": f"This is a mock snippet for the search result {i+1} related to {query}..."
-            })
+        with self._backend_in_use() as backend:
+            return self._search(query, num_results, backend)
+    
+    async def aexecute(self, **params) -> Dict[str, Any]:
+        # Native coroutine so that waiting on the search service does not hold a thread
+        query = params.get("query", "")
+        num_results = params.get("num_results", 5)
+        queries = self._queries(params)
+        
+        if len(queries) > 1:
+            print(f"Performing multi-query web search for: '{query}' and {len(queries) - 1} variants "
+                  f"(limit: {num_results} results)")
+            with self._backend_in_use() as backend:
+                responses = await asyncio.gather(*(self._asearch(variant, num_results, backend) for variant in queries))
+            return self._merge(query, queries, num_results, responses)
+        print(f"Performing web search for: '{query}' (limit: {num_results} results)")
         
+        with self._backend_in_use() as backend:
+            return await self._asearch(query, num_results, backend)
+    
+    def execute_batch(self, params_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Resolve the default once and log the whole batch as one search round
+        default_num_results = self.config.get("default_num_results", 5)
+        print(f"Performing batch web search for {len(params_list)} queries")
+        
+        searches = [(params.get("query", ""), self._queries(params), params.get("num_results", default_num_results))
+                    for params in params_list]
+        with self._backend_in_use() as backend:
+            responses = self._search_all([(variant, num_results) for _, queries, num_results in searches
+                                          for variant in queries], backend)
+        return [self._merge(query, queries, num_results, [responses[(variant, num_results)] for variant in queries])
+                if len(queries) > 1 else responses[(query, num_results)]
+                for query, queries, num_results in searches]
+    
+    def _queries(self, params: Dict[str, Any]) -> List[str]:
+        """The query followed by its distinct variants"""
+        return list(dict.fromkeys([params.get("query", ""), *(params.get("query_variants") or [])]))
+    
+    def _search_all(self, keys: List[Tuple[str, int]],
+                    backend: Tuple[int, SearchBackend]) -> Dict[Tuple[str, int], Dict[str, Any]]:
+        """Search responses for (query, num_results) keys, fetching uncached ones together"""
+        generation, search_backend = backend
+        responses = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            response = self.cache.get((generation, *key))
+            if response is None:
+                missing.append(key)
+            else:
+                responses[key] = response
+        # Uncached queries go to the backend together, so network backends can run them concurrently
+        for key, results in zip(missing, search_backend.search_many(missing)):
+            responses[key] = self._response(key[0], results)
+            self._cache_put(generation, key, responses[key])
+        return responses
+    
+    def _cache_put(self, generation: int, key: Tuple[str, int], response: Dict[str, Any]):
+        """Cache a response, unless the backend that produced it has been replaced meanwhile"""
+        if generation == self._generation:
+            self.cache.put((generation, *key), response)
+    
+    def _merge(self, query: str, queries: List[str], num_results: int,
+               responses: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """One response from the responses to each query variant, fused by rank and without duplicates"""
+        results, duplicates = merge_results(
+            [response["results"] for response in responses], num_results,
+            self.config.get("rrf_k", DEFAULT_RRF_K),
+            self.config.get("near_duplicate_similarity", DEFAULT_NEAR_DUPLICATE_SIMILARITY))
+        return {
+            "query": query,
+            "queries": queries,
+            "results": results,
+            "num_results_returned": len(results),
+            "duplicates_removed": duplicates
+        }
+    
+    def _search(self, query: str, num_results: int, backend: Tuple[int, SearchBackend]) -> Dict[str, Any]:
+        """Return the search response for a query, from the result cache when possible"""
+        generation, search_backend = backend
+        response = self.cache.get((generation, query, num_results))
+        if response is None:
+            response = self._fetch_results(query, num_results, search_backend)
+            self._cache_put(generation, (query, num_results), response)
+        return response
+    
+    async def _asearch(self, query: str, num_results: int, backend: Tuple[int, SearchBackend]) -> Dict[str, Any]:
+        """Async counterpart of _search"""
+        generation, search_backend = backend
+        response = self.cache.get((generation, query, num_results))
+        if response is None:
+            response = self._response(query, await search_backend.asearch(query, num_results))
+            self._cache_put(generation, (query, num_results), response)
+        return response
+    
+    def _fetch_results(self, query: str, num_results: int, search_backend: SearchBackend) -> Dict[str, Any]:
+        """Build the search response for a query from the given backend"""
+        return self._response(query, search_backend.search(query, num_results))
+    
+    def _response(self, query: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
         return {
             "query": query,
-            "results": mock_results,
-            "num_results_returned": len(mock_results)
-        }
\ No newline at end of file
+            "results": results,
+            "num_results_returned": len(results)
+        }
+    
+    def index_documents(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add {"url", "title", "content"} documents to the backend's index.
+        
+        Cached responses are dropped, since they may no longer be the best results.
+        Raises NotImplementedError for backends that cannot index (such as "mock").
+        """
+        with self._backend_in_use() as (_, backend):
+            indexed = backend.add_documents(documents)
+        self.cache.clear()
+        return indexed
+    
+    def close(self):
+        """Stop following configuration changes and release the backend's connections once its calls finish"""
+        self.config.unsubscribe(self._on_config_changed)
+        self.backend.retire()